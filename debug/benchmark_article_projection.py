@@ -0,0 +1,85 @@
+"""文章列表查詢的欄位投影基準測試。
+
+比較以完整物件 (含內文與摘要) 取回文章列表，與使用具名欄位集合 (list / status)
+只取回必要欄位時，每次查詢的延遲與從資料庫傳回的資料量。
+
+執行方式: python -m debug.benchmark_article_projection [文章數量] [重複次數]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from src.database.articles_repository import ArticlesRepository
+from src.models.articles_model import Articles, ArticleScrapeStatus
+from src.models.base_model import Base
+
+
+def seed(session, num_articles, rng):
+    """建立指定數量的文章，內文約 8KB、摘要約 400 字元"""
+    statuses = list(ArticleScrapeStatus)
+    session.add_all(
+        Articles(
+            title=f"文章標題 {i}",
+            link=f"https://example.com/article/{i}",
+            summary="摘要" * 200,
+            content="內文段落。" * rng.randint(1200, 2000),
+            source="benchmark",
+            source_url="https://example.com",
+            category=rng.choice(["AI", "科技", "財經"]),
+            is_scraped=rng.random() < 0.5,
+            scrape_status=rng.choice(statuses),
+            task_id=None,
+        )
+        for i in range(num_articles)
+    )
+    session.commit()
+
+
+def row_bytes(rows):
+    """估算結果列的資料量 (以字串表示的長度計)"""
+    total = 0
+    for row in rows:
+        if isinstance(row, dict):
+            values = row.values()
+        else:
+            values = [getattr(row, column.key) for column in Articles.__table__.columns]
+        total += sum(len(str(value).encode("utf-8")) for value in values if value is not None)
+    return total
+
+
+def main(num_articles=10_000, repeat=3):
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp_dir, 'benchmark.db')}")
+        Base.metadata.create_all(engine)
+        with Session(engine) as session:
+            start = time.perf_counter()
+            seed(session, num_articles, rng)
+            print(f"建立 {num_articles} 篇文章: {time.perf_counter() - start:.3f}s")
+
+        for column_set in ("full", "list", "status"):
+            elapsed = 0.0
+            size = 0
+            for _ in range(repeat):
+                with Session(engine) as session:
+                    repo = ArticlesRepository(session, Articles)
+                    start = time.perf_counter()
+                    rows = repo.find_by_filter({}, column_set=column_set)
+                    elapsed += time.perf_counter() - start
+                    size = row_bytes(rows)
+            print(
+                f"欄位集合 {column_set:<6} - 每次查詢 {elapsed / repeat * 1000:8.1f}ms, "
+                f"資料量 {size / 1024 / 1024:8.2f}MB ({len(rows)} 筆)"
+            )
+        engine.dispose()
+
+
+if __name__ == '__main__':
+    args = [int(arg) for arg in sys.argv[1:3]]
+    main(*args)
@@ -0,0 +1,70 @@
+"""文章記錄建表與抓取結果合併的微基準測試。
+
+比較逐篇建立單行 DataFrame 再 concat 的舊作法，與 BnextUtils 一次性建表、依 link 向量化合併的作法。
+
+執行方式: python -m debug.benchmark_bnext_records [文章數量]
+"""
+
+import sys
+import time
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from src.crawlers.bnext_utils import BnextUtils
+
+
+def legacy_process_articles_to_dataframe(articles_list):
+    """舊作法：每篇文章建立單行 DataFrame 後 concat"""
+    df_articles = [
+        pd.DataFrame([BnextUtils.get_article_columns_dict(**article)])
+        for article in articles_list
+    ]
+    df = pd.concat(df_articles, ignore_index=True)
+    return df.drop_duplicates(subset=['link'], keep='first')
+
+
+def legacy_merge(articles_df, articles_content, task_id):
+    """舊作法：依列表位置逐格 .loc 更新"""
+    for index, article in enumerate(articles_content):
+        if index < len(articles_df):
+            is_scraped = bool(article.get('is_scraped', False))
+            articles_df.loc[index, 'is_scraped'] = is_scraped
+            articles_df.loc[index, 'scrape_status'] = 'content_scraped' if is_scraped else 'failed'
+            articles_df.loc[index, 'scrape_error'] = article.get('scrape_error')
+            articles_df.loc[index, 'last_scrape_attempt'] = article.get('last_scrape_attempt')
+            articles_df.loc[index, 'task_id'] = task_id
+    return articles_df
+
+
+def timed(func, *args):
+    """執行函數並返回 (結果, 耗時秒數)"""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main(num_articles=10_000):
+    now = datetime.now(timezone.utc)
+    articles = [
+        {'title': f'文章{i}', 'link': f'https://example.com/{i}', 'category': 'AI'}
+        for i in range(num_articles)
+    ]
+    results = [
+        {'link': f'https://example.com/{i}', 'is_scraped': i % 2 == 0,
+         'scrape_error': None, 'last_scrape_attempt': now}
+        for i in range(num_articles)
+    ]
+
+    legacy_df, legacy_build = timed(legacy_process_articles_to_dataframe, articles)
+    _, legacy_merge_time = timed(legacy_merge, legacy_df, results, 1)
+    df, build = timed(BnextUtils.process_articles_to_dataframe, articles)
+    _, merge = timed(BnextUtils.merge_scrape_results_by_link, df, results, 1)
+
+    print(f"文章數量: {num_articles}")
+    print(f"建表  - 舊作法: {legacy_build:.3f}s, 新作法: {build:.3f}s")
+    print(f"合併  - 舊作法: {legacy_merge_time:.3f}s, 新作法: {merge:.3f}s")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
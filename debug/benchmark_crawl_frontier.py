@@ -0,0 +1,116 @@
+"""待抓取連結表 (crawl_frontier) 的領取吞吐量基準測試。
+
+加入指定數量、分布在多個主機的連結後，以多個執行緒同時依主機分散領取批次並標記完成，
+回報加入速度、每秒領取連結數，並確認每個連結只被領取一次。
+預設使用暫存的 SQLite 資料庫；設定環境變數 BENCHMARK_DATABASE_URL (例如 PostgreSQL) 時改用該資料庫，
+測試前後會清空 crawl_frontier 表。
+
+執行方式: python -m debug.benchmark_crawl_frontier [連結數量] [worker 數量]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+from sqlalchemy import create_engine, delete
+from sqlalchemy.orm import Session
+
+from src.database.crawl_frontier_repository import CrawlFrontierRepository
+from src.models.base_model import Base
+from src.models.crawl_frontier_model import CrawlFrontier
+
+NUM_HOSTS = 20
+BATCH_SIZE = 50
+PER_HOST_LIMIT = 5
+ENQUEUE_CHUNK_SIZE = 1000
+
+
+def seed(engine, num_links, rng):
+    """分批加入連結，主機分布不均 (少數主機佔多數連結)"""
+    hosts = [f"news{i}.example.com" for i in range(NUM_HOSTS)]
+    weights = [1 / (i + 1) for i in range(NUM_HOSTS)]
+    links = [
+        {
+            "url": f"https://{rng.choices(hosts, weights=weights)[0]}/article/{i}",
+            "priority": rng.random() * 10,
+            "payload": {"title": f"article {i}"},
+        }
+        for i in range(num_links)
+    ]
+    for start in range(0, num_links, ENQUEUE_CHUNK_SIZE):
+        with Session(engine) as session:
+            CrawlFrontierRepository(session, CrawlFrontier).enqueue_links(
+                links[start : start + ENQUEUE_CHUNK_SIZE]
+            )
+            session.commit()
+
+
+def run_workers(engine, num_workers):
+    """每個 worker 重複領取批次並標記完成，直到沒有可領取的連結"""
+    dialect_name = engine.dialect.name
+    claimed = []
+    lock = threading.Lock()
+
+    def worker(worker_id):
+        while True:
+            with CrawlFrontierRepository.claim_lock(dialect_name), Session(engine) as session:
+                repo = CrawlFrontierRepository(session, CrawlFrontier)
+                entries = repo.claim_batch(worker_id, BATCH_SIZE, PER_HOST_LIMIT)
+                entry_ids = [entry.id for entry in entries]
+                session.commit()
+            if not entry_ids:
+                return
+            with Session(engine) as session:
+                CrawlFrontierRepository(session, CrawlFrontier).mark_done(entry_ids, worker_id)
+                session.commit()
+            with lock:
+                claimed.extend(entry_ids)
+
+    threads = [threading.Thread(target=worker, args=(f"worker-{i}",)) for i in range(num_workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return claimed
+
+
+def clear(engine):
+    with Session(engine) as session:
+        session.execute(delete(CrawlFrontier))
+        session.commit()
+
+
+def main(num_links=20000, num_workers=4):
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        database_url = os.getenv("BENCHMARK_DATABASE_URL") or (
+            f"sqlite:///{os.path.join(tmp_dir, 'benchmark.db')}"
+        )
+        engine = create_engine(database_url, pool_size=num_workers + 2)
+        Base.metadata.create_all(engine)
+        clear(engine)
+        print(f"資料庫: {engine.dialect.name}")
+
+        start = time.perf_counter()
+        seed(engine, num_links, rng)
+        elapsed = time.perf_counter() - start
+        print(f"加入 {num_links} 個連結: {elapsed:.2f}s ({num_links / elapsed:.0f} 個/秒)")
+
+        start = time.perf_counter()
+        claimed = run_workers(engine, num_workers)
+        elapsed = time.perf_counter() - start
+        assert len(claimed) == len(set(claimed)) == num_links
+        print(
+            f"{num_workers} 個 worker 領取 {len(claimed)} 個連結 (每批 {BATCH_SIZE}、每主機 {PER_HOST_LIMIT}): "
+            f"{elapsed:.2f}s ({len(claimed) / elapsed:.0f} 個/秒)，無重複領取"
+        )
+        clear(engine)
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    main(*args)
@@ -0,0 +1,119 @@
+"""待執行任務查詢的微基準測試。
+
+比較舊作法 (取出所有自動任務後在 Python 中逐一以 croniter 計算下次執行時間)，
+與以預先計算的 next_run_at 欄位進行單一索引查詢的作法，並顯示查詢計畫確認使用索引。
+
+執行方式: python -m debug.benchmark_due_tasks [任務數量] [重複次數]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from src.database.crawler_tasks_repository import CrawlerTasksRepository
+from src.models.base_model import Base
+from src.models.crawler_tasks_model import CrawlerTasks
+from src.models.crawlers_model import Crawlers
+from src.utils.datetime_utils import calculate_next_cron_run
+
+CRON_EXPRESSIONS = ["0 * * * *", "*/15 * * * *", "0 0 * * *", "30 6 * * 1", "0 */6 * * *"]
+
+
+def seed(session, num_tasks, rng):
+    """建立指定數量的自動任務，上次執行時間隨機分布在過去兩天內"""
+    crawler = Crawlers(
+        crawler_name="benchmark",
+        module_name="benchmark",
+        base_url="https://example.com",
+        crawler_type="web",
+        config_file_name="benchmark.json",
+    )
+    session.add(crawler)
+    session.flush()
+    now = datetime.now(timezone.utc)
+    session.add_all(
+        CrawlerTasks(
+            task_name=f"task-{i}",
+            crawler_id=crawler.id,
+            is_auto=rng.random() < 0.9,
+            is_active=rng.random() < 0.95,
+            cron_expression=rng.choice(CRON_EXPRESSIONS),
+            last_run_at=now - timedelta(minutes=rng.randint(0, 2 * 24 * 60)),
+        )
+        for i in range(num_tasks)
+    )
+    session.commit()
+
+
+def legacy_due_ids(session, now):
+    """舊作法：每個 cron 表達式取出候選任務，在 Python 中逐一計算"""
+    due = []
+    for cron_expression in CRON_EXPRESSIONS:
+        rows = (
+            session.query(CrawlerTasks.id, CrawlerTasks.last_run_at)
+            .filter(
+                CrawlerTasks.cron_expression == cron_expression,
+                CrawlerTasks.is_auto == True,
+                CrawlerTasks.is_active == True,
+            )
+            .all()
+        )
+        for task_id, last_run_at in rows:
+            if last_run_at is None or now >= calculate_next_cron_run(cron_expression, last_run_at):
+                due.append(task_id)
+    return sorted(due)
+
+
+def main(num_tasks=10_000, repeat=5):
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp_dir, 'benchmark.db')}")
+        Base.metadata.create_all(engine)
+        with Session(engine) as session:
+            start = time.perf_counter()
+            seed(session, num_tasks, rng)
+            print(f"建立 {num_tasks} 個任務 (含 next_run_at 計算): {time.perf_counter() - start:.3f}s")
+
+            repo = CrawlerTasksRepository(session, CrawlerTasks)
+            now = datetime.now(timezone.utc)
+
+            start = time.perf_counter()
+            for _ in range(repeat):
+                legacy = legacy_due_ids(session, now)
+            legacy_elapsed = (time.perf_counter() - start) / repeat
+
+            start = time.perf_counter()
+            for _ in range(repeat):
+                current = sorted(
+                    row["id"]
+                    for row in repo.find_due_tasks(now=now, is_preview=True, preview_fields=["id"])
+                )
+            indexed_elapsed = (time.perf_counter() - start) / repeat
+
+            assert legacy == current
+            print(
+                f"到期任務 {len(current)} 個 - croniter 逐一計算: {legacy_elapsed * 1000:.1f}ms, "
+                f"next_run_at 索引查詢: {indexed_elapsed * 1000:.1f}ms"
+            )
+
+            plan = session.execute(
+                text(
+                    "EXPLAIN QUERY PLAN SELECT id FROM crawler_tasks "
+                    "WHERE is_auto = 1 AND is_active = 1 AND next_run_at <= :now"
+                ),
+                {"now": now.isoformat()},
+            ).all()
+            for row in plan:
+                print("查詢計畫:", row[-1])
+        engine.dispose()
+
+
+if __name__ == '__main__':
+    args = [int(arg) for arg in sys.argv[1:3]]
+    main(*args)
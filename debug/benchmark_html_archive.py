@@ -0,0 +1,54 @@
+"""原始 HTML 封存的儲存成本與寫入開銷基準測試。
+
+以模擬的文章頁面 (重複的網站版型加上約 6KB 的隨機內文，每頁約 80KB) 寫入封存，
+回報每萬篇文章的原始與壓縮後大小，以及每次寫入的平均耗時 (相對於一般網頁請求的數秒延遲)。
+
+執行方式: python -m debug.benchmark_html_archive [文章數量] [zstd 壓縮等級]
+"""
+
+import random
+import sys
+import tempfile
+import time
+
+from src.crawlers.html_archive import DEFAULT_ZSTD_LEVEL, HtmlArchive
+
+
+def build_page(index, layout, vocabulary, rng):
+    """建立模擬的文章頁面"""
+    body = "".join(
+        f"<p>{''.join(rng.choices(vocabulary, k=rng.randint(40, 80)))}</p>" for _ in range(20)
+    )
+    return (
+        f"<html><head><title>文章 {index}</title></head><body>{layout}"
+        f"<article id='a{index}'>{body}</article>{layout}</body></html>"
+    ).encode("utf-8")
+
+
+def main(num_articles=2000, level=DEFAULT_ZSTD_LEVEL):
+    rng = random.Random(42)
+    vocabulary = [chr(0x4E00 + i) for i in range(3000)]
+    layout = "".join(
+        f"<div class='nav-item'><a href='/category/{i}'>分類 {i}</a></div>" for i in range(600)
+    )
+    pages = [build_page(i, layout, vocabulary, rng) for i in range(num_articles)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        archive = HtmlArchive(directory, compression_level=level, retention_days=None, max_versions=None)
+        start = time.perf_counter()
+        for i, page in enumerate(pages):
+            archive.store(f"https://example.com/article/{i}", page)
+        elapsed = time.perf_counter() - start
+        stats = archive.get_stats()
+
+    scale = 10000 / num_articles
+    print(f"文章數: {num_articles}，zstd 等級: {level}")
+    print(f"每萬篇原始大小: {stats['raw_bytes'] * scale / 1024 / 1024:.1f} MB")
+    print(f"每萬篇封存大小: {stats['stored_bytes_per_10k_urls'] / 1024 / 1024:.1f} MB")
+    print(f"壓縮比: {stats['compression_ratio']}")
+    print(f"平均寫入耗時: {stats['avg_write_ms']:.3f} ms (總計 {elapsed:.2f} 秒)")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    main(*args)
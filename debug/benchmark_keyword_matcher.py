@@ -0,0 +1,60 @@
+"""AI 關鍵字比對的微基準測試。
+
+比較逐一以 in 檢查每個關鍵字的舊作法，與 KeywordMatcher (Aho-Corasick) 單次掃描的作法，
+並以不同的關鍵字數量觀察兩者的擴展性。
+
+執行方式: python -m debug.benchmark_keyword_matcher [文章數量] [文章長度]
+"""
+
+import random
+import sys
+import time
+
+from src.crawlers.configs.ai_filter_config import AI_KEYWORDS
+from src.crawlers.keyword_matcher import KeywordMatcher
+
+FILLER = "今天我們討論科技產業的發展趨勢與市場競爭以及半導體供應鏈的變化和企業數位轉型的挑戰"
+
+
+def build_article(length, keywords, rng):
+    """產生指定長度、夾雜少量關鍵字的中文長文"""
+    parts = []
+    size = 0
+    while size < length:
+        part = rng.choice(keywords) if rng.random() < 0.1 else FILLER
+        parts.append(part)
+        size += len(part)
+    return "".join(parts).lower()
+
+
+def extra_keywords(count, rng):
+    """產生額外的隨機中文關鍵字，模擬註冊更多關鍵字的情況"""
+    chars = "資料模型運算晶片雲端平台演算推論訓練參數向量語意視覺"
+    return {"".join(rng.choice(chars) for _ in range(4)) for _ in range(count)}
+
+
+def main(num_articles=200, article_length=10_000):
+    rng = random.Random(42)
+    for extra in (0, 500, 2000):
+        keywords = set(AI_KEYWORDS) | extra_keywords(extra, rng)
+        articles = [build_article(article_length, sorted(AI_KEYWORDS), rng) for _ in range(num_articles)]
+        matcher = KeywordMatcher(keywords)
+
+        start = time.perf_counter()
+        legacy = [sum(1 for keyword in keywords if keyword in text) for text in articles]
+        legacy_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        current = [len(matcher.find_keywords(text)) for text in articles]
+        matcher_elapsed = time.perf_counter() - start
+
+        assert legacy == current
+        print(
+            f"關鍵字 {len(keywords):>5} 個，{num_articles} 篇 x {article_length} 字 - "
+            f"in 逐一比對: {legacy_elapsed:.3f}s, Aho-Corasick: {matcher_elapsed:.3f}s"
+        )
+
+
+if __name__ == '__main__':
+    args = [int(arg) for arg in sys.argv[1:3]]
+    main(*args)
@@ -0,0 +1,105 @@
+"""近似重複查詢的速度基準測試。
+
+在暫存 SQLite 資料庫寫入指定數量的文章指紋 (預設 100 萬筆)，其中一部分是既有文章的近似副本，
+再以 ArticlesRepository.find_near_duplicates 查詢，回報每次查詢的平均與 P99 毫秒數及候選數量。
+
+執行方式: python -m debug.benchmark_near_duplicate [文章數量] [查詢次數]
+"""
+
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from src.database.articles_repository import ArticlesRepository
+from src.models.articles_model import Articles
+from src.models.base_model import Base
+from src.utils.simhash_utils import SIMHASH_BITS, split_bands, to_signed64
+
+BATCH_SIZE = 50000
+
+
+def random_fingerprint(rng):
+    return rng.getrandbits(SIMHASH_BITS)
+
+
+def flip_bits(fingerprint, count, rng):
+    for bit in rng.sample(range(SIMHASH_BITS), count):
+        fingerprint ^= 1 << bit
+    return fingerprint
+
+
+def build_row(index, fingerprint):
+    bands = split_bands(fingerprint)
+    return {
+        "title": f"文章 {index}",
+        "link": f"https://news.example.com/article/{index}",
+        "source": "benchmark",
+        "source_url": "https://news.example.com",
+        "is_ai_related": False,
+        "is_scraped": True,
+        "scrape_status": "content_scraped",
+        "simhash": to_signed64(fingerprint),
+        "simhash_band_0": bands[0],
+        "simhash_band_1": bands[1],
+        "simhash_band_2": bands[2],
+        "simhash_band_3": bands[3],
+    }
+
+
+def main(num_articles=1_000_000, num_queries=2000):
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'bench.db')}")
+        Base.metadata.create_all(engine)
+
+        start = time.perf_counter()
+        fingerprints = []
+        with engine.begin() as connection:
+            rows = []
+            for i in range(num_articles):
+                fingerprint = random_fingerprint(rng)
+                fingerprints.append(fingerprint)
+                rows.append(build_row(i, fingerprint))
+                if len(rows) >= BATCH_SIZE:
+                    connection.execute(insert(Articles.__table__), rows)
+                    rows = []
+            if rows:
+                connection.execute(insert(Articles.__table__), rows)
+        print(f"寫入 {num_articles} 筆指紋: {time.perf_counter() - start:.1f} 秒")
+
+        session = sessionmaker(bind=engine)()
+        repo = ArticlesRepository(session, Articles)
+        # 一半查詢為既有文章的近似副本 (1~3 個位元不同)，一半為全新內容
+        queries = []
+        for i in range(num_queries):
+            if i % 2 == 0:
+                queries.append((flip_bits(rng.choice(fingerprints), rng.randint(1, 3), rng), True))
+            else:
+                queries.append((random_fingerprint(rng), False))
+
+        timings = []
+        found = 0
+        expected = 0
+        for fingerprint, is_duplicate in queries:
+            begin = time.perf_counter()
+            matches = repo.find_near_duplicates(fingerprint, max_distance=3)
+            timings.append((time.perf_counter() - begin) * 1000)
+            expected += is_duplicate
+            found += is_duplicate and bool(matches)
+        session.close()
+
+        timings.sort()
+        print(f"查詢 {num_queries} 次: 平均 {statistics.mean(timings):.3f} ms，"
+              f"P50 {timings[len(timings) // 2]:.3f} ms，P99 {timings[int(len(timings) * 0.99)]:.3f} ms")
+        print(f"近似副本找到 {found}/{expected}")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    main(*args)
@@ -0,0 +1,95 @@
+"""離線重新解析的處理速度基準測試。
+
+將模擬的文章頁面 (每頁約 80KB) 寫入暫存封存後，分別以 1 個與多個子行程重新解析，
+回報整體與每個子行程每分鐘處理的頁數。資料庫更新以只計數的服務代替，只量測解析本身。
+
+執行方式: python -m debug.benchmark_reextraction [頁面數量] [子行程數量]
+"""
+
+import os
+import random
+import sys
+import tempfile
+
+from src.crawlers.bnext_content_extractor import BnextContentExtractor
+from src.crawlers.configs.site_config import SiteConfig
+from src.crawlers.html_archive import HtmlArchive
+from src.crawlers.reextraction import ArticleReextractionJob
+
+BASE_URL = "https://news.example.com"
+
+
+class CountingArticleService:
+    """只計算更新筆數的文章服務"""
+
+    def __init__(self):
+        self.updated = 0
+
+    def batch_update_articles_by_link(self, article_data):
+        self.updated += len(article_data)
+        return {"success": True, "message": "ok", "resultMsg": {"success_count": len(article_data)}}
+
+
+def build_site_config():
+    return SiteConfig(
+        name="benchmark",
+        base_url=BASE_URL,
+        list_url_template="{base_url}/{category}",
+        categories=["ai"],
+        full_categories=["ai"],
+        selectors={
+            "get_article_contents": {
+                "content_container": "div.article",
+                "title": "h1.title",
+                "category": "a.category",
+                "author": "span.author",
+                "tags": {"container": "div.tags", "tag": "a"},
+                "content": "div.body",
+            }
+        },
+    )
+
+
+def build_page(index, layout, vocabulary, rng):
+    paragraphs = "".join(
+        f"<p>{''.join(rng.choices(vocabulary, k=rng.randint(40, 80)))}</p>" for _ in range(20)
+    )
+    return (
+        f"<html><body>{layout}<div class='article'><h1 class='title'>文章 {index}</h1>"
+        f"<a class='category'>AI</a><span class='author'>作者</span>"
+        f"<div class='tags'><a>AI</a><a>科技</a></div></div>"
+        f"<div class='body'>{paragraphs}</div>{layout}</body></html>"
+    ).encode("utf-8")
+
+
+def run(archive, workers):
+    service = CountingArticleService()
+    job = ArticleReextractionJob(
+        BnextContentExtractor, build_site_config(), archive, service, max_workers=workers
+    )
+    report = job.run()["result"]
+    print(f"子行程 {workers} 個: {report['processed']} 頁，{report['elapsed_seconds']} 秒，"
+          f"每分鐘 {report['pages_per_minute']} 頁")
+    for worker in report["workers"]:
+        print(f"  PID {worker['pid']}: {worker['pages']} 頁，每分鐘 {worker['pages_per_minute']} 頁")
+
+
+def main(num_pages=2000, workers=None):
+    workers = workers or os.cpu_count() or 1
+    rng = random.Random(42)
+    vocabulary = [chr(0x4E00 + i) for i in range(3000)]
+    layout = "".join(
+        f"<div class='nav-item'><a href='/category/{i}'>分類 {i}</a></div>" for i in range(600)
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        archive = HtmlArchive(directory, retention_days=None, max_versions=None)
+        for i in range(num_pages):
+            archive.store(f"{BASE_URL}/article/{i}", build_page(i, layout, vocabulary, rng))
+        run(archive, 1)
+        if workers > 1:
+            run(archive, workers)
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    main(*args)
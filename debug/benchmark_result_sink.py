@@ -0,0 +1,81 @@
+"""爬蟲結果檔案輸出格式的基準測試。
+
+以相同的模擬文章資料 (內文約 4KB)，比較 CSV 與 zstd 壓縮的 Parquet 輸出的
+檔案大小、分批寫入時間與讀回時間。
+
+執行方式: python -m debug.benchmark_result_sink [文章數量] [重複次數]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+
+from src.crawlers.result_sink import (
+    DEFAULT_RESULT_BATCH_SIZE,
+    RESULT_FORMATS,
+    create_result_sink,
+    load_results,
+)
+
+
+def build_articles(num_articles, rng):
+    """建立模擬的爬取結果，內文由隨機詞彙組成以免壓縮率失真"""
+    vocabulary = [chr(0x4E00 + i) + chr(0x4E00 + (i * 7) % 20000) for i in range(3000)]
+    base_time = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    return pd.DataFrame(
+        {
+            "title": [f"文章標題 {i}" for i in range(num_articles)],
+            "link": [f"https://example.com/article/{i}" for i in range(num_articles)],
+            "summary": ["摘要" * 100] * num_articles,
+            "content": [
+                "".join(rng.choices(vocabulary, k=rng.randint(500, 800))) for _ in range(num_articles)
+            ],
+            "category": [rng.choice(["AI", "科技", "財經"]) for _ in range(num_articles)],
+            "source": ["benchmark"] * num_articles,
+            "published_at": [base_time + timedelta(minutes=i) for i in range(num_articles)],
+            "is_ai_related": [rng.random() < 0.3 for _ in range(num_articles)],
+            "is_scraped": [True] * num_articles,
+        }
+    )
+
+
+def measure(result_format, data, directory):
+    """寫入並讀回一次，返回 (檔案大小, 寫入秒數, 讀取秒數)"""
+    start = time.perf_counter()
+    with create_result_sink(result_format, directory, 1, f"bench_{result_format}") as sink:
+        sink.write_dataframe(data, DEFAULT_RESULT_BATCH_SIZE)
+    write_sec = time.perf_counter() - start
+
+    start = time.perf_counter()
+    loaded = load_results(sink.path)
+    read_sec = time.perf_counter() - start
+    assert len(loaded) == len(data)
+
+    size = os.path.getsize(sink.path)
+    os.remove(sink.path)
+    return size, write_sec, read_sec
+
+
+def main(num_articles=20000, repeat=3):
+    rng = random.Random(42)
+    data = build_articles(num_articles, rng)
+    print(f"文章數: {num_articles}，重複 {repeat} 次取最佳值")
+    print(f"{'格式':<10}{'檔案大小(MB)':>14}{'寫入(秒)':>12}{'讀取(秒)':>12}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        for result_format in RESULT_FORMATS:
+            results = [measure(result_format, data, directory) for _ in range(repeat)]
+            size = results[0][0]
+            write_sec = min(r[1] for r in results)
+            read_sec = min(r[2] for r in results)
+            print(f"{result_format:<10}{size / 1024 / 1024:>14.2f}{write_sec:>12.3f}{read_sec:>12.3f}")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    main(*args)
@@ -0,0 +1,54 @@
+"""網址標準化前後的重複抓取率基準測試。
+
+模擬多次抓取文章列表時發現的連結 (同一篇文章會以不同來源參數、結尾斜線、http 或 fragment 出現)，
+分別以原始網址與標準化網址去除重複，回報需要抓取的數量、重複抓取率及標準化速度。
+
+執行方式: python -m debug.benchmark_url_canonicalization [文章數量] [發現連結數量]
+"""
+
+import random
+import sys
+import time
+
+from src.utils.url_utils import UrlCanonicalizer
+
+BASE_URL = "https://www.bnext.com.tw"
+VARIANTS = (
+    lambda url: url,
+    lambda url: url + "/",
+    lambda url: url.replace("https://", "http://"),
+    lambda url: url + "?utm_source=facebook&utm_medium=social",
+    lambda url: url + "?utm_source=line&utm_campaign=daily",
+    lambda url: url + "#comments",
+    lambda url: url.replace(BASE_URL, ""),  # 相對路徑
+)
+
+
+def discovered_links(num_articles, num_links, rng):
+    # 大多數連結為原始形式，少部分帶有各種變形
+    weights = (70, 5, 3, 8, 6, 3, 5)
+    for _ in range(num_links):
+        url = f"{BASE_URL}/article/{rng.randrange(num_articles)}/story"
+        yield rng.choices(VARIANTS, weights=weights)[0](url)
+
+
+def main(num_articles=20000, num_links=100000):
+    rng = random.Random(42)
+    links = list(discovered_links(num_articles, num_links, rng))
+    canonicalizer = UrlCanonicalizer.from_config({"allowed_query_params": []}, base_url=BASE_URL)
+
+    start = time.perf_counter()
+    canonical = [canonicalizer.canonicalize(link, BASE_URL) for link in links]
+    elapsed = time.perf_counter() - start
+
+    unique_raw = len(set(links))
+    unique_canonical = len(set(canonical))
+    print(f"發現 {len(links)} 個連結，實際文章 {unique_canonical} 篇")
+    print(f"標準化前需抓取 {unique_raw} 次，重複抓取率 {1 - unique_canonical / unique_raw:.1%}")
+    print(f"標準化後需抓取 {unique_canonical} 次，重複抓取率 0.0%")
+    print(f"標準化速度: 每個連結 {elapsed / len(links) * 1e6:.1f} 微秒")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    main(*args)
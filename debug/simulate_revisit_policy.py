@@ -0,0 +1,92 @@
+"""模擬重訪策略 (adaptive_revisit) 與固定排程的請求數與新鮮度比較。
+
+以每小時觸發一次的任務模擬一週，各類別依不同的發文速率 (篇/小時) 隨機發文，
+列表頁每頁 10 篇、新文章在前。比較固定每次抓取 max_pages 頁與依新連結產出調整
+頁數與重訪間隔的請求數、發現的文章數、漏抓數 (超出抓取頁數時被擠出列表) 與平均發現延遲。
+
+執行方式: python -m debug.simulate_revisit_policy [max_pages]
+"""
+
+import random
+import sys
+from datetime import datetime, timedelta, timezone
+
+from src.services.revisit_policy import RevisitPolicy
+
+ARTICLES_PER_PAGE = 10
+HOURS = 24 * 7
+# 類別名稱: 每小時平均發文數
+CATEGORY_RATES = {"busy": 12.0, "normal": 2.0, "slow": 0.3, "quiet": 0.02}
+
+
+def publish_times(rng, rate):
+    """依發文速率產生一週內的發文時間 (小時)"""
+    times = []
+    current = 0.0
+    while rate > 0:
+        current += rng.expovariate(rate)
+        if current >= HOURS:
+            return times
+        times.append(current)
+    return times
+
+
+def simulate(max_pages, adaptive, seed=42):
+    rng = random.Random(seed)
+    articles = {category: publish_times(rng, rate) for category, rate in CATEGORY_RATES.items()}
+    policy = RevisitPolicy(min_pages=1, max_interval_sec=86400)
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    state = {}
+    seen = {category: set() for category in CATEGORY_RATES}
+    requests = 0
+    delays = []
+
+    for hour in range(1, HOURS + 1):
+        now = start + timedelta(hours=hour)
+        if adaptive:
+            category_pages, _ = policy.plan(list(CATEGORY_RATES), state, max_pages, now)
+        else:
+            category_pages = {category: max_pages for category in CATEGORY_RATES}
+
+        new_links = {}
+        for category, pages in category_pages.items():
+            # 列表頁依發文時間由新到舊排列
+            listed = sorted((t for t in articles[category] if t <= hour), reverse=True)
+            page_new_links = []
+            for page in range(pages):
+                page_articles = listed[page * ARTICLES_PER_PAGE : (page + 1) * ARTICLES_PER_PAGE]
+                if page > 0 and not page_articles:
+                    break
+                requests += 1
+                fresh = [t for t in page_articles if t not in seen[category]]
+                seen[category].update(fresh)
+                delays.extend(hour - t for t in fresh)
+                page_new_links.append(len(fresh))
+            new_links[category] = page_new_links
+        if adaptive:
+            state = policy.update(state, new_links, category_pages, max_pages, now)
+
+    published = sum(len(times) for times in articles.values())
+    discovered = sum(len(links) for links in seen.values())
+    return {
+        "requests": requests,
+        "discovered": discovered,
+        "missed": published - discovered,
+        "avg_delay_hours": sum(delays) / len(delays) if delays else 0.0,
+    }
+
+
+def main(max_pages=5):
+    fixed = simulate(max_pages, adaptive=False)
+    adaptive = simulate(max_pages, adaptive=True)
+    print(f"類別發文速率 (篇/小時): {CATEGORY_RATES}，每小時觸發 {HOURS} 次，max_pages={max_pages}")
+    for name, result in (("固定排程", fixed), ("調整重訪", adaptive)):
+        print(
+            f"{name}: 請求 {result['requests']} 次，發現 {result['discovered']} 篇，"
+            f"漏抓 {result['missed']} 篇，平均發現延遲 {result['avg_delay_hours']:.2f} 小時"
+        )
+    print(f"請求數減少 {1 - adaptive['requests'] / fixed['requests']:.1%}")
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:2]])
@@ -3,4 +3,4 @@ eventlet.monkey_patch()
 
 bind = "0.0.0.0:8000"
 worker_class = "eventlet"
-workers = 4  # 根據需求調整
+workers = 4  # 根據需求調整；排程器由領導者選舉確保只在其中一個 worker 運行 (SCHEDULER_LEADER_ELECTION)
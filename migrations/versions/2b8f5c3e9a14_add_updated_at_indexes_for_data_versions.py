@@ -0,0 +1,37 @@
+"""Index updated_at on articles and crawler_task_history for ETag data versions
+
+Revision ID: 2b8f5c3e9a14
+Revises: 9d4b6e2a7c51
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "2b8f5c3e9a14"
+down_revision: Union[str, None] = "9d4b6e2a7c51"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_articles_updated_at", "articles", ["updated_at"], unique=False
+    )
+    op.create_index(
+        "ix_crawler_task_history_updated_at",
+        "crawler_task_history",
+        ["updated_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_crawler_task_history_updated_at", table_name="crawler_task_history")
+    op.drop_index("ix_articles_updated_at", table_name="articles")
@@ -0,0 +1,82 @@
+"""Add task_queue table for multi-node worker mode
+
+Revision ID: 3f1c9a7d2e45
+Revises: b06a567756b9
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import src.utils.type_utils
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3f1c9a7d2e45"
+down_revision: Union[str, None] = "b06a567756b9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "task_queue",
+        sa.Column("task_id", sa.Integer(), nullable=False),
+        sa.Column("history_id", sa.Integer(), nullable=True),
+        sa.Column(
+            "status",
+            sa.Enum(
+                "queued",
+                "claimed",
+                "completed",
+                "failed",
+                "cancelled",
+                name="taskqueuestatus",
+                native_enum=False,
+            ),
+            nullable=False,
+        ),
+        sa.Column("worker_id", sa.String(length=255), nullable=True),
+        sa.Column("claimed_at", src.utils.type_utils.AwareDateTime(), nullable=True),
+        sa.Column("heartbeat_at", src.utils.type_utils.AwareDateTime(), nullable=True),
+        sa.Column("finished_at", src.utils.type_utils.AwareDateTime(), nullable=True),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=True),
+        sa.Column("result", sa.JSON(), nullable=True),
+        sa.Column("error_message", sa.Text(), nullable=True),
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column(
+            "created_at",
+            src.utils.type_utils.AwareDateTime(),
+            server_default=sa.text("timezone('UTC', now())"),
+            nullable=False,
+        ),
+        sa.Column("updated_at", src.utils.type_utils.AwareDateTime(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["task_id"],
+            ["crawler_tasks.id"],
+            ondelete="CASCADE",
+        ),
+        sa.ForeignKeyConstraint(
+            ["history_id"],
+            ["crawler_task_history.id"],
+            ondelete="SET NULL",
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_task_queue_status_id", "task_queue", ["status", "id"], unique=False
+    )
+    op.create_index(
+        op.f("ix_task_queue_task_id"), "task_queue", ["task_id"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_task_queue_task_id"), table_name="task_queue")
+    op.drop_index("ix_task_queue_status_id", table_name="task_queue")
+    op.drop_table("task_queue")
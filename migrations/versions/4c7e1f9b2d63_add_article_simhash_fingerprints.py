@@ -0,0 +1,81 @@
+"""Add SimHash fingerprint bands and duplicate_of_id to articles
+
+Revision ID: 4c7e1f9b2d63
+Revises: 2b8f5c3e9a14
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from src.utils.simhash_utils import compute_simhash, split_bands, to_signed64
+
+
+# revision identifiers, used by Alembic.
+revision: str = "4c7e1f9b2d63"
+down_revision: Union[str, None] = "2b8f5c3e9a14"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BAND_COLUMNS = [f"simhash_band_{i}" for i in range(4)]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table("articles", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("simhash", sa.BigInteger(), nullable=True))
+        for column in BAND_COLUMNS:
+            batch_op.add_column(sa.Column(column, sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column("duplicate_of_id", sa.Integer(), nullable=True))
+        batch_op.create_foreign_key(
+            "fk_articles_duplicate_of_id",
+            "articles",
+            ["duplicate_of_id"],
+            ["id"],
+            ondelete="SET NULL",
+        )
+        batch_op.create_index(
+            "ix_articles_duplicate_of_id", ["duplicate_of_id"], unique=False
+        )
+        for column in BAND_COLUMNS:
+            batch_op.create_index(f"ix_articles_{column}", [column], unique=False)
+
+    # 回填既有文章的指紋 (不回填 duplicate_of_id，避免誤將既有文章互相連結)
+    articles = sa.table(
+        "articles",
+        sa.column("id", sa.Integer()),
+        sa.column("content", sa.Text()),
+        sa.column("simhash", sa.BigInteger()),
+        *[sa.column(column, sa.Integer()) for column in BAND_COLUMNS],
+    )
+    connection = op.get_bind()
+    rows = connection.execute(
+        sa.select(articles.c.id, articles.c.content).where(
+            articles.c.content.isnot(None)
+        )
+    )
+    for article_id, content in rows.all():
+        fingerprint = compute_simhash(content)
+        if fingerprint is None:
+            continue
+        values = {"simhash": to_signed64(fingerprint)}
+        values.update(zip(BAND_COLUMNS, split_bands(fingerprint)))
+        connection.execute(
+            articles.update().where(articles.c.id == article_id).values(**values)
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("articles", schema=None) as batch_op:
+        for column in reversed(BAND_COLUMNS):
+            batch_op.drop_index(f"ix_articles_{column}")
+        batch_op.drop_index("ix_articles_duplicate_of_id")
+        batch_op.drop_constraint("fk_articles_duplicate_of_id", type_="foreignkey")
+        batch_op.drop_column("duplicate_of_id")
+        for column in reversed(BAND_COLUMNS):
+            batch_op.drop_column(column)
+        batch_op.drop_column("simhash")
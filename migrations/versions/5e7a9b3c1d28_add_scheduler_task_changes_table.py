@@ -0,0 +1,50 @@
+"""Add scheduler_task_changes change log for incremental scheduler sync
+
+Revision ID: 5e7a9b3c1d28
+Revises: 8c2d4e6f1a37
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import src.utils.type_utils
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5e7a9b3c1d28"
+down_revision: Union[str, None] = "8c2d4e6f1a37"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "scheduler_task_changes",
+        sa.Column("task_id", sa.Integer(), nullable=False),
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column(
+            "created_at",
+            src.utils.type_utils.AwareDateTime(),
+            nullable=False,
+        ),
+        sa.Column("updated_at", src.utils.type_utils.AwareDateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_scheduler_task_changes_task_id"),
+        "scheduler_task_changes",
+        ["task_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        op.f("ix_scheduler_task_changes_task_id"), table_name="scheduler_task_changes"
+    )
+    op.drop_table("scheduler_task_changes")
@@ -0,0 +1,32 @@
+"""Add content_hash to articles
+
+Revision ID: 7d2a9e4c1b58
+Revises: 4c7e1f9b2d63
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7d2a9e4c1b58"
+down_revision: Union[str, None] = "4c7e1f9b2d63"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 既有文章不回填：下次重新抓取時寫入雜湊，之後才開始跳過未變更的文章
+    with op.batch_alter_table("articles", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("content_hash", sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("articles", schema=None) as batch_op:
+        batch_op.drop_column("content_hash")
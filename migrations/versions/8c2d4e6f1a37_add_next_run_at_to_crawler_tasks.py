@@ -0,0 +1,74 @@
+"""Add precomputed next_run_at to crawler_tasks for due-task lookups
+
+Revision ID: 8c2d4e6f1a37
+Revises: 3f1c9a7d2e45
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import src.utils.type_utils
+
+from src.utils.datetime_utils import calculate_next_cron_run
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8c2d4e6f1a37"
+down_revision: Union[str, None] = "3f1c9a7d2e45"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table("crawler_tasks", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column("next_run_at", src.utils.type_utils.AwareDateTime(), nullable=True)
+        )
+        batch_op.create_index(
+            "ix_crawler_tasks_due",
+            ["is_auto", "is_active", "next_run_at"],
+            unique=False,
+        )
+
+    # 回填既有任務的 next_run_at
+    crawler_tasks = sa.table(
+        "crawler_tasks",
+        sa.column("id", sa.Integer()),
+        sa.column("cron_expression", sa.String()),
+        sa.column("last_run_at", src.utils.type_utils.AwareDateTime()),
+        sa.column("next_run_at", src.utils.type_utils.AwareDateTime()),
+    )
+    connection = op.get_bind()
+    now = datetime.now(timezone.utc)
+    rows = connection.execute(
+        sa.select(
+            crawler_tasks.c.id,
+            crawler_tasks.c.cron_expression,
+            crawler_tasks.c.last_run_at,
+        ).where(crawler_tasks.c.cron_expression.isnot(None))
+    ).all()
+    for task_id, cron_expression, last_run_at in rows:
+        if last_run_at is None:
+            next_run_at = now
+        else:
+            try:
+                next_run_at = calculate_next_cron_run(cron_expression, last_run_at)
+            except ValueError:
+                next_run_at = None
+        connection.execute(
+            crawler_tasks.update()
+            .where(crawler_tasks.c.id == task_id)
+            .values(next_run_at=next_run_at)
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("crawler_tasks", schema=None) as batch_op:
+        batch_op.drop_index("ix_crawler_tasks_due")
+        batch_op.drop_column("next_run_at")
@@ -0,0 +1,51 @@
+"""Add canonical_link to articles
+
+Revision ID: 9b3e6f2a7c41
+Revises: 7d2a9e4c1b58
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from src.utils.url_utils import canonicalize_url
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9b3e6f2a7c41"
+down_revision: Union[str, None] = "7d2a9e4c1b58"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table("articles", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("canonical_link", sa.String(length=1000), nullable=True))
+        batch_op.create_index("ix_articles_canonical_link", ["canonical_link"], unique=False)
+
+    # 回填既有文章的標準連結 (不合併既有的重複文章)
+    articles = sa.table(
+        "articles",
+        sa.column("id", sa.Integer()),
+        sa.column("link", sa.String()),
+        sa.column("canonical_link", sa.String()),
+    )
+    connection = op.get_bind()
+    rows = connection.execute(sa.select(articles.c.id, articles.c.link))
+    for article_id, link in rows.all():
+        connection.execute(
+            articles.update()
+            .where(articles.c.id == article_id)
+            .values(canonical_link=canonicalize_url(link))
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("articles", schema=None) as batch_op:
+        batch_op.drop_index("ix_articles_canonical_link")
+        batch_op.drop_column("canonical_link")
@@ -0,0 +1,82 @@
+"""Add article_stats rollup table for dashboard statistics
+
+Revision ID: 9d4b6e2a7c51
+Revises: 5e7a9b3c1d28
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import src.utils.type_utils
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9d4b6e2a7c51"
+down_revision: Union[str, None] = "5e7a9b3c1d28"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "article_stats",
+        sa.Column("source", sa.String(length=50), nullable=False),
+        sa.Column("category", sa.String(length=100), nullable=False),
+        sa.Column("day", sa.String(length=10), nullable=False),
+        sa.Column("is_ai_related", sa.Boolean(), nullable=False),
+        sa.Column("is_scraped", sa.Boolean(), nullable=False),
+        sa.Column("scrape_status", sa.String(length=20), nullable=False),
+        sa.Column("article_count", sa.Integer(), nullable=False),
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column(
+            "created_at",
+            src.utils.type_utils.AwareDateTime(),
+            nullable=False,
+        ),
+        sa.Column("updated_at", src.utils.type_utils.AwareDateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "source",
+            "category",
+            "day",
+            "is_ai_related",
+            "is_scraped",
+            "scrape_status",
+            name="uq_article_stats_key",
+        ),
+    )
+    # 以現有文章回填彙總 (published_at 以 UTC ISO 字串儲存，前 10 字元即為日期)
+    now = datetime.now(timezone.utc).isoformat()
+    op.get_bind().execute(
+        sa.text(
+            """
+        INSERT INTO article_stats (
+            source, category, day, is_ai_related, is_scraped, scrape_status,
+            article_count, created_at, updated_at
+        )
+        SELECT
+            COALESCE(source, ''),
+            COALESCE(category, ''),
+            COALESCE(SUBSTR(published_at, 1, 10), ''),
+            is_ai_related,
+            is_scraped,
+            COALESCE(scrape_status, ''),
+            COUNT(*),
+            :now,
+            :now
+        FROM articles
+        GROUP BY 1, 2, 3, 4, 5, 6
+        """
+        ),
+        {"now": now},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("article_stats")
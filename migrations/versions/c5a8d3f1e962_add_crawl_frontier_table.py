@@ -0,0 +1,95 @@
+"""Add crawl_frontier table for persistent link scheduling
+
+Revision ID: c5a8d3f1e962
+Revises: 9b3e6f2a7c41
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import src.utils.type_utils
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c5a8d3f1e962"
+down_revision: Union[str, None] = "9b3e6f2a7c41"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "crawl_frontier",
+        sa.Column("url", sa.String(length=1000), nullable=False),
+        sa.Column("host", sa.String(length=255), nullable=False),
+        sa.Column("source", sa.String(length=50), nullable=True),
+        sa.Column("task_id", sa.Integer(), nullable=True),
+        sa.Column("priority", sa.Float(), nullable=False),
+        sa.Column("ai_score", sa.Float(), nullable=True),
+        sa.Column(
+            "next_eligible_at", src.utils.type_utils.AwareDateTime(), nullable=False
+        ),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column(
+            "status",
+            sa.Enum(
+                "pending",
+                "claimed",
+                "done",
+                "failed",
+                name="crawlfrontierstatus",
+                native_enum=False,
+            ),
+            nullable=False,
+        ),
+        sa.Column("worker_id", sa.String(length=255), nullable=True),
+        sa.Column("claimed_at", src.utils.type_utils.AwareDateTime(), nullable=True),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("payload", sa.JSON(), nullable=True),
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column(
+            "created_at",
+            src.utils.type_utils.AwareDateTime(),
+            server_default=sa.text("timezone('UTC', now())"),
+            nullable=False,
+        ),
+        sa.Column("updated_at", src.utils.type_utils.AwareDateTime(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["task_id"],
+            ["crawler_tasks.id"],
+            ondelete="SET NULL",
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("url"),
+    )
+    # 領取時依狀態與可領取時間篩選候選連結
+    op.create_index(
+        "ix_crawl_frontier_status_eligible",
+        "crawl_frontier",
+        ["status", "next_eligible_at"],
+        unique=False,
+    )
+    # 爬蟲只領取自己來源的連結
+    op.create_index(
+        "ix_crawl_frontier_status_source_eligible",
+        "crawl_frontier",
+        ["status", "source", "next_eligible_at"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_crawl_frontier_host"), "crawl_frontier", ["host"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_crawl_frontier_host"), table_name="crawl_frontier")
+    op.drop_index(
+        "ix_crawl_frontier_status_source_eligible", table_name="crawl_frontier"
+    )
+    op.drop_index("ix_crawl_frontier_status_eligible", table_name="crawl_frontier")
+    op.drop_table("crawl_frontier")
@@ -0,0 +1,36 @@
+"""Add revisit_state to crawler_tasks and category_stats to crawler_task_history
+
+Revision ID: e2f7a4c9b813
+Revises: c5a8d3f1e962
+Create Date: 2026-10-18 22:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e2f7a4c9b813"
+down_revision: Union[str, None] = "c5a8d3f1e962"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 既有任務沒有重訪狀態：第一次執行時每個類別抓取完整頁數後才開始調整
+    with op.batch_alter_table("crawler_tasks", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("revisit_state", sa.JSON(), nullable=True))
+    with op.batch_alter_table("crawler_task_history", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("category_stats", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("crawler_task_history", schema=None) as batch_op:
+        batch_op.drop_column("category_stats")
+    with op.batch_alter_table("crawler_tasks", schema=None) as batch_op:
+        batch_op.drop_column("revisit_state")
@@ -5,9 +5,7 @@
 主要用於命令行執行或非 Web 環境下的應用啟動。
 """
 # 標準函式庫
-import os
 import sys
-import time
 import logging
 # 第三方函式庫
 from dotenv import load_dotenv
@@ -17,8 +15,11 @@ from src.config import get_db_manager
 from src.services.service_container import (
     ServiceContainer,
     get_crawlers_service,
+    get_scheduler_leader_election,
     get_scheduler_service,
 )
+from src.services.scheduler_leader import is_leader_election_enabled
+from src.services.scheduler_service import run_schedule_sync_loop
 
 
 logger = logging.getLogger(__name__)  # 使用統一的 logger
@@ -67,18 +68,26 @@ def initialize_default_crawler():
 def main():
     """執行應用程式的主要初始化邏輯"""
     try:
-        # 啟動排程器
+        # 啟動排程器 (與 Web 行程同時部署時，僅由取得領導權的行程啟動)
         try:
-            scheduler = get_scheduler_service()
-            scheduler_result = scheduler.start_scheduler()
-            if scheduler_result.get("success"):
-                logger.info(
-                    "排程器已成功啟動: %s", scheduler_result.get('message')
-                )
+            if is_leader_election_enabled():
+                election = get_scheduler_leader_election()
+                election.start()
+                if election.is_leader:
+                    logger.info("此行程為排程器領導者，排程器已啟動")
+                else:
+                    logger.info("排程器領導權由其他行程持有，等待接手")
             else:
-                logger.error(
-                    "啟動排程器失敗: %s", scheduler_result.get('message')
-                )
+                scheduler = get_scheduler_service()
+                scheduler_result = scheduler.start_scheduler()
+                if scheduler_result.get("success"):
+                    logger.info(
+                        "排程器已成功啟動: %s", scheduler_result.get('message')
+                    )
+                else:
+                    logger.error(
+                        "啟動排程器失敗: %s", scheduler_result.get('message')
+                    )
         except Exception as e:
             logger.error("啟動排程器時發生未預期錯誤: %s", e, exc_info=True)
             # 根據需求，決定是否在排程器啟動失敗時阻止應用程式啟動
@@ -122,38 +131,8 @@ def main():
 
 
 def run_scheduled_tasks():
-    """長期運行，定期執行排程任務重新載入"""
-    try:
-        raw_interval = os.getenv("SCHEDULE_RELOAD_INTERVAL_SEC", "1800")
-        interval_sec = int(raw_interval)
-        if interval_sec <= 0:
-            interval_sec = 1800
-            logger.warning(
-                "SCHEDULE_RELOAD_INTERVAL_SEC 必須為正整數，使用預設值: %s 秒",
-                interval_sec,
-            )
-        logger.info("排程任務重新載入間隔設定為: %s 秒", interval_sec)
-    except ValueError:
-        interval_sec = 1800
-        logger.warning(
-            "環境變數 SCHEDULE_RELOAD_INTERVAL_SEC 值 '%s' 無效，使用預設值: %s 秒",
-            raw_interval,
-            interval_sec,
-        )
-
-    interval_min = interval_sec / 60
-    while True:
-        try:
-            logger.info("開始重新載入排程任務...")
-            get_scheduler_service().reload_scheduler()
-            logger.info("排程任務重新載入完成。")
-            logger.info("下一次重新載入將在 %.1f 分鐘後進行。", interval_min)
-            time.sleep(interval_sec)
-        except Exception as e:
-            # 目前選擇記錄錯誤並在短暫延遲後重試
-            logger.error("排程任務重新載入/執行錯誤: %s", e, exc_info=True)
-            logger.info("發生錯誤，將在 60 秒後重試...")
-            time.sleep(60)
+    """長期運行，定期同步排程任務：增量套用任務的排程變更，並定期完整重載作為安全網"""
+    run_schedule_sync_loop()
 
 
 if __name__ == "__main__":
@@ -1,11 +1,21 @@
 """提供文章分析相關功能，特別是判斷文章是否與 AI 相關以及統計分析。"""
 
-from typing import Dict, Any
+from collections import Counter
+from typing import Dict, Any, Optional, Set
 import logging
+import threading
 
+import numpy as np
 import pandas as pd
 
-from src.crawlers.configs.ai_filter_config import AI_KEYWORDS, AI_CATEGORIES
+from src.crawlers.configs.ai_filter_config import (
+    AI_KEYWORDS,
+    AI_CATEGORIES,
+    HIGH_PRIORITY_KEYWORDS,
+    FIELD_WEIGHTS,
+    HIGH_PRIORITY_WEIGHT,
+)
+from src.crawlers.keyword_matcher import KeywordMatcher
   # 使用統一的 logger
 
 logger = logging.getLogger(__name__)  # 使用統一的 logger  # 使用統一的 logger
@@ -14,6 +24,33 @@ logger = logging.getLogger(__name__)  # 使用統一的 logger  # 使用統一
 class ArticleAnalyzer:
     """處理文章AI內容相關性分析的類別"""
 
+    # 依關鍵字集合快取已編譯的自動機，集合內容變動時 (例如 register_additional_keywords) 於下次使用時重建
+    _matchers: Dict[str, KeywordMatcher] = {}
+    _matchers_lock = threading.Lock()
+
+    @classmethod
+    def _get_matcher(cls, name: str, keywords: Set[str]) -> KeywordMatcher:
+        """取得指定關鍵字集合的自動機，若集合內容已變動則重建"""
+        matcher = cls._matchers.get(name)
+        if matcher is not None and matcher.keywords == keywords:
+            return matcher
+        with cls._matchers_lock:
+            matcher = cls._matchers.get(name)
+            if matcher is None or matcher.keywords != keywords:
+                matcher = KeywordMatcher(set(keywords))
+                cls._matchers[name] = matcher
+                logger.debug("已重建關鍵字自動機 %s，關鍵字數: %d", name, len(matcher))
+        return matcher
+
+    @staticmethod
+    def _tags_to_text(tags: Any) -> str:
+        """將字串或列表形式的標籤轉為小寫文字，以換行分隔避免跨標籤誤判"""
+        if isinstance(tags, str):
+            return "\n".join(tag.strip().lower() for tag in tags.split(","))
+        if isinstance(tags, list):
+            return "\n".join(str(tag).lower() for tag in tags)
+        return ""
+
     @staticmethod
     def is_ai_related(
         article_info: Dict[str, Any], min_keywords: int = 3, check_content: bool = True
@@ -29,46 +66,85 @@ class ArticleAnalyzer:
         Returns:
         bool: 如果文章與AI相關，則返回True；否則返回False
         """
+        keyword_matcher = ArticleAnalyzer._get_matcher("keywords", AI_KEYWORDS)
+
         # 1. 檢查分類是否AI相關
         if article_info.get("category"):
             category_lower = str(article_info["category"]).lower()
-            if any(ai_cat in category_lower for ai_cat in AI_CATEGORIES):
+            category_matcher = ArticleAnalyzer._get_matcher("categories", AI_CATEGORIES)
+            if category_matcher.contains_any(category_lower):
                 return True
 
         # 2. 檢查標題是否包含AI關鍵字
         if article_info.get("title"):
             title_lower = str(article_info["title"]).lower()
-            if any(keyword in title_lower for keyword in AI_KEYWORDS):
+            if keyword_matcher.contains_any(title_lower):
                 return True
 
-        # 3. 檢查標籤是否包含AI關鍵字
+        # 3. 檢查標籤是否包含AI關鍵字 (標籤可能是列表或字符串)
         if article_info.get("tags"):
-            tags = article_info["tags"]
-            # 處理標籤可能是列表或字符串的情況
-            if isinstance(tags, str) and tags:
-                tags_list = [tag.strip().lower() for tag in tags.split(",")]
-                if any(
-                    any(keyword in tag for keyword in AI_KEYWORDS) for tag in tags_list
-                ):
-                    return True
-            elif isinstance(tags, list):
-                tags_lower = [tag.lower() for tag in tags]
-                if any(
-                    any(keyword in tag for keyword in AI_KEYWORDS) for tag in tags_lower
-                ):
-                    return True
-
-        # 4. 檢查內容是否包含足夠的AI關鍵字
+            if keyword_matcher.contains_any(ArticleAnalyzer._tags_to_text(article_info["tags"])):
+                return True
+
+        # 4. 檢查內容是否包含足夠的AI關鍵字 (以不重複的關鍵字數量計算)
         if check_content and article_info.get("content"):
             content_lower = str(article_info["content"]).lower()
-            keyword_count = sum(
-                1 for keyword in AI_KEYWORDS if keyword in content_lower
-            )
+            keyword_count = len(keyword_matcher.find_keywords(content_lower))
             if keyword_count >= min_keywords:
                 return True
 
         return False
 
+    @staticmethod
+    def score_ai_relevance(
+        article_info: Dict[str, Any], field_weights: Optional[Dict[str, float]] = None
+    ) -> Dict[str, Any]:
+        """
+        計算文章的AI相關性分數
+
+        每個欄位只掃描一次，分數為各欄位命中的不重複關鍵字數乘上欄位權重，
+        每個命中的高優先級關鍵字 (HIGH_PRIORITY_KEYWORDS) 再額外加上 HIGH_PRIORITY_WEIGHT。
+
+        Parameters:
+        article_info (dict): 包含文章信息的字典
+        field_weights (dict): 欄位權重，預設使用 FIELD_WEIGHTS
+
+        Returns:
+        Dict[str, Any]: 包含 score、field_scores、keyword_hits (關鍵字出現次數)
+            與 high_priority_hits 的字典
+        """
+        weights = FIELD_WEIGHTS if field_weights is None else field_weights
+        matcher = ArticleAnalyzer._get_matcher(
+            "scoring", AI_KEYWORDS | HIGH_PRIORITY_KEYWORDS
+        )
+
+        keyword_hits: Dict[str, int] = {}
+        field_scores: Dict[str, float] = {}
+        for field, weight in weights.items():
+            value = article_info.get(field)
+            if not value:
+                continue
+            if field == "tags":
+                text = ArticleAnalyzer._tags_to_text(value)
+            else:
+                text = str(value).lower()
+            counts = matcher.count_occurrences(text)
+            if not counts:
+                continue
+            field_scores[field] = weight * len(counts)
+            for keyword, count in counts.items():
+                keyword_hits[keyword] = keyword_hits.get(keyword, 0) + count
+
+        high_priority_hits = sorted(k for k in keyword_hits if k in HIGH_PRIORITY_KEYWORDS)
+        score = sum(field_scores.values()) + HIGH_PRIORITY_WEIGHT * len(high_priority_hits)
+
+        return {
+            "score": score,
+            "field_scores": field_scores,
+            "keyword_hits": keyword_hits,
+            "high_priority_hits": high_priority_hits,
+        }
+
     @staticmethod
     def analyze_articles_statistics(
         articles_df: pd.DataFrame, ai_only: bool = True
@@ -96,23 +172,55 @@ class ArticleAnalyzer:
             category_counts = articles_df["category"].value_counts().to_dict()
             stats["category_distribution"] = category_counts
 
-        # 統計AI關鍵字出現頻率
-        if ai_only and "content" in articles_df.columns:
-            keyword_counts = {}
-            for _, row in articles_df.iterrows():
-                content = str(row["content"]).lower()
-                for keyword in AI_KEYWORDS:
-                    if keyword in content:
-                        keyword_counts[keyword] = keyword_counts.get(keyword, 0) + 1
+        # 統計AI相關文章比例
+        if "is_ai_related" in articles_df.columns and len(articles_df) > 0:
+            ai_count = int(articles_df["is_ai_related"].fillna(False).astype(bool).sum())
+            stats["ai_related_ratio"] = round(ai_count / len(articles_df), 4)
 
+        # 統計AI關鍵字出現頻率 (出現該關鍵字的文章數)
+        if ai_only and "content" in articles_df.columns:
+            keyword_counts = ArticleAnalyzer.count_keyword_documents(
+                articles_df["content"]
+            )
             # 排序並獲取前20個最常出現的關鍵字
-            sorted_keywords = sorted(
-                keyword_counts.items(), key=lambda x: x[1], reverse=True
-            )[:20]
-            stats["ai_keyword_frequency"] = dict(sorted_keywords)
+            stats["ai_keyword_frequency"] = dict(keyword_counts.most_common(20))
 
         return stats
 
+    @staticmethod
+    def count_keyword_documents(contents: pd.Series) -> Counter:
+        """
+        計算每個AI關鍵字出現在多少篇文章中
+
+        將所有文章以分隔字元串接後，只用關鍵字自動機掃描一次，
+        再以各文章的起始位置 (np.searchsorted) 將命中對應回文章並去除重複。
+
+        Parameters:
+        contents (pandas.Series): 文章內容
+
+        Returns:
+        Counter: 關鍵字 -> 出現的文章數
+        """
+        if contents is None or len(contents) == 0:
+            return Counter()
+
+        texts = contents.fillna("").astype(str).str.lower().tolist()
+        # 關鍵字不含換頁字元，用於分隔文章可避免跨文章誤判
+        separator = "\f"
+        corpus = separator.join(texts)
+        lengths = np.fromiter((len(text) + 1 for text in texts), dtype=np.int64, count=len(texts))
+        starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+
+        matcher = ArticleAnalyzer._get_matcher("keywords", AI_KEYWORDS)
+        matches = list(matcher.iter_matches(corpus))
+        if not matches:
+            return Counter()
+
+        positions = np.fromiter((pos for pos, _ in matches), dtype=np.int64, count=len(matches))
+        article_indexes = np.searchsorted(starts, positions, side="right") - 1
+        document_hits = set(zip(article_indexes.tolist(), (kw for _, kw in matches)))
+        return Counter(keyword for _, keyword in document_hits)
+
     @staticmethod
     def print_statistics(stats: Dict[str, Any]) -> None:
         """輸出統計數據到日誌"""
@@ -132,3 +240,92 @@ class ArticleAnalyzer:
             logger.debug("AI關鍵字出現頻率:")
             for keyword, count in stats["ai_keyword_frequency"].items():
                 logger.debug("  %s: %s 篇", keyword, count)
+
+
+class IncrementalArticleStatistics:
+    """可增量更新的文章統計
+
+    保留上次分析後的累計結果，之後每次 update 只處理新增的文章：
+    若有 id 欄位則以目前看過的最大 id 為界，否則以已處理過的 link 判斷。
+    """
+
+    def __init__(self, ai_only: bool = True):
+        self.ai_only = ai_only
+        self.total_articles = 0
+        self.content_length_sum = 0.0
+        self.content_length_count = 0
+        self.ai_related_count = 0
+        self.ai_related_known = 0
+        self.category_counts: Counter = Counter()
+        self.keyword_counts: Counter = Counter()
+        self.last_article_id: Optional[int] = None
+        self._seen_links: Set[str] = set()
+
+    def _select_new_articles(self, articles_df: pd.DataFrame) -> pd.DataFrame:
+        """篩選出上次分析後新增的文章"""
+        if "id" in articles_df.columns:
+            if self.last_article_id is None:
+                return articles_df
+            return articles_df[articles_df["id"] > self.last_article_id]
+        if "link" in articles_df.columns:
+            new_df = articles_df[~articles_df["link"].isin(self._seen_links)]
+            return new_df.drop_duplicates(subset=["link"], keep="first")
+        return articles_df
+
+    def update(self, articles_df: pd.DataFrame) -> int:
+        """
+        以新增的文章更新統計
+
+        Parameters:
+        articles_df (pandas.DataFrame): 文章數據框，可包含已分析過的文章
+
+        Returns:
+        int: 本次實際納入統計的文章數
+        """
+        if articles_df is None or articles_df.empty:
+            return 0
+
+        new_df = self._select_new_articles(articles_df)
+        if new_df.empty:
+            logger.debug("沒有新增的文章需要統計")
+            return 0
+
+        self.total_articles += len(new_df)
+        if "content_length" in new_df.columns:
+            lengths = new_df["content_length"].dropna()
+            self.content_length_sum += float(lengths.sum())
+            self.content_length_count += len(lengths)
+        if "category" in new_df.columns:
+            self.category_counts.update(new_df["category"].value_counts().to_dict())
+        if "is_ai_related" in new_df.columns:
+            self.ai_related_count += int(new_df["is_ai_related"].fillna(False).astype(bool).sum())
+            self.ai_related_known += len(new_df)
+        if self.ai_only and "content" in new_df.columns:
+            self.keyword_counts.update(
+                ArticleAnalyzer.count_keyword_documents(new_df["content"])
+            )
+
+        if "id" in new_df.columns:
+            max_id = new_df["id"].max()
+            if pd.notna(max_id):
+                self.last_article_id = int(max_id)
+        elif "link" in new_df.columns:
+            self._seen_links.update(new_df["link"].dropna().tolist())
+
+        logger.debug("增量統計已納入 %d 篇新文章，累計 %d 篇", len(new_df), self.total_articles)
+        return len(new_df)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """返回與 ArticleAnalyzer.analyze_articles_statistics 相同格式的統計結果"""
+        stats: Dict[str, Any] = {"total_articles": self.total_articles}
+        if self.content_length_count:
+            stats["avg_article_length"] = int(
+                round(self.content_length_sum / self.content_length_count, 2)
+            )
+        if self.category_counts:
+            stats["category_distribution"] = dict(self.category_counts.most_common())
+        if self.ai_related_known:
+            stats["ai_related_ratio"] = round(self.ai_related_count / self.ai_related_known, 4)
+        if self.ai_only and self.keyword_counts:
+            stats["ai_keyword_frequency"] = dict(self.keyword_counts.most_common(20))
+        return stats
@@ -4,6 +4,7 @@ from abc import ABC, abstractmethod
 from datetime import datetime, timezone
 import json
 import os
+import socket
 import time
 from typing import Dict, Optional, Any, List, Tuple, Callable
 import logging
@@ -11,11 +12,25 @@ import logging
 import pandas as pd
 
 # Local application imports
+from src.crawlers.article_analyzer import ArticleAnalyzer
 from src.crawlers.bnext_utils import BnextUtils
 from src.crawlers.configs.site_config import SiteConfig
+from src.crawlers.fetch_policy import CIRCUIT_CLOSED, CIRCUIT_OPEN, compute_backoff_delay
+from src.crawlers.http_cache import CachingHttpClient
+from src.crawlers.result_sink import (
+    DEFAULT_RESULT_BATCH_SIZE,
+    DEFAULT_RESULT_DIR,
+    RESULT_FORMAT_CSV,
+    create_result_sink,
+    load_results,
+    resolve_result_format,
+)
 from src.error.errors import ValidationError
 from src.interface.progress_reporter import ProgressListener, ProgressReporter
 from src.services.article_service import ArticleService
+from src.services.article_write_queue import ArticleWriteQueue, DEFAULT_ACK_TIMEOUT
+from src.services.crawl_frontier_service import CrawlFrontierService
+from src.services.revisit_policy import RevisitPolicy, build_category_stats
 from src.utils.enum_utils import ArticleScrapeStatus, ScrapeMode, ScrapePhase
 
 from src.utils.model_utils import validate_task_args
@@ -47,6 +62,26 @@ class BaseCrawler(ABC):
         self.scrape_phase = {}
         self.config_file_name = config_file_name
         self.articles_df = pd.DataFrame()
+        # 跨任務共用的文章寫入佇列 (由 TaskExecutorService 設定)，未設定時直接寫入資料庫
+        self.article_write_queue: Optional[ArticleWriteQueue] = None
+        # 持久化的待抓取連結服務 (由 TaskExecutorService 設定)，未設定時只抓取本次任務發現的連結
+        self.crawl_frontier: Optional[CrawlFrontierService] = None
+        # 本次任務從待抓取連結表領取的 {文章連結: 待抓取連結 ID}
+        self.frontier_claims: Dict[str, int] = {}
+        # 任務的各類別重訪狀態 (由 TaskExecutorService 從 crawler_tasks.revisit_state 設定)
+        self.revisit_state: Optional[Dict[str, Any]] = None
+        # 本次任務依新連結產出更新後的重訪狀態 (任務啟用 adaptive_revisit 時)
+        self.updated_revisit_state: Optional[Dict[str, Any]] = None
+        # 本次任務未到期而略過的 {類別: 下次重訪時間}
+        self.revisit_skipped_categories: Dict[str, Optional[str]] = {}
+        # 本次任務各類別的抓取統計 (頁數、請求數、新連結數、新連結/請求比例)
+        self.category_stats: Dict[str, Dict[str, Any]] = {}
+        # 最近一次保存到資料庫時實際寫入成功的文章數
+        self.saved_articles_count: Optional[int] = None
+        # 其中內容雜湊未變更、未實際寫入的文章數
+        self.unchanged_articles_count: int = 0
+        # 抓取網頁使用的 HTTP 用戶端 (由子類別設定)，用於回報每個任務的快取統計
+        self.http_client: Optional[CachingHttpClient] = None
         if article_service is None:
             logger.error("未提供文章服務，請提供有效的文章服務")
             raise ValueError("未提供文章服務，請提供有效的文章服務")
@@ -167,7 +202,8 @@ class BaseCrawler(ABC):
             list_url_template=self.config_data.get("list_url_template", None),
             categories=self.config_data.get("categories", None),
             full_categories=self.config_data.get("full_categories", None),
-            selectors=self.config_data.get("selectors", None)
+            selectors=self.config_data.get("selectors", None),
+            url_canonicalization=self.config_data.get("url_canonicalization") or {}
         )
         
         # 初始化默認參數
@@ -274,6 +310,8 @@ class BaseCrawler(ABC):
             if filters:
                 logger.warning("發現未處理的過濾條件: %s，這些條件將被忽略。", filters.keys())
 
+            # 只需要連結與抓取狀態，不載入內文與摘要
+            advanced_filters['column_set'] = 'status'
             articles_response = self.article_service.find_articles_advanced(**advanced_filters)
 
             if articles_response["success"] and articles_response.get("resultMsg") and articles_response["resultMsg"].items:
@@ -282,8 +320,13 @@ class BaseCrawler(ABC):
                 # 從 PaginatedArticleResponse 中獲取文章列表
                 articles_list = articles_response["resultMsg"].items
                 for article_schema in articles_list:
-                    # 將 Pydantic Schema 轉換為字典
-                    article_dict = article_schema.model_dump() if hasattr(article_schema, 'model_dump') else vars(article_schema)
+                    # 將 Pydantic Schema 轉換為字典 (欄位集合查詢已返回字典)
+                    if isinstance(article_schema, dict):
+                        article_dict = dict(article_schema)
+                    elif hasattr(article_schema, 'model_dump'):
+                        article_dict = article_schema.model_dump()
+                    else:
+                        article_dict = vars(article_schema)
 
                     # 添加必要的轉換，例如將枚舉轉換為其值
                     if 'scrape_status' in article_dict and hasattr(article_dict['scrape_status'], 'value'):
@@ -336,7 +379,10 @@ class BaseCrawler(ABC):
                             
                 str_articles_data = [convert_hashable_dict_to_str_dict(article) for article in articles_data]
 
-                if self.global_params.get('get_links_by_task_id', False) or self.global_params.get('scrape_mode') == ScrapeMode.CONTENT_ONLY.value:
+                update_by_link = self.global_params.get('get_links_by_task_id', False) or self.global_params.get('scrape_mode') == ScrapeMode.CONTENT_ONLY.value
+                if self.article_write_queue is not None:
+                    result = self._save_through_write_queue(str_articles_data, update_by_link)
+                elif update_by_link:
                     logger.info("調用 article_service.batch_update_articles_by_link...") # 新增日誌
                     result = self.article_service.batch_update_articles_by_link(
                         article_data = str_articles_data
@@ -346,6 +392,11 @@ class BaseCrawler(ABC):
                     result = self.article_service.batch_create_articles(
                         articles_data = str_articles_data
                     )
+
+                result_msg = result.get("resultMsg")
+                if isinstance(result_msg, dict) and "success_count" in result_msg:
+                    self.saved_articles_count = result_msg.get("success_count", 0) + result_msg.get("update_count", 0)
+                    self.unchanged_articles_count = result_msg.get("unchanged_count", 0)
                 
                 if not result["success"]:
                     logger.error("批量保存文章到資料庫失敗: %s", result['message'])
@@ -359,6 +410,18 @@ class BaseCrawler(ABC):
             logger.error("保存到資料庫失敗: %s", e)
             raise e
 
+    def _save_through_write_queue(self, articles_data: List[Dict[str, Any]], update_by_link: bool) -> Dict[str, Any]:
+        """透過共用的寫入佇列保存文章，並等待本任務的寫入確認"""
+        task_id = self.global_params.get('task_id')
+        logger.info("任務 %s 提交 %d 篇文章至寫入佇列...", task_id, len(articles_data))
+        ticket = self.article_write_queue.submit(
+            task_id, articles_data, update_by_link=update_by_link
+        )
+        ack_timeout = self.global_params.get('write_ack_timeout', DEFAULT_ACK_TIMEOUT)
+        if not ticket.wait(timeout=ack_timeout):
+            logger.warning("任務 %s 等待寫入確認逾時 (%s 秒)", task_id, ack_timeout)
+        return ticket.to_result()
+
     def _save_to_csv(self, data: pd.DataFrame, csv_path: Optional[str] = None):
         """保存數據到CSV文件"""
         if not csv_path:
@@ -373,6 +436,40 @@ class BaseCrawler(ABC):
         except Exception as e:
             logger.error("保存文章到 CSV 文件失敗: %s", e, exc_info=True)
 
+    def _save_to_result_file(self, task_id: int, data: pd.DataFrame, file_prefix: str) -> Optional[str]:
+        """依 result_format 參數保存爬取結果 (csv 或 parquet)，返回輸出檔案路徑"""
+        result_format = resolve_result_format(self.global_params.get('result_format'))
+        timestamp = datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S')
+        if result_format == RESULT_FORMAT_CSV:
+            csv_path = os.path.join(DEFAULT_RESULT_DIR, f"{file_prefix}_{task_id}_{timestamp}.csv")
+            self._save_to_csv(data, csv_path)
+            return csv_path
+
+        try:
+            with create_result_sink(result_format, DEFAULT_RESULT_DIR, task_id, file_prefix, timestamp) as sink:
+                sink.write_dataframe(data, self.global_params.get('result_batch_size', DEFAULT_RESULT_BATCH_SIZE))
+            logger.debug("文章數據已保存到 %s 文件: %s", result_format, sink.path)
+            return sink.path
+        except Exception as e:
+            logger.error("保存文章到 %s 文件失敗: %s", result_format, e, exc_info=True)
+            return None
+
+    def replay_saved_results(self, path: str, task_id: Optional[int] = None, date: Optional[str] = None) -> int:
+        """讀回已保存的結果檔案並重新保存到資料庫，返回讀回的文章數
+
+        Args:
+            path: 結果檔案路徑，或 Parquet 分區根目錄
+            task_id: 只讀取指定任務分區
+            date: 只讀取指定日期分區 (YYYY-MM-DD)
+        """
+        saved_df = load_results(path, task_id=task_id, date=date)
+        if saved_df.empty:
+            return 0
+        self.articles_df = saved_df
+        self._save_to_database()
+        logger.info("已從 %s 重新保存 %d 篇文章", path, len(saved_df))
+        return len(saved_df)
+
     def _update_articles_with_content(self, articles_df: pd.DataFrame, articles_content: List[Dict[str, Any]]) -> pd.DataFrame:
         """
         使用批量更新方式更新 DataFrame 中的文章內容
@@ -424,6 +521,9 @@ class BaseCrawler(ABC):
                     
                     # 刪除臨時列
                     merged_df = merged_df.drop(f'{col}_new', axis=1)
+                elif col != 'link' and col not in articles_df.columns:
+                    # 原 DataFrame 沒有的欄位 (例如 content_hash)，未抓取成功的列以 None 取代 NaN，避免寫入 'nan'
+                    merged_df[col] = merged_df[col].astype(object).where(merged_df[col].notna(), None)
                     
             # 更新抓取相關標記
             successful_links = [article['link'] for article in articles_content 
@@ -548,14 +648,24 @@ class BaseCrawler(ABC):
                 - max_cancel_wait: 最大取消等待時間
                 - cancel_interrupt_interval: 取消等待間隔
                 - cancel_timeout: 取消超時時間
+                - adaptive_revisit: 是否依各類別的新連結產出調整重訪頻率與頁數
+                - min_pages: 調整重訪時每個類別最少抓取的頁數
+                - revisit_max_interval_sec: 調整重訪時類別最長的重訪間隔秒數
                 
         Returns:
             Dict[str, Any]: 包含任務執行結果
                 success: 是否成功
                 message: 任務執行結果訊息
                 articles_count: 文章數量
+                saved_articles_count: 實際保存到資料庫的文章數 (有保存到資料庫時才提供)
+                changed_articles_count / unchanged_articles_count: 保存的文章中內容有變更與未變更 (未寫入) 的數量
+                http_cache: 本任務的 HTTP 快取統計，包含 bytes_saved (有設定 http_client 時才提供)
+                category_stats: 各類別的抓取統計 (有從網站抓取文章列表時才提供)
+                revisit_state: 更新後的各類別重訪狀態 (任務啟用 adaptive_revisit 時才提供)
                 scrape_phase: 任務狀態
                 get_links_by_task_id: 是否從資料庫根據任務ID獲取要抓取內容的文章，這個參數會在任務完成後，文章有儲存成功設定為True
+
+        執行期間主機的斷路器狀態改變時，任務進度會帶有 circuit_breaker (主機、狀態、剩餘暫停秒數)。
         """
         if self.site_config is None:
             logger.error("site_config 未初始化")
@@ -569,6 +679,15 @@ class BaseCrawler(ABC):
             'start_time': datetime.now(timezone.utc)
         }
         self.scrape_phase[task_id][ScrapePhase.CANCELLED.value] = False
+        self.saved_articles_count = None
+        self.unchanged_articles_count = 0
+        self.updated_revisit_state = None
+        self.revisit_skipped_categories = {}
+        self.category_stats = {}
+        if self.http_client is not None:
+            self.http_client.reset_stats()
+            self.http_client.on_circuit_change = lambda state: self._report_circuit_state(task_id, state)
+            self.http_client.should_abort = lambda: self._check_if_cancelled(task_id)
         # 驗證並更新任務參數
         if not self._validate_and_update_task_params(task_id, task_args):
             return {
@@ -599,6 +718,22 @@ class BaseCrawler(ABC):
             # 設定get_links_by_task_id為True，這個任務下次就不會再去網站抓取文章列表
             if execute_result.get('success', False):
                 execute_result['get_links_by_task_id'] = True
+            # 實際寫入資料庫的文章數 (經寫入確認)
+            if self.saved_articles_count is not None:
+                execute_result['saved_articles_count'] = self.saved_articles_count
+                execute_result['changed_articles_count'] = self.saved_articles_count - self.unchanged_articles_count
+                execute_result['unchanged_articles_count'] = self.unchanged_articles_count
+                logger.info("任務 %s 保存文章：內容變更 %d 篇，未變更 %d 篇",
+                            task_id, execute_result['changed_articles_count'], self.unchanged_articles_count)
+            # 本任務的 HTTP 快取統計 (節省的下載量等)
+            if self.http_client is not None:
+                execute_result['http_cache'] = self.http_client.get_stats()
+                logger.info("任務 %s HTTP 快取統計: %s", task_id, execute_result['http_cache'])
+            # 各類別的抓取統計與更新後的重訪狀態
+            if self.category_stats:
+                execute_result['category_stats'] = self.category_stats
+            if self.updated_revisit_state is not None:
+                execute_result['revisit_state'] = self.updated_revisit_state
 
             return execute_result
         except Exception as e:
@@ -768,6 +903,9 @@ class BaseCrawler(ABC):
         
         # 檢查是否成功獲取文章列表
         if fetched_articles_df is None or fetched_articles_df.empty:
+            not_due_result = self._revisit_not_due_result(task_id)
+            if not_due_result is not None:
+                return not_due_result
             logger.warning("沒有獲取到任何文章連結")
             self._update_scrape_phase(task_id, 100, '沒有獲取到任何文章連結', ScrapePhase.COMPLETED)
             return {
@@ -818,6 +956,9 @@ class BaseCrawler(ABC):
         
         # 檢查是否成功獲取文章列表
         if fetched_articles_df is None or fetched_articles_df.empty:
+            not_due_result = self._revisit_not_due_result(task_id)
+            if not_due_result is not None:
+                return not_due_result
             logger.warning("沒有獲取到任何文章連結")
             self._update_scrape_phase(task_id, 100, '沒有獲取到任何文章連結', ScrapePhase.COMPLETED)
             return {
@@ -833,6 +974,20 @@ class BaseCrawler(ABC):
         
         # 將获取的文章列表赋值给 self.articles_df
         self.articles_df = fetched_articles_df
+
+        # 啟用待抓取連結表時，改為抓取依優先度與主機分散領取的連結 (可能包含先前中斷任務留下的連結)
+        if self.crawl_frontier is not None:
+            self.articles_df = self._claim_from_frontier(task_id, self.articles_df)
+            articles_count = len(self.articles_df)
+            if self.articles_df.empty:
+                logger.info("待抓取連結表中沒有可領取的連結")
+                self._update_scrape_phase(task_id, 100, '沒有可領取的待抓取連結', ScrapePhase.COMPLETED)
+                return {
+                    'success': True,
+                    'message': '沒有可領取的待抓取連結',
+                    'articles_count': 0,
+                    'scrape_phase': self.get_scrape_phase(task_id).get('scrape_phase')
+                }
         
         # 步驟2：抓取文章詳細內容
         progress_msg = f'抓取文章詳細內容中 (0/{articles_count})...'
@@ -853,6 +1008,7 @@ class BaseCrawler(ABC):
             
             # 即使沒有獲取到內容，仍然保存連結
             self._save_results(task_id)
+            self._finish_frontier_claims(task_id, fetched_articles)
             
             self._update_scrape_phase(task_id, 100, '沒有獲取到任何文章內容，但已保存連結', ScrapePhase.COMPLETED)
             return {
@@ -878,6 +1034,7 @@ class BaseCrawler(ABC):
         
         # 步驟4：保存結果
         self._save_results(task_id)
+        self._finish_frontier_claims(task_id, fetched_articles)
         
         # 任務完成
         self._update_scrape_phase(task_id, 100, '任務完成', ScrapePhase.COMPLETED)
@@ -890,6 +1047,168 @@ class BaseCrawler(ABC):
             'scrape_phase': self.get_scrape_phase(task_id).get('scrape_phase')
         }
 
+    def _frontier_worker_id(self, task_id: int) -> str:
+        """本次任務領取待抓取連結使用的識別碼"""
+        return f"{socket.gethostname()}-{os.getpid()}-task{task_id}"
+
+    def _claim_from_frontier(self, task_id: int, articles_df: pd.DataFrame) -> pd.DataFrame:
+        """將發現的連結加入待抓取連結表，再領取本次要抓取內容的連結
+
+        優先度為 AI 相關性分數，相同時較新發現的連結優先；只領取本爬蟲來源的連結，
+        每個主機的領取數量只在設定 frontier_per_host_limit 時限制。加入或領取失敗時退回抓取本次發現的連結。
+
+        Returns:
+            pd.DataFrame: 領取的文章連結列表
+        """
+        self.frontier_claims = {}
+        records = articles_df.astype(object).where(articles_df.notna(), None).to_dict('records')
+        entries = []
+        for record in records:
+            ai_score = ArticleAnalyzer.score_ai_relevance(record)['score']
+            entries.append({
+                'url': record.get('canonical_link') or record.get('link'),
+                'source': record.get('source') or None,
+                'task_id': task_id,
+                'priority': ai_score,
+                'ai_score': ai_score,
+                'payload': json.loads(json.dumps(record, default=str)),
+            })
+
+        enqueue_result = self.crawl_frontier.enqueue_links(entries)
+        if not enqueue_result.get('success'):
+            logger.warning("加入待抓取連結表失敗，改為抓取本次發現的連結: %s", enqueue_result.get('message'))
+            return articles_df
+        logger.info("任務 %s %s", task_id, enqueue_result.get('message'))
+
+        # 回收中斷任務遺留的連結，讓本次任務可以繼續抓取
+        self.crawl_frontier.requeue_stale_claims()
+        claim_result = self.crawl_frontier.claim_batch(
+            self._frontier_worker_id(task_id),
+            limit=len(articles_df),
+            per_host_limit=self.global_params.get('frontier_per_host_limit'),
+            source=self.site_config.name,
+        )
+        if not claim_result.get('success'):
+            logger.warning("領取待抓取連結失敗，改為抓取本次發現的連結: %s", claim_result.get('message'))
+            return articles_df
+
+        claimed_records = []
+        for entry in claim_result['entries']:
+            payload = dict(entry.get('payload') or {})
+            payload['task_id'] = task_id
+            claimed_records.append(payload)
+            self.frontier_claims[payload.get('link')] = entry['id']
+        logger.info("任務 %s 從待抓取連結表領取 %d 個連結", task_id, len(claimed_records))
+        return BnextUtils.process_articles_to_dataframe(claimed_records)
+
+    def _finish_frontier_claims(self, task_id: int, fetched_articles: Optional[List[Dict[str, Any]]]) -> None:
+        """回報領取連結的抓取結果：完成 (含因非 AI 相關而略過) 的標記完成，失敗的延後重試，未抓取的放回"""
+        if self.crawl_frontier is None or not self.frontier_claims:
+            return
+        results = {article.get('link'): article for article in fetched_articles or [] if article.get('link')}
+        done_ids: List[int] = []
+        failed: Dict[int, Optional[str]] = {}
+        released_ids: List[int] = []
+        for link, entry_id in self.frontier_claims.items():
+            article = results.get(link)
+            if article is None:
+                released_ids.append(entry_id)
+            elif article.get('is_scraped') or article.get('scrape_status') == ArticleScrapeStatus.CONTENT_SCRAPED.value:
+                done_ids.append(entry_id)
+            else:
+                failed[entry_id] = article.get('scrape_error') or '抓取文章內容失敗'
+
+        result = self.crawl_frontier.complete_claims(
+            self._frontier_worker_id(task_id), done_ids, failed, released_ids
+        )
+        logger.info("任務 %s %s", task_id, result.get('message'))
+        self.frontier_claims = {}
+
+    def _revisit_policy(self) -> Optional[RevisitPolicy]:
+        """任務啟用 adaptive_revisit (且非測試模式) 時返回重訪策略"""
+        if not self.global_params.get('adaptive_revisit', False) or self.global_params.get('is_test', False):
+            return None
+        return RevisitPolicy(
+            min_pages=self.global_params.get('min_pages'),
+            max_interval_sec=self.global_params.get('revisit_max_interval_sec'),
+        )
+
+    def _plan_category_revisits(self, categories: List[str], max_pages: int) -> Optional[Dict[str, int]]:
+        """依重訪狀態決定本次要抓取的類別與各類別頁數
+
+        Returns:
+            {類別: 頁數}，只包含到期的類別；未啟用 adaptive_revisit 時返回 None (每個類別抓取 max_pages 頁)
+        """
+        self.revisit_skipped_categories = {}
+        policy = self._revisit_policy()
+        if policy is None:
+            return None
+        category_pages, skipped = policy.plan(categories, self.revisit_state, max_pages)
+        self.revisit_skipped_categories = skipped
+        self.category_stats = build_category_stats({}, {}, skipped)
+        if skipped:
+            logger.info("類別 %s 尚未到期重訪，本次略過", ", ".join(skipped))
+        return category_pages
+
+    def _record_category_yield(self, category_pages: Dict[str, Dict[str, Any]], max_pages: int) -> None:
+        """計算各類別每頁的新連結數 (資料庫中尚不存在的連結)，記錄抓取統計並更新重訪狀態
+
+        Args:
+            category_pages: 抓取文章列表時各類別的 {requests, planned_pages, page_links}
+            max_pages: 任務的最大頁數
+        """
+        all_links = [
+            link
+            for observed in category_pages.values()
+            for page_links in observed.get('page_links', [])
+            for link in page_links
+        ]
+        result = self.article_service.find_existing_links(all_links)
+        if not result.get('success'):
+            logger.warning("查詢已存在的文章連結失敗，無法計算各類別的新連結數: %s", result.get('message'))
+            return
+
+        new_links: Dict[str, List[int]] = {}
+        for category, observed in category_pages.items():
+            # 同一類別中重複出現的連結只在第一次出現的頁面計為新連結
+            seen = set(result['links'])
+            counts = []
+            for page_links in observed.get('page_links', []):
+                page_new_links = set(page_links) - seen
+                seen.update(page_new_links)
+                counts.append(len(page_new_links))
+            new_links[category] = counts
+
+        self.category_stats = build_category_stats(category_pages, new_links, self.revisit_skipped_categories)
+        for category, stats in self.category_stats.items():
+            if not stats.get('skipped'):
+                logger.info("類別 %s 抓取 %d 頁 (%d 次請求)，新連結 %d 個，新連結/請求: %.2f",
+                            category, stats['pages'], stats['requests'], stats['new_links'], stats['yield_ratio'])
+
+        # 以任務開始時的重訪狀態為基準更新，重試抓取文章列表時不會重複調整
+        policy = self._revisit_policy()
+        if policy is not None:
+            planned_pages = {
+                category: observed.get('planned_pages', max_pages)
+                for category, observed in category_pages.items()
+            }
+            self.updated_revisit_state = policy.update(self.revisit_state, new_links, planned_pages, max_pages)
+
+    def _revisit_not_due_result(self, task_id: int) -> Optional[Dict[str, Any]]:
+        """所有類別都尚未到期重訪 (未抓取任何列表頁) 時返回成功的任務結果，否則返回 None"""
+        if not self.revisit_skipped_categories or any(
+            not stats.get('skipped') for stats in self.category_stats.values()
+        ):
+            return None
+        logger.info("任務 %s 沒有到期需要重訪的類別", task_id)
+        self._update_scrape_phase(task_id, 100, '沒有到期需要重訪的類別', ScrapePhase.COMPLETED)
+        return {
+            'success': True,
+            'message': '沒有到期需要重訪的類別',
+            'articles_count': 0,
+            'scrape_phase': self.get_scrape_phase(task_id).get('scrape_phase')
+        }
+
     def _fetch_article_list(self, task_id: int, max_retries: int = 3, retry_delay: float = 2.0) -> Optional[pd.DataFrame]:
         """抓取文章列表"""
         try:
@@ -954,13 +1273,7 @@ class BaseCrawler(ABC):
                 self._update_scrape_phase(task_id, progress, '保存數據到CSV文件中...', ScrapePhase.SAVE_TO_CSV)
                 
                 csv_file_prefix = self.global_params.get("csv_file_prefix", "articles")
-                # 使用前綴+任務ID+時間戳作為文件名
-                from datetime import datetime
-                timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
-                csv_file_name = f"{csv_file_prefix}_{task_id}_{timestamp}.csv"
-                csv_path = f'./logs/{csv_file_name}'
-                
-                self._save_to_csv(self.articles_df, csv_path)
+                self._save_to_result_file(task_id, self.articles_df, csv_file_prefix)
                 
                 progress = self._calculate_progress('save_to_csv', 1)
                 self._update_scrape_phase(task_id, progress, '保存數據到CSV文件完成', ScrapePhase.SAVE_TO_CSV)
@@ -998,6 +1311,19 @@ class BaseCrawler(ABC):
             progress_data = self.get_scrape_phase(task_id)
             self.progress_reporter.notify_progress(task_id, progress_data)
     
+    def _report_circuit_state(self, task_id: int, state: Dict[str, Any]):
+        """將主機斷路器的狀態加入任務進度"""
+        if task_id not in self.scrape_phase:
+            return
+        self.scrape_phase[task_id]['circuit_breaker'] = state
+        if state['state'] == CIRCUIT_OPEN:
+            message = f"主機 {state['host']} 暫時無法連線，暫停請求 {state['retry_in']:.0f} 秒"
+        elif state['state'] == CIRCUIT_CLOSED:
+            message = f"主機 {state['host']} 已恢復連線"
+        else:
+            message = f"主機 {state['host']} 正在探測是否恢復"
+        self._update_scrape_phase(task_id, self.scrape_phase[task_id].get('progress', 0), message)
+
     def get_scrape_phase(self, task_id: int):
         """獲取任務狀態"""
         return self.scrape_phase.get(task_id, {
@@ -1012,7 +1338,7 @@ class BaseCrawler(ABC):
         Args:
             operation: 要執行的操作
             max_retries: 最大重試次數
-            retry_delay: 重試延遲時間
+            retry_delay: 第一次重試的延遲時間，之後每次加倍並加入隨機抖動
             task_id: 任務ID，用於檢查是否取消
             
         Returns:
@@ -1032,8 +1358,9 @@ class BaseCrawler(ABC):
                     logger.error("操作失敗，已重試 %d 次: %s", retries, e)
                     raise e
                 
-                logger.warning("操作失敗，正在重試 (%d/%d): %s", retries, max_retries, e)
-                time.sleep(retry_delay)
+                delay = compute_backoff_delay(retries, retry_delay)
+                logger.warning("操作失敗，%.1f 秒後重試 (%d/%d): %s", delay, retries, max_retries, e)
+                time.sleep(delay)
                 
     def cancel_task(self, task_id: int) -> bool:
         """取消正在執行的任務
@@ -1105,12 +1432,10 @@ class BaseCrawler(ABC):
                     if self.global_params.get('save_to_csv', False):
                         # 使用特殊前綴標記是取消的部分保存
                         csv_file_prefix = self.global_params.get("csv_file_prefix", "articles")
-                        timestamp = datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S')
-                        csv_file_name = f"{csv_file_prefix}_cancelled_{task_id}_{timestamp}.csv"
-                        csv_path = f'./logs/{csv_file_name}'
-                        
-                        self._save_to_csv(self.articles_df, csv_path)
-                        logger.info("已將取消任務的部分數據保存到 %s", csv_path)
+                        result_path = self._save_to_result_file(
+                            task_id, self.articles_df, f"{csv_file_prefix}_cancelled"
+                        )
+                        logger.info("已將取消任務的部分數據保存到 %s", result_path)
                     
                     # 保存到資料庫（如果配置了且獲取了有意義的數據）
                     if self.global_params.get('save_to_database', False) and self.global_params.get('save_partial_to_database', False):
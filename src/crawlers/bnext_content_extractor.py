@@ -10,23 +10,42 @@ import requests
 from src.crawlers.article_analyzer import ArticleAnalyzer
 from src.crawlers.bnext_utils import BnextUtils
 from src.crawlers.configs.base_config import DEFAULT_HEADERS
+from src.crawlers.html_archive import HtmlArchive, get_html_archive
+from src.crawlers.http_cache import CachingHttpClient, get_http_cache
 from src.utils import datetime_utils
+from src.utils.content_hash_utils import compute_content_hash
 from src.utils.enum_utils import ArticleScrapeStatus
+from src.utils.url_utils import UrlCanonicalizer
 
 
 logger = logging.getLogger(__name__)  # 使用統一的 logger
 
 
 class BnextContentExtractor:
-    def __init__(self, config=None):
+    def __init__(self, config=None, html_archive: Optional[HtmlArchive] = None,
+                 http_client: Optional[CachingHttpClient] = None):
         """
         初始化爬蟲設定
+
+        Args:
+            config: 網站配置
+            html_archive: 原始 HTML 封存，未提供時依 HTML_ARCHIVE_ENABLED 使用行程共用的封存
+            http_client: HTTP 用戶端，未提供時依 HTTP_CACHE_ENABLED 決定是否使用回應快取
         """
         if config is None:
             logger.error("未提供網站配置，請提供有效的配置")
             raise ValueError("未提供網站配置，請提供有效的配置")
         else:
             self.site_config = config
+        self.html_archive = html_archive if html_archive is not None else get_html_archive()
+        self.http_client = http_client or CachingHttpClient(get_http_cache())
+        self.url_canonicalizer = self._create_canonicalizer()
+
+    def _create_canonicalizer(self) -> UrlCanonicalizer:
+        return UrlCanonicalizer.from_config(
+            getattr(self.site_config, 'url_canonicalization', None),
+            getattr(self.site_config, 'base_url', None),
+        )
 
     def update_config(self, config=None):
         """
@@ -37,6 +56,7 @@ class BnextContentExtractor:
             raise ValueError("未提供網站配置，請提供有效的配置")
         else:
             self.site_config = config
+            self.url_canonicalizer = self._create_canonicalizer()
 
     def batch_get_articles_content(self, articles_df: pd.DataFrame, num_articles: Optional[int] = None,
                                    ai_only: bool = True, min_keywords: int = 3, is_limit_num_articles: bool = False) -> List[Dict[str, Any]]:
@@ -114,42 +134,17 @@ class BnextContentExtractor:
         try:
             BnextUtils.sleep_random_time(2.0, 4.0)
 
-            response = requests.get(article_url, headers=DEFAULT_HEADERS, timeout=15)
+            response = self.http_client.get(article_url, headers=DEFAULT_HEADERS, timeout=15)
             if response.status_code != 200:
                 logger.error("請求失敗 (%s): %s", response.status_code, article_url)
                 return None
 
             logger.debug("成功獲取網頁內容: %s", article_url)
+            self._archive_response(article_url, response)
 
-            soup = BnextUtils.get_soup_from_html(response.text)
-            if soup is None:
-                logger.error("無法解析網頁內容: %s", article_url)
-                return None
-
-            if self.site_config is None or not hasattr(self.site_config, 'selectors') or 'get_article_contents' not in self.site_config.selectors:
-                logger.error("網站配置或選擇器未正確設定")
-                raise ValueError("網站配置或選擇器未正確設定")
-
-            selectors = self.site_config.selectors
-            get_article_contents_selectors = selectors.get('get_article_contents')
-
-            content_container_selector = get_article_contents_selectors.get("content_container")
-            if not content_container_selector:
-                 logger.error("缺少 'content_container' 選擇器配置: %s", article_url)
-                 return None
-
-            # 提取文章內容
-            article_content_container = soup.select_one(content_container_selector) # 使用 select_one 获取单个容器
-            if not article_content_container:
-                logger.error("無法找到文章 container 使用選擇器 '%s': %s", content_container_selector, article_url)
-                return None
-
-            # 傳遞單個容器元素而非列表
-            article_data = self._extract_article_parts(article_content_container, soup, get_article_contents_selectors, article_url)
-
+            article_data = self.parse_article_html(response.text, article_url)
             if article_data is None:
-                logger.error("文章內容提取失敗 (可能缺少必要部分): %s", article_url)
-                return None # _extract_article_parts 内部已记录错误
+                return None
 
             # AI 相關性檢查 - 僅在需要時執行
             if ai_only:
@@ -195,6 +190,64 @@ class BnextContentExtractor:
             logger.error("獲取文章內容時發生未知錯誤: %s, URL: %s", str(e), article_url, exc_info=True)
             return None # 返回 None 表示處理失敗
 
+    def parse_article_html(self, html: str, article_url: str) -> Optional[Dict]:
+        """依網站的選擇器解析文章網頁 (線上抓取與離線重新解析共用)
+
+        Raises:
+            ValueError: 網站配置或選擇器未正確設定
+        """
+        soup = BnextUtils.get_soup_from_html(html)
+        if soup is None:
+            logger.error("無法解析網頁內容: %s", article_url)
+            return None
+
+        if self.site_config is None or not hasattr(self.site_config, 'selectors') or 'get_article_contents' not in self.site_config.selectors:
+            logger.error("網站配置或選擇器未正確設定")
+            raise ValueError("網站配置或選擇器未正確設定")
+
+        selectors = self.site_config.selectors
+        get_article_contents_selectors = selectors.get('get_article_contents')
+
+        content_container_selector = get_article_contents_selectors.get("content_container")
+        if not content_container_selector:
+            logger.error("缺少 'content_container' 選擇器配置: %s", article_url)
+            return None
+
+        # 提取文章內容
+        article_content_container = soup.select_one(content_container_selector) # 使用 select_one 获取单个容器
+        if not article_content_container:
+            logger.error("無法找到文章 container 使用選擇器 '%s': %s", content_container_selector, article_url)
+            return None
+
+        # 傳遞單個容器元素而非列表
+        article_data = self._extract_article_parts(article_content_container, soup, get_article_contents_selectors, article_url)
+
+        if article_data is None:
+            logger.error("文章內容提取失敗 (可能缺少必要部分): %s", article_url)
+            return None # _extract_article_parts 内部已记录错误
+        # 擷取結果的雜湊，重新抓取時用於判斷內容是否變更
+        article_data['content_hash'] = compute_content_hash(article_data)
+        # 頁面宣告的 canonical 連結 (同一網站) 優先，否則使用標準化後的抓取網址
+        article_data['canonical_link'] = (
+            self.url_canonicalizer.extract_canonical_link(soup, article_url)
+            or self.url_canonicalizer.canonicalize(article_url)
+        )
+        return article_data
+
+    def _archive_response(self, article_url: str, response) -> None:
+        """將原始回應內容寫入封存，封存失敗不影響抓取"""
+        if self.html_archive is None:
+            return
+        try:
+            self.html_archive.store(
+                article_url,
+                response.content,
+                status_code=response.status_code,
+                encoding=response.encoding,
+            )
+        except Exception as e:
+            logger.warning("封存原始 HTML 失敗: %s - %s", e, article_url)
+
     def _extract_article_parts(self, article_content_container, soup, get_article_contents_selectors, article_url: str):
         """提取文章各個部分"""
         logger.debug("開始提取文章各部分內容: %s", article_url)
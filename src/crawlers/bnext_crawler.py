@@ -11,7 +11,8 @@ import pandas as pd
 from src.crawlers.base_crawler import BaseCrawler
 from src.crawlers.bnext_content_extractor import BnextContentExtractor
 from src.crawlers.bnext_scraper import BnextScraper
-from src.models.articles_model import ArticleScrapeStatus # 確保導入 ArticleScrapeStatus
+from src.crawlers.bnext_utils import BnextUtils
+from src.crawlers.http_cache import CachingHttpClient, get_http_cache
 
 
 # 使用統一的 logger
@@ -29,14 +30,19 @@ class BnextCrawler(BaseCrawler):
         """
         super().__init__(config_file_name, article_service)
         
+        # 列表與內文共用同一個 HTTP 用戶端，統計即為此爬蟲任務的快取效益
+        self.http_client = CachingHttpClient(get_http_cache())
+
         # 創建爬蟲和擷取器實例，傳入配置
         logger.debug("BnextCrawler - call_create_scraper(): 建立爬蟲實例")
         self.scraper = scraper or BnextScraper(
-            config=self.site_config
+            config=self.site_config,
+            http_client=self.http_client
         )
         logger.debug("BnextCrawler - call_create_extractor(): 建立文章內容擷取器")
         self.extractor = extractor or BnextContentExtractor(
-            config=self.site_config
+            config=self.site_config,
+            http_client=self.http_client
         )
         
         # 初始化 DataFrame
@@ -85,11 +91,21 @@ class BnextCrawler(BaseCrawler):
             self.site_config.categories = categories
             logger.info("測試模式：只使用第一個類別 %s 進行測試", categories[0])
         
+        # 啟用 adaptive_revisit 時只抓取到期的類別，並依各類別的重訪狀態決定頁數
+        category_pages = self._plan_category_revisits(categories, max_pages)
+        if category_pages is not None and not category_pages:
+            logger.info("沒有到期需要重訪的類別")
+            return None
+
         logger.debug("抓取文章列表參數設定：最大頁數: %s, 文章類別: %s, AI 相關文章: %s", max_pages, categories, ai_only)
         logger.debug("抓取文章列表中...")
+        scrape_kwargs = {} if category_pages is None else {'category_pages': category_pages}
         article_links_df = self.retry_operation(
-            lambda: self.scraper.scrape_article_list(max_pages, ai_only, min_keywords)
+            lambda: self.scraper.scrape_article_list(max_pages, ai_only, min_keywords, **scrape_kwargs)
         )
+        observed_pages = getattr(self.scraper, 'last_category_pages', None)
+        if isinstance(observed_pages, dict):
+            self._record_category_yield(observed_pages, max_pages)
         if article_links_df is None or article_links_df.empty:
             logger.warning("沒有文章列表可供處理")
             return None
@@ -126,22 +142,11 @@ class BnextCrawler(BaseCrawler):
             if not articles_content:
                 return None
             
-            # 更新 DataFrame 中的文章狀態
-            for index, article in enumerate(articles_content):
-                if index < len(self.articles_df):
-                    # 使用 bool() 確保布林值類型正確
-                    is_scraped = bool(article.get('is_scraped', False))
-                    
-                    # 更新狀態
-                    self.articles_df.loc[index, 'is_scraped'] = is_scraped
-                    self.articles_df.loc[index, 'scrape_status'] = ArticleScrapeStatus.CONTENT_SCRAPED.value if is_scraped else ArticleScrapeStatus.FAILED.value
-                    self.articles_df.loc[index, 'scrape_error'] = article.get('scrape_error')
-                    self.articles_df.loc[index, 'last_scrape_attempt'] = article.get('last_scrape_attempt')
-                    self.articles_df.loc[index, 'task_id'] = task_id
-            
-            # 確保布林值欄位的類型 (迴圈外執行一次)
-            self.articles_df['is_scraped'] = self.articles_df['is_scraped'].astype(bool)
-            
+            # 依 link 一次性合併抓取狀態回 DataFrame
+            self.articles_df = BnextUtils.merge_scrape_results_by_link(
+                self.articles_df, articles_content, task_id=task_id
+            )
+
             return articles_content
             
         except Exception as e:
@@ -11,6 +11,8 @@ import pandas as pd
 from src.crawlers.configs.base_config import DEFAULT_HEADERS
 from src.crawlers.article_analyzer import ArticleAnalyzer
 from src.crawlers.bnext_utils import BnextUtils
+from src.crawlers.http_cache import CachingHttpClient, get_http_cache
+from src.utils.url_utils import UrlCanonicalizer
 
 from src.utils.enum_utils import ArticleScrapeStatus
 # from src.utils.enum_utils import ScrapePhase # ScrapePhase seems unused
@@ -20,18 +22,31 @@ logger = logging.getLogger(__name__)  # 使用統一的 logger
 
 
 class BnextScraper:
-    def __init__(self, config=None):
+    def __init__(self, config=None, http_client=None):
         """
         初始化爬蟲
         
         Parameters:
         config: 網站配置
+        http_client: HTTP 用戶端，未提供時依 HTTP_CACHE_ENABLED 決定是否使用回應快取
         """
         if config is None:
             logger.error("未提供網站配置，請提供有效的配置")
             raise ValueError("未提供網站配置，請提供有效的配置")
         else:
             self.site_config = config
+        self.http_client = http_client or CachingHttpClient(get_http_cache())
+        self.url_canonicalizer = self._create_canonicalizer()
+        # 最近一次抓取文章列表的連結統計 (標準化前後的不重複連結數)
+        self.last_link_stats = {}
+        # 最近一次抓取文章列表各類別的 {requests, planned_pages, page_links (每頁標準化後的連結)}
+        self.last_category_pages = {}
+
+    def _create_canonicalizer(self) -> UrlCanonicalizer:
+        return UrlCanonicalizer.from_config(
+            getattr(self.site_config, 'url_canonicalization', None),
+            getattr(self.site_config, 'base_url', None),
+        )
 
     def update_config(self, config=None):
         """
@@ -42,10 +57,33 @@ class BnextScraper:
             raise ValueError("未提供網站配置，請提供有效的配置")
         else:
             self.site_config = config
+            self.url_canonicalizer = self._create_canonicalizer()
+
+    def _canonicalize_links(self, article_links_list, raw_links: set, canonical_links: set):
+        """在發現連結時將網址標準化，並記錄標準化前後的不重複連結"""
+        for article in article_links_list:
+            raw_link = article.get('link')
+            if not raw_link:
+                continue
+            canonical = self.url_canonicalizer.canonicalize(raw_link, self.site_config.base_url)
+            raw_links.add(raw_link)
+            canonical_links.add(canonical)
+            article['link'] = canonical
+            article['canonical_link'] = canonical
+        return article_links_list
+
+    def scrape_article_list(self, max_pages=3, ai_only=True, min_keywords=3, category_pages=None) -> pd.DataFrame:
+        """
+        抓取各類別的文章列表
 
-    def scrape_article_list(self, max_pages=3, ai_only=True, min_keywords=3) -> pd.DataFrame:
+        Parameters:
+        category_pages: 各類別要抓取的頁數 {類別: 頁數}，提供時只抓取其中的類別；未提供時每個類別抓取 max_pages 頁
+        """
         start_time = time.time()
         all_article_links_list = []
+        raw_links = set()
+        canonical_links = set()
+        self.last_category_pages = {}
         
         try:
             logger.debug("開始抓取文章列表")
@@ -55,7 +93,11 @@ class BnextScraper:
                 
             session = requests.Session()
 
-            for current_category_name in self.site_config.categories:
+            categories = self.site_config.categories if category_pages is None else list(category_pages)
+            for current_category_name in categories:
+                category_max_pages = max_pages if category_pages is None else category_pages[current_category_name]
+                category_pages_stats = {'requests': 0, 'planned_pages': category_max_pages, 'page_links': []}
+                self.last_category_pages[current_category_name] = category_pages_stats
                 
                 logger.debug("開始處理類別: %s", current_category_name)
                 current_category_url = self.site_config.get_category_url(current_category_name)
@@ -65,8 +107,8 @@ class BnextScraper:
                 base_category_url = current_category_url
                 logger.debug("保存原始類別URL: %s", base_category_url)
 
-                while page <= max_pages:
-                    logger.debug("正在處理第 %s/%s 頁", page, max_pages)
+                while page <= category_max_pages:
+                    logger.debug("正在處理第 %s/%s 頁", page, category_max_pages)
                     logger.debug("當前URL: %s", current_category_url)
                     
                     try:
@@ -77,7 +119,8 @@ class BnextScraper:
                         logger.debug("延遲完成")
                         
                         logger.debug("準備使用session.get()")
-                        response = session.get(str(current_category_url), headers=self.site_config.headers, timeout=15)
+                        category_pages_stats['requests'] += 1
+                        response = self.http_client.get(str(current_category_url), headers=self.site_config.headers, timeout=15, session=session)
                         logger.debug("使用session.get()完成")
                     except Exception as e:
                         logger.error("增加隨機延遲時發生錯誤: %s", str(e), exc_info=True)
@@ -93,6 +136,10 @@ class BnextScraper:
 
                         logger.debug("BnextScraper(scrape_article_list()) - call self.extract_article_links() 爬取文章連結")
                         current_page_article_links_list = self.extract_article_links(soup, ai_only=ai_only, min_keywords=min_keywords)
+                        self._canonicalize_links(current_page_article_links_list, raw_links, canonical_links)
+                        category_pages_stats['page_links'].append(
+                            [article['link'] for article in current_page_article_links_list if article.get('link')]
+                        )
                         
                         all_article_links_list.extend(current_page_article_links_list)
                         logger.debug("共爬取 %s 篇文章連結", len(all_article_links_list))
@@ -106,6 +153,10 @@ class BnextScraper:
                             current_category_url = self._build_next_page_url(base_category_url, page + 1)
                             page += 1
                             
+                            # 已達本類別頁數上限時不需再確認下一頁
+                            if page > category_max_pages:
+                                break
+                            category_pages_stats['requests'] += 1
                             if not self._is_valid_next_page(session, current_category_url):
                                 break
                     
@@ -131,6 +182,19 @@ class BnextScraper:
             end_time = time.time()
             duration = end_time - start_time
             logger.debug("爬蟲任務完成，總耗時: %.2f 秒", duration)
+            self.last_link_stats = {
+                'discovered': len(all_article_links_list),
+                'unique_raw_links': len(raw_links),
+                'unique_canonical_links': len(canonical_links),
+                # 未標準化時不重複網址中屬於重複抓取的比例 (標準化後同一次抓取不會重複)
+                'duplicate_fetch_rate': (
+                    round(1 - len(canonical_links) / len(raw_links), 4) if raw_links else 0.0
+                ),
+            }
+            if len(raw_links) > len(canonical_links):
+                logger.info("網址標準化合併了 %d 個重複連結 (重複抓取率 %.1f%% -> 0%%)",
+                            len(raw_links) - len(canonical_links),
+                            self.last_link_stats['duplicate_fetch_rate'] * 100)
             if self.site_config.categories:
                 logger.debug("共處理 %s 個類別，爬取 %s 篇文章", len(self.site_config.categories), len(all_article_links_list))
             else:
@@ -149,7 +213,7 @@ class BnextScraper:
     def _is_valid_next_page(self, session, url: str) -> bool:
         """檢查下一頁URL是否有效"""
         try:
-            test_response = session.get(url, headers=DEFAULT_HEADERS, timeout=10)
+            test_response = self.http_client.get(url, headers=DEFAULT_HEADERS, timeout=10, session=session)
             if test_response.status_code != 200:
                 logger.warning("無法訪問下一頁: %s", url)
                 return False
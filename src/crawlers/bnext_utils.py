@@ -11,13 +11,15 @@
 import random
 import time
 from datetime import datetime, timezone
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 from urllib.parse import urljoin
 import logging
 
+import numpy as np
 import pandas as pd
 from bs4 import BeautifulSoup
 
+from src.utils.enum_utils import ArticleScrapeStatus
 
 
 logger = logging.getLogger(__name__)  # 使用統一的 logger
@@ -102,7 +104,9 @@ class BnextUtils:
         scrape_status: Optional[str] = 'pending',
         scrape_error: Optional[str] = None,
         last_scrape_attempt: Optional[datetime] = None,
-        task_id: Optional[int] = None) -> Dict:
+        task_id: Optional[int] = None,
+        content_hash: Optional[str] = None,
+        canonical_link: Optional[str] = None) -> Dict:
         """建立包含單一文章所有欄位的字典 (常用於資料庫操作)
 
         Returns:
@@ -125,7 +129,9 @@ class BnextUtils:
             'scrape_status': scrape_status,
             'scrape_error': scrape_error,
             'last_scrape_attempt': last_scrape_attempt,
-            'task_id': task_id
+            'task_id': task_id,
+            'content_hash': content_hash,
+            'canonical_link': canonical_link
         }
 
     @staticmethod
@@ -146,7 +152,9 @@ class BnextUtils:
         scrape_status: Optional[str] = 'pending',
         scrape_error: Optional[str] = None,
         last_scrape_attempt: Optional[datetime] = None,
-        task_id: Optional[int] = None) -> Dict:
+        task_id: Optional[int] = None,
+        content_hash: Optional[str] = None,
+        canonical_link: Optional[str] = None) -> Dict:
         """建立適合直接轉換為 Pandas DataFrame 的文章欄位字典。
            與 get_article_columns_dict 不同，此方法的值為列表。
 
@@ -170,7 +178,9 @@ class BnextUtils:
             'scrape_status': [scrape_status],
             'scrape_error': [scrape_error],
             'last_scrape_attempt': [last_scrape_attempt],
-            'task_id': [task_id]
+            'task_id': [task_id],
+            'content_hash': [content_hash],
+            'canonical_link': [canonical_link]
         }
 
     @staticmethod
@@ -187,50 +197,103 @@ class BnextUtils:
             logger.warning("輸入的文章列表為空，無法轉換為 DataFrame。")
             return pd.DataFrame()
 
-        # 將每個文章字典轉換為單行 DataFrame，確保所有欄位都存在
-        df_articles = []
-        for article in articles_list:
-            # 使用 .get() 提供預設值，避免 KeyError
-            article_data = {
-                'title': article.get('title', ''),
-                'summary': article.get('summary', ''),
-                'content': article.get('content', ''),
-                'link': article.get('link', ''),
-                'category': article.get('category', ''),
-                'published_at': article.get('published_at', None),
-                'author': article.get('author', ''),
-                'source': article.get('source', ''),
-                'source_url': article.get('source_url', ''),
-                'article_type': article.get('article_type', ''),
-                'tags': article.get('tags', ''),
-                'is_ai_related': article.get('is_ai_related', False),
-                'is_scraped': article.get('is_scraped', False),
-                'scrape_status': article.get('scrape_status', 'pending'),
-                'scrape_error': article.get('scrape_error', None),
-                'last_scrape_attempt': article.get('last_scrape_attempt', None),
-                'task_id': article.get('task_id', None)
-            }
-            # 將單個字典包裝在列表中以創建單行 DataFrame
-            df_articles.append(pd.DataFrame([article_data]))
-
-        # 合併所有單行 DataFrame
-        if df_articles:
-            df = pd.concat(df_articles, ignore_index=True)
-            # 根據 'link' 欄位去除重複的文章，保留第一個出現的
-            df = df.drop_duplicates(subset=['link'], keep='first')
-            logger.info("已將 %d 篇文章處理並轉換為 DataFrame (已去除重複)。", len(df))
-        else:
-            # 如果轉換過程中沒有有效的 DataFrame 生成
-            df = pd.DataFrame()
-            logger.warning("處理後未生成有效的 DataFrame。")
+        # 先收集為純字典記錄，最後一次性建立 DataFrame，避免逐篇建立單行 DataFrame 再 concat
+        records = BnextUtils.build_article_records(articles_list)
+        df = pd.DataFrame.from_records(records, columns=list(ARTICLE_COLUMN_DEFAULTS))
+        # 根據 'link' 欄位去除重複的文章，保留第一個出現的
+        df = df.drop_duplicates(subset=['link'], keep='first').reset_index(drop=True)
+        logger.info("已將 %d 篇文章處理並轉換為 DataFrame (已去除重複)。", len(df))
 
-        # 日誌記錄處理後的統計信息
-        stats = {
-            'total': len(df)
-        }
         logger.debug("DataFrame 處理統計信息:")
-        logger.debug("最終 DataFrame 文章數: %s", stats['total']) # 修正 Pylint W1203
+        logger.debug("最終 DataFrame 文章數: %s", len(df))
 
         return df
 
- 
+    @staticmethod
+    def build_article_records(articles_list: List[Dict]) -> List[Dict]:
+        """將文章字典列表正規化為包含完整欄位的記錄列表 (不建立 DataFrame)。
+
+        缺少的欄位會以 ARTICLE_COLUMN_DEFAULTS 的預設值補齊，多餘的欄位會被忽略。
+
+        Args:
+            articles_list: 包含多個文章字典的列表。
+
+        Returns:
+            List[Dict]: 欄位順序與 ARTICLE_COLUMN_DEFAULTS 一致的記錄列表。
+        """
+        columns = ARTICLE_COLUMN_DEFAULTS.items()
+        return [
+            {column: article.get(column, default) for column, default in columns}
+            for article in articles_list
+        ]
+
+    @staticmethod
+    def merge_scrape_results_by_link(articles_df: pd.DataFrame,
+                                     articles_content: List[Dict],
+                                     task_id: Optional[int] = None) -> pd.DataFrame:
+        """依照 link 將內容抓取結果一次性合併回文章 DataFrame 的狀態欄位。
+
+        以單次向量化 merge 取代逐列 .loc 更新；僅更新 link 有對應抓取結果的列，
+        同一 link 若有多筆結果則以最後一筆為準。
+
+        Args:
+            articles_df: 文章列表 DataFrame (需包含 link 欄位)，會直接更新此物件。
+            articles_content: batch_get_articles_content 返回的文章內容列表。
+            task_id: 任務 ID，會寫入有對應結果的列。
+
+        Returns:
+            pd.DataFrame: 更新後的文章 DataFrame。
+        """
+        if articles_df is None or articles_df.empty or not articles_content:
+            return articles_df
+
+        status_columns = ['is_scraped', 'scrape_error', 'last_scrape_attempt']
+        results_df = pd.DataFrame.from_records(
+            [
+                {
+                    'link': article.get('link'),
+                    'is_scraped': bool(article.get('is_scraped', False)),
+                    'scrape_error': article.get('scrape_error'),
+                    'last_scrape_attempt': article.get('last_scrape_attempt'),
+                }
+                for article in articles_content
+            ],
+            columns=['link'] + status_columns,
+        )
+        # pandas merge 會將 NaN/None 視為相等的鍵，需先排除缺少 link 的結果
+        results_df = results_df[results_df['link'].notna()].drop_duplicates(
+            subset=['link'], keep='last'
+        )
+
+        merged = articles_df[['link']].merge(
+            results_df, on='link', how='left', indicator=True
+        )
+        matched = (merged['_merge'] == 'both').to_numpy()
+        if not matched.any():
+            logger.warning("抓取結果中沒有任何連結與文章列表相符，未更新 DataFrame。")
+            return articles_df
+
+        # 統一轉為 object 欄位，避免寫入不同型別的值時觸發 dtype 不相容的警告
+        for column in status_columns + ['scrape_status', 'task_id']:
+            if column not in articles_df.columns:
+                articles_df[column] = ARTICLE_COLUMN_DEFAULTS[column]
+            articles_df[column] = articles_df[column].astype(object)
+
+        for column in status_columns:
+            articles_df.loc[matched, column] = merged.loc[matched, column].to_numpy(dtype=object)
+
+        scraped = merged.loc[matched, 'is_scraped'].to_numpy(dtype=bool)
+        articles_df.loc[matched, 'scrape_status'] = np.where(
+            scraped,
+            ArticleScrapeStatus.CONTENT_SCRAPED.value,
+            ArticleScrapeStatus.FAILED.value,
+        )
+        articles_df.loc[matched, 'task_id'] = task_id
+
+        # 確保布林值欄位的類型
+        articles_df['is_scraped'] = articles_df['is_scraped'].astype(bool)
+        return articles_df
+
+
+# 文章 DataFrame 的欄位與預設值 (順序即為 DataFrame 欄位順序)，以 get_article_columns_dict 為唯一來源
+ARTICLE_COLUMN_DEFAULTS: Dict[str, Any] = BnextUtils.get_article_columns_dict()
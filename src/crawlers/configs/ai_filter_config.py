@@ -1,7 +1,7 @@
 """定義用於篩選 AI 相關內容的關鍵字、分類和優先級設定。"""
 
 # 標準函式庫導入
-from typing import Set
+from typing import Dict, Set
 import logging
 # 本地應用程式導入
 
@@ -46,8 +46,19 @@ HIGH_PRIORITY_KEYWORDS: Set[str] = {
     '大語言模型', 'llm', '生成式ai', 'generative ai', '人工智慧'
 }
 
+# 各欄位命中關鍵字時的權重，用於 ArticleAnalyzer.score_ai_relevance
+FIELD_WEIGHTS: Dict[str, float] = {
+    'title': 3.0,
+    'tags': 2.0,
+    'summary': 1.5,
+    'content': 1.0
+}
+
+# 每個命中的高優先級關鍵字額外加上的分數
+HIGH_PRIORITY_WEIGHT: float = 5.0
+
 def register_additional_keywords(*keywords: str) -> None:
-    """註冊額外的AI關鍵字"""
+    """註冊額外的AI關鍵字 (ArticleAnalyzer 的關鍵字自動機會在下次使用時重建)"""
     # 可以在這裡加入 log，例如記錄新增了哪些關鍵字
     # logger.info("新增 AI 關鍵字: %s", ", ".join(keywords))
     for keyword in keywords:
@@ -29,6 +29,8 @@ class SiteConfig:
     valid_domains: List[str] = field(default_factory=list)
     url_patterns: List[str] = field(default_factory=list)
     url_file_extensions: List[str] = field(default_factory=lambda: ['.html', '.htm'])
+    # 文章網址標準化設定 (allowed_query_params、force_https 等，見 UrlCanonicalizer.from_config)
+    url_canonicalization: Dict[str, Any] = field(default_factory=dict)
 
     def validate_url(self, url: str) -> bool:
         """根據配置驗證提供的 URL 是否有效。"""
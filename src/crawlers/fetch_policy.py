@@ -0,0 +1,229 @@
+"""爬蟲抓取網頁時的重試與斷路器策略。
+
+- 重試：連線錯誤、逾時與 429/5xx 回應以指數退避加隨機抖動 (jitter) 重試，
+  429/503 帶有 ``Retry-After`` 時至少等待伺服器要求的時間。
+- 斷路器：依主機記錄連續失敗次數，超過門檻後開啟斷路器，行程內所有任務對該主機的請求都暫停；
+  恢復時間到後只放行一個探測請求，成功即關閉斷路器，失敗則加倍暫停時間後再次開啟。
+"""
+
+import logging
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+import requests
+
+logger = logging.getLogger(__name__)  # 使用統一的 logger
+
+# 視為暫時性失敗、可以重試的 HTTP 狀態碼
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+# 視為暫時性失敗、可以重試的請求例外
+RETRYABLE_EXCEPTIONS = (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+
+DEFAULT_MAX_BACKOFF_DELAY = 60.0
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+
+def parse_retry_after(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """解析 Retry-After 標頭 (秒數或 HTTP 日期)，返回需等待的秒數"""
+    if not value or not isinstance(value, str):
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+    return max(retry_at - (now if now is not None else time.time()), 0.0)
+
+
+def compute_backoff_delay(attempt: int, base_delay: float, max_delay: float = DEFAULT_MAX_BACKOFF_DELAY,
+                          rng: Optional[random.Random] = None) -> float:
+    """第 attempt 次重試 (從 1 開始) 的等待秒數
+
+    基本等待時間為 base_delay * 2^(attempt-1) (不超過 max_delay)，再隨機增加最多一半，
+    避免多個任務在同一時間重試。
+    """
+    delay = min(max_delay, base_delay * (2 ** max(attempt - 1, 0)))
+    return delay * (rng or random).uniform(1.0, 1.5)
+
+
+class RetryPolicy:
+    """請求重試策略：最大重試次數、指數退避參數與 Retry-After 上限"""
+
+    def __init__(self, max_retries: int = 2, base_delay: float = 2.0,
+                 max_delay: float = DEFAULT_MAX_BACKOFF_DELAY, max_retry_after: float = 120.0,
+                 rng: Optional[random.Random] = None):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retry_after = max_retry_after
+        self._rng = rng
+
+    def get_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """第 attempt 次重試前的等待秒數，有 Retry-After 時至少等待該時間 (不超過 max_retry_after)"""
+        delay = compute_backoff_delay(attempt, self.base_delay, self.max_delay, self._rng)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_retry_after))
+        return delay
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """主機的斷路器開啟中，請求未送出"""
+
+    def __init__(self, host: str, retry_in: float):
+        super().__init__(f"主機 {host} 的斷路器開啟中，{retry_in:.0f} 秒後才會重新嘗試")
+        self.host = host
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """單一主機的斷路器"""
+
+    def __init__(self, host: str, failure_threshold: int = 5, recovery_timeout: float = 30.0,
+                 max_recovery_timeout: float = 600.0, clock=time.monotonic):
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.max_recovery_timeout = max_recovery_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.state = CIRCUIT_CLOSED
+        self.consecutive_failures = 0
+        self.trips = 0
+        self._open_until = 0.0
+        self._current_timeout = recovery_timeout
+        self._probe_in_flight = False
+
+    def acquire(self) -> float:
+        """請求前呼叫：可以送出時返回 0，否則返回建議等待的秒數
+
+        斷路器半開時只放行一個探測請求，其餘請求等待探測結果。
+        """
+        with self._lock:
+            if self.state == CIRCUIT_CLOSED:
+                return 0.0
+            now = self._clock()
+            if self.state == CIRCUIT_OPEN:
+                if now < self._open_until:
+                    return self._open_until - now
+                self.state = CIRCUIT_HALF_OPEN
+                logger.info("主機 %s 的斷路器進入半開狀態，送出探測請求", self.host)
+            if self._probe_in_flight:
+                return 1.0
+            self._probe_in_flight = True
+            return 0.0
+
+    def record_success(self) -> None:
+        """主機正常回應"""
+        with self._lock:
+            if self.state != CIRCUIT_CLOSED:
+                logger.info("主機 %s 已恢復，關閉斷路器", self.host)
+            self.state = CIRCUIT_CLOSED
+            self.consecutive_failures = 0
+            self._current_timeout = self.recovery_timeout
+            self._probe_in_flight = False
+
+    def record_failure(self, retry_after: Optional[float] = None) -> None:
+        """主機連線失敗或回應 429/5xx；伺服器以 Retry-After 要求暫停時直接開啟斷路器"""
+        with self._lock:
+            self.consecutive_failures += 1
+            if self.state == CIRCUIT_HALF_OPEN:
+                # 探測失敗：加倍暫停時間
+                self._current_timeout = min(self._current_timeout * 2, self.max_recovery_timeout)
+                self._open(self._current_timeout)
+            elif retry_after is not None or self.consecutive_failures >= self.failure_threshold:
+                pause = self._current_timeout
+                if retry_after is not None:
+                    pause = min(max(retry_after, 0.0), self.max_recovery_timeout)
+                if self.state != CIRCUIT_OPEN or self._clock() + pause > self._open_until:
+                    self._open(pause)
+            self._probe_in_flight = False
+
+    def release(self) -> None:
+        """請求因其他原因中止時釋放探測名額"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def _open(self, pause: float) -> None:
+        if self.state != CIRCUIT_OPEN:
+            self.trips += 1
+            logger.warning("主機 %s 連續失敗 %d 次，開啟斷路器，暫停 %.0f 秒", self.host, self.consecutive_failures, pause)
+        self.state = CIRCUIT_OPEN
+        self._open_until = self._clock() + pause
+
+    def snapshot(self) -> Dict[str, Any]:
+        """斷路器狀態 (供任務進度顯示)"""
+        with self._lock:
+            retry_in = max(self._open_until - self._clock(), 0.0) if self.state == CIRCUIT_OPEN else 0.0
+            return {
+                "host": self.host,
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                "trips": self.trips,
+                "retry_in": round(retry_in, 1),
+            }
+
+
+class CircuitBreakerRegistry:
+    """依主機管理斷路器；同一個實例由行程內所有爬蟲共用"""
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0,
+                 max_recovery_timeout: float = 600.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.max_recovery_timeout = max_recovery_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, host: str) -> CircuitBreaker:
+        """取得 (必要時建立) 主機的斷路器"""
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = CircuitBreaker(
+                    host,
+                    failure_threshold=self.failure_threshold,
+                    recovery_timeout=self.recovery_timeout,
+                    max_recovery_timeout=self.max_recovery_timeout,
+                    clock=self._clock,
+                )
+                self._breakers[host] = breaker
+            return breaker
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """所有主機的斷路器狀態"""
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return {breaker.host: breaker.snapshot() for breaker in breakers}
+
+
+_registry_instance: Optional[CircuitBreakerRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_circuit_breakers() -> CircuitBreakerRegistry:
+    """取得行程共用的斷路器 (門檻與暫停秒數由 CIRCUIT_BREAKER_FAILURE_THRESHOLD / CIRCUIT_BREAKER_RECOVERY_SECONDS 設定)"""
+    global _registry_instance
+    with _registry_lock:
+        if _registry_instance is None:
+            _registry_instance = CircuitBreakerRegistry(
+                failure_threshold=int(os.getenv("CIRCUIT_BREAKER_FAILURE_THRESHOLD", "5")),
+                recovery_timeout=float(os.getenv("CIRCUIT_BREAKER_RECOVERY_SECONDS", "30")),
+            )
+        return _registry_instance
+
+
+def reset_circuit_breakers() -> None:
+    """清除行程共用的斷路器 (測試或重新設定時使用)"""
+    global _registry_instance
+    with _registry_lock:
+        _registry_instance = None
@@ -0,0 +1,375 @@
+"""提供爬蟲抓取網頁的原始 HTML 封存 (raw HTML archive)。
+
+網頁內容以 SHA-256 雜湊定址 (相同內容只保存一份)，以 zstd 壓縮後存放在本機檔案系統的
+``<根目錄>/objects/<雜湊前兩碼>/<雜湊>.zst``；以 URL 與抓取時間為鍵的索引保存在
+``<根目錄>/index.sqlite3``，供重新解析時取回最近一次抓取的原始網頁。
+
+封存只在本機有效 (多節點部署時每台主機各自保存)；保留政策依抓取時間與每個 URL
+保留的版本數刪除索引，未被引用的內容檔案會一併清除。
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)  # 使用統一的 logger
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - 未安裝 zstandard 時無法啟用封存
+    zstandard = None  # type: ignore[assignment]
+
+DEFAULT_ARCHIVE_DIR = os.path.join("data", "html_archive")
+DEFAULT_ZSTD_LEVEL = 3
+DEFAULT_RETENTION_DAYS = 30
+DEFAULT_MAX_VERSIONS = 3
+DEFAULT_RETENTION_CHECK_SEC = 3600.0
+INDEX_FILE_NAME = "index.sqlite3"
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS archive_blobs (
+        content_hash TEXT PRIMARY KEY,
+        raw_size INTEGER NOT NULL,
+        stored_size INTEGER NOT NULL,
+        created_at TEXT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS archive_entries (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        url TEXT NOT NULL,
+        fetched_at TEXT NOT NULL,
+        content_hash TEXT NOT NULL,
+        status_code INTEGER,
+        encoding TEXT
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_archive_entries_url_fetched_at ON archive_entries (url, fetched_at)",
+    "CREATE INDEX IF NOT EXISTS ix_archive_entries_content_hash ON archive_entries (content_hash)",
+    "CREATE INDEX IF NOT EXISTS ix_archive_entries_fetched_at ON archive_entries (fetched_at)",
+)
+
+
+def is_html_archive_available() -> bool:
+    """是否已安裝 zstandard (封存所需)"""
+    return zstandard is not None
+
+
+def _format_time(value: Optional[datetime]) -> str:
+    value = value or datetime.now(timezone.utc)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).isoformat(timespec="microseconds")
+
+
+def _read_int_env(name: str, default: int) -> int:
+    raw = os.getenv(name)
+    if raw is None or raw.strip() == "":
+        return default
+    try:
+        return max(int(raw), 0)
+    except ValueError:
+        logger.warning("環境變數 %s 值 '%s' 無效，使用預設值: %s", name, raw, default)
+        return default
+
+
+class HtmlArchive:
+    """以內容雜湊定址、zstd 壓縮的原始 HTML 封存"""
+
+    def __init__(
+        self,
+        root_dir: str = DEFAULT_ARCHIVE_DIR,
+        compression_level: int = DEFAULT_ZSTD_LEVEL,
+        retention_days: Optional[int] = DEFAULT_RETENTION_DAYS,
+        max_versions: Optional[int] = DEFAULT_MAX_VERSIONS,
+        retention_check_interval: float = DEFAULT_RETENTION_CHECK_SEC,
+    ):
+        if not is_html_archive_available():
+            raise RuntimeError("原始 HTML 封存需要安裝 zstandard")
+        self.root_dir = root_dir
+        self.compression_level = compression_level
+        self.retention_days = retention_days or None
+        self.max_versions = max_versions or None
+        self.retention_check_interval = retention_check_interval
+        self.index_path = os.path.join(root_dir, INDEX_FILE_NAME)
+        self._lock = threading.Lock()
+        self._last_retention_check = time.monotonic()
+        self._write_count = 0
+        self._write_seconds = 0.0
+        os.makedirs(os.path.join(root_dir, "objects"), exist_ok=True)
+        with self._transaction() as connection:
+            for statement in _SCHEMA:
+                connection.execute(statement)
+        with self._transaction(write=False) as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+
+    @contextmanager
+    def _transaction(self, write: bool = True):
+        """開啟索引連線；寫入時以 BEGIN IMMEDIATE 取得寫入鎖，與其他執行緒及行程序列化"""
+        # 每次操作使用獨立連線，允許多個執行緒與同一主機上的多個行程共用索引
+        connection = sqlite3.connect(self.index_path, timeout=30, isolation_level=None)
+        connection.row_factory = sqlite3.Row
+        try:
+            if write:
+                connection.execute("BEGIN IMMEDIATE")
+            yield connection
+            if write:
+                connection.execute("COMMIT")
+        except Exception:
+            if connection.in_transaction:
+                connection.execute("ROLLBACK")
+            raise
+        finally:
+            connection.close()
+
+    def blob_path(self, content_hash: str) -> str:
+        """內容檔案路徑"""
+        return os.path.join(self.root_dir, "objects", content_hash[:2], f"{content_hash}.zst")
+
+    def store(
+        self,
+        url: str,
+        content: bytes,
+        fetched_at: Optional[datetime] = None,
+        status_code: Optional[int] = 200,
+        encoding: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """封存一次抓取的原始內容，相同內容只保存一份，返回索引項目"""
+        start = time.perf_counter()
+        content_hash = hashlib.sha256(content).hexdigest()
+        path = self.blob_path(content_hash)
+        # 壓縮在取得寫入鎖之前完成，縮短持有鎖的時間
+        compressed = None if os.path.exists(path) else self._compress(content)
+
+        entry = {
+            "url": url,
+            "fetched_at": _format_time(fetched_at),
+            "content_hash": content_hash,
+            "status_code": status_code,
+            "encoding": encoding,
+        }
+        with self._transaction() as connection:
+            # 在寫入鎖內確認內容檔案，避免與保留政策同時清除同一個檔案
+            if os.path.exists(path):
+                stored_size = os.path.getsize(path)
+            else:
+                if compressed is None:
+                    compressed = self._compress(content)
+                self._write_blob(path, compressed)
+                stored_size = len(compressed)
+            connection.execute(
+                "INSERT OR IGNORE INTO archive_blobs (content_hash, raw_size, stored_size, created_at) "
+                "VALUES (?, ?, ?, ?)",
+                (content_hash, len(content), stored_size, entry["fetched_at"]),
+            )
+            cursor = connection.execute(
+                "INSERT INTO archive_entries (url, fetched_at, content_hash, status_code, encoding) "
+                "VALUES (:url, :fetched_at, :content_hash, :status_code, :encoding)",
+                entry,
+            )
+            entry["id"] = cursor.lastrowid
+
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self._write_count += 1
+            self._write_seconds += elapsed
+        self.maybe_apply_retention()
+        return entry
+
+    def _compress(self, content: bytes) -> bytes:
+        # ZstdCompressor 不可跨執行緒共用，每次建立新的實例
+        return zstandard.ZstdCompressor(level=self.compression_level).compress(content)
+
+    @staticmethod
+    def _write_blob(path: str, compressed: bytes) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # 先寫入暫存檔再改名，避免其他行程讀到不完整的檔案
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                tmp_file.write(compressed)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def load(self, content_hash: str) -> bytes:
+        """依內容雜湊讀取並解壓縮原始內容"""
+        with open(self.blob_path(content_hash), "rb") as blob_file:
+            return zstandard.ZstdDecompressor().decompress(blob_file.read())
+
+    def get_latest(self, url: str) -> Optional[Dict[str, Any]]:
+        """取得 URL 最近一次封存的索引項目與內容 (content)，沒有封存時返回 None"""
+        entries = self.find_latest_entries([url])
+        if not entries:
+            return None
+        entry = entries[0]
+        entry["content"] = self.load(entry["content_hash"])
+        return entry
+
+    def get_history(self, url: str) -> List[Dict[str, Any]]:
+        """取得 URL 的所有封存索引項目 (由新到舊)"""
+        with self._transaction(write=False) as connection:
+            rows = connection.execute(
+                "SELECT * FROM archive_entries WHERE url = ? ORDER BY fetched_at DESC, id DESC",
+                (url,),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def find_latest_entries(self, urls: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """取得每個 URL 最近一次封存的索引項目；未指定 urls 時返回全部 URL"""
+        query = (
+            "SELECT * FROM (SELECT *, ROW_NUMBER() OVER "
+            "(PARTITION BY url ORDER BY fetched_at DESC, id DESC) AS version_rank "
+            "FROM archive_entries{where}) WHERE version_rank = 1 ORDER BY url"
+        )
+        with self._transaction(write=False) as connection:
+            if urls is None:
+                rows = connection.execute(query.format(where="")).fetchall()
+            else:
+                rows = []
+                unique_urls = list(dict.fromkeys(urls))
+                # SQLite 參數數量有上限，分批查詢
+                for start in range(0, len(unique_urls), 500):
+                    chunk = unique_urls[start:start + 500]
+                    placeholders = ",".join("?" * len(chunk))
+                    rows.extend(
+                        connection.execute(
+                            query.format(where=f" WHERE url IN ({placeholders})"), chunk
+                        ).fetchall()
+                    )
+        results = []
+        for row in rows:
+            entry = dict(row)
+            entry.pop("version_rank", None)
+            results.append(entry)
+        return results
+
+    def iter_latest_entries(self, batch_size: int = 1000) -> Iterator[List[Dict[str, Any]]]:
+        """分批產生每個 URL 最近一次封存的索引項目"""
+        entries = self.find_latest_entries()
+        for start in range(0, len(entries), batch_size):
+            yield entries[start:start + batch_size]
+
+    def maybe_apply_retention(self) -> Optional[Dict[str, int]]:
+        """距離上次檢查超過 retention_check_interval 秒時執行保留政策"""
+        with self._lock:
+            if time.monotonic() - self._last_retention_check < self.retention_check_interval:
+                return None
+            self._last_retention_check = time.monotonic()
+        try:
+            return self.apply_retention()
+        except Exception as e:
+            logger.warning("執行原始 HTML 封存保留政策失敗: %s", e)
+            return None
+
+    def apply_retention(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """刪除超過保留天數或超過每個 URL 保留版本數的索引，並清除未被引用的內容檔案"""
+        removed_entries = 0
+        with self._transaction() as connection:
+            if self.retention_days:
+                cutoff = _format_time((now or datetime.now(timezone.utc)) - timedelta(days=self.retention_days))
+                removed_entries += connection.execute(
+                    "DELETE FROM archive_entries WHERE fetched_at < ?", (cutoff,)
+                ).rowcount
+            if self.max_versions:
+                removed_entries += connection.execute(
+                    "DELETE FROM archive_entries WHERE id IN (SELECT id FROM (SELECT id, ROW_NUMBER() OVER "
+                    "(PARTITION BY url ORDER BY fetched_at DESC, id DESC) AS version_rank "
+                    "FROM archive_entries) WHERE version_rank > ?)",
+                    (self.max_versions,),
+                ).rowcount
+            orphans = connection.execute(
+                "SELECT content_hash, stored_size FROM archive_blobs WHERE content_hash NOT IN "
+                "(SELECT DISTINCT content_hash FROM archive_entries)"
+            ).fetchall()
+            freed_bytes = 0
+            for row in orphans:
+                try:
+                    os.remove(self.blob_path(row["content_hash"]))
+                except FileNotFoundError:
+                    pass
+                freed_bytes += row["stored_size"]
+            connection.executemany(
+                "DELETE FROM archive_blobs WHERE content_hash = ?",
+                [(row["content_hash"],) for row in orphans],
+            )
+        if removed_entries or orphans:
+            logger.info(
+                "原始 HTML 封存保留政策: 刪除 %d 筆索引、%d 個內容檔案，釋放 %d bytes",
+                removed_entries, len(orphans), freed_bytes,
+            )
+        return {
+            "removed_entries": removed_entries,
+            "removed_blobs": len(orphans),
+            "freed_bytes": freed_bytes,
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """封存統計：索引與內容數量、原始與壓縮後大小、每萬篇的儲存成本與平均寫入耗時"""
+        with self._transaction(write=False) as connection:
+            entry_count, url_count = connection.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT url) FROM archive_entries"
+            ).fetchone()
+            blob_count, raw_bytes, stored_bytes = connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(raw_size), 0), COALESCE(SUM(stored_size), 0) FROM archive_blobs"
+            ).fetchone()
+        with self._lock:
+            write_count = self._write_count
+            write_seconds = self._write_seconds
+        return {
+            "root_dir": self.root_dir,
+            "entry_count": entry_count,
+            "url_count": url_count,
+            "blob_count": blob_count,
+            "raw_bytes": raw_bytes,
+            "stored_bytes": stored_bytes,
+            "compression_ratio": round(raw_bytes / stored_bytes, 2) if stored_bytes else None,
+            "stored_bytes_per_10k_urls": int(stored_bytes * 10000 / url_count) if url_count else 0,
+            "writes": write_count,
+            "avg_write_ms": round(write_seconds * 1000 / write_count, 3) if write_count else None,
+        }
+
+
+_archive_instance: Optional[HtmlArchive] = None
+_archive_lock = threading.Lock()
+
+
+def is_html_archive_enabled() -> bool:
+    """是否啟用原始 HTML 封存 (環境變數 HTML_ARCHIVE_ENABLED，預設停用)"""
+    return os.getenv("HTML_ARCHIVE_ENABLED", "false").lower() in ("true", "1", "yes")
+
+
+def get_html_archive() -> Optional[HtmlArchive]:
+    """取得行程共用的原始 HTML 封存，未啟用或未安裝 zstandard 時返回 None"""
+    global _archive_instance
+    if not is_html_archive_enabled():
+        return None
+    if not is_html_archive_available():
+        logger.warning("已設定 HTML_ARCHIVE_ENABLED 但未安裝 zstandard，不封存原始 HTML")
+        return None
+    with _archive_lock:
+        if _archive_instance is None:
+            _archive_instance = HtmlArchive(
+                root_dir=os.getenv("HTML_ARCHIVE_DIR") or DEFAULT_ARCHIVE_DIR,
+                compression_level=_read_int_env("HTML_ARCHIVE_ZSTD_LEVEL", DEFAULT_ZSTD_LEVEL),
+                retention_days=_read_int_env("HTML_ARCHIVE_RETENTION_DAYS", DEFAULT_RETENTION_DAYS),
+                max_versions=_read_int_env("HTML_ARCHIVE_MAX_VERSIONS", DEFAULT_MAX_VERSIONS),
+            )
+        return _archive_instance
+
+
+def reset_html_archive() -> None:
+    """清除行程共用的封存實例 (測試或重新設定時使用)"""
+    global _archive_instance
+    with _archive_lock:
+        _archive_instance = None
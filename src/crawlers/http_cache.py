@@ -0,0 +1,380 @@
+"""提供爬蟲抓取網頁時使用的本機 HTTP 回應快取與條件式重新驗證。
+
+快取以 URL 的雜湊為檔名保存在本機檔案系統 (``<根目錄>/<雜湊前兩碼>/<雜湊>.cache``，
+內容為一行 JSON 中繼資料加上回應本文)，依 ``Cache-Control`` / ``Expires`` 判斷是否仍然新鮮；
+過期後以 ``If-None-Match`` / ``If-Modified-Since`` 重新驗證，伺服器回應 304 時使用本機副本，
+並統計節省的下載量。實際送出的請求依 fetch_policy 的重試策略與主機斷路器執行。
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from src.crawlers.fetch_policy import (
+    RETRYABLE_EXCEPTIONS,
+    RETRYABLE_STATUS_CODES,
+    CircuitBreaker,
+    CircuitBreakerRegistry,
+    CircuitOpenError,
+    RetryPolicy,
+    get_circuit_breakers,
+    parse_retry_after,
+)
+
+logger = logging.getLogger(__name__)  # 使用統一的 logger
+
+DEFAULT_HTTP_CACHE_DIR = os.path.join("data", "http_cache")
+# 保存在快取中的回應標頭
+CACHED_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Cache-Control", "Expires", "Date")
+CACHE_STATUS_HEADER = "X-Local-Cache"
+
+
+def parse_cache_control(value: Optional[str]) -> Dict[str, Optional[str]]:
+    """解析 Cache-Control 標頭為 {指令: 值}"""
+    directives: Dict[str, Optional[str]] = {}
+    for part in (value or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        name, _, argument = part.partition("=")
+        directives[name.strip().lower()] = argument.strip().strip('"') or None
+    return directives
+
+
+def _http_date_to_timestamp(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def compute_freshness_lifetime(headers) -> Optional[float]:
+    """依 Cache-Control max-age 或 Expires 計算新鮮時間 (秒)；必須每次重新驗證時返回 None"""
+    directives = parse_cache_control(headers.get("Cache-Control"))
+    if "no-cache" in directives:
+        return None
+    max_age = directives.get("max-age")
+    if max_age is not None:
+        try:
+            return max(float(max_age), 0.0)
+        except ValueError:
+            return None
+    expires = _http_date_to_timestamp(headers.get("Expires"))
+    if expires is not None:
+        date = _http_date_to_timestamp(headers.get("Date")) or time.time()
+        return max(expires - date, 0.0)
+    return None
+
+
+class HttpResponseCache:
+    """本機檔案系統上的 HTTP 回應快取，保存驗證標頭與回應本文"""
+
+    def __init__(self, root_dir: str = DEFAULT_HTTP_CACHE_DIR):
+        self.root_dir = root_dir
+        os.makedirs(root_dir, exist_ok=True)
+
+    def _path(self, url: str) -> str:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.root_dir, key[:2], f"{key}.cache")
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """讀取快取項目 (含 body)，不存在或損毀時返回 None"""
+        path = self._path(url)
+        try:
+            with open(path, "rb") as cache_file:
+                meta_line = cache_file.readline()
+                body = cache_file.read()
+            entry = json.loads(meta_line)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning("HTTP 快取項目損毀，將重新下載: %s (%s)", url, e)
+            return None
+        if entry.get("url") != url or len(body) != entry.get("size"):
+            return None
+        entry["body"] = body
+        return entry
+
+    def put(self, url: str, response, stored_at: Optional[float] = None) -> bool:
+        """保存 200 回應；no-store 或沒有驗證標頭且不可快取的回應不保存"""
+        if response.status_code != 200:
+            return False
+        headers = response.headers
+        directives = parse_cache_control(headers.get("Cache-Control"))
+        if "no-store" in directives:
+            self.delete(url)
+            return False
+        lifetime = compute_freshness_lifetime(headers)
+        if not headers.get("ETag") and not headers.get("Last-Modified") and not lifetime:
+            return False
+        body = response.content
+        entry = {
+            "url": url,
+            "status_code": 200,
+            "headers": {name: headers[name] for name in CACHED_HEADERS if headers.get(name)},
+            "encoding": response.encoding,
+            "stored_at": stored_at if stored_at is not None else time.time(),
+            "freshness_lifetime": lifetime,
+            "size": len(body),
+        }
+        self._write(url, entry, body)
+        return True
+
+    def refresh(self, url: str, entry: Dict[str, Any], not_modified_response, stored_at: Optional[float] = None) -> Dict[str, Any]:
+        """收到 304 後以新的標頭更新快取項目的新鮮時間與驗證標頭"""
+        headers = dict(entry["headers"])
+        for name in CACHED_HEADERS:
+            value = not_modified_response.headers.get(name)
+            if value and name != "Content-Type":
+                headers[name] = value
+        merged = CaseInsensitiveDict(headers)
+        updated = {key: value for key, value in entry.items() if key != "body"}
+        updated.update(
+            headers=headers,
+            stored_at=stored_at if stored_at is not None else time.time(),
+            freshness_lifetime=compute_freshness_lifetime(merged),
+        )
+        self._write(url, updated, entry["body"])
+        updated["body"] = entry["body"]
+        return updated
+
+    def delete(self, url: str) -> None:
+        """刪除快取項目"""
+        try:
+            os.remove(self._path(url))
+        except FileNotFoundError:
+            pass
+
+    def _write(self, url: str, entry: Dict[str, Any], body: bytes) -> None:
+        path = self._path(url)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # 中繼資料與本文寫入同一個暫存檔後再改名，避免同時寫入時兩者不一致
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                tmp_file.write(json.dumps(entry, ensure_ascii=False).encode("utf-8") + b"\n")
+                tmp_file.write(body)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+
+def _content_length(response) -> int:
+    content = getattr(response, "content", None)
+    return len(content) if isinstance(content, (bytes, bytearray)) else 0
+
+
+class CachingHttpClient:
+    """爬蟲使用的 HTTP 用戶端：有設定快取時依快取規則返回本機副本或條件式重新驗證
+
+    每個爬蟲實例 (即每個任務) 使用自己的用戶端，統計資料即為該任務的下載量與節省量。
+    暫時性失敗依 retry_policy 重試；主機的斷路器開啟時暫停請求，最多等待 max_circuit_wait 秒。
+    """
+
+    def __init__(self, cache: Optional[HttpResponseCache] = None, clock=time.time,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 breakers: Optional[CircuitBreakerRegistry] = None,
+                 sleep=time.sleep, max_circuit_wait: float = 600.0):
+        self.cache = cache
+        self._clock = clock
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.breakers = breakers or get_circuit_breakers()
+        self._sleep = sleep
+        self.max_circuit_wait = max_circuit_wait
+        # 斷路器狀態改變時的回呼 (任務進度顯示) 與取消檢查，由爬蟲在執行任務時設定
+        self.on_circuit_change: Optional[Callable[[Dict[str, Any]], None]] = None
+        self.should_abort: Optional[Callable[[], bool]] = None
+        self._lock = threading.Lock()
+        self._stats = self._empty_stats()
+
+    @staticmethod
+    def _empty_stats() -> Dict[str, int]:
+        return {
+            "requests": 0,
+            "network_requests": 0,
+            "fresh_hits": 0,
+            "revalidated": 0,
+            "misses": 0,
+            "bytes_downloaded": 0,
+            "bytes_saved": 0,
+            "retries": 0,
+            "circuit_waits": 0,
+        }
+
+    def reset_stats(self) -> None:
+        """清除統計 (任務開始時呼叫)"""
+        with self._lock:
+            self._stats = self._empty_stats()
+
+    def get_stats(self) -> Dict[str, int]:
+        """取得統計：請求數、實際連線數、新鮮命中、304 重新驗證、下載與節省的位元組數、重試與斷路器等待次數"""
+        with self._lock:
+            return dict(self._stats)
+
+    def _record(self, **increments: int) -> None:
+        with self._lock:
+            for name, value in increments.items():
+                self._stats[name] += value
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None, timeout: float = 15, session=None):
+        """發送 GET 請求 (可指定 requests.Session)，返回 requests.Response"""
+        send = (session or requests).get
+        if self.cache is None:
+            response = self._send(send, url, headers, timeout)
+            self._record(requests=1, network_requests=1, misses=1, bytes_downloaded=_content_length(response))
+            return response
+
+        entry = self.cache.get(url)
+        now = self._clock()
+        if entry is not None:
+            lifetime = entry.get("freshness_lifetime")
+            if lifetime is not None and now - entry["stored_at"] < lifetime:
+                self._record(requests=1, fresh_hits=1, bytes_saved=entry["size"])
+                return self._build_response(url, entry, "HIT")
+
+        request_headers = dict(headers or {})
+        if entry is not None:
+            cached_headers = CaseInsensitiveDict(entry["headers"])
+            if cached_headers.get("ETag"):
+                request_headers["If-None-Match"] = cached_headers["ETag"]
+            if cached_headers.get("Last-Modified"):
+                request_headers["If-Modified-Since"] = cached_headers["Last-Modified"]
+
+        response = self._send(send, url, request_headers, timeout)
+        if entry is not None and response.status_code == 304:
+            entry = self.cache.refresh(url, entry, response, stored_at=now)
+            self._record(requests=1, network_requests=1, revalidated=1, bytes_saved=entry["size"])
+            return self._build_response(url, entry, "REVALIDATED")
+
+        self._record(requests=1, network_requests=1, misses=1, bytes_downloaded=_content_length(response))
+        try:
+            self.cache.put(url, response, stored_at=now)
+        except Exception as e:
+            logger.warning("寫入 HTTP 快取失敗: %s (%s)", url, e)
+        return response
+
+    def _send(self, send, url: str, headers: Optional[Dict[str, str]], timeout: float):
+        """依重試策略與主機斷路器送出請求；重試用盡時返回最後的回應或拋出最後的例外"""
+        breaker = self.breakers.get(urlsplit(url).hostname or "")
+        attempt = 0
+        while True:
+            self._wait_for_circuit(breaker)
+            try:
+                response = send(url, headers=headers, timeout=timeout)
+            except RETRYABLE_EXCEPTIONS as e:
+                self._record_outcome(breaker, failed=True)
+                if attempt >= self.retry_policy.max_retries:
+                    raise
+                delay = self.retry_policy.get_delay(attempt + 1)
+                logger.warning("請求失敗，%.1f 秒後重試 (%d/%d): %s (%s)",
+                               delay, attempt + 1, self.retry_policy.max_retries, url, e)
+            except Exception:
+                breaker.release()
+                raise
+            else:
+                status_code = response.status_code
+                if not (isinstance(status_code, int) and status_code in RETRYABLE_STATUS_CODES):
+                    self._record_outcome(breaker, failed=False)
+                    return response
+                retry_after = None
+                if status_code in (429, 503):
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                self._record_outcome(breaker, failed=True, retry_after=retry_after)
+                if attempt >= self.retry_policy.max_retries:
+                    return response
+                delay = self.retry_policy.get_delay(attempt + 1, retry_after)
+                logger.warning("請求返回 %s，%.1f 秒後重試 (%d/%d): %s",
+                               status_code, delay, attempt + 1, self.retry_policy.max_retries, url)
+            attempt += 1
+            self._record(retries=1)
+            self._sleep(delay)
+
+    def _wait_for_circuit(self, breaker: CircuitBreaker) -> None:
+        """斷路器開啟時暫停，直到可以送出請求；等待超過上限或任務取消時拋出 CircuitOpenError"""
+        waited = 0.0
+        paused = False
+        while True:
+            wait = breaker.acquire()
+            if wait <= 0:
+                if paused:
+                    self._notify_circuit(breaker)
+                return
+            if not paused:
+                paused = True
+                self._record(circuit_waits=1)
+                self._notify_circuit(breaker)
+            if waited >= self.max_circuit_wait or (self.should_abort is not None and self.should_abort()):
+                raise CircuitOpenError(breaker.host, wait)
+            # 分段等待，以便及時回應任務取消
+            step = min(wait, 5.0, self.max_circuit_wait - waited)
+            self._sleep(step)
+            waited += step
+
+    def _record_outcome(self, breaker: CircuitBreaker, failed: bool, retry_after: Optional[float] = None) -> None:
+        state = breaker.state
+        if failed:
+            breaker.record_failure(retry_after)
+        else:
+            breaker.record_success()
+        if breaker.state != state:
+            self._notify_circuit(breaker)
+
+    def _notify_circuit(self, breaker: CircuitBreaker) -> None:
+        if self.on_circuit_change is None:
+            return
+        try:
+            self.on_circuit_change(breaker.snapshot())
+        except Exception as e:
+            logger.warning("回報斷路器狀態失敗: %s", e)
+
+    @staticmethod
+    def _build_response(url: str, entry: Dict[str, Any], cache_status: str):
+        response = requests.Response()
+        response.status_code = entry["status_code"]
+        response._content = entry["body"]  # pylint: disable=protected-access
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response.headers[CACHE_STATUS_HEADER] = cache_status
+        response.encoding = entry.get("encoding")
+        response.url = url
+        return response
+
+
+_cache_instance: Optional[HttpResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def is_http_cache_enabled() -> bool:
+    """是否啟用 HTTP 回應快取 (環境變數 HTTP_CACHE_ENABLED，預設停用)"""
+    return os.getenv("HTTP_CACHE_ENABLED", "false").lower() in ("true", "1", "yes")
+
+
+def get_http_cache() -> Optional[HttpResponseCache]:
+    """取得行程共用的 HTTP 回應快取，未啟用時返回 None"""
+    global _cache_instance
+    if not is_http_cache_enabled():
+        return None
+    with _cache_lock:
+        if _cache_instance is None:
+            _cache_instance = HttpResponseCache(os.getenv("HTTP_CACHE_DIR") or DEFAULT_HTTP_CACHE_DIR)
+        return _cache_instance
+
+
+def reset_http_cache() -> None:
+    """清除行程共用的快取實例 (測試或重新設定時使用)"""
+    global _cache_instance
+    with _cache_lock:
+        _cache_instance = None
@@ -0,0 +1,119 @@
+"""提供以 Aho-Corasick 自動機實作的多關鍵字比對器，用於單次掃描文字即找出所有關鍵字命中。"""
+
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+import re
+import logging
+
+logger = logging.getLogger(__name__)  # 使用統一的 logger
+
+
+class KeywordMatcher:
+    """Aho-Corasick 多關鍵字比對器
+
+    建構時將所有關鍵字編譯為確定性自動機 (每個狀態的轉移已預先套用失敗連結)，
+    比對時只需掃描文字一次即可取得所有 (可重疊的) 關鍵字命中，
+    成本為 O(文字長度 + 命中數)，與關鍵字數量無關。
+
+    比對區分大小寫，呼叫端應自行將文字與關鍵字轉為小寫。
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self._keywords: frozenset = frozenset(k for k in keywords if k)
+        self._transitions: List[Dict[str, int]] = [{}]
+        self._outputs: List[Tuple[str, ...]] = [()]
+        self._build()
+        # 根狀態可轉移的字元集合，用於在根狀態時以正規表達式快速跳過不可能命中的字元
+        first_chars = "".join(sorted(self._transitions[0]))
+        self._start_pattern = (
+            re.compile("[" + re.escape(first_chars) + "]") if first_chars else None
+        )
+
+    def _build(self) -> None:
+        """建立 trie、失敗連結，並展開為完整的狀態轉移表"""
+        transitions = self._transitions
+        terminal: List[Tuple[str, ...]] = [()]
+
+        for keyword in self._keywords:
+            state = 0
+            for char in keyword:
+                next_state = transitions[state].get(char)
+                if next_state is None:
+                    next_state = len(transitions)
+                    transitions[state][char] = next_state
+                    transitions.append({})
+                    terminal.append(())
+                state = next_state
+            terminal[state] = terminal[state] + (keyword,)
+
+        fail = [0] * len(transitions)
+        outputs: List[Tuple[str, ...]] = list(terminal)
+        trie_children = [dict(t) for t in transitions]
+        # 以廣度優先順序處理，確保較淺的失敗狀態已先完成輸出合併與轉移展開
+        queue = deque(transitions[0].values())
+        while queue:
+            state = queue.popleft()
+            fail_transitions = transitions[fail[state]]
+            outputs[state] = terminal[state] + outputs[fail[state]]
+            for char, child in trie_children[state].items():
+                fail[child] = fail_transitions.get(char, 0)
+                queue.append(child)
+            # 繼承失敗狀態的轉移，比對時不需再沿失敗連結回溯
+            for char, target in fail_transitions.items():
+                transitions[state].setdefault(char, target)
+
+        self._outputs = outputs
+
+    @property
+    def keywords(self) -> frozenset:
+        """比對器包含的關鍵字集合"""
+        return self._keywords
+
+    def __len__(self) -> int:
+        return len(self._keywords)
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, str]]:
+        """逐一產生文字中的關鍵字命中
+
+        Args:
+            text: 要比對的文字
+
+        Yields:
+            Tuple[int, str]: (命中的起始位置, 關鍵字)
+        """
+        if not text or self._start_pattern is None:
+            return
+        transitions = self._transitions
+        outputs = self._outputs
+        start_search = self._start_pattern.search
+        length = len(text)
+        state = 0
+        pos = 0
+        while pos < length:
+            if state == 0:
+                found = start_search(text, pos)
+                if found is None:
+                    return
+                pos = found.start()
+            state = transitions[state].get(text[pos], 0)
+            if outputs[state]:
+                for keyword in outputs[state]:
+                    yield pos - len(keyword) + 1, keyword
+            pos += 1
+
+    def count_occurrences(self, text: str) -> Dict[str, int]:
+        """計算每個關鍵字在文字中出現的次數 (僅包含出現過的關鍵字)"""
+        counts: Dict[str, int] = {}
+        for _, keyword in self.iter_matches(text):
+            counts[keyword] = counts.get(keyword, 0) + 1
+        return counts
+
+    def find_keywords(self, text: str) -> Set[str]:
+        """返回文字中出現過的關鍵字集合"""
+        return {keyword for _, keyword in self.iter_matches(text)}
+
+    def contains_any(self, text: str) -> bool:
+        """文字中是否包含任一關鍵字 (找到第一個命中即返回)"""
+        for _ in self.iter_matches(text):
+            return True
+        return False
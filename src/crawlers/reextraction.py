@@ -0,0 +1,210 @@
+"""以本機封存的原始 HTML 離線重新解析文章 (網站改版或選擇器修正後修復已保存的欄位)。
+
+解析工作分批送到 ProcessPoolExecutor 的子行程執行，避開 GIL 對 HTML 解析 (CPU 密集) 的限制；
+子行程直接從封存目錄讀取壓縮內容，主行程只傳遞索引項目，並在結果陸續返回時依連結批量更新文章。
+
+執行方式: python -m src.crawlers.reextraction <爬蟲名稱> [連結 ...]
+"""
+
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from src.crawlers.html_archive import HtmlArchive, get_html_archive
+
+logger = logging.getLogger(__name__)  # 使用統一的 logger
+
+# 重新解析後預設更新的欄位
+DEFAULT_REEXTRACT_FIELDS = ("content", "author", "category", "tags")
+DEFAULT_REEXTRACT_BATCH_SIZE = 100
+
+# 子行程的解析器與封存 (由 _init_worker 在每個子行程建立一次)
+_worker_state: Dict[str, Any] = {}
+
+
+def _init_worker(extractor_class, site_config, archive_root: str) -> None:
+    """子行程初始化：建立解析器與唯讀使用的封存"""
+    _worker_state["extractor"] = extractor_class(config=site_config)
+    _worker_state["archive"] = HtmlArchive(archive_root, retention_days=None, max_versions=None)
+
+
+def _reextract_batch(entries: List[Dict[str, Any]], fields: Sequence[str]) -> Dict[str, Any]:
+    """子行程執行：讀取一批封存頁面並重新解析，返回更新資料與耗時"""
+    start = time.perf_counter()
+    extractor = _worker_state["extractor"]
+    archive = _worker_state["archive"]
+    articles = []
+    failed = []
+    for entry in entries:
+        url = entry["url"]
+        try:
+            raw = archive.load(entry["content_hash"])
+            html = raw.decode(entry.get("encoding") or "utf-8", errors="replace")
+            article_data = extractor.parse_article_html(html, url)
+        except Exception as e:
+            failed.append({"link": url, "error": str(e)})
+            continue
+        if article_data is None:
+            failed.append({"link": url, "error": "無法從封存內容解析文章"})
+            continue
+        # 解析不到的欄位不覆寫資料庫中的既有值
+        update = {field: article_data.get(field) for field in fields if article_data.get(field) is not None}
+        if update:
+            update["link"] = url
+            # 寫入內容時須一併寫入新的內容雜湊，否則既有雜湊會被清除
+            if article_data.get("content_hash"):
+                update["content_hash"] = article_data["content_hash"]
+            articles.append(update)
+    return {
+        "pid": os.getpid(),
+        "pages": len(entries),
+        "seconds": time.perf_counter() - start,
+        "articles": articles,
+        "failed": failed,
+    }
+
+
+class ArticleReextractionJob:
+    """離線重新解析工作：讀取封存頁面、以多個子行程解析，並依連結批量更新文章"""
+
+    def __init__(
+        self,
+        extractor_class,
+        site_config,
+        archive: HtmlArchive,
+        article_service,
+        max_workers: Optional[int] = None,
+        batch_size: int = DEFAULT_REEXTRACT_BATCH_SIZE,
+        fields: Sequence[str] = DEFAULT_REEXTRACT_FIELDS,
+    ):
+        self.extractor_class = extractor_class
+        self.site_config = site_config
+        self.archive = archive
+        self.article_service = article_service
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.batch_size = max(int(batch_size), 1)
+        self.fields = tuple(fields)
+
+    @classmethod
+    def from_crawler(cls, crawler, archive: HtmlArchive, **kwargs) -> "ArticleReextractionJob":
+        """使用爬蟲的解析器類別、網站配置與文章服務建立工作"""
+        return cls(
+            type(crawler.extractor),
+            crawler.site_config,
+            archive,
+            crawler.article_service,
+            **kwargs,
+        )
+
+    def _select_entries(self, links: Optional[Iterable[str]]) -> List[Dict[str, Any]]:
+        if links is not None:
+            return self.archive.find_latest_entries(list(links))
+        # 未指定連結時處理封存中屬於此網站的所有頁面
+        base_url = getattr(self.site_config, "base_url", "") or ""
+        return [e for e in self.archive.find_latest_entries() if e["url"].startswith(base_url)]
+
+    def run(self, links: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """執行重新解析，返回處理數量、更新數量與每個子行程的處理速度"""
+        start = time.perf_counter()
+        links = list(dict.fromkeys(links)) if links is not None else None
+        entries = self._select_entries(links)
+        missing = len(links) - len(entries) if links is not None else 0
+        report: Dict[str, Any] = {
+            "processed": 0,
+            "updated": 0,
+            "failed": 0,
+            "missing": missing,
+            "failures": [],
+            "workers": [],
+        }
+        if not entries:
+            report.update(elapsed_seconds=0.0, pages_per_minute=0.0)
+            return {"success": True, "message": "沒有可重新解析的封存頁面", "result": report}
+
+        batches = [entries[i:i + self.batch_size] for i in range(0, len(entries), self.batch_size)]
+        workers: Dict[int, Dict[str, float]] = {}
+        pending_updates: List[Dict[str, Any]] = []
+        update_errors = []
+        with ProcessPoolExecutor(
+            max_workers=min(self.max_workers, len(batches)),
+            initializer=_init_worker,
+            initargs=(self.extractor_class, self.site_config, self.archive.root_dir),
+        ) as executor:
+            futures = [executor.submit(_reextract_batch, batch, self.fields) for batch in batches]
+            for future in as_completed(futures):
+                batch_result = future.result()
+                stats = workers.setdefault(batch_result["pid"], {"pages": 0, "seconds": 0.0})
+                stats["pages"] += batch_result["pages"]
+                stats["seconds"] += batch_result["seconds"]
+                report["processed"] += batch_result["pages"]
+                report["failed"] += len(batch_result["failed"])
+                report["failures"].extend(batch_result["failed"])
+                pending_updates.extend(batch_result["articles"])
+                # 解析結果陸續返回時即寫入資料庫，與其他子行程的解析重疊
+                if len(pending_updates) >= self.batch_size:
+                    report["updated"] += self._flush_updates(pending_updates, update_errors)
+                    pending_updates = []
+        if pending_updates:
+            report["updated"] += self._flush_updates(pending_updates, update_errors)
+
+        elapsed = time.perf_counter() - start
+        report["elapsed_seconds"] = round(elapsed, 3)
+        report["pages_per_minute"] = round(report["processed"] * 60 / elapsed, 1) if elapsed else 0.0
+        report["workers"] = [
+            {
+                "pid": pid,
+                "pages": int(stats["pages"]),
+                "seconds": round(stats["seconds"], 3),
+                "pages_per_minute": round(stats["pages"] * 60 / stats["seconds"], 1) if stats["seconds"] else 0.0,
+            }
+            for pid, stats in sorted(workers.items())
+        ]
+        success = not update_errors
+        message = (
+            f"重新解析 {report['processed']} 篇封存頁面，更新 {report['updated']} 篇，"
+            f"解析失敗 {report['failed']} 篇，每分鐘 {report['pages_per_minute']} 篇"
+        )
+        if update_errors:
+            message += f"；更新資料庫失敗: {'; '.join(update_errors)}"
+        logger.info(message)
+        return {"success": success, "message": message, "result": report}
+
+    def _flush_updates(self, articles: List[Dict[str, Any]], errors: List[str]) -> int:
+        result = self.article_service.batch_update_articles_by_link(article_data=articles)
+        if not result.get("success"):
+            errors.append(result.get("message", "未知錯誤"))
+            return 0
+        return (result.get("resultMsg") or {}).get("success_count", 0)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """命令列入口：以指定爬蟲的解析器重新解析封存頁面"""
+    from src.crawlers.crawler_factory import CrawlerFactory
+    from src.services.service_container import get_article_service, get_crawlers_service
+
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        print("用法: python -m src.crawlers.reextraction <爬蟲名稱> [連結 ...]")
+        return 2
+    archive = get_html_archive()
+    if archive is None:
+        print("未啟用原始 HTML 封存 (HTML_ARCHIVE_ENABLED)")
+        return 1
+    CrawlerFactory.initialize(get_crawlers_service(), get_article_service())
+    crawler = CrawlerFactory.get_crawler(argv[0])
+    job = ArticleReextractionJob.from_crawler(crawler, archive)
+    result = job.run(argv[1:] or None)
+    print(result["message"])
+    for worker in result["result"]["workers"]:
+        print(f"  PID {worker['pid']}: {worker['pages']} 篇，每分鐘 {worker['pages_per_minute']} 篇")
+    return 0 if result["success"] else 1
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    sys.exit(main())
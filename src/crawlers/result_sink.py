@@ -0,0 +1,270 @@
+"""提供爬蟲結果的檔案輸出 (result sink)，支援 CSV 與以 zstd 壓縮的 Parquet 欄式格式。
+
+Parquet 輸出依任務與日期分區 (``<根目錄>/task=<任務ID>/date=<YYYY-MM-DD>/<前綴>_<時間戳>.parquet``)，
+每批資料寫入一個 row group，不需要在記憶體中累積整份結果；已保存的結果可透過
+``load_results`` 讀回 DataFrame，重新送入資料庫保存流程 (replay)。
+"""
+
+import enum
+import glob
+import logging
+import math
+import os
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from typing import Any, Iterable, List, Optional
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)  # 使用統一的 logger
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - 未安裝 pyarrow 時只能輸出 CSV
+    pa = None  # type: ignore[assignment]
+    pq = None  # type: ignore[assignment]
+
+RESULT_FORMAT_CSV = "csv"
+RESULT_FORMAT_PARQUET = "parquet"
+RESULT_FORMATS = (RESULT_FORMAT_CSV, RESULT_FORMAT_PARQUET)
+DEFAULT_RESULT_DIR = "./logs"
+DEFAULT_RESULT_BATCH_SIZE = 1000
+DEFAULT_PARQUET_COMPRESSION = "zstd"
+
+FILE_EXTENSIONS = {RESULT_FORMAT_CSV: ".csv", RESULT_FORMAT_PARQUET: ".parquet"}
+
+
+def is_parquet_available() -> bool:
+    """是否已安裝 pyarrow (Parquet 輸出所需)"""
+    return pa is not None
+
+
+def resolve_result_format(result_format: Optional[str]) -> str:
+    """解析輸出格式；未指定時沿用 CSV，要求 Parquet 但未安裝 pyarrow 時退回 CSV"""
+    fmt = (result_format or RESULT_FORMAT_CSV).lower()
+    if fmt not in RESULT_FORMATS:
+        logger.warning("未知的結果輸出格式 '%s'，改用 CSV", result_format)
+        return RESULT_FORMAT_CSV
+    if fmt == RESULT_FORMAT_PARQUET and not is_parquet_available():
+        logger.warning("未安裝 pyarrow，無法輸出 Parquet，改用 CSV")
+        return RESULT_FORMAT_CSV
+    return fmt
+
+
+def build_partition_dir(base_dir: str, task_id: Any, date: Optional[str] = None) -> str:
+    """取得任務與日期分區目錄: <根目錄>/task=<任務ID>/date=<YYYY-MM-DD>"""
+    day = date or datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    return os.path.join(base_dir, f"task={task_id}", f"date={day}")
+
+
+class ResultSink(ABC):
+    """爬蟲結果輸出的基底類別，以批次寫入並在 close() 後完成檔案"""
+
+    result_format = ""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.rows_written = 0
+        self.closed = False
+
+    def write_batch(self, batch: pd.DataFrame) -> None:
+        """寫入一批資料"""
+        if self.closed:
+            raise RuntimeError(f"結果輸出已關閉: {self.path}")
+        if batch is None or batch.empty:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._write(batch)
+        self.rows_written += len(batch)
+
+    def write_dataframe(self, data: pd.DataFrame, batch_size: int = DEFAULT_RESULT_BATCH_SIZE) -> None:
+        """將 DataFrame 分批寫入"""
+        batch_size = max(int(batch_size or DEFAULT_RESULT_BATCH_SIZE), 1)
+        for start in range(0, len(data), batch_size):
+            self.write_batch(data.iloc[start:start + batch_size])
+
+    def close(self) -> None:
+        """完成輸出並釋放檔案"""
+        if not self.closed:
+            self.closed = True
+            self._close()
+
+    @abstractmethod
+    def _write(self, batch: pd.DataFrame) -> None:
+        """將一批資料寫入檔案，子類別需要實作"""
+        raise NotImplementedError("子類別需要實作 _write 方法")
+
+    def _close(self) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class CsvResultSink(ResultSink):
+    """CSV 輸出 (utf-8-sig)，第一批寫入標題列，之後的批次附加在後"""
+
+    result_format = RESULT_FORMAT_CSV
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self._columns: Optional[List[str]] = None
+
+    def _write(self, batch: pd.DataFrame) -> None:
+        if self._columns is None:
+            self._columns = list(batch.columns)
+            batch.to_csv(self.path, index=False, encoding="utf-8-sig")
+            return
+        # 後續批次依第一批的欄位順序輸出，缺少的欄位留空
+        batch.reindex(columns=self._columns).to_csv(
+            self.path, mode="a", header=False, index=False, encoding="utf-8"
+        )
+
+
+class ParquetResultSink(ResultSink):
+    """Parquet 輸出，每批寫入一個 row group，欄位結構以第一批為準"""
+
+    result_format = RESULT_FORMAT_PARQUET
+
+    def __init__(self, path: str, compression: str = DEFAULT_PARQUET_COMPRESSION):
+        if not is_parquet_available():
+            raise RuntimeError("輸出 Parquet 需要安裝 pyarrow")
+        super().__init__(path)
+        self.compression = compression
+        self._writer = None
+        self._schema = None
+
+    def _write(self, batch: pd.DataFrame) -> None:
+        if self._writer is None:
+            table = _dataframe_to_table(batch)
+            self._schema = table.schema
+            self._writer = pq.ParquetWriter(self.path, self._schema, compression=self.compression)
+        else:
+            table = _dataframe_to_table(batch, self._schema)
+        self._writer.write_table(table)
+
+    def _close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+def create_result_sink(
+    result_format: Optional[str],
+    base_dir: str,
+    task_id: Any,
+    file_prefix: str,
+    timestamp: Optional[str] = None,
+) -> ResultSink:
+    """依格式建立結果輸出
+
+    CSV 維持原本的 ``<根目錄>/<前綴>_<任務ID>_<時間戳>.csv``；
+    Parquet 則寫入任務與日期分區目錄下的 ``<前綴>_<時間戳>.parquet``。
+    """
+    fmt = resolve_result_format(result_format)
+    timestamp = timestamp or datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S")
+    if fmt == RESULT_FORMAT_PARQUET:
+        path = os.path.join(
+            build_partition_dir(base_dir, task_id), f"{file_prefix}_{timestamp}.parquet"
+        )
+        return ParquetResultSink(path)
+    return CsvResultSink(os.path.join(base_dir, f"{file_prefix}_{task_id}_{timestamp}.csv"))
+
+
+def find_result_files(
+    path: str, task_id: Optional[Any] = None, date: Optional[str] = None
+) -> List[str]:
+    """列出已保存的結果檔案；path 可為單一檔案或 Parquet 分區根目錄"""
+    if os.path.isfile(path):
+        return [path]
+    task_part = f"task={task_id}" if task_id is not None else "task=*"
+    date_part = f"date={date}" if date is not None else "date=*"
+    return sorted(glob.glob(os.path.join(path, task_part, date_part, "*.parquet")))
+
+
+def load_results(
+    path: str,
+    task_id: Optional[Any] = None,
+    date: Optional[str] = None,
+    columns: Optional[Iterable[str]] = None,
+) -> pd.DataFrame:
+    """讀回已保存的結果 (CSV 或 Parquet)，缺值統一為 None 以便送入資料庫保存流程"""
+    frames = []
+    for file_path in find_result_files(path, task_id, date):
+        if file_path.endswith(FILE_EXTENSIONS[RESULT_FORMAT_CSV]):
+            frame = pd.read_csv(file_path, encoding="utf-8-sig")
+            if columns is not None:
+                frame = frame[[c for c in columns if c in frame.columns]]
+        else:
+            if not is_parquet_available():
+                raise RuntimeError("讀取 Parquet 需要安裝 pyarrow")
+            frame = pq.read_table(file_path, columns=list(columns) if columns else None).to_pandas()
+        frames.append(frame)
+    if not frames:
+        logger.warning("找不到已保存的結果檔案: %s", path)
+        return pd.DataFrame()
+    data = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+    for column in data.columns:
+        # Arrow 讀回的時區為 pytz.UTC，統一為 datetime.timezone.utc 以通過 UTC 驗證
+        if isinstance(data[column].dtype, pd.DatetimeTZDtype):
+            data[column] = data[column].dt.tz_convert(timezone.utc)
+    return data.astype(object).where(data.notna(), None)
+
+
+def _dataframe_to_table(batch: pd.DataFrame, schema=None):
+    """將 DataFrame 轉為 Arrow Table；無法推斷型別的欄位改存字串，給定 schema 時對齊欄位與型別"""
+    arrays = {}
+    for column in batch.columns:
+        arrays[str(column)] = _column_to_array(batch[column])
+    if schema is None:
+        fields = []
+        for name, array in arrays.items():
+            # 全為空值的欄位推斷為 null 型別，改用字串以便後續批次寫入實際值
+            if pa.types.is_null(array.type):
+                array = pa.array([None] * len(array), type=pa.string())
+                arrays[name] = array
+            fields.append(pa.field(name, array.type))
+        schema = pa.schema(fields)
+    else:
+        extra = set(arrays) - set(schema.names)
+        if extra:
+            logger.warning("結果批次包含第一批沒有的欄位，將被忽略: %s", sorted(extra))
+    columns = []
+    for field in schema:
+        array = arrays.get(field.name)
+        if array is None:
+            array = pa.nulls(len(batch), type=field.type)
+        elif not array.type.equals(field.type):
+            array = _cast_array(array, field.type)
+        columns.append(array)
+    return pa.Table.from_arrays(columns, schema=schema)
+
+
+def _column_to_array(series: pd.Series):
+    try:
+        return pa.array(series, from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        # 混合型別 (例如枚舉與字串、字典) 的欄位以字串保存
+        return pa.array([_to_text(value) for value in series], type=pa.string())
+
+
+def _cast_array(array, target_type):
+    try:
+        return array.cast(target_type)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        if pa.types.is_string(target_type) or pa.types.is_large_string(target_type):
+            return pa.array([_to_text(value) for value in array.to_pylist()], type=target_type)
+        logger.warning("結果欄位型別 %s 無法轉換為 %s，以空值寫入", array.type, target_type)
+        return pa.nulls(len(array), type=target_type)
+
+
+def _to_text(value: Any) -> Optional[str]:
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return None
+    if isinstance(value, enum.Enum):
+        return str(value.value)
+    return str(value)
@@ -0,0 +1,210 @@
+"""定義 ArticleStats 模型的資料庫操作 Repository，提供統計彙總的讀取與重建。"""
+
+import logging
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Type, Literal, overload
+
+from pydantic import BaseModel
+from sqlalchemy import delete, func, insert, select
+
+from .base_repository import BaseRepository, SchemaType
+from src.models.article_stats_model import (
+    ARTICLE_STATS_KEY_FIELDS,
+    ArticleStats,
+    article_stats_key,
+)
+from src.models.article_stats_schema import (
+    ArticleStatsCreateSchema,
+    ArticleStatsUpdateSchema,
+)
+from src.models.articles_model import Articles
+from src.error.errors import ValidationError
+
+logger = logging.getLogger(__name__)  # 使用統一的 logger
+
+UNCATEGORIZED_LABEL = "未分類"
+UNKNOWN_SOURCE_LABEL = "未知來源"
+
+
+class ArticleStatsRepository(BaseRepository["ArticleStats"]):
+    """ArticleStats 特定的Repository
+
+    彙總表由文章寫入時的 flush 事件增量維護，此處只提供讀取與全量重建。
+    """
+
+    @classmethod
+    @overload
+    def get_schema_class(
+        cls, schema_type: Literal[SchemaType.CREATE]
+    ) -> Type[ArticleStatsCreateSchema]: ...
+
+    @classmethod
+    @overload
+    def get_schema_class(
+        cls, schema_type: Literal[SchemaType.UPDATE]
+    ) -> Type[ArticleStatsUpdateSchema]: ...
+
+    @classmethod
+    def get_schema_class(
+        cls, schema_type: SchemaType = SchemaType.CREATE
+    ) -> Type[BaseModel]:
+        """獲取對應的schema類別"""
+        if schema_type == SchemaType.UPDATE:
+            return ArticleStatsUpdateSchema
+        elif schema_type == SchemaType.CREATE:
+            return ArticleStatsCreateSchema
+        raise ValueError(f"未支援的 schema 類型: {schema_type}")
+
+    def create(self, entity_data: Dict[str, Any]) -> Optional[ArticleStats]:
+        """統計彙總由系統維護，不允許直接創建"""
+        raise ValidationError("文章統計彙總由系統維護，不允許直接創建")
+
+    def update(
+        self, entity_id: Any, entity_data: Dict[str, Any]
+    ) -> Optional[ArticleStats]:
+        """統計彙總由系統維護，不允許直接更新"""
+        raise ValidationError("文章統計彙總由系統維護，不允許直接更新")
+
+    def rebuild(self, batch_size: int = 1000) -> Dict[str, int]:
+        """依文章表重新計算彙總 (修正批次 SQL 等繞過 ORM 的寫入造成的誤差)
+
+        Returns:
+            Dict[str, int]: 文章數量、彙總列數與修正的列數
+        """
+        key_columns = [
+            Articles.source,
+            Articles.category,
+            Articles.published_at,
+            Articles.is_ai_related,
+            Articles.is_scraped,
+            Articles.scrape_status,
+        ]
+
+        def rebuild_func():
+            counts: Counter = Counter()
+            article_total = 0
+            rows = self.session.execute(
+                select(*key_columns).execution_options(yield_per=batch_size)
+            )
+            for row in rows:
+                counts[article_stats_key(row._asdict())] += 1
+                article_total += 1
+
+            existing = {
+                tuple(getattr(row, field) for field in ARTICLE_STATS_KEY_FIELDS): row.article_count
+                for row in self.session.execute(
+                    select(ArticleStats.__table__)
+                )
+            }
+            corrected = sum(
+                1
+                for key in set(existing) | set(counts)
+                if existing.get(key, 0) != counts.get(key, 0)
+            )
+
+            self.session.execute(delete(ArticleStats))
+            now = datetime.now(timezone.utc)
+            if counts:
+                self.session.execute(
+                    insert(ArticleStats),
+                    [
+                        {
+                            **dict(zip(ARTICLE_STATS_KEY_FIELDS, key)),
+                            "article_count": count,
+                            "created_at": now,
+                            "updated_at": now,
+                        }
+                        for key, count in counts.items()
+                    ],
+                )
+            return {
+                "article_count": article_total,
+                "row_count": len(counts),
+                "corrected_rows": corrected,
+            }
+
+        return self.execute_query(rebuild_func, err_msg="重建文章統計彙總時發生錯誤")
+
+    def _grouped_counts(self, *columns, where=None) -> Dict[Any, int]:
+        """依指定欄位加總文章數量"""
+        total = func.sum(ArticleStats.article_count)
+        statement = select(*columns, total).group_by(*columns).having(total != 0)
+        if where is not None:
+            statement = statement.where(where)
+        rows = self.session.execute(statement).all()
+        if len(columns) == 1:
+            return {row[0]: int(row[1]) for row in rows}
+        return {tuple(row[:-1]): int(row[-1]) for row in rows}
+
+    def count_articles(self, where=None) -> int:
+        """彙總的文章數量"""
+
+        def query_builder():
+            statement = select(func.coalesce(func.sum(ArticleStats.article_count), 0))
+            if where is not None:
+                statement = statement.where(where)
+            return int(self.session.execute(statement).scalar() or 0)
+
+        return self.execute_query(query_builder, err_msg="讀取文章統計彙總時發生錯誤")
+
+    def get_category_distribution(self) -> Dict[str, int]:
+        """獲取各分類的文章數量分布"""
+        result = self.execute_query(
+            lambda: self._grouped_counts(ArticleStats.category),
+            err_msg="獲取各分類的文章數量分布時發生錯誤",
+        )
+        return {category or UNCATEGORIZED_LABEL: count for category, count in result.items()}
+
+    def get_source_distribution(self) -> Dict[str, int]:
+        """獲取各來源的統計"""
+        result = self.execute_query(
+            lambda: self._grouped_counts(ArticleStats.source),
+            err_msg="獲取來源統計時發生錯誤",
+        )
+        return {source or UNKNOWN_SOURCE_LABEL: count for source, count in result.items()}
+
+    def get_scrape_status_distribution(self) -> Dict[str, int]:
+        """獲取各爬取狀態的統計"""
+        return self.execute_query(
+            lambda: self._grouped_counts(ArticleStats.scrape_status),
+            err_msg="獲取爬取狀態統計時發生錯誤",
+        )
+
+    def get_source_statistics(self) -> Dict[str, Dict[str, int]]:
+        """獲取各來源的爬取統計"""
+        result = self.execute_query(
+            lambda: self._grouped_counts(ArticleStats.source, ArticleStats.is_scraped),
+            err_msg="獲取來源統計時發生錯誤",
+        )
+        stats: Dict[str, Dict[str, int]] = {}
+        for (source, is_scraped), count in result.items():
+            entry = stats.setdefault(
+                source or UNKNOWN_SOURCE_LABEL, {"total": 0, "unscraped": 0, "scraped": 0}
+            )
+            entry["total"] += count
+            entry["scraped" if is_scraped else "unscraped"] += count
+        return stats
+
+    def get_statistics(self, recent_days: int = 7) -> Dict[str, Any]:
+        """獲取文章統計信息 (欄位與 ArticlesRepository.get_statistics 相同)
+
+        recent_count 以發布日期 (UTC) 的天為單位計算。
+        """
+        since_day = (datetime.now(timezone.utc) - timedelta(days=recent_days)).strftime(
+            "%Y-%m-%d"
+        )
+
+        def stats_func():
+            return {
+                "total_count": self.count_articles(),
+                "ai_related_count": self.count_articles(ArticleStats.is_ai_related.is_(True)),
+                "category_distribution": self.get_category_distribution(),
+                "recent_count": self.count_articles(
+                    (ArticleStats.day != "") & (ArticleStats.day >= since_day)
+                ),
+                "source_distribution": self.get_source_distribution(),
+                "scrape_status_distribution": self.get_scrape_status_distribution(),
+            }
+
+        return self.execute_query(stats_func, err_msg="獲取文章統計信息時發生錯誤")
@@ -7,15 +7,17 @@ from typing import (
     List,
     Dict,
     Any,
+    Iterator,
     Type,
     Union,
     overload,
     Literal,
     Tuple,
+    Set,
     cast,
 )
 
-from sqlalchemy import func, or_, case, desc, asc
+from sqlalchemy import func, or_, case, desc, asc, select, tuple_, update, bindparam
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Query
 
@@ -25,17 +27,75 @@ from src.error.errors import (
     DatabaseOperationError,
     InvalidOperationError,
 )
-from src.models.articles_model import Articles, ArticleScrapeStatus
+from src.models.articles_model import (
+    ARTICLE_BODY_GROUP,
+    FINGERPRINT_COLUMNS,
+    Articles,
+    ArticleScrapeStatus,
+)
 from src.models.articles_schema import ArticleCreateSchema, ArticleUpdateSchema
+from src.models.article_stats_model import ArticleStats
+from src.utils.simhash_utils import (
+    NEAR_DUPLICATE_POLICY_OFF,
+    compute_simhash,
+    from_signed64,
+    get_max_hamming_distance,
+    get_near_duplicate_policy,
+    hamming_distance,
+    split_bands,
+    to_signed64,
+)
+from src.utils.url_utils import canonicalize_url
   # 使用統一的 logger
 
 # 使用統一的 logger
 logger = logging.getLogger(__name__)  # 使用統一的 logger
 
+# 比對內容雜湊時每次查詢的 (link, content_hash) 組數，避免超過資料庫的參數數量上限
+CONTENT_HASH_LOOKUP_CHUNK_SIZE = 400
+# 查詢連結是否已存在時每次查詢的連結數 (同時比對 link 與 canonical_link)
+LINK_LOOKUP_CHUNK_SIZE = 400
+# 內容未變更而跳過寫入的文章仍更新的抓取中繼資料欄位
+UNCHANGED_METADATA_FIELDS = ("task_id", "last_scrape_attempt")
+
 
 class ArticlesRepository(BaseRepository[Articles]):
     """Article 的Repository"""
 
+    # 具名欄位集合：list 供列表顯示，status 供爬蟲判斷抓取狀態，full 為完整物件
+    column_sets = {
+        "list": (
+            "id",
+            "title",
+            "link",
+            "category",
+            "published_at",
+            "author",
+            "source",
+            "article_type",
+            "tags",
+            "is_ai_related",
+            "is_scraped",
+            "scrape_status",
+            "task_id",
+            "created_at",
+            "updated_at",
+        ),
+        "status": (
+            "id",
+            "title",
+            "link",
+            "source",
+            "is_scraped",
+            "scrape_status",
+            "scrape_error",
+            "last_scrape_attempt",
+            "task_id",
+        ),
+        "full": None,
+    }
+    deferred_column_group = ARTICLE_BODY_GROUP
+
     @classmethod
     @overload
     def get_schema_class(
@@ -60,10 +120,25 @@ class ArticlesRepository(BaseRepository[Articles]):
         raise ValueError(f"未支援的 schema 類型: {schema_type}")
 
     def find_by_link(self, link: str) -> Optional[Articles]:
-        """根據文章連結查詢"""
-        return self.execute_query(
+        """根據文章連結查詢，找不到時以標準化連結比對同一篇文章的其他網址形式"""
+        article = self.execute_query(
             lambda: self.session.query(self.model_class).filter_by(link=link).first()
         )
+        if article is None:
+            article = self.find_by_canonical_link(link)
+        return article
+
+    def find_by_canonical_link(self, link: str) -> Optional[Articles]:
+        """以標準化連結查詢文章 (同一標準連結有多筆時返回最早建立的文章)"""
+        canonical = canonicalize_url(link)
+        if not canonical:
+            return None
+        return self.execute_query(
+            lambda: self.session.query(self.model_class)
+            .filter_by(canonical_link=canonical)
+            .order_by(self.model_class.id)
+            .first()
+        )
 
     def find_by_category(
         self,
@@ -103,6 +178,7 @@ class ArticlesRepository(BaseRepository[Articles]):
         offset: Optional[int] = None,
         is_preview: bool = False,
         preview_fields: Optional[List[str]] = None,
+        column_set: Optional[str] = None,
     ) -> Union[List[Articles], List[Dict[str, Any]]]:
         """根據標題搜索文章，支援分頁和預覽
 
@@ -113,6 +189,7 @@ class ArticlesRepository(BaseRepository[Articles]):
             offset: 偏移量
             is_preview: 是否預覽模式
             preview_fields: 預覽欄位
+            column_set: 具名欄位集合 (list/status/full)，優先於預覽欄位
 
         Returns:
             符合條件的文章列表 (模型實例或字典)
@@ -124,29 +201,16 @@ class ArticlesRepository(BaseRepository[Articles]):
                 offset=offset,
                 is_preview=is_preview,
                 preview_fields=preview_fields,
+                column_set=column_set,
             )
         else:
 
             def query_builder():
-                query_entities = [self.model_class]
-                valid_preview_fields = []
-                local_is_preview = is_preview
-                if local_is_preview and preview_fields:
-                    valid_preview_fields = [
-                        f for f in preview_fields if hasattr(self.model_class, f)
-                    ]
-                    if valid_preview_fields:
-                        query_entities = [
-                            getattr(self.model_class, f) for f in valid_preview_fields
-                        ]
-                    else:
-                        logger.warning(
-                            "search_by_title (fuzzy) 預覽欄位無效: %s，返回完整物件。",
-                            preview_fields,
-                        )
-                        local_is_preview = False
-
-                query = self.session.query(*query_entities).filter(
+                query_entities, projected_fields = self._resolve_projection(
+                    is_preview, preview_fields, column_set
+                )
+
+                query = self._projection_query(query_entities, projected_fields).filter(
                     self.model_class.title.like(f"%{keyword}%")
                 )
 
@@ -155,12 +219,7 @@ class ArticlesRepository(BaseRepository[Articles]):
                 if limit is not None:
                     query = query.limit(limit)
 
-                raw_results = query.all()
-
-                if local_is_preview and valid_preview_fields:
-                    return [dict(zip(valid_preview_fields, row)) for row in raw_results]
-                else:
-                    return raw_results
+                return self._projection_rows(query.all(), projected_fields)
 
             return self.execute_query(
                 query_builder, err_msg=f"模糊搜索標題 '{keyword}' 時出錯"
@@ -201,6 +260,35 @@ class ArticlesRepository(BaseRepository[Articles]):
             preview_fields=preview_fields,
         )
 
+    def get_data_version(self) -> Dict[str, Any]:
+        """取得文章表的輕量版本資訊
+
+        筆數取自統計彙總；新增、刪除與狀態變更都會更新彙總的 updated_at，
+        因此最近更新時間可作為 Last-Modified。
+        """
+
+        def query_builder():
+            max_id, max_updated_at = self.session.execute(
+                select(func.max(Articles.id), func.max(Articles.updated_at))
+            ).one()
+            count, stats_updated_at = self.session.execute(
+                select(
+                    func.coalesce(func.sum(ArticleStats.article_count), 0),
+                    func.max(ArticleStats.updated_at),
+                )
+            ).one()
+            candidates = [t for t in (max_updated_at, stats_updated_at) if t is not None]
+            return {
+                "count": int(count or 0),
+                "max_id": max_id,
+                "max_updated_at": max_updated_at,
+                "last_modified": max(candidates) if candidates else None,
+            }
+
+        return self.execute_query(
+            query_builder, err_msg="取得文章表版本資訊時發生錯誤"
+        )
+
     def get_statistics(self) -> Dict[str, Any]:
         """獲取文章統計信息"""
 
@@ -332,31 +420,19 @@ class ArticlesRepository(BaseRepository[Articles]):
         offset: Optional[int] = None,
         is_preview: bool = False,
         preview_fields: Optional[List[str]] = None,
+        column_set: Optional[str] = None,
     ) -> Union[List[Articles], List[Dict[str, Any]]]:
-        """根據標籤列表查詢文章 (OR 邏輯)，支援分頁和預覽"""
+        """根據標籤列表查詢文章 (OR 邏輯)，支援分頁、預覽與具名欄位集合"""
         if not tags or not isinstance(tags, list):
             logger.warning("find_by_tags 需要一個非空的標籤列表。")
             return []
 
         def query_builder():
-            query_entities = [self.model_class]
-            valid_preview_fields = []
-            local_is_preview = is_preview
-            if local_is_preview and preview_fields:
-                valid_preview_fields = [
-                    f for f in preview_fields if hasattr(self.model_class, f)
-                ]
-                if valid_preview_fields:
-                    query_entities = [
-                        getattr(self.model_class, f) for f in valid_preview_fields
-                    ]
-                else:
-                    logger.warning(
-                        "find_by_tags 預覽欄位無效: %s，返回完整物件。", preview_fields
-                    )
-                    local_is_preview = False
+            query_entities, projected_fields = self._resolve_projection(
+                is_preview, preview_fields, column_set
+            )
 
-            query = self.session.query(*query_entities)
+            query = self._projection_query(query_entities, projected_fields)
 
             conditions = []
             for tag in tags:
@@ -376,12 +452,7 @@ class ArticlesRepository(BaseRepository[Articles]):
             if limit is not None:
                 query = query.limit(limit)
 
-            raw_results = query.all()
-
-            if local_is_preview and valid_preview_fields:
-                return [dict(zip(valid_preview_fields, row)) for row in raw_results]
-            else:
-                return raw_results
+            return self._projection_rows(query.all(), projected_fields)
 
         return self.execute_query(
             query_builder, err_msg="根據標籤列表查詢文章時發生錯誤"
@@ -451,6 +522,12 @@ class ArticlesRepository(BaseRepository[Articles]):
                 logger.error(error_msg)
                 raise ValidationError(error_msg)
 
+            validated_data["canonical_link"] = canonicalize_url(
+                validated_data.get("canonical_link") or validated_data.get("link")
+            )
+            self._apply_content_hash(validated_data)
+            self._apply_fingerprint(validated_data)
+
             # 調用內部創建方法
             created_article = self._create_internal(validated_data)
             return created_article
@@ -519,6 +596,16 @@ class ArticlesRepository(BaseRepository[Articles]):
                 logger.error(error_msg)
                 raise ValidationError(error_msg)
 
+            self._apply_content_hash(validated_payload)
+            if "canonical_link" in validated_payload:
+                if validated_payload["canonical_link"]:
+                    validated_payload["canonical_link"] = canonicalize_url(
+                        validated_payload["canonical_link"]
+                    )
+                else:
+                    # 不清除建立時計算的標準連結
+                    validated_payload.pop("canonical_link")
+
             if not validated_payload:
                 logger.debug(
                     "更新 Article (ID=%s) 驗證後的 payload 為空，無需更新資料庫。",
@@ -526,6 +613,9 @@ class ArticlesRepository(BaseRepository[Articles]):
                 )
                 return None
 
+            if "content" in validated_payload:
+                self._apply_fingerprint(validated_payload, exclude_id=entity_id)
+
             # 調用內部更新方法
             updated_article = self._update_internal(entity_id, validated_payload)
             return updated_article
@@ -544,6 +634,175 @@ class ArticlesRepository(BaseRepository[Articles]):
                 f"更新 Article (ID={entity_id}) 時發生未預期錯誤: {e}"
             ) from e
 
+    def find_near_duplicates(
+        self,
+        fingerprint: int,
+        exclude_id: Optional[int] = None,
+        max_distance: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """以分段索引查詢內容指紋近似的文章
+
+        Args:
+            fingerprint: 無號 64 位元 SimHash
+            exclude_id: 排除的文章ID (更新自身內容時)
+            max_distance: 最大漢明距離，預設由 NEAR_DUPLICATE_MAX_DISTANCE 決定
+
+        Returns:
+            依漢明距離排序的 [{"id", "duplicate_of_id", "distance"}]
+        """
+        if max_distance is None:
+            max_distance = get_max_hamming_distance()
+        bands = split_bands(fingerprint)
+
+        def query_builder():
+            # 以 Core select 查詢，避免每次查詢建立 ORM Query 的成本
+            stmt = select(
+                self.model_class.id,
+                self.model_class.simhash,
+                self.model_class.duplicate_of_id,
+            ).where(
+                or_(
+                    self.model_class.simhash_band_0 == bands[0],
+                    self.model_class.simhash_band_1 == bands[1],
+                    self.model_class.simhash_band_2 == bands[2],
+                    self.model_class.simhash_band_3 == bands[3],
+                )
+            )
+            if exclude_id is not None:
+                stmt = stmt.where(self.model_class.id != exclude_id)
+            return self.session.execute(stmt).all()
+
+        candidates = self.execute_query(
+            query_builder, err_msg="查詢近似重複文章時發生錯誤"
+        )
+        matches = []
+        for article_id, simhash, duplicate_of_id in candidates:
+            if simhash is None:
+                continue
+            distance = hamming_distance(fingerprint, from_signed64(simhash))
+            if distance <= max_distance:
+                matches.append(
+                    {
+                        "id": article_id,
+                        "duplicate_of_id": duplicate_of_id,
+                        "distance": distance,
+                    }
+                )
+        matches.sort(key=lambda m: (m["distance"], m["id"]))
+        return matches
+
+    def find_canonical_duplicate(
+        self, content: Optional[str], exclude_id: Optional[int] = None
+    ) -> Optional[int]:
+        """找出內容近似重複的原始文章ID，沒有近似文章或內容太短時返回 None"""
+        fingerprint = compute_simhash(content)
+        if fingerprint is None:
+            return None
+        return self._resolve_canonical(fingerprint, exclude_id)
+
+    def _resolve_canonical(
+        self, fingerprint: int, exclude_id: Optional[int]
+    ) -> Optional[int]:
+        for match in self.find_near_duplicates(fingerprint, exclude_id=exclude_id):
+            # 指向最接近文章的原始文章，避免形成重複鏈
+            canonical_id = match["duplicate_of_id"] or match["id"]
+            if canonical_id != exclude_id:
+                return canonical_id
+        return None
+
+    def _apply_fingerprint(
+        self, data: Dict[str, Any], exclude_id: Optional[int] = None
+    ) -> None:
+        """依內容填入指紋欄位，並在未指定 duplicate_of_id 時連結近似重複的原始文章"""
+        fingerprint = compute_simhash(data.get("content"))
+        if fingerprint is None:
+            data.update({column: None for column in FINGERPRINT_COLUMNS})
+            return
+        data["simhash"] = to_signed64(fingerprint)
+        for index, band in enumerate(split_bands(fingerprint)):
+            data[f"simhash_band_{index}"] = band
+        if (
+            data.get("duplicate_of_id") is None
+            and get_near_duplicate_policy() != NEAR_DUPLICATE_POLICY_OFF
+        ):
+            canonical_id = self._resolve_canonical(fingerprint, exclude_id)
+            if canonical_id is not None:
+                logger.info(
+                    "文章內容與 ID=%s 近似重複，設定 duplicate_of_id", canonical_id
+                )
+            # 內容更新後不再重複時一併清除舊的連結
+            data["duplicate_of_id"] = canonical_id
+
+    @staticmethod
+    def _apply_content_hash(data: Dict[str, Any]) -> None:
+        """寫入內容時一併寫入內容雜湊；內容為空或未提供雜湊時清除，避免保留過期的雜湊"""
+        if "content" in data:
+            if not data.get("content") or not data.get("content_hash"):
+                data["content_hash"] = None
+        elif data.get("content_hash") is None:
+            # 沒有寫入內容時不清除既有的雜湊
+            data.pop("content_hash", None)
+
+    def find_unchanged_links(self, entities_data: List[Dict[str, Any]]) -> Set[str]:
+        """找出內容雜湊與資料庫相同 (內容未變更) 的文章連結
+
+        以 (link, content_hash) 列值比對一次查詢一批，不載入文章物件；
+        沒有提供 content_hash 的文章一律視為已變更。
+        """
+        pairs = list(
+            {
+                (data["link"], data["content_hash"])
+                for data in entities_data
+                if isinstance(data.get("link"), str)
+                and isinstance(data.get("content_hash"), str)
+                and data["content_hash"]
+            }
+        )
+        if not pairs:
+            return set()
+
+        def query_builder():
+            unchanged: Set[str] = set()
+            for start in range(0, len(pairs), CONTENT_HASH_LOOKUP_CHUNK_SIZE):
+                chunk = pairs[start : start + CONTENT_HASH_LOOKUP_CHUNK_SIZE]
+                stmt = select(self.model_class.link).where(
+                    tuple_(self.model_class.link, self.model_class.content_hash).in_(
+                        chunk
+                    )
+                )
+                unchanged.update(self.session.execute(stmt).scalars())
+            return unchanged
+
+        return self.execute_query(
+            query_builder, err_msg="比對文章內容雜湊時發生錯誤"
+        )
+
+    def find_existing_links(self, links: List[str]) -> Set[str]:
+        """找出已存在於資料庫的文章連結 (比對 link 或 canonical_link)，不載入文章物件"""
+        unique_links = list({link for link in links if isinstance(link, str) and link})
+        if not unique_links:
+            return set()
+
+        def query_builder():
+            existing: Set[str] = set()
+            for start in range(0, len(unique_links), LINK_LOOKUP_CHUNK_SIZE):
+                chunk = unique_links[start : start + LINK_LOOKUP_CHUNK_SIZE]
+                stmt = select(
+                    self.model_class.link, self.model_class.canonical_link
+                ).where(
+                    or_(
+                        self.model_class.link.in_(chunk),
+                        self.model_class.canonical_link.in_(chunk),
+                    )
+                )
+                for row in self.session.execute(stmt):
+                    existing.update(value for value in row if value in chunk)
+            return existing
+
+        return self.execute_query(
+            query_builder, err_msg="查詢已存在的文章連結時發生錯誤"
+        )
+
     def update_scrape_status(
         self,
         link: str,
@@ -616,6 +875,54 @@ class ArticlesRepository(BaseRepository[Articles]):
             )
             raise
 
+    def update_unchanged_metadata(
+        self, entities_data: List[Dict[str, Any]], unchanged_links: Set[str]
+    ) -> int:
+        """內容未變更的文章只更新抓取中繼資料 (UNCHANGED_METADATA_FIELDS)
+
+        不載入文章物件，依提供的欄位分組後以 executemany 的 UPDATE 語句依連結更新；
+        沒有提供 (或為空值) 的欄位保留資料庫中的原值。
+
+        Returns:
+            更新的文章數
+        """
+        rows_by_fields: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+        for data in entities_data:
+            link = data.get("link")
+            if link not in unchanged_links:
+                continue
+            metadata = {
+                field: data[field]
+                for field in UNCHANGED_METADATA_FIELDS
+                if data.get(field) is not None and data[field] == data[field]  # 排除 NaN/NaT
+            }
+            if not metadata:
+                continue
+            validated = self.validate_data(metadata, SchemaType.UPDATE)
+            fields = tuple(sorted(validated))
+            rows_by_fields.setdefault(fields, []).append(
+                {"b_link": link, **{f"b_{field}": validated[field] for field in fields}}
+            )
+        if not rows_by_fields:
+            return 0
+
+        def do_update():
+            table = self.model_class.__table__
+            updated = 0
+            for fields, rows in rows_by_fields.items():
+                stmt = (
+                    update(table)
+                    .where(table.c.link == bindparam("b_link"))
+                    .values({field: bindparam(f"b_{field}") for field in fields})
+                )
+                self.session.execute(stmt, rows)
+                updated += len(rows)
+            return updated
+
+        return self.execute_query(
+            do_update, err_msg="更新內容未變更文章的抓取資訊時發生錯誤"
+        )
+
     def batch_update_by_link(
         self, entities_data: List[Dict[str, Any]]
     ) -> Dict[str, Any]:
@@ -623,6 +930,9 @@ class ArticlesRepository(BaseRepository[Articles]):
         Args:
             entities_data: 實體資料列表, 每個字典必須包含 'link' 和其他要更新的欄位。
 
+        內容雜湊與資料庫相同的文章視為未變更，不載入也不寫入內容，只更新抓取中繼資料
+        (計入成功數與 unchanged_count)。
+
         Returns:
             包含成功和失敗資訊的字典
         """
@@ -631,6 +941,10 @@ class ArticlesRepository(BaseRepository[Articles]):
         updated_articles: List[Articles] = []
         missing_links: List[str] = []
         error_details: List[Dict[str, Any]] = []
+        unchanged_links = self.find_unchanged_links(entities_data)
+        unchanged_count = 0
+        if unchanged_links:
+            self.update_unchanged_metadata(entities_data, unchanged_links)
 
         for entity_data in entities_data:
             link = entity_data.get("link")
@@ -640,6 +954,12 @@ class ArticlesRepository(BaseRepository[Articles]):
                 error_details.append({"link": link, "error": "缺少有效的 'link' 鍵"})
                 continue
 
+            if link in unchanged_links:
+                logger.debug("連結 '%s' 的內容雜湊未變更，跳過更新。", link)
+                success_count += 1
+                unchanged_count += 1
+                continue
+
             try:
                 update_payload = entity_data.copy()
                 update_payload.pop("link", None)
@@ -681,6 +1001,8 @@ class ArticlesRepository(BaseRepository[Articles]):
             "updated_articles": updated_articles,
             "missing_links": missing_links,
             "error_details": error_details,
+            "unchanged_count": unchanged_count,
+            "unchanged_links": sorted(unchanged_links),
         }
 
     def batch_update_by_ids(
@@ -903,6 +1225,43 @@ class ArticlesRepository(BaseRepository[Articles]):
             preview_fields=preview_fields,
         )
 
+    def resolve_export_fields(self, column_set: Optional[str] = None) -> List[str]:
+        """取得匯出的欄位列表，column_set 為 None 或 full 時匯出所有欄位"""
+        column_set = column_set or "full"
+        if column_set not in self.column_sets:
+            raise InvalidOperationError(
+                f"未知的欄位集合: {column_set}，可用: {', '.join(self.column_sets)}"
+            )
+        fields = self.column_sets[column_set]
+        if fields is None:
+            return [
+                column.key
+                for column in self.model_class.__table__.columns
+                if column.key not in FINGERPRINT_COLUMNS
+            ]
+        return list(fields)
+
+    def stream_rows(
+        self,
+        fields: List[str],
+        filter_criteria: Optional[Dict[str, Any]] = None,
+        batch_size: int = 1000,
+    ) -> Iterator[Dict[str, Any]]:
+        """以伺服器端游標 (yield_per) 依 id 順序逐列串流文章欄位，不建立 ORM 物件
+
+        記憶體用量只與 batch_size 有關，與結果總數無關。
+        """
+        columns = [getattr(self.model_class, field) for field in fields]
+        query = self.session.query(*columns)
+        query = self._apply_filters(query, filter_criteria or {})
+        query = query.order_by(self.model_class.id).yield_per(batch_size)
+        try:
+            for row in query:
+                yield dict(zip(fields, row))
+        except Exception as e:
+            logger.error("串流匯出文章時發生錯誤: %s", e, exc_info=True)
+            raise DatabaseOperationError(f"串流匯出文章時發生錯誤: {e}") from e
+
     def find_unscraped_links(
         self,
         limit: Optional[int] = 100,
@@ -910,29 +1269,16 @@ class ArticlesRepository(BaseRepository[Articles]):
         order_by_status: bool = True,
         is_preview: bool = False,
         preview_fields: Optional[List[str]] = None,
+        column_set: Optional[str] = None,
     ) -> Union[List[Articles], List[Dict[str, Any]]]:
-        """查詢未爬取的連結 (is_scraped=False)，可選按爬取狀態排序，支援預覽"""
+        """查詢未爬取的連結 (is_scraped=False)，可選按爬取狀態排序，支援預覽與具名欄位集合"""
 
         def query_func():
-            query_entities = [self.model_class]
-            valid_preview_fields = []
-            local_is_preview = is_preview
-            if local_is_preview and preview_fields:
-                valid_preview_fields = [
-                    f for f in preview_fields if hasattr(self.model_class, f)
-                ]
-                if valid_preview_fields:
-                    query_entities = [
-                        getattr(self.model_class, f) for f in valid_preview_fields
-                    ]
-                else:
-                    logger.warning(
-                        "find_unscraped_links 預覽欄位無效: %s，返回完整物件。",
-                        preview_fields,
-                    )
-                    local_is_preview = False
+            query_entities, projected_fields = self._resolve_projection(
+                is_preview, preview_fields, column_set
+            )
 
-            query = self.session.query(*query_entities).filter(
+            query = self._projection_query(query_entities, projected_fields).filter(
                 self.model_class.is_scraped
                 == False  # pylint: disable=singleton-comparison
             )
@@ -981,12 +1327,7 @@ class ArticlesRepository(BaseRepository[Articles]):
                     "查詢未爬取連結時提供了無效的 limit=%s，將忽略限制。", limit
                 )
 
-            raw_results = query.all()
-
-            if local_is_preview and valid_preview_fields:
-                return [dict(zip(valid_preview_fields, row)) for row in raw_results]
-            else:
-                return raw_results
+            return self._projection_rows(query.all(), projected_fields)
 
         return self.execute_query(query_func, err_msg="查詢未爬取的連結時發生錯誤")
 
@@ -1017,36 +1358,23 @@ class ArticlesRepository(BaseRepository[Articles]):
         limit: Optional[int] = None,
         is_preview: bool = False,
         preview_fields: Optional[List[str]] = None,
+        column_set: Optional[str] = None,
     ) -> Union[List[Articles], List[Dict[str, Any]]]:
-        """根據任務ID查詢相關的文章，支援預覽"""
+        """根據任務ID查詢相關的文章，支援預覽與具名欄位集合"""
         if task_id is not None and (not isinstance(task_id, int) or task_id <= 0):
             raise ValueError("task_id 必須是正整數或 None")
 
         def query_func():
-            query_entities = [self.model_class]
-            valid_preview_fields = []
-            local_is_preview = is_preview
-            if local_is_preview and preview_fields:
-                valid_preview_fields = [
-                    f for f in preview_fields if hasattr(self.model_class, f)
-                ]
-                if valid_preview_fields:
-                    query_entities = [
-                        getattr(self.model_class, f) for f in valid_preview_fields
-                    ]
-                else:
-                    logger.warning(
-                        "find_articles_by_task_id 預覽欄位無效: %s，返回完整物件。",
-                        preview_fields,
-                    )
-                    local_is_preview = False
+            query_entities, projected_fields = self._resolve_projection(
+                is_preview, preview_fields, column_set
+            )
 
             if not hasattr(self.model_class, "task_id"):
                 raise AttributeError(
                     f"模型 {self.model_class.__name__} 沒有 'task_id' 欄位"
                 )
 
-            query = self.session.query(*query_entities).filter(
+            query = self._projection_query(query_entities, projected_fields).filter(
                 self.model_class.task_id == task_id
             )
 
@@ -1101,12 +1429,7 @@ class ArticlesRepository(BaseRepository[Articles]):
                         limit,
                     )
 
-            raw_results = query.all()
-
-            if local_is_preview and valid_preview_fields:
-                return [dict(zip(valid_preview_fields, row)) for row in raw_results]
-            else:
-                return raw_results
+            return self._projection_rows(query.all(), projected_fields)
 
         return self.execute_query(
             query_func, err_msg=f"根據任務ID={task_id}查詢文章時發生錯誤"
@@ -12,6 +12,7 @@ from typing import (
     Generic,
     List,
     Optional,
+    Tuple,
     Type,
     TypeVar,
     Union,
@@ -22,9 +23,9 @@ import copy
 # 第三方函式庫
 from pydantic import BaseModel
 from pydantic_core import ValidationError as PydanticValidationError
-from sqlalchemy import and_, asc, desc, not_, or_
+from sqlalchemy import and_, asc, desc, func, not_, or_, select
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, undefer_group
 from sqlalchemy.orm.attributes import flag_modified
 
 # 本地應用程式
@@ -55,10 +56,63 @@ class SchemaType(Enum):
 class BaseRepository(Generic[T], ABC):
     """基礎 Repository 類別，提供通用 CRUD 操作。"""
 
+    # 具名欄位集合 {名稱: 欄位名稱 tuple}，值為 None 表示完整物件 (由子類別定義)
+    column_sets: Dict[str, Optional[Tuple[str, ...]]] = {}
+    # 模型中預設延遲載入的欄位群組，列表查詢返回完整物件時一併載入，避免逐筆補查
+    deferred_column_group: Optional[str] = None
+
     def __init__(self, session: Session, model_class: Type[T]):
         self.session = session
         self.model_class = model_class
 
+    def _resolve_projection(
+        self,
+        is_preview: bool = False,
+        preview_fields: Optional[List[str]] = None,
+        column_set: Optional[str] = None,
+    ) -> Tuple[List[Any], List[str]]:
+        """決定列表查詢要取回的欄位
+
+        column_set 優先於 is_preview/preview_fields。
+
+        Returns:
+            (查詢實體列表, 投影欄位名稱列表)；欄位名稱列表為空表示返回完整物件
+        """
+        if column_set is not None:
+            if column_set not in self.column_sets:
+                raise InvalidOperationError(
+                    f"{self.model_class.__name__} 沒有名為 '{column_set}' 的欄位集合"
+                )
+            fields = self.column_sets[column_set]
+            if fields is None:
+                return [self.model_class], []
+            return [getattr(self.model_class, field) for field in fields], list(fields)
+
+        if is_preview and preview_fields:
+            valid_preview_fields = [
+                field for field in preview_fields if hasattr(self.model_class, field)
+            ]
+            if valid_preview_fields:
+                return [
+                    getattr(self.model_class, field) for field in valid_preview_fields
+                ], valid_preview_fields
+            logger.warning("預覽模式請求的欄位 %s 均無效，將返回完整物件。", preview_fields)
+        return [self.model_class], []
+
+    def _projection_query(self, query_entities: List[Any], projected_fields: List[str]):
+        """建立列表查詢；返回完整物件時一併載入延遲欄位群組"""
+        query = self.session.query(*query_entities)
+        if not projected_fields and self.deferred_column_group:
+            query = query.options(undefer_group(self.deferred_column_group))
+        return query
+
+    @staticmethod
+    def _projection_rows(raw_results: List[Any], projected_fields: List[str]) -> list:
+        """投影查詢的結果轉為字典，完整物件則原樣返回"""
+        if projected_fields:
+            return [dict(zip(projected_fields, row)) for row in raw_results]
+        return raw_results
+
     @check_session
     def execute_query(
         self,
@@ -399,8 +453,9 @@ class BaseRepository(Generic[T], ABC):
         sort_desc: bool = False,
         is_preview: bool = False,
         preview_fields: Optional[List[str]] = None,
+        column_set: Optional[str] = None,
     ) -> tuple[int, list]:
-        """獲取分頁數據，支援過濾、排序和預覽模式。"""
+        """獲取分頁數據，支援過濾、排序、預覽模式與具名欄位集合。"""
         if not isinstance(per_page, int) or per_page <= 0:
             raise InvalidOperationError("每頁記錄數必須是正整數")
         if not isinstance(page, int) or page <= 0:
@@ -408,24 +463,10 @@ class BaseRepository(Generic[T], ABC):
 
         offset = (page - 1) * per_page
 
-        query_entities = [self.model_class]
-        valid_preview_fields = []
-        local_is_preview = is_preview
-        if local_is_preview and preview_fields:
-            valid_preview_fields = [
-                field for field in preview_fields if hasattr(self.model_class, field)
-            ]
-            if valid_preview_fields:
-                query_entities = [
-                    getattr(self.model_class, field) for field in valid_preview_fields
-                ]
-            else:
-                logger.warning(
-                    "預覽模式請求的欄位 %s 均無效，將返回完整物件。", preview_fields
-                )
-                local_is_preview = False
-
-        base_query = self.session.query(*query_entities)
+        query_entities, projected_fields = self._resolve_projection(
+            is_preview, preview_fields, column_set
+        )
+        base_query = self._projection_query(query_entities, projected_fields)
         filtered_query = self._apply_filters(base_query, filter_criteria or {})
         if extra_filters:
             for extra_filter in extra_filters:
@@ -455,13 +496,7 @@ class BaseRepository(Generic[T], ABC):
             err_msg=f"分頁獲取資料時發生錯誤 (Page: {page}, PerPage: {per_page})",
         )
 
-        items: list
-        if local_is_preview and valid_preview_fields:
-            items = [dict(zip(valid_preview_fields, row)) for row in raw_items]
-        else:
-            items = raw_items
-
-        return total, items
+        return total, self._projection_rows(raw_items, projected_fields)
 
     def find_by_filter(
         self,
@@ -472,31 +507,15 @@ class BaseRepository(Generic[T], ABC):
         offset: Optional[int] = None,
         is_preview: bool = False,
         preview_fields: Optional[List[str]] = None,
+        column_set: Optional[str] = None,
     ) -> Union[List[T], List[Dict[str, Any]]]:
         """根據過濾條件查找實體列表。"""
 
         def query_builder():
-            query_entities = [self.model_class]
-            valid_preview_fields = []
-            local_is_preview = is_preview
-            if local_is_preview and preview_fields:
-                valid_preview_fields = [
-                    field
-                    for field in preview_fields
-                    if hasattr(self.model_class, field)
-                ]
-                if valid_preview_fields:
-                    query_entities = [
-                        getattr(self.model_class, field)
-                        for field in valid_preview_fields
-                    ]
-                else:
-                    logger.warning(
-                        "預覽模式請求的欄位 %s 均無效，將返回完整物件。", preview_fields
-                    )
-                    local_is_preview = False
-
-            query = self.session.query(*query_entities)
+            query_entities, projected_fields = self._resolve_projection(
+                is_preview, preview_fields, column_set
+            )
+            query = self._projection_query(query_entities, projected_fields)
             query = self._apply_filters(query, filter_criteria or {})
 
             if sort_by:
@@ -524,12 +543,7 @@ class BaseRepository(Generic[T], ABC):
             if limit is not None:
                 query = query.limit(limit)
 
-            raw_results = query.all()
-
-            if local_is_preview and valid_preview_fields:
-                return [dict(zip(valid_preview_fields, row)) for row in raw_results]
-            else:
-                return raw_results
+            return self._projection_rows(query.all(), projected_fields)
 
         return self.execute_query(
             query_builder,
@@ -545,31 +559,15 @@ class BaseRepository(Generic[T], ABC):
         sort_desc: bool = False,
         is_preview: bool = False,
         preview_fields: Optional[List[str]] = None,
+        column_set: Optional[str] = None,
     ) -> Union[List[T], List[Dict[str, Any]]]:
         """獲取所有實體。"""
 
         def query_builder():
-            query_entities = [self.model_class]
-            valid_preview_fields = []
-            local_is_preview = is_preview
-            if local_is_preview and preview_fields:
-                valid_preview_fields = [
-                    field
-                    for field in preview_fields
-                    if hasattr(self.model_class, field)
-                ]
-                if valid_preview_fields:
-                    query_entities = [
-                        getattr(self.model_class, field)
-                        for field in valid_preview_fields
-                    ]
-                else:
-                    logger.warning(
-                        "預覽模式請求的欄位 %s 均無效，將返回完整物件。", preview_fields
-                    )
-                    local_is_preview = False
-
-            query = self.session.query(*query_entities)
+            query_entities, projected_fields = self._resolve_projection(
+                is_preview, preview_fields, column_set
+            )
+            query = self._projection_query(query_entities, projected_fields)
 
             if sort_by:
                 if not hasattr(self.model_class, sort_by):
@@ -596,15 +594,34 @@ class BaseRepository(Generic[T], ABC):
             if limit is not None:
                 query = query.limit(limit)
 
-            raw_results = query.all()
-
-            if local_is_preview and valid_preview_fields:
-                return [dict(zip(valid_preview_fields, row)) for row in raw_results]
-            else:
-                return raw_results
+            return self._projection_rows(query.all(), projected_fields)
 
         return self.execute_query(
             query_builder,
             err_msg="獲取所有資料庫物件時發生錯誤",
             exception_class=DatabaseOperationError,
         )
+
+    def get_data_version(self) -> Dict[str, Any]:
+        """取得資料表的輕量版本資訊 (筆數、最大 id、最近更新時間)，用於產生 HTTP ETag
+
+        last_modified 只在能反映刪除時提供，預設為 None (刪除不會改變最近更新時間)。
+        """
+
+        def query_builder():
+            id_column = getattr(self.model_class, "id")
+            updated_column = getattr(self.model_class, "updated_at", None)
+            columns = [func.count(id_column), func.max(id_column)]
+            if updated_column is not None:
+                columns.append(func.max(updated_column))
+            row = self.session.execute(select(*columns)).one()
+            return {
+                "count": row[0] or 0,
+                "max_id": row[1],
+                "max_updated_at": row[2] if updated_column is not None else None,
+                "last_modified": None,
+            }
+
+        return self.execute_query(
+            query_builder, err_msg="取得資料表版本資訊時發生錯誤"
+        )
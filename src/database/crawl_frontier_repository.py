@@ -0,0 +1,536 @@
+"""
+定義 CrawlFrontier 模型的資料庫操作 Repository。
+
+待抓取連結以標準化後的 url 為唯一鍵，重複發現時只提高尚未抓取連結的優先度。
+領取時依優先度 (相同時較新發現者優先) 取出候選連結，再依主機輪流挑選並限制每個主機的數量，
+讓同一批次的請求分散到不同網站。
+PostgreSQL 以 SELECT ... FOR UPDATE SKIP LOCKED 鎖定候選列，多個 worker 同時領取時不會互相阻塞；
+SQLite 改以行程內鎖 (claim_lock，須包住整個領取交易直到提交) 序列化領取，
+並以條件式 UPDATE (status='pending') 確保跨行程時同一連結只有一個 worker 能領取成功。
+"""
+
+import contextlib
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    overload,
+)
+from urllib.parse import urlsplit
+
+from pydantic import BaseModel
+from sqlalchemy import case, func, select, update
+
+from .base_repository import BaseRepository, SchemaType
+from src.models.crawl_frontier_model import CrawlFrontier
+from src.models.crawl_frontier_schema import (
+    CrawlFrontierCreateSchema,
+    CrawlFrontierUpdateSchema,
+)
+from src.error.errors import ValidationError, DatabaseOperationError
+from src.utils.enum_utils import CrawlFrontierStatus
+from src.utils.url_utils import canonicalize_url
+
+logger = logging.getLogger(__name__)  # 使用統一的 logger
+
+# 支援 FOR UPDATE SKIP LOCKED 的資料庫方言
+SKIP_LOCKED_DIALECTS = {"postgresql", "mysql", "oracle"}
+
+# 依 url 查詢既有連結時每次 IN 查詢的數量
+URL_LOOKUP_CHUNK_SIZE = 400
+
+# 限制每個主機數量時多取出的候選倍數，避免熱門主機佔滿候選而使批次不足
+CLAIM_OVERSAMPLE_FACTOR = 4
+
+# SQLite 模式下序列化同一行程內的領取交易
+_CLAIM_LOCK = threading.RLock()
+
+
+class CrawlFrontierRepository(BaseRepository["CrawlFrontier"]):
+    """CrawlFrontier 特定的Repository"""
+
+    @classmethod
+    @overload
+    def get_schema_class(
+        cls, schema_type: Literal[SchemaType.CREATE]
+    ) -> Type[CrawlFrontierCreateSchema]: ...
+
+    @classmethod
+    @overload
+    def get_schema_class(
+        cls, schema_type: Literal[SchemaType.UPDATE]
+    ) -> Type[CrawlFrontierUpdateSchema]: ...
+
+    @classmethod
+    def get_schema_class(
+        cls, schema_type: SchemaType = SchemaType.CREATE
+    ) -> Type[BaseModel]:
+        """獲取對應的schema類別"""
+        if schema_type == SchemaType.UPDATE:
+            return CrawlFrontierUpdateSchema
+        elif schema_type == SchemaType.CREATE:
+            return CrawlFrontierCreateSchema
+        raise ValueError(f"未支援的 schema 類型: {schema_type}")
+
+    @staticmethod
+    def claim_lock(dialect_name: str):
+        """
+        取得領取交易所需的鎖
+
+        支援 SKIP LOCKED 的資料庫不需要額外的鎖；SQLite 須在鎖內完成領取與提交，
+        否則其他執行緒可能讀到尚未提交的領取而重複競爭。
+        """
+        if dialect_name in SKIP_LOCKED_DIALECTS:
+            return contextlib.nullcontext()
+        return _CLAIM_LOCK
+
+    def create(self, entity_data: Dict[str, Any]) -> Optional[CrawlFrontier]:
+        """
+        創建待抓取連結，先進行 Pydantic 驗證，然後調用內部創建。
+
+        Args:
+            entity_data: 實體資料
+
+        Returns:
+            創建的待抓取連結
+        """
+        try:
+            validated_data = self.validate_data(entity_data, SchemaType.CREATE)
+            if validated_data is None:
+                error_msg = "創建 CrawlFrontier 時驗證步驟失敗"
+                logger.error(error_msg)
+                raise ValidationError(error_msg)
+            return self._create_internal(validated_data)
+        except ValidationError as e:
+            logger.error("創建 CrawlFrontier 驗證失敗: %s", e)
+            raise
+        except DatabaseOperationError:
+            raise
+        except Exception as e:
+            logger.error("創建 CrawlFrontier 時發生未預期錯誤: %s", e, exc_info=True)
+            raise DatabaseOperationError(
+                f"創建 CrawlFrontier 時發生未預期錯誤: {e}"
+            ) from e
+
+    def update(
+        self, entity_id: Any, entity_data: Dict[str, Any]
+    ) -> Optional[CrawlFrontier]:
+        """
+        更新待抓取連結，先進行 Pydantic 驗證，然後調用內部更新。
+
+        Args:
+            entity_id: 實體ID
+            entity_data: 要更新的實體資料
+
+        Returns:
+            更新後的待抓取連結，如果實體不存在則返回None
+        """
+        try:
+            existing_entity = self.get_by_id(entity_id)
+            if not existing_entity:
+                logger.warning("更新待抓取連結失敗，ID不存在: %s", entity_id)
+                return None
+            if not entity_data:
+                return existing_entity
+
+            update_payload = self.validate_data(entity_data, SchemaType.UPDATE)
+            if update_payload is None:
+                error_msg = f"更新 CrawlFrontier (ID={entity_id}) 時驗證步驟失敗"
+                logger.error(error_msg)
+                raise ValidationError(error_msg)
+            return self._update_internal(entity_id, update_payload)
+        except ValidationError as e:
+            logger.error("更新 CrawlFrontier (ID=%s) 驗證失敗: %s", entity_id, e)
+            raise
+        except DatabaseOperationError:
+            raise
+        except Exception as e:
+            logger.error(
+                "更新 CrawlFrontier (ID=%s) 時發生未預期錯誤: %s",
+                entity_id,
+                e,
+                exc_info=True,
+            )
+            raise DatabaseOperationError(
+                f"更新 CrawlFrontier (ID={entity_id}) 時發生未預期錯誤: {e}"
+            ) from e
+
+    def find_by_urls(self, urls: Iterable[str]) -> Dict[str, CrawlFrontier]:
+        """依 url 查詢既有的待抓取連結，返回 {url: 實體}"""
+        unique_urls = list(dict.fromkeys(url for url in urls if url))
+
+        def query_builder():
+            found: Dict[str, CrawlFrontier] = {}
+            for start in range(0, len(unique_urls), URL_LOOKUP_CHUNK_SIZE):
+                chunk = unique_urls[start : start + URL_LOOKUP_CHUNK_SIZE]
+                stmt = select(CrawlFrontier).where(CrawlFrontier.url.in_(chunk))
+                for entity in self.session.execute(stmt).scalars():
+                    found[entity.url] = entity
+            return found
+
+        return self.execute_query(query_builder, err_msg="依 url 查詢待抓取連結時發生錯誤")
+
+    def enqueue_links(self, entries: Sequence[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        將發現的連結加入待抓取清單 (待提交)
+
+        url 會先標準化並取出主機名稱；同一批次內重複的 url 保留優先度最高者。
+        已存在且仍在等待中的連結更新為較高的優先度與最新的發現資料，
+        已被領取、完成或失敗的連結不變更。
+
+        Args:
+            entries: 連結資料列表，需包含 url，可包含 source、task_id、priority、ai_score、payload
+
+        Returns:
+            Dict[str, int]: {"inserted": 新增數量, "updated": 更新數量, "skipped": 略過數量}
+        """
+        counts = {"inserted": 0, "updated": 0, "skipped": 0}
+        merged: Dict[str, Dict[str, Any]] = {}
+        for entry in entries:
+            url = canonicalize_url(entry.get("url"))
+            host = urlsplit(url).hostname if url else None
+            if not host:
+                logger.warning("無法取得連結的主機名稱，略過: %s", entry.get("url"))
+                counts["skipped"] += 1
+                continue
+            data = {**entry, "url": url, "host": host}
+            data["priority"] = float(data.get("priority") or 0.0)
+            previous = merged.get(url)
+            if previous is not None:
+                counts["skipped"] += 1
+                if previous["priority"] >= data["priority"]:
+                    continue
+            merged[url] = data
+
+        existing = self.find_by_urls(merged.keys())
+        now = datetime.now(timezone.utc)
+        for url, data in merged.items():
+            entity = existing.get(url)
+            if entity is None:
+                data.setdefault("next_eligible_at", now)
+                self.create(data)
+                counts["inserted"] += 1
+            elif entity.status == CrawlFrontierStatus.PENDING:
+                changes = {
+                    key: data[key]
+                    for key in ("source", "task_id", "ai_score", "payload")
+                    if data.get(key) is not None
+                }
+                changes["priority"] = max(entity.priority or 0.0, data["priority"])
+                self.update(entity.id, changes)
+                counts["updated"] += 1
+            else:
+                counts["skipped"] += 1
+
+        self.execute_query(lambda: self.session.flush(), err_msg="加入待抓取連結時發生錯誤")
+        return counts
+
+    @staticmethod
+    def select_host_batch(
+        candidates: Sequence[Tuple[int, str]],
+        limit: int,
+        per_host_limit: Optional[int] = None,
+    ) -> List[int]:
+        """
+        從依優先順序排列的候選 (id, host) 中挑選一個批次
+
+        各主機輪流取出其優先度最高的下一筆，每個主機最多 per_host_limit 筆，
+        返回的順序即為建議的抓取順序 (相鄰請求盡量來自不同主機)。
+        """
+        per_host: Dict[str, List[int]] = {}
+        for entry_id, host in candidates:
+            bucket = per_host.setdefault(host, [])
+            if per_host_limit is None or len(bucket) < per_host_limit:
+                bucket.append(entry_id)
+
+        selected: List[int] = []
+        rounds = max((len(bucket) for bucket in per_host.values()), default=0)
+        for rank in range(rounds):
+            for bucket in per_host.values():
+                if rank < len(bucket):
+                    selected.append(bucket[rank])
+                    if len(selected) >= limit:
+                        return selected
+        return selected
+
+    def _candidate_stmt(
+        self,
+        now: datetime,
+        limit: int,
+        per_host_limit: Optional[int],
+        source: Optional[str] = None,
+    ):
+        """可領取的候選連結查詢 (指定 source 時只取該來源)，依優先度、再依發現順序 (新者優先) 排序"""
+        candidate_limit = limit if per_host_limit is None else limit * CLAIM_OVERSAMPLE_FACTOR
+        conditions = [
+            CrawlFrontier.status == CrawlFrontierStatus.PENDING,
+            CrawlFrontier.next_eligible_at <= now,
+        ]
+        if source is not None:
+            conditions.append(CrawlFrontier.source == source)
+        return (
+            select(CrawlFrontier.id, CrawlFrontier.host)
+            .where(*conditions)
+            .order_by(CrawlFrontier.priority.desc(), CrawlFrontier.id.desc())
+            .limit(candidate_limit)
+        )
+
+    def claim_batch(
+        self,
+        worker_id: str,
+        limit: int,
+        per_host_limit: Optional[int] = None,
+        source: Optional[str] = None,
+    ) -> List[CrawlFrontier]:
+        """
+        領取一批待抓取連結 (待提交)
+
+        Args:
+            worker_id: 領取者識別碼
+            limit: 最多領取數量
+            per_host_limit: 每個主機最多領取數量，None 表示不限制
+            source: 只領取此來源的連結，None 表示不限來源
+
+        Returns:
+            已標記為 claimed 的連結，依建議的抓取順序排列；沒有可領取的連結時返回空列表
+        """
+        if limit <= 0:
+            return []
+        dialect = self.session.get_bind().dialect.name
+        if dialect in SKIP_LOCKED_DIALECTS:
+            return self.execute_query(
+                lambda: self._claim_batch(
+                    worker_id, limit, per_host_limit, source, skip_locked=True
+                ),
+                err_msg="領取待抓取連結時發生錯誤",
+            )
+        with _CLAIM_LOCK:
+            return self.execute_query(
+                lambda: self._claim_batch(
+                    worker_id, limit, per_host_limit, source, skip_locked=False
+                ),
+                err_msg="領取待抓取連結時發生錯誤",
+            )
+
+    def _claim_batch(
+        self,
+        worker_id: str,
+        limit: int,
+        per_host_limit: Optional[int],
+        source: Optional[str],
+        skip_locked: bool,
+    ) -> List[CrawlFrontier]:
+        """
+        選出候選並標記為 claimed
+
+        skip_locked 時候選列以 FOR UPDATE SKIP LOCKED 鎖定，已被其他交易鎖定的列直接略過；
+        否則以條件式 UPDATE 領取，其他行程先領走的連結 rowcount 不計入。
+        """
+        now = datetime.now(timezone.utc)
+        stmt = self._candidate_stmt(now, limit, per_host_limit, source)
+        if skip_locked:
+            stmt = stmt.with_for_update(skip_locked=True)
+        candidates = [(row.id, row.host) for row in self.session.execute(stmt)]
+        selected_ids = self.select_host_batch(candidates, limit, per_host_limit)
+        if not selected_ids:
+            return []
+
+        self.session.execute(
+            update(CrawlFrontier)
+            .where(
+                CrawlFrontier.id.in_(selected_ids),
+                CrawlFrontier.status == CrawlFrontierStatus.PENDING,
+            )
+            .values(
+                status=CrawlFrontierStatus.CLAIMED,
+                worker_id=worker_id,
+                claimed_at=now,
+                attempts=CrawlFrontier.attempts + 1,
+                updated_at=now,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        claimed = self.session.execute(
+            select(CrawlFrontier)
+            .where(
+                CrawlFrontier.id.in_(selected_ids),
+                CrawlFrontier.worker_id == worker_id,
+                CrawlFrontier.status == CrawlFrontierStatus.CLAIMED,
+            )
+            .execution_options(populate_existing=True)
+        ).scalars()
+        order = {entry_id: index for index, entry_id in enumerate(selected_ids)}
+        return sorted(claimed, key=lambda entry: order[entry.id])
+
+    def mark_done(self, entry_ids: Sequence[int], worker_id: str) -> int:
+        """將 worker 持有的連結標記為完成，返回更新數量"""
+        if not entry_ids:
+            return 0
+        now = datetime.now(timezone.utc)
+
+        def do_update():
+            return self.session.execute(
+                update(CrawlFrontier)
+                .where(
+                    CrawlFrontier.id.in_(list(entry_ids)),
+                    CrawlFrontier.worker_id == worker_id,
+                    CrawlFrontier.status == CrawlFrontierStatus.CLAIMED,
+                )
+                .values(status=CrawlFrontierStatus.DONE, last_error=None, updated_at=now)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+
+        return self.execute_query(do_update, err_msg="標記待抓取連結完成時發生錯誤")
+
+    def mark_failed(
+        self,
+        errors: Dict[int, Optional[str]],
+        worker_id: str,
+        retry_delay_seconds: float,
+        max_attempts: int,
+    ) -> Dict[str, int]:
+        """
+        記錄抓取失敗
+
+        未達最大嘗試次數的連結放回等待中，下次可領取時間依嘗試次數指數延後
+        (retry_delay_seconds * 2^(attempts-1))，其餘標記為失敗。
+
+        Args:
+            errors: {連結 ID: 錯誤訊息}
+            worker_id: 領取者識別碼
+            retry_delay_seconds: 第一次重試的延遲秒數
+            max_attempts: 最大嘗試次數
+
+        Returns:
+            Dict[str, int]: {"retry": 放回等待數量, "failed": 標記失敗數量}
+        """
+        counts = {"retry": 0, "failed": 0}
+        if not errors:
+            return counts
+        now = datetime.now(timezone.utc)
+
+        def do_update():
+            entries = self.session.execute(
+                select(CrawlFrontier).where(
+                    CrawlFrontier.id.in_(list(errors)),
+                    CrawlFrontier.worker_id == worker_id,
+                    CrawlFrontier.status == CrawlFrontierStatus.CLAIMED,
+                )
+            ).scalars()
+            for entry in entries:
+                entry.last_error = errors.get(entry.id)
+                entry.updated_at = now
+                if entry.attempts >= max_attempts:
+                    entry.status = CrawlFrontierStatus.FAILED
+                    counts["failed"] += 1
+                    continue
+                delay = retry_delay_seconds * (2 ** max(entry.attempts - 1, 0))
+                entry.status = CrawlFrontierStatus.PENDING
+                entry.worker_id = None
+                entry.claimed_at = None
+                entry.next_eligible_at = now + timedelta(seconds=delay)
+                counts["retry"] += 1
+            self.session.flush()
+            return counts
+
+        return self.execute_query(do_update, err_msg="記錄待抓取連結失敗時發生錯誤")
+
+    def release(
+        self, entry_ids: Sequence[int], worker_id: str, delay_seconds: float = 0.0
+    ) -> int:
+        """將領取後未抓取的連結放回等待中 (不計入嘗試次數)，返回更新數量"""
+        if not entry_ids:
+            return 0
+        now = datetime.now(timezone.utc)
+
+        def do_update():
+            return self.session.execute(
+                update(CrawlFrontier)
+                .where(
+                    CrawlFrontier.id.in_(list(entry_ids)),
+                    CrawlFrontier.worker_id == worker_id,
+                    CrawlFrontier.status == CrawlFrontierStatus.CLAIMED,
+                )
+                .values(
+                    status=CrawlFrontierStatus.PENDING,
+                    worker_id=None,
+                    claimed_at=None,
+                    attempts=case(
+                        (CrawlFrontier.attempts > 0, CrawlFrontier.attempts - 1), else_=0
+                    ),
+                    next_eligible_at=now + timedelta(seconds=delay_seconds),
+                    updated_at=now,
+                )
+                .execution_options(synchronize_session=False)
+            ).rowcount
+
+        return self.execute_query(do_update, err_msg="放回待抓取連結時發生錯誤")
+
+    def requeue_stale(self, stale_after_seconds: float, max_attempts: int) -> Dict[str, int]:
+        """
+        回收領取逾時的連結 (worker 已失聯，例如任務中斷或服務重啟)
+
+        未達最大嘗試次數的連結重新放回等待中，其餘標記為失敗。
+
+        Returns:
+            Dict[str, int]: {"requeued": 重新排入數量, "failed": 標記失敗數量}
+        """
+        now = datetime.now(timezone.utc)
+        cutoff = now - timedelta(seconds=stale_after_seconds)
+        stale_filter = (
+            CrawlFrontier.status == CrawlFrontierStatus.CLAIMED,
+            CrawlFrontier.claimed_at < cutoff,
+        )
+
+        def do_update():
+            failed = self.session.execute(
+                update(CrawlFrontier)
+                .where(*stale_filter, CrawlFrontier.attempts >= max_attempts)
+                .values(
+                    status=CrawlFrontierStatus.FAILED,
+                    last_error="領取逾時且已達最大嘗試次數",
+                    updated_at=now,
+                )
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            requeued = self.session.execute(
+                update(CrawlFrontier)
+                .where(*stale_filter, CrawlFrontier.attempts < max_attempts)
+                .values(
+                    status=CrawlFrontierStatus.PENDING,
+                    worker_id=None,
+                    claimed_at=None,
+                    next_eligible_at=now,
+                    updated_at=now,
+                )
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            return {"requeued": requeued, "failed": failed}
+
+        return self.execute_query(do_update, err_msg="回收逾時待抓取連結時發生錯誤")
+
+    def count_by_status(self) -> Dict[str, int]:
+        """統計各狀態的待抓取連結數量"""
+
+        def query_builder():
+            rows = self.session.execute(
+                select(CrawlFrontier.status, func.count(CrawlFrontier.id)).group_by(
+                    CrawlFrontier.status
+                )
+            ).all()
+            counts = {status.value: 0 for status in CrawlFrontierStatus}
+            for status, count in rows:
+                key = status.value if isinstance(status, CrawlFrontierStatus) else str(status)
+                counts[key] = count
+            return counts
+
+        return self.execute_query(query_builder, err_msg="統計待抓取連結時發生錯誤")
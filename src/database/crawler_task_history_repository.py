@@ -7,6 +7,7 @@ from datetime import datetime, timedelta, timezone
 from typing import List, Optional, Dict, Any, Type, Union, overload, Literal
 
 from pydantic import BaseModel
+from sqlalchemy import func
 
 from .base_repository import BaseRepository, SchemaType
 from src.models.crawler_task_history_model import CrawlerTaskHistory
@@ -458,3 +459,70 @@ class CrawlerTaskHistoryRepository(BaseRepository["CrawlerTaskHistory"]):
             preview_fields=preview_fields,
         )
         return items[0] if items else None
+
+    def find_latest_run_summaries(
+        self, task_ids: Optional[List[int]] = None
+    ) -> Dict[int, Dict[str, Any]]:
+        """以單一視窗函數查詢取得每個任務最新一次執行的摘要
+
+        每個任務只返回一筆 (按 created_at、id 降序的第一筆)，並附上執行次數，
+        查詢次數與返回資料量不隨歷史記錄數量增長。
+
+        :param task_ids: 可選的任務 ID 列表，None 表示所有任務
+        :return: {task_id: 摘要字典}
+        """
+        if task_ids is not None and not task_ids:
+            return {}
+
+        def query_builder():
+            model = self.model_class
+            ranked = self.session.query(
+                model.id.label("history_id"),
+                model.task_id,
+                model.start_time,
+                model.end_time,
+                model.success,
+                model.task_status,
+                model.articles_count,
+                model.message,
+                func.row_number()
+                .over(
+                    partition_by=model.task_id,
+                    order_by=(model.created_at.desc(), model.id.desc()),
+                )
+                .label("row_number"),
+                func.count(model.id).over(partition_by=model.task_id).label("run_count"),
+            )
+            if task_ids is not None:
+                ranked = ranked.filter(model.task_id.in_(task_ids))
+            ranked_subquery = ranked.subquery()
+            rows = (
+                self.session.query(ranked_subquery)
+                .filter(ranked_subquery.c.row_number == 1)
+                .all()
+            )
+            summaries = {}
+            for row in rows:
+                start_time = row.start_time
+                end_time = row.end_time
+                task_status = row.task_status
+                summaries[row.task_id] = {
+                    "history_id": row.history_id,
+                    "start_time": start_time.isoformat() if start_time else None,
+                    "end_time": end_time.isoformat() if end_time else None,
+                    "success": row.success,
+                    "task_status": getattr(task_status, "value", task_status),
+                    "articles_count": row.articles_count,
+                    "message": row.message,
+                    "duration": (
+                        (end_time - start_time).total_seconds()
+                        if start_time and end_time
+                        else None
+                    ),
+                    "run_count": row.run_count,
+                }
+            return summaries
+
+        return self.execute_query(
+            query_builder, err_msg="獲取任務最新執行摘要時發生錯誤"
+        )
@@ -27,6 +27,7 @@ from sqlalchemy import (
     or_,
     func,
 )  # 引入 JSON, Text, desc, asc, Boolean, or_, func. Alias sqlalchemy.cast to sql_cast
+from sqlalchemy.orm import selectinload
 from sqlalchemy.orm.attributes import flag_modified  # 導入 flag_modified
 
 from .base_repository import BaseRepository, SchemaType
@@ -164,6 +165,21 @@ class CrawlerTasksRepository(BaseRepository["CrawlerTasks"]):
                 return item
         return None
 
+    def get_task_with_history(self, task_id: int) -> Optional[CrawlerTasks]:
+        """查詢特定任務並明確載入完整執行歷史 (歷史預設不隨任務載入)"""
+
+        def query_builder():
+            return (
+                self.session.query(self.model_class)
+                .options(selectinload(self.model_class.history))
+                .filter(self.model_class.id == task_id)
+                .one_or_none()
+            )
+
+        return self.execute_query(
+            query_builder, err_msg=f"查詢任務 {task_id} 及其執行歷史時發生錯誤"
+        )
+
     def find_tasks_by_crawler_id(
         self,
         crawler_id: int,
@@ -553,20 +569,33 @@ class CrawlerTasksRepository(BaseRepository["CrawlerTasks"]):
 
     def find_due_tasks(
         self,
-        cron_expression: str,
+        cron_expression: Optional[str] = None,
         limit: Optional[int] = None,
         is_preview: bool = False,
         preview_fields: Optional[List[str]] = None,
+        now: Optional[datetime] = None,
     ) -> Union[List[CrawlerTasks], List[Dict[str, Any]]]:
-        """查詢需要執行的任務（根據 cron 表達式和上次執行時間, 只查 is_auto=True），支援分頁和預覽"""
-        try:
-            validate_cron_expression(
-                "cron_expression", max_length=255, min_length=5, required=True
-            )(cron_expression)
-        except ValueError:
-            error_msg = f"無效的 cron 表達式: {cron_expression}"  # Keep f-string for error message detail
-            logger.error(error_msg)
-            raise ValidationError(error_msg)
+        """查詢需要執行的任務 (只查 is_auto=True 且 is_active=True)，支援預覽
+
+        以預先計算的 next_run_at 欄位進行單一索引查詢 (next_run_at <= now)，
+        next_run_at 會在排程設定變更與每次執行後自動重新計算。
+
+        Args:
+            cron_expression: 只查詢指定 cron 表達式的任務，None 表示所有自動任務
+            limit: 最多返回的任務數量
+            is_preview: 是否只返回預覽欄位
+            preview_fields: 預覽欄位列表
+            now: 判斷基準時間，預設為現在 (UTC)
+        """
+        if cron_expression is not None:
+            try:
+                validate_cron_expression(
+                    "cron_expression", max_length=255, min_length=5, required=True
+                )(cron_expression)
+            except ValueError:
+                error_msg = f"無效的 cron 表達式: {cron_expression}"  # Keep f-string for error message detail
+                logger.error(error_msg)
+                raise ValidationError(error_msg)
 
         def get_due_tasks_logic():
             query_entities = [self.model_class]
@@ -587,98 +616,24 @@ class CrawlerTasksRepository(BaseRepository["CrawlerTasks"]):
                     )
                     local_is_preview = False
 
-            candidate_tasks_info = (
-                self.session.query(self.model_class.id, self.model_class.last_run_at)
-                .filter(
-                    self.model_class.cron_expression == cron_expression,
-                    self.model_class.is_auto == True,
-                    self.model_class.is_active == True,
-                )
-                .all()
+            current_time = enforce_utc_datetime_transform(
+                now or datetime.now(timezone.utc)
             )
-
-            now = datetime.now(timezone.utc)
-            due_task_ids = []
-            logger.debug("[find_due_tasks] Current UTC time (now): %s", now.isoformat())
-
-            for task_id, last_run_at in candidate_tasks_info:
-                if last_run_at is None:
-                    logger.debug(
-                        "[find_due_tasks] Task ID %d added (never run).", task_id
-                    )
-                    due_task_ids.append(task_id)
-                    continue
-
-                last_run = last_run_at
-                if last_run.tzinfo is None:
-                    last_run = enforce_utc_datetime_transform(last_run)
-                    logger.debug(
-                        "[find_due_tasks] Task ID %d: Forced last_run_at to UTC: %s",
-                        task_id,
-                        last_run.isoformat(),
-                    )
-
-                try:
-                    # 計算相對於 last_run 的下一個執行時間
-                    cron_iter = croniter(cron_expression, last_run)
-                    next_scheduled_run_after_last = cron_iter.get_next(datetime)
-
-                    if next_scheduled_run_after_last.tzinfo is None:
-                       next_scheduled_run_after_last = enforce_utc_datetime_transform(
-                           next_scheduled_run_after_last
-                       )
-                       logger.debug(
-                           "[find_due_tasks] Task ID %d: Forced next_scheduled_run_after_last to UTC: %s",
-                           task_id,
-                           next_scheduled_run_after_last.isoformat(),
-                       )
-
-
-                    logger.debug(
-                        "[find_due_tasks] Task ID %d: last_run=%s, next_scheduled_run_after_last=%s, now=%s",
-                        task_id,
-                        last_run.isoformat(),
-                        next_scheduled_run_after_last.isoformat(),
-                        now.isoformat(),
-                    )
-
-                    # 比較 now 是否達到或超過下一個排定時間
-                    if now >= next_scheduled_run_after_last:
-                        logger.debug(
-                            "[find_due_tasks] Task ID %d added. Condition (now >= next_run) met.", task_id
-                        )
-                        due_task_ids.append(task_id)
-                    else:
-                        logger.debug(
-                            "[find_due_tasks] Task ID %d skipped. Condition (now >= next_run) not met.",
-                            task_id,
-                        )
-                        continue
-
-                except Exception as e:
-                    logger.error(
-                        "計算任務 %d 的下次執行時間時出錯 (%s, %s): %s",
-                        task_id,
-                        cron_expression,
-                        last_run,
-                        e,
-                        exc_info=True,
-                    )
-                    continue
-
-            if not due_task_ids:
-                return []
-
-            final_query = self.session.query(*query_entities).filter(
-                self.model_class.id.in_(due_task_ids)
+            query = self.session.query(*query_entities).filter(
+                self.model_class.is_auto == True,
+                self.model_class.is_active == True,
+                self.model_class.next_run_at <= current_time,
             )
+            if cron_expression is not None:
+                query = query.filter(
+                    self.model_class.cron_expression == cron_expression
+                )
 
+            query = query.order_by(self.model_class.next_run_at, self.model_class.id)
             if limit is not None:
-                final_query = final_query.limit(limit)
-
-            final_query = final_query.order_by(self.model_class.id)
+                query = query.limit(limit)
 
-            raw_results = final_query.all()
+            raw_results = query.all()
 
             if local_is_preview and valid_preview_fields:
                 return [dict(zip(valid_preview_fields, row)) for row in raw_results]
@@ -0,0 +1,116 @@
+"""定義 SchedulerTaskChange 模型的資料庫操作 Repository，提供排程變更記錄的寫入、增量讀取與清理。"""
+
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Type, Literal, overload
+
+from pydantic import BaseModel
+from sqlalchemy import delete, func, select
+
+from .base_repository import BaseRepository, SchemaType
+from src.models.scheduler_task_change_model import SchedulerTaskChange
+from src.models.scheduler_task_change_schema import (
+    SchedulerTaskChangeCreateSchema,
+    SchedulerTaskChangeUpdateSchema,
+)
+from src.error.errors import ValidationError, DatabaseOperationError
+
+logger = logging.getLogger(__name__)  # 使用統一的 logger
+
+
+class SchedulerTaskChangeRepository(BaseRepository["SchedulerTaskChange"]):
+    """SchedulerTaskChange 特定的Repository"""
+
+    @classmethod
+    @overload
+    def get_schema_class(
+        cls, schema_type: Literal[SchemaType.CREATE]
+    ) -> Type[SchedulerTaskChangeCreateSchema]: ...
+
+    @classmethod
+    @overload
+    def get_schema_class(
+        cls, schema_type: Literal[SchemaType.UPDATE]
+    ) -> Type[SchedulerTaskChangeUpdateSchema]: ...
+
+    @classmethod
+    def get_schema_class(
+        cls, schema_type: SchemaType = SchemaType.CREATE
+    ) -> Type[BaseModel]:
+        """獲取對應的schema類別"""
+        if schema_type == SchemaType.UPDATE:
+            return SchedulerTaskChangeUpdateSchema
+        elif schema_type == SchemaType.CREATE:
+            return SchedulerTaskChangeCreateSchema
+        raise ValueError(f"未支援的 schema 類型: {schema_type}")
+
+    def create(self, entity_data: Dict[str, Any]) -> Optional[SchedulerTaskChange]:
+        """創建排程變更記錄，先進行 Pydantic 驗證，然後調用內部創建。"""
+        try:
+            validated_data = self.validate_data(entity_data, SchemaType.CREATE)
+            if validated_data is None:
+                error_msg = "創建 SchedulerTaskChange 時驗證步驟失敗"
+                logger.error(error_msg)
+                raise ValidationError(error_msg)
+            return self._create_internal(validated_data)
+        except ValidationError as e:
+            logger.error("創建 SchedulerTaskChange 驗證失敗: %s", e)
+            raise
+        except DatabaseOperationError:
+            raise
+        except Exception as e:
+            logger.error(
+                "創建 SchedulerTaskChange 時發生未預期錯誤: %s", e, exc_info=True
+            )
+            raise DatabaseOperationError(
+                f"創建 SchedulerTaskChange 時發生未預期錯誤: {e}"
+            ) from e
+
+    def update(
+        self, entity_id: Any, entity_data: Dict[str, Any]
+    ) -> Optional[SchedulerTaskChange]:
+        """排程變更記錄寫入後不可修改"""
+        raise ValidationError("排程變更記錄不允許更新")
+
+    def record_change(self, task_id: int) -> Optional[SchedulerTaskChange]:
+        """記錄任務的排程相關變更 (待提交，須與任務變更在同一交易中)"""
+        change = self.create({"task_id": task_id})
+        self.execute_query(
+            lambda: self.session.flush(), err_msg=f"記錄任務 {task_id} 的排程變更時發生錯誤"
+        )
+        return change
+
+    def find_changes_after(self, last_change_id: int, limit: int = 500) -> List[Dict[str, int]]:
+        """依 id 遞增順序讀取指定 id 之後的變更記錄"""
+
+        def query_builder():
+            rows = self.session.execute(
+                select(SchedulerTaskChange.id, SchedulerTaskChange.task_id)
+                .where(SchedulerTaskChange.id > last_change_id)
+                .order_by(SchedulerTaskChange.id)
+                .limit(limit)
+            ).all()
+            return [{"id": change_id, "task_id": task_id} for change_id, task_id in rows]
+
+        return self.execute_query(query_builder, err_msg="讀取排程變更記錄時發生錯誤")
+
+    def get_latest_change_id(self) -> int:
+        """取得目前最新的變更記錄 id，沒有記錄時返回 0"""
+        return self.execute_query(
+            lambda: self.session.execute(
+                select(func.max(SchedulerTaskChange.id))
+            ).scalar()
+            or 0,
+            err_msg="取得最新排程變更記錄時發生錯誤",
+        )
+
+    def purge_before(self, cutoff: datetime) -> int:
+        """刪除指定時間之前的變更記錄，返回刪除數量"""
+        return self.execute_query(
+            lambda: self.session.execute(
+                delete(SchedulerTaskChange)
+                .where(SchedulerTaskChange.created_at < cutoff)
+                .execution_options(synchronize_session=False)
+            ).rowcount,
+            err_msg="清理排程變更記錄時發生錯誤",
+        )
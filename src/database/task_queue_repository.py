@@ -0,0 +1,425 @@
+"""
+定義 TaskQueue 模型的資料庫操作 Repository。
+
+領取佇列項目時，PostgreSQL 使用 SELECT ... FOR UPDATE SKIP LOCKED，
+讓多個 worker 同時領取時不會互相阻塞；SQLite 不支援列鎖，
+改以行程內鎖 (claim_lock，須包住整個領取交易直到提交) 序列化領取，
+並以條件式 UPDATE (status='queued') 確保跨行程時同一項目只有一個 worker 能領取成功。
+"""
+
+import contextlib
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Type, Literal, overload
+
+from pydantic import BaseModel
+from sqlalchemy import func, select, update
+
+from .base_repository import BaseRepository, SchemaType
+from src.models.task_queue_model import TaskQueue
+from src.models.task_queue_schema import TaskQueueCreateSchema, TaskQueueUpdateSchema
+from src.error.errors import ValidationError, DatabaseOperationError
+from src.utils.enum_utils import TaskQueueStatus
+
+logger = logging.getLogger(__name__)  # 使用統一的 logger
+
+# 支援 FOR UPDATE SKIP LOCKED 的資料庫方言
+SKIP_LOCKED_DIALECTS = {"postgresql", "mysql", "oracle"}
+
+# SQLite 模式下序列化同一行程內的領取交易
+_CLAIM_LOCK = threading.RLock()
+
+
+class TaskQueueRepository(BaseRepository["TaskQueue"]):
+    """TaskQueue 特定的Repository"""
+
+    @classmethod
+    @overload
+    def get_schema_class(
+        cls, schema_type: Literal[SchemaType.CREATE]
+    ) -> Type[TaskQueueCreateSchema]: ...
+
+    @classmethod
+    @overload
+    def get_schema_class(
+        cls, schema_type: Literal[SchemaType.UPDATE]
+    ) -> Type[TaskQueueUpdateSchema]: ...
+
+    @classmethod
+    def get_schema_class(
+        cls, schema_type: SchemaType = SchemaType.CREATE
+    ) -> Type[BaseModel]:
+        """獲取對應的schema類別"""
+        if schema_type == SchemaType.UPDATE:
+            return TaskQueueUpdateSchema
+        elif schema_type == SchemaType.CREATE:
+            return TaskQueueCreateSchema
+        raise ValueError(f"未支援的 schema 類型: {schema_type}")
+
+    @staticmethod
+    def claim_lock(dialect_name: str):
+        """
+        取得領取交易所需的鎖
+
+        支援 SKIP LOCKED 的資料庫不需要額外的鎖；SQLite 須在鎖內完成領取與提交，
+        否則其他執行緒可能讀到尚未提交的領取而重複競爭。
+        """
+        if dialect_name in SKIP_LOCKED_DIALECTS:
+            return contextlib.nullcontext()
+        return _CLAIM_LOCK
+
+    def create(self, entity_data: Dict[str, Any]) -> Optional[TaskQueue]:
+        """
+        創建任務佇列項目，先進行 Pydantic 驗證，然後調用內部創建。
+
+        Args:
+            entity_data: 實體資料
+
+        Returns:
+            創建的任務佇列項目
+        """
+        try:
+            validated_data = self.validate_data(entity_data, SchemaType.CREATE)
+            if validated_data is None:
+                error_msg = "創建 TaskQueue 時驗證步驟失敗"
+                logger.error(error_msg)
+                raise ValidationError(error_msg)
+            return self._create_internal(validated_data)
+        except ValidationError as e:
+            logger.error("創建 TaskQueue 驗證失敗: %s", e)
+            raise
+        except DatabaseOperationError:
+            raise
+        except Exception as e:
+            logger.error("創建 TaskQueue 時發生未預期錯誤: %s", e, exc_info=True)
+            raise DatabaseOperationError(
+                f"創建 TaskQueue 時發生未預期錯誤: {e}"
+            ) from e
+
+    def update(
+        self, entity_id: Any, entity_data: Dict[str, Any]
+    ) -> Optional[TaskQueue]:
+        """
+        更新任務佇列項目，先進行 Pydantic 驗證，然後調用內部更新。
+
+        Args:
+            entity_id: 實體ID
+            entity_data: 要更新的實體資料
+
+        Returns:
+            更新後的任務佇列項目，如果實體不存在則返回None
+        """
+        try:
+            existing_entity = self.get_by_id(entity_id)
+            if not existing_entity:
+                logger.warning("更新任務佇列項目失敗，ID不存在: %s", entity_id)
+                return None
+            if not entity_data:
+                return existing_entity
+
+            update_payload = self.validate_data(entity_data, SchemaType.UPDATE)
+            if update_payload is None:
+                error_msg = f"更新 TaskQueue (ID={entity_id}) 時驗證步驟失敗"
+                logger.error(error_msg)
+                raise ValidationError(error_msg)
+            return self._update_internal(entity_id, update_payload)
+        except ValidationError as e:
+            logger.error("更新 TaskQueue (ID=%s) 驗證失敗: %s", entity_id, e)
+            raise
+        except DatabaseOperationError:
+            raise
+        except Exception as e:
+            logger.error(
+                "更新 TaskQueue (ID=%s) 時發生未預期錯誤: %s",
+                entity_id,
+                e,
+                exc_info=True,
+            )
+            raise DatabaseOperationError(
+                f"更新 TaskQueue (ID={entity_id}) 時發生未預期錯誤: {e}"
+            ) from e
+
+    def enqueue(
+        self,
+        task_id: int,
+        history_id: Optional[int] = None,
+        payload: Optional[Dict[str, Any]] = None,
+    ) -> Optional[TaskQueue]:
+        """將任務加入佇列 (待提交)"""
+        entry_data: Dict[str, Any] = {"task_id": task_id, "payload": payload or {}}
+        if history_id is not None:
+            entry_data["history_id"] = history_id
+        entry = self.create(entry_data)
+        self.execute_query(lambda: self.session.flush(), err_msg="加入任務佇列時發生錯誤")
+        return entry
+
+    def find_active_by_task_id(self, task_id: int) -> List[TaskQueue]:
+        """查詢指定任務尚未結束 (queued/claimed) 的佇列項目"""
+
+        def query_builder():
+            stmt = (
+                select(TaskQueue)
+                .where(
+                    TaskQueue.task_id == task_id,
+                    TaskQueue.status.in_(
+                        [TaskQueueStatus.QUEUED, TaskQueueStatus.CLAIMED]
+                    ),
+                )
+                .order_by(TaskQueue.id)
+            )
+            return list(self.session.execute(stmt).scalars().all())
+
+        return self.execute_query(
+            query_builder, err_msg=f"查詢任務 {task_id} 的佇列項目時發生錯誤"
+        )
+
+    def claim_next(self, worker_id: str) -> Optional[TaskQueue]:
+        """
+        領取下一個等待中的佇列項目 (待提交)
+
+        Args:
+            worker_id: 領取者識別碼
+
+        Returns:
+            已標記為 claimed 的佇列項目，佇列為空時返回 None
+        """
+        dialect = self.session.get_bind().dialect.name
+        if dialect in SKIP_LOCKED_DIALECTS:
+            return self.execute_query(
+                lambda: self._claim_with_skip_locked(worker_id),
+                err_msg="領取任務佇列項目時發生錯誤",
+            )
+        with _CLAIM_LOCK:
+            return self.execute_query(
+                lambda: self._claim_with_conditional_update(worker_id),
+                err_msg="領取任務佇列項目時發生錯誤",
+            )
+
+    def _claim_with_skip_locked(self, worker_id: str) -> Optional[TaskQueue]:
+        """以 SELECT ... FOR UPDATE SKIP LOCKED 領取，已被其他交易鎖定的列會直接略過"""
+        stmt = (
+            select(TaskQueue)
+            .where(TaskQueue.status == TaskQueueStatus.QUEUED)
+            .order_by(TaskQueue.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+        entry = self.session.execute(stmt).scalars().first()
+        if entry is None:
+            return None
+        now = datetime.now(timezone.utc)
+        entry.status = TaskQueueStatus.CLAIMED
+        entry.worker_id = worker_id
+        entry.claimed_at = now
+        entry.heartbeat_at = now
+        entry.attempts = (entry.attempts or 0) + 1
+        entry.updated_at = now
+        self.session.flush()
+        return entry
+
+    def _claim_with_conditional_update(
+        self, worker_id: str, max_retries: int = 3
+    ) -> Optional[TaskQueue]:
+        """以條件式 UPDATE 領取；其他行程先領走同一列時 rowcount 為 0，改領下一列"""
+        for _ in range(max_retries):
+            candidate_id = self.session.execute(
+                select(TaskQueue.id)
+                .where(TaskQueue.status == TaskQueueStatus.QUEUED)
+                .order_by(TaskQueue.id)
+                .limit(1)
+            ).scalar()
+            if candidate_id is None:
+                return None
+            now = datetime.now(timezone.utc)
+            result = self.session.execute(
+                update(TaskQueue)
+                .where(
+                    TaskQueue.id == candidate_id,
+                    TaskQueue.status == TaskQueueStatus.QUEUED,
+                )
+                .values(
+                    status=TaskQueueStatus.CLAIMED,
+                    worker_id=worker_id,
+                    claimed_at=now,
+                    heartbeat_at=now,
+                    attempts=TaskQueue.attempts + 1,
+                    updated_at=now,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount == 1:
+                return self.session.get(
+                    TaskQueue, candidate_id, populate_existing=True
+                )
+        return None
+
+    def heartbeat(self, queue_id: int, worker_id: str) -> bool:
+        """更新心跳時間，返回該 worker 是否仍持有此項目"""
+        now = datetime.now(timezone.utc)
+
+        def do_update():
+            result = self.session.execute(
+                update(TaskQueue)
+                .where(
+                    TaskQueue.id == queue_id,
+                    TaskQueue.worker_id == worker_id,
+                    TaskQueue.status == TaskQueueStatus.CLAIMED,
+                )
+                .values(heartbeat_at=now)
+                .execution_options(synchronize_session=False)
+            )
+            return result.rowcount == 1
+
+        return self.execute_query(
+            do_update, err_msg=f"更新佇列項目 {queue_id} 心跳時發生錯誤"
+        )
+
+    def complete(
+        self,
+        queue_id: int,
+        worker_id: str,
+        success: bool,
+        result: Optional[Dict[str, Any]] = None,
+        error_message: Optional[str] = None,
+    ) -> bool:
+        """寫回執行結果，返回是否成功 (項目已被其他 worker 重新領取時返回 False)"""
+        now = datetime.now(timezone.utc)
+        status = TaskQueueStatus.COMPLETED if success else TaskQueueStatus.FAILED
+
+        def do_update():
+            update_result = self.session.execute(
+                update(TaskQueue)
+                .where(
+                    TaskQueue.id == queue_id,
+                    TaskQueue.worker_id == worker_id,
+                    TaskQueue.status == TaskQueueStatus.CLAIMED,
+                )
+                .values(
+                    status=status,
+                    finished_at=now,
+                    heartbeat_at=now,
+                    result=result,
+                    error_message=error_message,
+                    updated_at=now,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            return update_result.rowcount == 1
+
+        return self.execute_query(
+            do_update, err_msg=f"寫回佇列項目 {queue_id} 結果時發生錯誤"
+        )
+
+    def requeue_stale(self, stale_after_seconds: float, max_attempts: int) -> Dict[str, Any]:
+        """
+        回收心跳逾時的項目 (worker 已失聯)
+
+        未達最大嘗試次數的項目重新放回佇列，其餘標記為失敗。
+
+        Returns:
+            Dict[str, Any]: {"requeued": 重新排入數量, "failed": 標記失敗數量,
+            "failed_entries": 標記失敗項目的 [{"task_id", "history_id"}]，供呼叫端一併結束任務與歷史記錄}
+        """
+        now = datetime.now(timezone.utc)
+        cutoff = now - timedelta(seconds=stale_after_seconds)
+        stale_filter = (
+            TaskQueue.status == TaskQueueStatus.CLAIMED,
+            TaskQueue.heartbeat_at < cutoff,
+        )
+
+        def do_update():
+            exhausted = self.session.execute(
+                select(TaskQueue.id, TaskQueue.task_id, TaskQueue.history_id).where(
+                    *stale_filter, TaskQueue.attempts >= max_attempts
+                )
+            ).all()
+            failed_entries: List[Dict[str, Any]] = []
+            if exhausted:
+                exhausted_ids = [row.id for row in exhausted]
+                updated = self.session.execute(
+                    update(TaskQueue)
+                    .where(TaskQueue.id.in_(exhausted_ids), *stale_filter)
+                    .values(
+                        status=TaskQueueStatus.FAILED,
+                        finished_at=now,
+                        error_message="worker 心跳逾時且已達最大嘗試次數",
+                        updated_at=now,
+                    )
+                    .execution_options(synchronize_session=False)
+                ).rowcount
+                if updated != len(exhausted_ids):
+                    # 查詢後有項目被其他 worker 回報心跳或完成，只保留本次實際標記失敗的項目
+                    failed_ids = set(
+                        self.session.execute(
+                            select(TaskQueue.id).where(
+                                TaskQueue.id.in_(exhausted_ids),
+                                TaskQueue.status == TaskQueueStatus.FAILED,
+                                TaskQueue.finished_at == now,
+                            )
+                        ).scalars()
+                    )
+                    exhausted = [row for row in exhausted if row.id in failed_ids]
+                failed_entries = [
+                    {"task_id": row.task_id, "history_id": row.history_id}
+                    for row in exhausted
+                ]
+            requeued = self.session.execute(
+                update(TaskQueue)
+                .where(*stale_filter, TaskQueue.attempts < max_attempts)
+                .values(
+                    status=TaskQueueStatus.QUEUED,
+                    worker_id=None,
+                    claimed_at=None,
+                    heartbeat_at=None,
+                    updated_at=now,
+                )
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            return {
+                "requeued": requeued,
+                "failed": len(failed_entries),
+                "failed_entries": failed_entries,
+            }
+
+        return self.execute_query(do_update, err_msg="回收逾時佇列項目時發生錯誤")
+
+    def cancel_queued(self, task_id: int) -> int:
+        """取消指定任務尚未被領取的佇列項目，返回取消數量"""
+        now = datetime.now(timezone.utc)
+
+        def do_update():
+            return self.session.execute(
+                update(TaskQueue)
+                .where(
+                    TaskQueue.task_id == task_id,
+                    TaskQueue.status == TaskQueueStatus.QUEUED,
+                )
+                .values(
+                    status=TaskQueueStatus.CANCELLED,
+                    finished_at=now,
+                    updated_at=now,
+                )
+                .execution_options(synchronize_session=False)
+            ).rowcount
+
+        return self.execute_query(
+            do_update, err_msg=f"取消任務 {task_id} 的佇列項目時發生錯誤"
+        )
+
+    def count_by_status(self) -> Dict[str, int]:
+        """統計各狀態的佇列項目數量"""
+
+        def query_builder():
+            rows = self.session.execute(
+                select(TaskQueue.status, func.count(TaskQueue.id)).group_by(
+                    TaskQueue.status
+                )
+            ).all()
+            counts = {status.value: 0 for status in TaskQueueStatus}
+            for status, count in rows:
+                key = status.value if isinstance(status, TaskQueueStatus) else str(status)
+                counts[key] = count
+            return counts
+
+        return self.execute_query(query_builder, err_msg="統計任務佇列時發生錯誤")
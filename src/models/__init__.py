@@ -5,10 +5,18 @@ from .articles_model import Articles
 from .crawlers_model import Crawlers
 from .crawler_tasks_model import CrawlerTasks
 from .crawler_task_history_model import CrawlerTaskHistory
+from .task_queue_model import TaskQueue
+from .crawl_frontier_model import CrawlFrontier
+from .scheduler_task_change_model import SchedulerTaskChange
+from .article_stats_model import ArticleStats
 from .articles_schema import ArticleCreateSchema, ArticleUpdateSchema
 from .crawlers_schema import CrawlersCreateSchema, CrawlersUpdateSchema
 from .crawler_tasks_schema import CrawlerTasksCreateSchema, CrawlerTasksUpdateSchema
 from .crawler_task_history_schema import CrawlerTaskHistoryCreateSchema, CrawlerTaskHistoryUpdateSchema
+from .task_queue_schema import TaskQueueCreateSchema, TaskQueueUpdateSchema
+from .crawl_frontier_schema import CrawlFrontierCreateSchema, CrawlFrontierUpdateSchema
+from .scheduler_task_change_schema import SchedulerTaskChangeCreateSchema, SchedulerTaskChangeUpdateSchema
+from .article_stats_schema import ArticleStatsCreateSchema, ArticleStatsUpdateSchema
 
 # 確保所有模型都被導入
-__all__ = ['Base', 'BaseEntity', 'BaseCreateSchema', 'BaseUpdateSchema', 'Articles', 'Crawlers', 'CrawlerTasks', 'CrawlerTaskHistory', 'ArticleCreateSchema', 'ArticleUpdateSchema', 'CrawlersCreateSchema', 'CrawlersUpdateSchema', 'CrawlerTasksCreateSchema', 'CrawlerTasksUpdateSchema', 'CrawlerTaskHistoryCreateSchema', 'CrawlerTaskHistoryUpdateSchema'] 
\ No newline at end of file
+__all__ = ['Base', 'BaseEntity', 'BaseCreateSchema', 'BaseUpdateSchema', 'Articles', 'Crawlers', 'CrawlerTasks', 'CrawlerTaskHistory', 'ArticleCreateSchema', 'ArticleUpdateSchema', 'CrawlersCreateSchema', 'CrawlersUpdateSchema', 'CrawlerTasksCreateSchema', 'CrawlerTasksUpdateSchema', 'CrawlerTaskHistoryCreateSchema', 'CrawlerTaskHistoryUpdateSchema', 'TaskQueue', 'TaskQueueCreateSchema', 'TaskQueueUpdateSchema', 'CrawlFrontier', 'CrawlFrontierCreateSchema', 'CrawlFrontierUpdateSchema', 'SchedulerTaskChange', 'SchedulerTaskChangeCreateSchema', 'SchedulerTaskChangeUpdateSchema', 'ArticleStats', 'ArticleStatsCreateSchema', 'ArticleStatsUpdateSchema'] 
\ No newline at end of file
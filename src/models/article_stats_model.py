@@ -0,0 +1,249 @@
+"""本模組定義文章統計彙總模型，並在文章寫入時以增量方式維護彙總計數。
+
+文章的新增、刪除與統計欄位 (來源、分類、發布日期、AI 相關、爬取狀態) 的變更，
+會在同一次 flush 中以原子的 UPSERT 累加到 article_stats，儀表板統計只需讀取彙總表。
+批次 SQL 更新等不經過 ORM 的寫入無法追蹤，由定期重建修正誤差。
+"""
+
+import logging
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import (
+    Boolean,
+    Integer,
+    String,
+    UniqueConstraint,
+    event,
+    inspect,
+    select,
+    update,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Mapped, Session, mapped_column
+
+from src.models.articles_model import Articles
+from src.models.base_model import Base
+from src.models.base_entity import BaseEntity
+from src.utils.enum_utils import ArticleScrapeStatus
+
+logger = logging.getLogger(__name__)  # 使用統一的 logger
+
+# 彙總鍵的欄位順序
+ARTICLE_STATS_KEY_FIELDS = (
+    "source",
+    "category",
+    "day",
+    "is_ai_related",
+    "is_scraped",
+    "scrape_status",
+)
+
+ArticleStatsKey = Tuple[str, str, str, bool, bool, str]
+
+
+class ArticleStats(Base, BaseEntity):
+    """文章統計彙總
+
+    欄位說明：
+    - source: 文章來源 (未設定為空字串)
+    - category: 文章分類 (未分類為空字串)
+    - day: 發布日期 YYYY-MM-DD (UTC，未知為空字串)
+    - is_ai_related: 是否與 AI 相關
+    - is_scraped: 是否已爬取
+    - scrape_status: 爬取狀態
+    - article_count: 符合此組合的文章數量
+    """
+
+    __tablename__ = "article_stats"
+    __table_args__ = (
+        UniqueConstraint(*ARTICLE_STATS_KEY_FIELDS, name="uq_article_stats_key"),
+    )
+
+    source: Mapped[str] = mapped_column(String(50), nullable=False, default="")
+    category: Mapped[str] = mapped_column(String(100), nullable=False, default="")
+    day: Mapped[str] = mapped_column(String(10), nullable=False, default="")
+    is_ai_related: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    is_scraped: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    scrape_status: Mapped[str] = mapped_column(String(20), nullable=False, default="")
+    article_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return (
+            f"<ArticleStats(source={self.source}, category={self.category}, "
+            f"day={self.day}, article_count={self.article_count})>"
+        )
+
+    def to_dict(self):
+        return {
+            **super().to_dict(),
+            "source": self.source,
+            "category": self.category,
+            "day": self.day,
+            "is_ai_related": self.is_ai_related,
+            "is_scraped": self.is_scraped,
+            "scrape_status": self.scrape_status,
+            "article_count": self.article_count,
+        }
+
+
+def article_stats_key(values: Dict[str, Any]) -> ArticleStatsKey:
+    """由文章欄位值計算彙總鍵"""
+    published_at: Optional[datetime] = values.get("published_at")
+    if published_at is not None:
+        if published_at.tzinfo is not None:
+            published_at = published_at.astimezone(timezone.utc)
+        day = published_at.strftime("%Y-%m-%d")
+    else:
+        day = ""
+    # 新增時尚未套用欄位預設值
+    scrape_status = values.get("scrape_status") or ArticleScrapeStatus.PENDING
+    return (
+        values.get("source") or "",
+        values.get("category") or "",
+        day,
+        bool(values.get("is_ai_related")),
+        bool(values.get("is_scraped")),
+        str(getattr(scrape_status, "value", scrape_status) or ""),
+    )
+
+
+_STATS_SOURCE_FIELDS = (
+    "source",
+    "category",
+    "published_at",
+    "is_ai_related",
+    "is_scraped",
+    "scrape_status",
+)
+
+
+def _current_values(article: Articles) -> Dict[str, Any]:
+    return {field: getattr(article, field) for field in _STATS_SOURCE_FIELDS}
+
+
+def _previous_values(article: Articles) -> Optional[Dict[str, Any]]:
+    """取得 flush 前已存在於資料庫的欄位值，無法得知 (欄位未載入就被覆寫) 時返回 None"""
+    state = inspect(article)
+    values = {}
+    for field in _STATS_SOURCE_FIELDS:
+        history = state.attrs[field].history
+        if history.deleted:
+            values[field] = history.deleted[0]
+        elif history.unchanged:
+            values[field] = history.unchanged[0]
+        elif history.added:
+            return None
+        else:
+            values[field] = getattr(article, field)
+    return values
+
+
+_PREVIOUS_VALUES_KEY = "article_stats_previous_values"
+
+
+def _snapshot_unknown_previous_values(session: Session) -> None:
+    """flush 前從資料庫讀取變更前的值 (欄位過期後直接覆寫時，屬性歷史沒有舊值)"""
+    unknown_ids = [
+        obj.id
+        for obj in session.dirty
+        if isinstance(obj, Articles)
+        and obj.id is not None
+        and session.is_modified(obj)
+        and _previous_values(obj) is None
+    ]
+    if not unknown_ids:
+        session.info.pop(_PREVIOUS_VALUES_KEY, None)
+        return
+    columns = [Articles.id] + [getattr(Articles, field) for field in _STATS_SOURCE_FIELDS]
+    rows = session.connection().execute(
+        select(*columns).where(Articles.id.in_(unknown_ids))
+    )
+    session.info[_PREVIOUS_VALUES_KEY] = {
+        row.id: {field: getattr(row, field) for field in _STATS_SOURCE_FIELDS}
+        for row in rows
+    }
+
+
+def collect_article_stats_deltas(session: Session) -> Counter:
+    """計算本次 flush 對各彙總鍵的增減量"""
+    snapshots = session.info.pop(_PREVIOUS_VALUES_KEY, None) or {}
+    deltas: Counter = Counter()
+    for obj in session.new:
+        if isinstance(obj, Articles):
+            deltas[article_stats_key(_current_values(obj))] += 1
+    for obj in session.deleted:
+        if isinstance(obj, Articles):
+            previous = _previous_values(obj) or _current_values(obj)
+            deltas[article_stats_key(previous)] -= 1
+    for obj in session.dirty:
+        if not isinstance(obj, Articles) or not session.is_modified(obj):
+            continue
+        previous = _previous_values(obj) or snapshots.get(obj.id)
+        if previous is None:
+            logger.warning("文章 %s 的統計欄位變更前的值未知，將由定期重建修正", obj.id)
+            continue
+        old_key = article_stats_key(previous)
+        new_key = article_stats_key(_current_values(obj))
+        if old_key != new_key:
+            deltas[old_key] -= 1
+            deltas[new_key] += 1
+    return Counter({key: delta for key, delta in deltas.items() if delta})
+
+
+def apply_article_stats_deltas(connection, deltas: Counter) -> None:
+    """以原子 UPSERT 將增減量累加到彙總表"""
+    if not deltas:
+        return
+    table = ArticleStats.__table__
+    now = datetime.now(timezone.utc)
+    dialect_name = connection.dialect.name
+    insert_factory = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}.get(
+        dialect_name
+    )
+    for key, delta in deltas.items():
+        key_values = dict(zip(ARTICLE_STATS_KEY_FIELDS, key))
+        if insert_factory is not None:
+            statement = insert_factory(table).values(
+                **key_values, article_count=delta, created_at=now, updated_at=now
+            )
+            statement = statement.on_conflict_do_update(
+                index_elements=list(ARTICLE_STATS_KEY_FIELDS),
+                set_={
+                    "article_count": table.c.article_count
+                    + statement.excluded.article_count,
+                    "updated_at": now,
+                },
+            )
+            connection.execute(statement)
+            continue
+        # 其他資料庫：先更新，不存在時新增
+        result = connection.execute(
+            update(table)
+            .where(*(table.c[field] == value for field, value in key_values.items()))
+            .values(article_count=table.c.article_count + delta, updated_at=now)
+        )
+        if result.rowcount == 0:
+            connection.execute(
+                table.insert().values(
+                    **key_values, article_count=delta, created_at=now, updated_at=now
+                )
+            )
+
+
+@event.listens_for(Session, "before_flush")
+def _snapshot_article_stats(session: Session, flush_context, instances) -> None:
+    """記錄文章變更前無法由屬性歷史取得的統計欄位值"""
+    if not session.info.get("skip_article_stats"):
+        _snapshot_unknown_previous_values(session)
+
+
+@event.listens_for(Session, "after_flush")
+def _maintain_article_stats(session: Session, flush_context) -> None:
+    """文章寫入後於同一交易中更新統計彙總"""
+    if session.info.get("skip_article_stats"):
+        return
+    deltas = collect_article_stats_deltas(session)
+    if deltas:
+        apply_article_stats_deltas(session.connection(), deltas)
@@ -0,0 +1,76 @@
+"""本模組定義文章統計彙總的 Schema 類別 (彙總由系統維護，僅供驗證與重建使用)。"""
+
+from typing import Annotated, Optional
+from pydantic import BeforeValidator, model_validator
+import logging
+
+from src.utils.model_utils import validate_positive_int
+from src.utils.schema_utils import (
+    validate_required_fields_schema,
+    validate_update_schema,
+)
+from src.models.base_schema import BaseCreateSchema, BaseUpdateSchema
+
+
+logger = logging.getLogger(__name__)  # 使用統一的 logger
+
+ArticleCount = Annotated[
+    int,
+    BeforeValidator(
+        validate_positive_int("article_count", is_zero_allowed=True, required=True)
+    ),
+]
+
+
+class ArticleStatsCreateSchema(BaseCreateSchema):
+    """文章統計彙總創建模型"""
+
+    source: str = ""
+    category: str = ""
+    day: str = ""
+    is_ai_related: bool = False
+    is_scraped: bool = False
+    scrape_status: str = ""
+    article_count: ArticleCount
+
+    @model_validator(mode="before")
+    @classmethod
+    def validate_required_fields(cls, data):
+        """驗證必填欄位"""
+        if isinstance(data, dict):
+            required_fields = ArticleStatsCreateSchema.get_required_fields()
+            return validate_required_fields_schema(required_fields, data)
+
+    @classmethod
+    def get_required_fields(cls):
+        return ["article_count"]
+
+
+class ArticleStatsUpdateSchema(BaseUpdateSchema):
+    """文章統計彙總更新模型 (只允許修改計數)"""
+
+    article_count: Optional[ArticleCount] = None
+
+    @model_validator(mode="before")
+    @classmethod
+    def validate_update(cls, data):
+        """驗證更新操作"""
+        if isinstance(data, dict):
+            return validate_update_schema(
+                cls.get_immutable_fields(), cls.get_updated_fields(), data
+            )
+
+    @classmethod
+    def get_immutable_fields(cls):
+        return [
+            "source",
+            "category",
+            "day",
+            "is_ai_related",
+            "is_scraped",
+            "scrape_status",
+        ] + BaseUpdateSchema.get_immutable_fields()
+
+    @classmethod
+    def get_updated_fields(cls):
+        return ["article_count"] + BaseUpdateSchema.get_updated_fields()
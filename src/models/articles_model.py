@@ -8,6 +8,8 @@ import logging
 
 from sqlalchemy import (
     UniqueConstraint,
+    Index,
+    BigInteger,
     Integer,
     String,
     Text,
@@ -26,6 +28,18 @@ from src.utils.enum_utils import ArticleScrapeStatus
 logger = logging.getLogger(__name__)  # 使用統一的 logger
 
 
+# 延遲載入的大型文字欄位群組
+ARTICLE_BODY_GROUP = "article_body"
+# 由內容計算的 SimHash 指紋欄位 (內部使用，不提供給 API 或匯出)
+FINGERPRINT_COLUMNS = (
+    "simhash",
+    "simhash_band_0",
+    "simhash_band_1",
+    "simhash_band_2",
+    "simhash_band_3",
+)
+
+
 class Articles(Base, BaseEntity):
     """文章模型
 
@@ -47,20 +61,38 @@ class Articles(Base, BaseEntity):
     - scrape_error: 爬取錯誤訊息
     - last_scrape_attempt: 最後爬取嘗試時間
     - task_id: 爬取任務ID
+    - simhash / simhash_band_0~3: 內容的 SimHash 指紋與分段 (近似重複查詢用)
+    - duplicate_of_id: 近似重複時指向的原始文章ID
+    - content_hash: 擷取結果的 SHA-256 雜湊 (重新抓取時判斷內容是否變更)
+    - canonical_link: 標準化後的文章連結 (比對同一篇文章的不同網址形式)
     """
 
     __tablename__ = "articles"
     __table_args__ = (
         # 保留資料庫層面的唯一性約束
         UniqueConstraint("link", name="uq_article_link"),
+        # 供條件請求的版本查詢 max(updated_at) 使用
+        Index("ix_articles_updated_at", "updated_at"),
+        # 近似重複查詢：任一段指紋相同即為候選
+        Index("ix_articles_simhash_band_0", "simhash_band_0"),
+        Index("ix_articles_simhash_band_1", "simhash_band_1"),
+        Index("ix_articles_simhash_band_2", "simhash_band_2"),
+        Index("ix_articles_simhash_band_3", "simhash_band_3"),
     )
 
     title: Mapped[str] = mapped_column(String(500), nullable=False)
-    summary: Mapped[Optional[str]] = mapped_column(Text)
-    content: Mapped[Optional[str]] = mapped_column(Text)
+    # 摘要與內文是最大的欄位，預設延遲載入；列表查詢需要完整物件時由 Repository 一併載入
+    summary: Mapped[Optional[str]] = mapped_column(
+        Text, deferred=True, deferred_group=ARTICLE_BODY_GROUP
+    )
+    content: Mapped[Optional[str]] = mapped_column(
+        Text, deferred=True, deferred_group=ARTICLE_BODY_GROUP
+    )
     link: Mapped[str] = mapped_column(
         String(1000), unique=True, nullable=False, index=True
     )
+    # 由 Repository 在建立文章時計算；不設唯一約束，既有資料可能有多筆對應同一標準連結
+    canonical_link: Mapped[Optional[str]] = mapped_column(String(1000), index=True)
     category: Mapped[Optional[str]] = mapped_column(String(100))
     published_at: Mapped[Optional[datetime]] = mapped_column(AwareDateTime)
     author: Mapped[Optional[str]] = mapped_column(String(100))
@@ -90,6 +122,21 @@ class Articles(Base, BaseEntity):
         Integer, ForeignKey("crawler_tasks.id"), nullable=True
     )
 
+    # 內容的 SimHash 指紋 (有號 64 位元) 與 16 位元分段，由 Repository 在寫入內容時計算
+    simhash: Mapped[Optional[int]] = mapped_column(BigInteger)
+    simhash_band_0: Mapped[Optional[int]] = mapped_column(Integer)
+    simhash_band_1: Mapped[Optional[int]] = mapped_column(Integer)
+    simhash_band_2: Mapped[Optional[int]] = mapped_column(Integer)
+    simhash_band_3: Mapped[Optional[int]] = mapped_column(Integer)
+
+    # 近似重複的文章指向原始文章
+    duplicate_of_id: Mapped[Optional[int]] = mapped_column(
+        Integer, ForeignKey("articles.id", ondelete="SET NULL"), nullable=True, index=True
+    )
+
+    # 擷取結果的雜湊，與重新抓取的結果相同時跳過寫入
+    content_hash: Mapped[Optional[str]] = mapped_column(String(64))
+
     # 新增關聯關係
     task = relationship("CrawlerTasks", back_populates="articles")
 
@@ -81,6 +81,15 @@ LastScrapeAttempt = Annotated[
 TaskId = Annotated[
     Optional[int], BeforeValidator(validate_int("task_id", required=False))
 ]
+DuplicateOfId = Annotated[
+    Optional[int], BeforeValidator(validate_int("duplicate_of_id", required=False))
+]
+CanonicalLink = Annotated[
+    Optional[str], BeforeValidator(validate_str("canonical_link", 1000, required=False))
+]
+ContentHash = Annotated[
+    Optional[str], BeforeValidator(validate_str("content_hash", 64, required=False))
+]
 
 
 class ArticleCreateSchema(BaseCreateSchema):
@@ -103,6 +112,9 @@ class ArticleCreateSchema(BaseCreateSchema):
     scrape_error: ScrapeError = None
     last_scrape_attempt: LastScrapeAttempt = None
     task_id: TaskId = None
+    duplicate_of_id: DuplicateOfId = None
+    content_hash: ContentHash = None
+    canonical_link: CanonicalLink = None
 
     @model_validator(mode="before")
     @classmethod
@@ -144,6 +156,9 @@ class ArticleUpdateSchema(BaseUpdateSchema):
     scrape_error: Optional[ScrapeError] = None
     last_scrape_attempt: Optional[LastScrapeAttempt] = None
     task_id: Optional[TaskId] = None
+    duplicate_of_id: Optional[DuplicateOfId] = None
+    content_hash: Optional[ContentHash] = None
+    canonical_link: Optional[CanonicalLink] = None
 
     @model_validator(mode="before")
     @classmethod
@@ -177,6 +192,9 @@ class ArticleUpdateSchema(BaseUpdateSchema):
             "scrape_error",
             "last_scrape_attempt",
             "task_id",
+            "duplicate_of_id",
+            "content_hash",
+            "canonical_link",
         ] + BaseUpdateSchema.get_updated_fields()
 
 
@@ -201,6 +219,9 @@ class ArticleReadSchema(BaseModel):
     scrape_error: Optional[str] = None
     last_scrape_attempt: Optional[datetime] = None
     task_id: Optional[int] = None
+    duplicate_of_id: Optional[int] = None
+    content_hash: Optional[str] = None
+    canonical_link: Optional[str] = None
     created_at: datetime
     updated_at: datetime
 
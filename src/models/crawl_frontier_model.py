@@ -0,0 +1,111 @@
+"""本模組定義待抓取連結 (crawl frontier) 模型，將發現的文章連結持久化，供爬蟲跨任務依優先度與主機分批領取。"""
+
+from datetime import datetime
+from typing import Any, Dict, Optional
+import logging
+
+from sqlalchemy import JSON, Float, ForeignKey, Index, Integer, String, Text
+from sqlalchemy import Enum as SQLAlchemyEnum
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.models.base_model import Base
+from src.models.base_entity import BaseEntity
+from src.utils.enum_utils import CrawlFrontierStatus
+
+from src.utils.type_utils import AwareDateTime
+
+logger = logging.getLogger(__name__)  # 使用統一的 logger
+
+
+class CrawlFrontier(Base, BaseEntity):
+    """待抓取連結
+
+    欄位說明：
+    - url: 標準化後的文章連結 (唯一)
+    - host: 連結的主機名稱，領取時依主機分散
+    - source: 來源名稱
+    - task_id: 外鍵，最後發現此連結的爬蟲任務
+    - priority: 優先度，數值越高越先領取
+    - ai_score: AI 相關性分數
+    - next_eligible_at: 最早可領取時間 (失敗重試時延後)
+    - attempts: 已領取次數
+    - status: 狀態 (pending/claimed/done/failed)
+    - worker_id: 領取此連結的 worker 識別碼
+    - claimed_at: 領取時間
+    - last_error: 最後一次抓取的錯誤訊息
+    - payload: 發現連結時的文章欄位 (標題、摘要、分類等)
+    """
+
+    __tablename__ = "crawl_frontier"
+    __table_args__ = (
+        Index("ix_crawl_frontier_status_eligible", "status", "next_eligible_at"),
+        Index(
+            "ix_crawl_frontier_status_source_eligible",
+            "status",
+            "source",
+            "next_eligible_at",
+        ),
+    )
+
+    url: Mapped[str] = mapped_column(String(1000), unique=True, nullable=False)
+    host: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
+    source: Mapped[Optional[str]] = mapped_column(String(50))
+    task_id: Mapped[Optional[int]] = mapped_column(
+        Integer,
+        ForeignKey("crawler_tasks.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+    priority: Mapped[float] = mapped_column(Float, default=0.0, nullable=False)
+    ai_score: Mapped[Optional[float]] = mapped_column(Float)
+    next_eligible_at: Mapped[datetime] = mapped_column(AwareDateTime, nullable=False)
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    status: Mapped[CrawlFrontierStatus] = mapped_column(
+        SQLAlchemyEnum(
+            CrawlFrontierStatus,
+            values_callable=lambda x: [str(e.value) for e in CrawlFrontierStatus],
+            native_enum=False,
+        ),
+        default=CrawlFrontierStatus.PENDING,
+        nullable=False,
+    )
+    worker_id: Mapped[Optional[str]] = mapped_column(String(255))
+    claimed_at: Mapped[Optional[datetime]] = mapped_column(AwareDateTime)
+    last_error: Mapped[Optional[str]] = mapped_column(Text)
+    payload: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSON)
+
+    # 定義需要監聽的 datetime 欄位
+    _aware_datetime_fields = Base._aware_datetime_fields.union(
+        {"next_eligible_at", "claimed_at"}
+    )
+
+    def __init__(self, **kwargs):
+        if "status" not in kwargs:
+            kwargs["status"] = CrawlFrontierStatus.PENDING
+        if "attempts" not in kwargs:
+            kwargs["attempts"] = 0
+        if kwargs.get("priority") is None:
+            kwargs["priority"] = 0.0
+        super().__init__(**kwargs)
+
+    def __repr__(self):
+        return f"<CrawlFrontier(id={self.id}, url='{self.url}', status='{self.status}', priority={self.priority})>"
+
+    def to_dict(self):
+        return {
+            **super().to_dict(),
+            "url": self.url,
+            "host": self.host,
+            "source": self.source,
+            "task_id": self.task_id,
+            "priority": self.priority,
+            "ai_score": self.ai_score,
+            "next_eligible_at": (
+                self.next_eligible_at.isoformat() if self.next_eligible_at else None
+            ),
+            "attempts": self.attempts,
+            "status": self.status.value if self.status else None,
+            "worker_id": self.worker_id,
+            "claimed_at": self.claimed_at.isoformat() if self.claimed_at else None,
+            "last_error": self.last_error,
+            "payload": self.payload,
+        }
@@ -0,0 +1,165 @@
+"""本模組定義待抓取連結的 Schema 類別，包括創建、更新和讀取的資料驗證與轉換功能。"""
+
+from typing import Annotated, Optional, Any, Dict
+from pydantic import BaseModel, BeforeValidator, model_validator, ConfigDict
+from datetime import datetime
+import logging
+
+from src.utils.model_utils import (
+    validate_str,
+    validate_url,
+    validate_datetime,
+    validate_positive_int,
+    validate_positive_float,
+    validate_crawl_frontier_status,
+)
+from src.utils.schema_utils import (
+    validate_required_fields_schema,
+    validate_update_schema,
+)
+from src.models.base_schema import BaseCreateSchema, BaseUpdateSchema
+from src.utils.enum_utils import CrawlFrontierStatus
+
+
+logger = logging.getLogger(__name__)  # 使用統一的 logger
+
+# 通用字段定義
+Url = Annotated[str, BeforeValidator(validate_url("url", max_length=1000, required=True))]
+Host = Annotated[str, BeforeValidator(validate_str("host", max_length=255, required=True))]
+Source = Annotated[
+    Optional[str], BeforeValidator(validate_str("source", max_length=50, required=False))
+]
+TaskId = Annotated[
+    Optional[int],
+    BeforeValidator(
+        validate_positive_int("task_id", is_zero_allowed=False, required=False)
+    ),
+]
+Priority = Annotated[
+    float,
+    BeforeValidator(validate_positive_float("priority", is_zero_allowed=True, required=False)),
+]
+AiScore = Annotated[
+    Optional[float],
+    BeforeValidator(validate_positive_float("ai_score", is_zero_allowed=True, required=False)),
+]
+NextEligibleAt = Annotated[
+    datetime, BeforeValidator(validate_datetime("next_eligible_at", required=True))
+]
+FrontierStatus = Annotated[
+    CrawlFrontierStatus,
+    BeforeValidator(validate_crawl_frontier_status("status", required=True)),
+]
+WorkerId = Annotated[
+    Optional[str],
+    BeforeValidator(validate_str("worker_id", max_length=255, required=False)),
+]
+ClaimedAt = Annotated[
+    Optional[datetime], BeforeValidator(validate_datetime("claimed_at", required=False))
+]
+Attempts = Annotated[
+    int,
+    BeforeValidator(
+        validate_positive_int("attempts", is_zero_allowed=True, required=False)
+    ),
+]
+LastError = Annotated[
+    Optional[str],
+    BeforeValidator(validate_str("last_error", max_length=65536, required=False)),
+]
+
+
+class CrawlFrontierCreateSchema(BaseCreateSchema):
+    """待抓取連結創建模型"""
+
+    url: Url
+    host: Host
+    source: Source = None
+    task_id: TaskId = None
+    priority: Priority = 0.0
+    ai_score: AiScore = None
+    next_eligible_at: NextEligibleAt
+    status: FrontierStatus = CrawlFrontierStatus.PENDING
+    attempts: Attempts = 0
+    payload: Optional[Dict[str, Any]] = None
+
+    @model_validator(mode="before")
+    @classmethod
+    def validate_required_fields(cls, data):
+        """驗證必填欄位"""
+        if isinstance(data, dict):
+            required_fields = CrawlFrontierCreateSchema.get_required_fields()
+            return validate_required_fields_schema(required_fields, data)
+
+    @classmethod
+    def get_required_fields(cls):
+        return ["url", "host", "next_eligible_at"]
+
+
+class CrawlFrontierUpdateSchema(BaseUpdateSchema):
+    """待抓取連結更新模型"""
+
+    source: Optional[Source] = None
+    task_id: Optional[TaskId] = None
+    priority: Optional[Priority] = None
+    ai_score: Optional[AiScore] = None
+    next_eligible_at: Optional[NextEligibleAt] = None
+    status: Optional[FrontierStatus] = None
+    worker_id: Optional[WorkerId] = None
+    claimed_at: Optional[ClaimedAt] = None
+    attempts: Optional[Attempts] = None
+    last_error: Optional[LastError] = None
+    payload: Optional[Dict[str, Any]] = None
+
+    @model_validator(mode="before")
+    @classmethod
+    def validate_update(cls, data):
+        """驗證更新操作"""
+        if isinstance(data, dict):
+            return validate_update_schema(
+                cls.get_immutable_fields(), cls.get_updated_fields(), data
+            )
+
+    @classmethod
+    def get_immutable_fields(cls):
+        return ["url", "host"] + BaseUpdateSchema.get_immutable_fields()
+
+    @classmethod
+    def get_updated_fields(cls):
+        return [
+            "source",
+            "task_id",
+            "priority",
+            "ai_score",
+            "next_eligible_at",
+            "status",
+            "worker_id",
+            "claimed_at",
+            "attempts",
+            "last_error",
+            "payload",
+        ] + BaseUpdateSchema.get_updated_fields()
+
+
+class CrawlFrontierReadSchema(BaseModel):
+    """用於 API 響應的待抓取連結數據模型"""
+
+    id: int
+    url: str
+    host: str
+    source: Optional[str] = None
+    task_id: Optional[int] = None
+    priority: float
+    ai_score: Optional[float] = None
+    next_eligible_at: datetime
+    attempts: int
+    status: CrawlFrontierStatus
+    worker_id: Optional[str] = None
+    claimed_at: Optional[datetime] = None
+    last_error: Optional[str] = None
+    payload: Optional[Dict[str, Any]] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    # Pydantic V2 配置: 允許從 ORM 屬性創建模型
+    model_config = ConfigDict(from_attributes=True)
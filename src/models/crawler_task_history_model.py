@@ -4,7 +4,7 @@ from datetime import datetime
 from typing import Optional
 import logging
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, Text
+from sqlalchemy import JSON, Boolean, DateTime, ForeignKey, Index, Integer, Text
 from sqlalchemy import Enum as SQLAlchemyEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -28,9 +28,14 @@ class CrawlerTaskHistory(Base, BaseEntity):
     - message: 訊息
     - task_status: 任務狀態
     - articles_count: 文章數量
+    - category_stats: 各類別的抓取統計 (頁數、請求數、新連結數、新連結/請求比例)
     """
 
     __tablename__ = "crawler_task_history"
+    __table_args__ = (
+        # 供條件請求的版本查詢 max(updated_at) 使用
+        Index("ix_crawler_task_history_updated_at", "updated_at"),
+    )
 
     task_id: Mapped[int] = mapped_column(
         Integer, ForeignKey("crawler_tasks.id"), nullable=False
@@ -40,6 +45,7 @@ class CrawlerTaskHistory(Base, BaseEntity):
     success: Mapped[Optional[bool]] = mapped_column(Boolean)
     message: Mapped[Optional[str]] = mapped_column(Text)
     articles_count: Mapped[Optional[int]] = mapped_column(Integer)
+    category_stats: Mapped[Optional[dict]] = mapped_column(JSON)
     task_status: Mapped[TaskStatus] = mapped_column(
         SQLAlchemyEnum(
             TaskStatus,
@@ -75,6 +81,7 @@ class CrawlerTaskHistory(Base, BaseEntity):
             "success": self.success,
             "message": self.message,
             "articles_count": self.articles_count,
+            "category_stats": self.category_stats,
             "task_status": self.task_status.value if self.task_status else None,
             "duration": (
                 (self.end_time - self.start_time).total_seconds()
@@ -61,6 +61,7 @@ class CrawlerTaskHistoryCreateSchema(BaseCreateSchema):
     message: Message = None
     articles_count: ArticlesCount = None
     task_status: TaskStatusValidator = TaskStatus.INIT
+    category_stats: Optional[Dict[str, Any]] = None
 
     @model_validator(mode="before")
     @classmethod
@@ -84,6 +85,7 @@ class CrawlerTaskHistoryUpdateSchema(BaseUpdateSchema):
     message: Optional[Message] = None
     articles_count: Optional[ArticlesCount] = None
     task_status: Optional[TaskStatusValidator] = None
+    category_stats: Optional[Dict[str, Any]] = None
 
     @model_validator(mode="before")
     @classmethod
@@ -107,6 +109,7 @@ class CrawlerTaskHistoryUpdateSchema(BaseUpdateSchema):
             "message",
             "articles_count",
             "task_status",
+            "category_stats",
         ] + BaseUpdateSchema.get_updated_fields()
 
 
@@ -124,6 +127,7 @@ class CrawlerTaskHistoryReadSchema(BaseModel):
     message: Optional[str] = None
     articles_count: Optional[int] = None
     task_status: TaskStatus
+    category_stats: Optional[Dict[str, Any]] = None
     created_at: datetime
     updated_at: datetime
 
@@ -1,13 +1,15 @@
 """本模組定義爬蟲任務模型，用於管理和追蹤爬蟲任務的執行狀態、設定和結果。"""
 
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional
 import logging
+import os
 
 from sqlalchemy import (
     Boolean,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     JSON,
     String,
@@ -15,16 +17,37 @@ from sqlalchemy import (
     VARCHAR,
 )
 from sqlalchemy import Enum as SQLAlchemyEnum
+from sqlalchemy import event, inspect
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.models.base_model import Base
 from src.models.base_entity import BaseEntity
+from src.utils.datetime_utils import calculate_next_cron_run
 from src.utils.enum_utils import ScrapePhase, ScrapeMode, TaskStatus
 
 from src.utils.type_utils import AwareDateTime
 
 logger = logging.getLogger(__name__)  # 使用統一的 logger
 
+# 任務執行歷史會無限增長，預設不隨任務載入 (noload)；需要歷史時以
+# CrawlerTasksRepository.get_task_with_history 明確載入。
+# 可由環境變數 CRAWLER_TASK_HISTORY_LOADING 改為 selectin 或 select。
+TASK_HISTORY_LOADING_STRATEGIES = ("noload", "selectin", "select")
+DEFAULT_TASK_HISTORY_LOADING = "noload"
+
+
+def _task_history_loading() -> str:
+    strategy = os.getenv("CRAWLER_TASK_HISTORY_LOADING", DEFAULT_TASK_HISTORY_LOADING)
+    if strategy not in TASK_HISTORY_LOADING_STRATEGIES:
+        logger.warning(
+            "CRAWLER_TASK_HISTORY_LOADING 值 '%s' 無效，使用預設值: %s",
+            strategy,
+            DEFAULT_TASK_HISTORY_LOADING,
+        )
+        return DEFAULT_TASK_HISTORY_LOADING
+    return strategy
+
+
 TASK_ARGS_DEFAULT = {
     "max_pages": 10,
     "ai_only": False,
@@ -37,6 +60,7 @@ TASK_ARGS_DEFAULT = {
     "is_test": False,
     "save_to_csv": False,
     "csv_file_prefix": "",
+    "result_format": "parquet",
     "save_to_database": True,
     "scrape_mode": ScrapeMode.FULL_SCRAPE.value,
     "get_links_by_task_id": False,
@@ -63,6 +87,7 @@ class CrawlerTasks(Base, BaseEntity):
     - last_run_success: 上次執行成功與否
     - last_run_message: 上次執行訊息
     - cron_expression: 排程-cron表達式
+    - next_run_at: 下次排定執行時間 (依 cron_expression 與 last_run_at 自動計算，供待執行任務查詢使用)
     - scrape_phase: 當前爬取階段
     - task_status: 當前任務狀態
     - retry_count: 重試次數
@@ -78,6 +103,8 @@ class CrawlerTasks(Base, BaseEntity):
         - is_test: 是否為測試模式
         - save_to_csv: 是否保存到CSV文件
         - csv_file_prefix: CSV檔案名稱前綴，最終文件名格式為 {前綴}_{任務ID}_{時間戳}.csv
+        - result_format: 結果檔案格式 (csv 或 parquet)，parquet 依任務與日期分區保存在 logs/task={任務ID}/date={日期}/ 下，未設定時沿用 csv
+        - result_batch_size: 寫入結果檔案時每批的文章數
         - save_to_database: 是否保存到資料庫
         - scrape_mode: 抓取模式 (LINKS_ONLY, CONTENT_ONLY, FULL_SCRAPE)
         - get_links_by_task_id: 是否從資料庫根據任務ID獲取要抓取內容的文章(scrape_mode=CONTENT_ONLY時有效)
@@ -87,9 +114,17 @@ class CrawlerTasks(Base, BaseEntity):
         - max_cancel_wait: 最大取消等待時間
         - cancel_interrupt_interval: 取消等待間隔
         - cancel_timeout: 取消超時時間
+        - schedule_jitter_sec: (可選) 排程觸發的隨機抖動秒數，未設定時使用全域 SCHEDULER_JITTER_SEC
+        - adaptive_revisit: (可選) 是否依各類別的新連結產出調整重訪頻率與頁數 (max_pages 為上限)
+        - min_pages: (可選) 調整重訪時每個類別最少抓取的頁數，未設定時使用全域 REVISIT_MIN_PAGES
+        - revisit_max_interval_sec: (可選) 調整重訪時類別最長的重訪間隔秒數，未設定時使用全域 REVISIT_MAX_INTERVAL_SEC
+    - revisit_state: 各類別的重訪狀態 (頁數、重訪間隔、下次重訪時間、平均新連結數)，由 adaptive_revisit 任務自動維護
     """
 
     __tablename__ = "crawler_tasks"
+    __table_args__ = (
+        Index("ix_crawler_tasks_due", "is_auto", "is_active", "next_run_at"),
+    )
 
     task_name: Mapped[str] = mapped_column(String(255), nullable=False)
     crawler_id: Mapped[int] = mapped_column(
@@ -105,6 +140,8 @@ class CrawlerTasks(Base, BaseEntity):
     last_run_success: Mapped[Optional[bool]] = mapped_column(Boolean)
     last_run_message: Mapped[Optional[str]] = mapped_column(Text)
     cron_expression: Mapped[Optional[str]] = mapped_column(VARCHAR(255))
+    next_run_at: Mapped[Optional[datetime]] = mapped_column(AwareDateTime)
+    revisit_state: Mapped[Optional[dict]] = mapped_column(JSON)
 
     scrape_phase: Mapped[ScrapePhase] = mapped_column(
         SQLAlchemyEnum(
@@ -127,9 +164,13 @@ class CrawlerTasks(Base, BaseEntity):
 
     articles = relationship("Articles", back_populates="task")
     crawler = relationship("Crawlers", back_populates="crawler_tasks", lazy="joined")
-    history = relationship("CrawlerTaskHistory", back_populates="task", lazy="joined")
+    history = relationship(
+        "CrawlerTaskHistory", back_populates="task", lazy=_task_history_loading()
+    )
 
-    _aware_datetime_fields = Base._aware_datetime_fields.union({"last_run_at"})
+    _aware_datetime_fields = Base._aware_datetime_fields.union(
+        {"last_run_at", "next_run_at"}
+    )
 
     def __init__(self, **kwargs):
         if "is_auto" not in kwargs:
@@ -149,6 +190,32 @@ class CrawlerTasks(Base, BaseEntity):
 
         super().__init__(**kwargs)
 
+    def refresh_next_run_at(self, now: Optional[datetime] = None) -> Optional[datetime]:
+        """依 cron_expression 與 last_run_at 重新計算 next_run_at
+
+        - 未設定 cron 表達式: None (不會被視為待執行)
+        - 從未執行: 現在 (立即視為待執行)
+        - 其他: last_run_at 之後的下一個排定時間
+        """
+        if not self.cron_expression:
+            self.next_run_at = None
+        elif self.last_run_at is None:
+            self.next_run_at = now or datetime.now(timezone.utc)
+        else:
+            try:
+                self.next_run_at = calculate_next_cron_run(
+                    self.cron_expression, self.last_run_at
+                )
+            except ValueError as e:
+                logger.error(
+                    "計算任務 %s 的下次執行時間時出錯 (%s): %s",
+                    self.id,
+                    self.cron_expression,
+                    e,
+                )
+                self.next_run_at = None
+        return self.next_run_at
+
     def __repr__(self):
         return f"<CrawlerTask(id={self.id}, task_name={self.task_name}, crawler_id={self.crawler_id})>"
 
@@ -166,7 +233,27 @@ class CrawlerTasks(Base, BaseEntity):
             "last_run_success": self.last_run_success,
             "last_run_message": self.last_run_message,
             "cron_expression": self.cron_expression,
+            "next_run_at": self.next_run_at.isoformat() if self.next_run_at else None,
+            "revisit_state": self.revisit_state,
             "scrape_phase": self.scrape_phase.value if self.scrape_phase else None,
             "retry_count": self.retry_count,
             "task_status": self.task_status.value if self.task_status else None,
         }
+
+
+@event.listens_for(CrawlerTasks, "before_insert")
+def _set_next_run_at_on_insert(_mapper, _connection, target: CrawlerTasks):
+    """新增任務時計算 next_run_at"""
+    target.refresh_next_run_at()
+
+
+@event.listens_for(CrawlerTasks, "before_update")
+def _set_next_run_at_on_update(_mapper, _connection, target: CrawlerTasks):
+    """排程設定或上次執行時間變更時重新計算 next_run_at"""
+    state = inspect(target)
+    if (
+        state.attrs.cron_expression.history.has_changes()
+        or state.attrs.last_run_at.history.has_changes()
+        or (target.cron_expression and target.next_run_at is None)
+    ):
+        target.refresh_next_run_at()
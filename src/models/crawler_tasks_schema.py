@@ -139,6 +139,7 @@ class CrawlerTasksUpdateSchema(BaseUpdateSchema):
     scrape_phase: Optional[CurrentPhase] = None
     retry_count: Optional[RetryCount] = None
     task_status: Optional[TaskStatusValidator] = None
+    revisit_state: Optional[Dict[str, Any]] = None
 
     # 添加 model_config 來處理序列化
     model_config = ConfigDict(
@@ -165,6 +166,7 @@ class CrawlerTasksUpdateSchema(BaseUpdateSchema):
             "scrape_phase",
             "retry_count",
             "task_status",
+            "revisit_state",
         ] + BaseUpdateSchema.get_updated_fields()
 
     @model_validator(mode="before")
@@ -197,9 +199,11 @@ class CrawlerTaskReadSchema(BaseModel):
     last_run_success: Optional[bool] = None
     last_run_message: Optional[str] = None
     cron_expression: Optional[str] = None
+    next_run_at: Optional[datetime] = None
     scrape_phase: Optional[ScrapePhase] = None
     task_status: TaskStatus
     retry_count: int
+    revisit_state: Optional[Dict[str, Any]] = None
     created_at: datetime
     updated_at: datetime
 
@@ -0,0 +1,35 @@
+"""本模組定義排程變更記錄模型，用於將任務的排程相關變更增量同步到排程器。"""
+
+import logging
+
+from sqlalchemy import Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.models.base_model import Base
+from src.models.base_entity import BaseEntity
+
+logger = logging.getLogger(__name__)  # 使用統一的 logger
+
+
+class SchedulerTaskChange(Base, BaseEntity):
+    """排程變更記錄
+
+    任務新增、更新、刪除或切換自動/啟用狀態時寫入一筆記錄 (與任務變更同一交易)，
+    排程器依遞增的 id 讀取尚未套用的記錄，只重新排程有變更的任務。
+
+    欄位說明：
+    - task_id: 有變更的任務 ID (任務刪除後仍需保留記錄，因此不設外鍵)
+    """
+
+    __tablename__ = "scheduler_task_changes"
+
+    task_id: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<SchedulerTaskChange(id={self.id}, task_id={self.task_id})>"
+
+    def to_dict(self):
+        return {
+            **super().to_dict(),
+            "task_id": self.task_id,
+        }
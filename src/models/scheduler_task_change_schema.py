@@ -0,0 +1,61 @@
+"""本模組定義排程變更記錄的 Schema 類別，包括創建與更新的資料驗證。"""
+
+from typing import Annotated
+from pydantic import BeforeValidator, model_validator
+import logging
+
+from src.utils.model_utils import validate_positive_int
+from src.utils.schema_utils import (
+    validate_required_fields_schema,
+    validate_update_schema,
+)
+from src.models.base_schema import BaseCreateSchema, BaseUpdateSchema
+
+
+logger = logging.getLogger(__name__)  # 使用統一的 logger
+
+TaskId = Annotated[
+    int,
+    BeforeValidator(
+        validate_positive_int("task_id", is_zero_allowed=False, required=True)
+    ),
+]
+
+
+class SchedulerTaskChangeCreateSchema(BaseCreateSchema):
+    """排程變更記錄創建模型"""
+
+    task_id: TaskId
+
+    @model_validator(mode="before")
+    @classmethod
+    def validate_required_fields(cls, data):
+        """驗證必填欄位"""
+        if isinstance(data, dict):
+            required_fields = SchedulerTaskChangeCreateSchema.get_required_fields()
+            return validate_required_fields_schema(required_fields, data)
+
+    @classmethod
+    def get_required_fields(cls):
+        return ["task_id"]
+
+
+class SchedulerTaskChangeUpdateSchema(BaseUpdateSchema):
+    """排程變更記錄更新模型 (記錄寫入後不可修改)"""
+
+    @model_validator(mode="before")
+    @classmethod
+    def validate_update(cls, data):
+        """驗證更新操作"""
+        if isinstance(data, dict):
+            return validate_update_schema(
+                cls.get_immutable_fields(), cls.get_updated_fields(), data
+            )
+
+    @classmethod
+    def get_immutable_fields(cls):
+        return ["task_id"] + BaseUpdateSchema.get_immutable_fields()
+
+    @classmethod
+    def get_updated_fields(cls):
+        return BaseUpdateSchema.get_updated_fields()
@@ -0,0 +1,100 @@
+"""本模組定義任務佇列模型，用於多節點 worker 模式下以資料庫作為爬蟲任務的派工佇列。"""
+
+from datetime import datetime
+from typing import Any, Dict, Optional
+import logging
+
+from sqlalchemy import JSON, ForeignKey, Index, Integer, String, Text
+from sqlalchemy import Enum as SQLAlchemyEnum
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.models.base_model import Base
+from src.models.base_entity import BaseEntity
+from src.utils.enum_utils import TaskQueueStatus
+
+from src.utils.type_utils import AwareDateTime
+
+logger = logging.getLogger(__name__)  # 使用統一的 logger
+
+
+class TaskQueue(Base, BaseEntity):
+    """任務佇列項目
+
+    欄位說明：
+    - task_id: 外鍵，關聯爬蟲任務
+    - history_id: 外鍵，關聯本次執行的歷史記錄
+    - status: 佇列狀態 (queued/claimed/completed/failed/cancelled)
+    - worker_id: 領取此項目的 worker 識別碼
+    - claimed_at: 領取時間
+    - heartbeat_at: 最後心跳時間
+    - finished_at: 結束時間
+    - attempts: 已領取次數
+    - payload: 執行參數
+    - result: 執行結果
+    - error_message: 錯誤訊息
+    """
+
+    __tablename__ = "task_queue"
+    __table_args__ = (Index("ix_task_queue_status_id", "status", "id"),)
+
+    task_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("crawler_tasks.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    history_id: Mapped[Optional[int]] = mapped_column(
+        Integer,
+        ForeignKey("crawler_task_history.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+    status: Mapped[TaskQueueStatus] = mapped_column(
+        SQLAlchemyEnum(
+            TaskQueueStatus,
+            values_callable=lambda x: [str(e.value) for e in TaskQueueStatus],
+            native_enum=False,
+        ),
+        default=TaskQueueStatus.QUEUED,
+        nullable=False,
+    )
+    worker_id: Mapped[Optional[str]] = mapped_column(String(255))
+    claimed_at: Mapped[Optional[datetime]] = mapped_column(AwareDateTime)
+    heartbeat_at: Mapped[Optional[datetime]] = mapped_column(AwareDateTime)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(AwareDateTime)
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    payload: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSON)
+    result: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSON)
+    error_message: Mapped[Optional[str]] = mapped_column(Text)
+
+    # 定義需要監聽的 datetime 欄位
+    _aware_datetime_fields = Base._aware_datetime_fields.union(
+        {"claimed_at", "heartbeat_at", "finished_at"}
+    )
+
+    def __init__(self, **kwargs):
+        if "status" not in kwargs:
+            kwargs["status"] = TaskQueueStatus.QUEUED
+        if "attempts" not in kwargs:
+            kwargs["attempts"] = 0
+        super().__init__(**kwargs)
+
+    def __repr__(self):
+        return f"<TaskQueue(id={self.id}, task_id={self.task_id}, status='{self.status}', worker_id='{self.worker_id}')>"
+
+    def to_dict(self):
+        return {
+            **super().to_dict(),
+            "task_id": self.task_id,
+            "history_id": self.history_id,
+            "status": self.status.value if self.status else None,
+            "worker_id": self.worker_id,
+            "claimed_at": self.claimed_at.isoformat() if self.claimed_at else None,
+            "heartbeat_at": (
+                self.heartbeat_at.isoformat() if self.heartbeat_at else None
+            ),
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "attempts": self.attempts,
+            "payload": self.payload,
+            "result": self.result,
+            "error_message": self.error_message,
+        }
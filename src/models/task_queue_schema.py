@@ -0,0 +1,148 @@
+"""本模組定義任務佇列的 Schema 類別，包括創建、更新和讀取的資料驗證與轉換功能。"""
+
+from typing import Annotated, Optional, Any, Dict
+from pydantic import BaseModel, BeforeValidator, model_validator, ConfigDict
+from datetime import datetime
+import logging
+
+from src.utils.model_utils import (
+    validate_str,
+    validate_datetime,
+    validate_positive_int,
+    validate_task_queue_status,
+)
+from src.utils.schema_utils import (
+    validate_required_fields_schema,
+    validate_update_schema,
+)
+from src.models.base_schema import BaseCreateSchema, BaseUpdateSchema
+from src.utils.enum_utils import TaskQueueStatus
+
+
+logger = logging.getLogger(__name__)  # 使用統一的 logger
+
+# 通用字段定義
+TaskId = Annotated[
+    int,
+    BeforeValidator(
+        validate_positive_int("task_id", is_zero_allowed=False, required=True)
+    ),
+]
+HistoryId = Annotated[
+    Optional[int],
+    BeforeValidator(
+        validate_positive_int("history_id", is_zero_allowed=False, required=False)
+    ),
+]
+QueueStatus = Annotated[
+    TaskQueueStatus,
+    BeforeValidator(validate_task_queue_status("status", required=True)),
+]
+WorkerId = Annotated[
+    Optional[str],
+    BeforeValidator(validate_str("worker_id", max_length=255, required=False)),
+]
+ClaimedAt = Annotated[
+    Optional[datetime], BeforeValidator(validate_datetime("claimed_at", required=False))
+]
+HeartbeatAt = Annotated[
+    Optional[datetime],
+    BeforeValidator(validate_datetime("heartbeat_at", required=False)),
+]
+FinishedAt = Annotated[
+    Optional[datetime],
+    BeforeValidator(validate_datetime("finished_at", required=False)),
+]
+Attempts = Annotated[
+    int,
+    BeforeValidator(
+        validate_positive_int("attempts", is_zero_allowed=True, required=False)
+    ),
+]
+ErrorMessage = Annotated[
+    Optional[str],
+    BeforeValidator(validate_str("error_message", max_length=65536, required=False)),
+]
+
+
+class TaskQueueCreateSchema(BaseCreateSchema):
+    """任務佇列項目創建模型"""
+
+    task_id: TaskId
+    history_id: HistoryId = None
+    status: QueueStatus = TaskQueueStatus.QUEUED
+    attempts: Attempts = 0
+    payload: Optional[Dict[str, Any]] = None
+
+    @model_validator(mode="before")
+    @classmethod
+    def validate_required_fields(cls, data):
+        """驗證必填欄位"""
+        if isinstance(data, dict):
+            required_fields = TaskQueueCreateSchema.get_required_fields()
+            return validate_required_fields_schema(required_fields, data)
+
+    @classmethod
+    def get_required_fields(cls):
+        return ["task_id"]
+
+
+class TaskQueueUpdateSchema(BaseUpdateSchema):
+    """任務佇列項目更新模型"""
+
+    status: Optional[QueueStatus] = None
+    worker_id: Optional[WorkerId] = None
+    claimed_at: Optional[ClaimedAt] = None
+    heartbeat_at: Optional[HeartbeatAt] = None
+    finished_at: Optional[FinishedAt] = None
+    attempts: Optional[Attempts] = None
+    result: Optional[Dict[str, Any]] = None
+    error_message: Optional[ErrorMessage] = None
+
+    @model_validator(mode="before")
+    @classmethod
+    def validate_update(cls, data):
+        """驗證更新操作"""
+        if isinstance(data, dict):
+            return validate_update_schema(
+                cls.get_immutable_fields(), cls.get_updated_fields(), data
+            )
+
+    @classmethod
+    def get_immutable_fields(cls):
+        return ["task_id", "history_id", "payload"] + BaseUpdateSchema.get_immutable_fields()
+
+    @classmethod
+    def get_updated_fields(cls):
+        return [
+            "status",
+            "worker_id",
+            "claimed_at",
+            "heartbeat_at",
+            "finished_at",
+            "attempts",
+            "result",
+            "error_message",
+        ] + BaseUpdateSchema.get_updated_fields()
+
+
+class TaskQueueReadSchema(BaseModel):
+    """用於 API 響應的任務佇列項目數據模型"""
+
+    id: int
+    task_id: int
+    history_id: Optional[int] = None
+    status: TaskQueueStatus
+    worker_id: Optional[str] = None
+    claimed_at: Optional[datetime] = None
+    heartbeat_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    attempts: int
+    payload: Optional[Dict[str, Any]] = None
+    result: Optional[Dict[str, Any]] = None
+    error_message: Optional[str] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    # Pydantic V2 配置: 允許從 ORM 屬性創建模型
+    model_config = ConfigDict(from_attributes=True)
@@ -12,6 +12,7 @@ from typing import Optional, Dict, Any, List, Type, cast, Union, Tuple
 from sqlalchemy.orm.attributes import instance_state
 
 # 本地應用程式導入
+from src.database.article_stats_repository import ArticleStatsRepository
 from src.database.articles_repository import ArticlesRepository
 from src.database.base_repository import BaseRepository, SchemaType
 from src.error.errors import (
@@ -19,9 +20,15 @@ from src.error.errors import (
     ValidationError,
     InvalidOperationError,
 )
+from src.models.article_stats_model import ArticleStats
 from src.models.articles_model import Base, Articles, ArticleScrapeStatus
 from src.models.articles_schema import ArticleReadSchema, PaginatedArticleResponse
 from src.services.base_service import BaseService
+from src.services.query_cache import QueryCache, cached_query
+from src.utils.simhash_utils import (
+    NEAR_DUPLICATE_POLICY_SKIP,
+    get_near_duplicate_policy,
+)
   # 使用統一的 logger
 
 logger = logging.getLogger(__name__)  # 使用統一的 logger  # 使用統一的 logger
@@ -35,12 +42,18 @@ class ArticleService(BaseService[Articles]):
 
     def __init__(self, db_manager=None):
         super().__init__(db_manager)
+        self.query_cache = QueryCache(
+            "ArticleService", version_loader=self.get_query_cache_version
+        )
 
     def _get_repository_mapping(
         self,
     ) -> Dict[str, Tuple[Type[BaseRepository], Type[Base]]]:
         """提供儲存庫映射"""
-        return {"Article": (ArticlesRepository, Articles)}
+        return {
+            "Article": (ArticlesRepository, Articles),
+            "ArticleStats": (ArticleStatsRepository, ArticleStats),
+        }
 
     def validate_article_data(
         self, data: Dict[str, Any], is_update: bool = False
@@ -151,10 +164,16 @@ class ArticleService(BaseService[Articles]):
         """
         批量創建或更新文章。
         如果文章連結已存在，則更新；否則創建新文章。
+        內容與既有文章近似重複的新文章，依 NEAR_DUPLICATE_POLICY 跳過 (skip) 或連結到原始文章 (link)。
+        已存在且內容雜湊未變更的文章不載入也不寫入內容，只更新抓取中繼資料 (task_id、last_scrape_attempt)，
+        計入 update_count 與 unchanged_count。
         """
         success_count = 0
         update_count = 0
+        unchanged_count = 0
         fail_count = 0
+        skipped_duplicates: List[Dict[str, Any]] = []
+        skip_duplicates = get_near_duplicate_policy() == NEAR_DUPLICATE_POLICY_SKIP
         inserted_articles_orm: List[Articles] = []
         updated_articles_orm: List[Articles] = []
         failed_articles_details: List[Dict[str, Any]] = []
@@ -169,6 +188,9 @@ class ArticleService(BaseService[Articles]):
                 article_repo = cast(
                     ArticlesRepository, self._get_repository("Article", session)
                 )
+                unchanged_links = article_repo.find_unchanged_links(articles_data)
+                if unchanged_links:
+                    article_repo.update_unchanged_metadata(articles_data, unchanged_links)
 
                 for item_data in articles_data:
                     link = item_data.get("link")
@@ -180,6 +202,12 @@ class ArticleService(BaseService[Articles]):
                         if not link:
                             raise ValidationError("文章資料缺少 'link' 欄位")
 
+                        if link in unchanged_links:
+                            logger.debug("批量處理：連結 '%s' 內容未變更，跳過更新。", link)
+                            update_count += 1
+                            unchanged_count += 1
+                            continue
+
                         existing_article = article_repo.find_by_link(link)
 
                         if existing_article:
@@ -208,6 +236,21 @@ class ArticleService(BaseService[Articles]):
                             validated_data = self.validate_article_data(
                                 item_data, is_update=False
                             )
+                            if skip_duplicates:
+                                canonical_id = article_repo.find_canonical_duplicate(
+                                    validated_data.get("content")
+                                )
+                                if canonical_id is not None:
+                                    logger.info(
+                                        "批量處理：連結 '%s' 與文章 ID=%s 近似重複，跳過。",
+                                        link,
+                                        canonical_id,
+                                    )
+                                    skipped_duplicates.append(
+                                        {"link": link, "duplicate_of_id": canonical_id}
+                                    )
+                                    item_success = True
+                                    continue
                             new_article = article_repo.create(validated_data)
 
                             if new_article:
@@ -297,11 +340,21 @@ class ArticleService(BaseService[Articles]):
                     ArticleReadSchema.model_validate(a) for a in valid_updated_orms
                 ]
 
+            linked_duplicate_count = sum(
+                1 for a in inserted_schemas + updated_schemas if a.duplicate_of_id
+            )
             message = (
                 f"批量處理文章完成：新增 {success_count} 筆，"
                 f"更新 {update_count} 筆，"
                 f"失敗 {fail_count} 筆"
             )
+            if unchanged_count:
+                message += f"，內容未變更 {unchanged_count} 筆"
+            if skipped_duplicates or linked_duplicate_count:
+                message += (
+                    f"，近似重複：跳過 {len(skipped_duplicates)} 筆、"
+                    f"連結 {linked_duplicate_count} 筆"
+                )
             final_result_msg = {
                 "success_count": success_count,
                 "update_count": update_count,
@@ -309,6 +362,10 @@ class ArticleService(BaseService[Articles]):
                 "inserted_articles": inserted_schemas,
                 "updated_articles": updated_schemas,
                 "failed_details": failed_articles_details,
+                "skipped_duplicates": skipped_duplicates,
+                "linked_duplicate_count": linked_duplicate_count,
+                "unchanged_count": unchanged_count,
+                "unchanged_links": sorted(unchanged_links),
             }
             overall_success = fail_count == 0
 
@@ -530,6 +587,25 @@ class ArticleService(BaseService[Articles]):
             logger.error("根據連結獲取文章失敗, link=%s: %s", link, e, exc_info=True)
             return {"success": False, "message": error_msg, "article": None}
 
+    def find_existing_links(self, links: List[str]) -> Dict[str, Any]:
+        """找出已存在於資料庫的文章連結，用於計算抓取文章列表時的新連結數"""
+        try:
+            with self._transaction() as session:
+                article_repo = cast(
+                    ArticlesRepository, self._get_repository("Article", session)
+                )
+                existing_links = article_repo.find_existing_links(links)
+                return {
+                    "success": True,
+                    "message": f"{len(existing_links)} 個連結已存在",
+                    "links": existing_links,
+                }
+        except Exception as e:
+            error_msg = f"查詢已存在的文章連結失敗: {e}"
+            logger.error(error_msg, exc_info=True)
+            return {"success": False, "message": error_msg, "links": set()}
+
+    @cached_query("articles")
     def find_articles_paginated(
         self,
         page: int,
@@ -540,8 +616,9 @@ class ArticleService(BaseService[Articles]):
         is_preview: bool = False,
         preview_fields: Optional[List[str]] = None,
         validated_params: Optional[Dict[str, Any]] = None,
+        column_set: Optional[str] = None,
     ) -> Dict[str, Any]:
-        """查找文章並分頁返回，支援過濾、排序和預覽"""
+        """查找文章並分頁返回，支援過濾、排序、預覽與具名欄位集合 (list/status/full)"""
         try:
             if filter_criteria is None:
                 filter_criteria = {}
@@ -560,6 +637,7 @@ class ArticleService(BaseService[Articles]):
                     sort_desc=sort_desc,
                     is_preview=is_preview,
                     preview_fields=preview_fields,
+                    column_set=column_set,
                 )
 
                 total_pages = (
@@ -803,9 +881,12 @@ class ArticleService(BaseService[Articles]):
                 final_result_msg = repo_result.copy()
                 final_result_msg["updated_articles"] = updated_schemas
 
+                message = f"批量更新文章完成: {final_result_msg.get('success_count', 0)} 筆成功, {final_result_msg.get('fail_count', 0)} 筆失敗"
+                if final_result_msg.get("unchanged_count"):
+                    message += f" (內容未變更 {final_result_msg['unchanged_count']} 筆)"
                 return {
                     "success": True,
-                    "message": f"批量更新文章完成: {final_result_msg.get('success_count', 0)} 筆成功, {final_result_msg.get('fail_count', 0)} 筆失敗",
+                    "message": message,
                     "resultMsg": final_result_msg,
                 }
         except ValidationError as e:
@@ -1014,15 +1095,17 @@ class ArticleService(BaseService[Articles]):
             logger.error("更新文章標籤失敗, ID=%s: %s", article_id, e, exc_info=True)
             return {"success": False, "message": error_msg, "article": None}
 
+    @cached_query("articles", "article_stats")
     def get_articles_statistics(self) -> Dict[str, Any]:
-        """獲取文章統計信息"""
+        """獲取文章統計信息 (讀取增量維護的統計彙總)"""
         try:
             with self._transaction() as session:
-                article_repo = cast(
-                    ArticlesRepository, self._get_repository("Article", session)
+                stats_repo = cast(
+                    ArticleStatsRepository,
+                    self._get_repository("ArticleStats", session),
                 )
 
-                stats = article_repo.get_statistics()
+                stats = stats_repo.get_statistics()
                 return {
                     "success": True,
                     "message": "獲取文章統計信息成功",
@@ -1058,9 +1141,51 @@ class ArticleService(BaseService[Articles]):
         sort_desc: bool = False,
         is_preview: bool = False,
         preview_fields: Optional[List[str]] = None,
+        column_set: Optional[str] = None,
     ) -> Dict[str, Any]:
-        """進階搜尋文章 (分頁, 支援預覽)"""
-        criteria = {}
+        """進階搜尋文章 (分頁, 支援預覽與具名欄位集合)"""
+        criteria = self._build_advanced_criteria(
+            task_id=task_id,
+            keywords=keywords,
+            category=category,
+            date_range=date_range,
+            is_ai_related=is_ai_related,
+            is_scraped=is_scraped,
+            scrape_status=scrape_status,
+            tags=tags,
+            source=source,
+        )
+
+        try:
+            return self.find_articles_paginated(
+                page=page,
+                per_page=per_page,
+                filter_criteria=criteria,
+                sort_by=sort_by,
+                sort_desc=sort_desc,
+                is_preview=is_preview,
+                preview_fields=preview_fields,
+                column_set=column_set,
+            )
+        except Exception as e:
+            error_msg = f"進階搜尋文章失敗: {e}"
+            logger.error("進階搜尋文章失敗: %s", e)
+            return {"success": False, "message": error_msg, "resultMsg": None}
+
+    @staticmethod
+    def _build_advanced_criteria(
+        task_id: Optional[str] = None,
+        keywords: Optional[str] = None,
+        category: Optional[str] = None,
+        date_range: Optional[Tuple[datetime, datetime]] = None,
+        is_ai_related: Optional[bool] = None,
+        is_scraped: Optional[bool] = None,
+        scrape_status: Optional[ArticleScrapeStatus] = None,
+        tags: Optional[List[str]] = None,
+        source: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """將進階搜尋條件轉為 Repository 的過濾條件"""
+        criteria: Dict[str, Any] = {}
         if task_id is not None:
             criteria["task_id"] = task_id
         if keywords is not None:
@@ -1085,21 +1210,46 @@ class ArticleService(BaseService[Articles]):
                 criteria["tags"] = tags[0]
         if source is not None:
             criteria["source"] = source
+        return criteria
+
+    def export_articles(
+        self,
+        column_set: Optional[str] = None,
+        batch_size: int = 1000,
+        **advanced_filters: Any,
+    ) -> Dict[str, Any]:
+        """串流匯出文章，支援與 find_articles_advanced 相同的過濾條件
 
+        返回的 rows 為惰性迭代器：開始迭代時才開啟交易，以伺服器端游標逐批讀取，
+        迭代結束 (或被關閉) 時結束交易，因此記憶體用量與匯出的總筆數無關。
+        """
         try:
-            return self.find_articles_paginated(
-                page=page,
-                per_page=per_page,
-                filter_criteria=criteria,
-                sort_by=sort_by,
-                sort_desc=sort_desc,
-                is_preview=is_preview,
-                preview_fields=preview_fields,
-            )
-        except Exception as e:
-            error_msg = f"進階搜尋文章失敗: {e}"
-            logger.error("進階搜尋文章失敗: %s", e)
-            return {"success": False, "message": error_msg, "resultMsg": None}
+            criteria = self._build_advanced_criteria(**advanced_filters)
+            with self._transaction() as session:
+                article_repo = cast(
+                    ArticlesRepository, self._get_repository("Article", session)
+                )
+                fields = article_repo.resolve_export_fields(column_set)
+        except TypeError as e:
+            return {"success": False, "message": f"無效的匯出條件: {e}", "fields": None, "rows": None}
+        except InvalidOperationError as e:
+            return {"success": False, "message": str(e), "fields": None, "rows": None}
+
+        def iter_rows():
+            with self._transaction() as session:
+                article_repo = cast(
+                    ArticlesRepository, self._get_repository("Article", session)
+                )
+                yield from article_repo.stream_rows(
+                    fields, filter_criteria=criteria, batch_size=batch_size
+                )
+
+        return {
+            "success": True,
+            "message": "開始匯出文章",
+            "fields": fields,
+            "rows": iter_rows(),
+        }
 
     def find_articles_by_title(
         self,
@@ -1157,6 +1307,7 @@ class ArticleService(BaseService[Articles]):
             )
             return {"success": False, "message": error_msg, "articles": []}
 
+    @cached_query("articles")
     def find_articles_by_keywords(
         self,
         keywords: str,
@@ -1213,15 +1364,17 @@ class ArticleService(BaseService[Articles]):
             )
             return {"success": False, "message": error_msg, "articles": []}
 
+    @cached_query("articles", "article_stats")
     def get_source_statistics(self) -> Dict[str, Any]:
-        """獲取來源統計信息"""
+        """獲取來源統計信息 (讀取增量維護的統計彙總)"""
         try:
             with self._transaction() as session:
-                article_repo = cast(
-                    ArticlesRepository, self._get_repository("Article", session)
+                stats_repo = cast(
+                    ArticleStatsRepository,
+                    self._get_repository("ArticleStats", session),
                 )
 
-                stats = article_repo.get_source_statistics()
+                stats = stats_repo.get_source_statistics()
                 return {
                     "success": True,
                     "message": "獲取來源統計信息成功",
@@ -1240,6 +1393,33 @@ class ArticleService(BaseService[Articles]):
             logger.error("獲取來源統計信息失敗: %s", e, exc_info=True)
             return {"success": False, "message": error_msg, "statistics": None}
 
+    def rebuild_article_stats(self) -> Dict[str, Any]:
+        """依文章表重建統計彙總，修正繞過 ORM 的寫入造成的誤差"""
+        try:
+            with self._transaction() as session:
+                stats_repo = cast(
+                    ArticleStatsRepository,
+                    self._get_repository("ArticleStats", session),
+                )
+                result = stats_repo.rebuild()
+            if result["corrected_rows"]:
+                logger.warning(
+                    "文章統計彙總重建修正了 %s 列誤差", result["corrected_rows"]
+                )
+            return {
+                "success": True,
+                "message": "文章統計彙總重建完成",
+                "result": result,
+            }
+        except DatabaseOperationError as e:
+            error_msg = f"重建文章統計彙總時資料庫操作失敗: {e}"
+            logger.error("重建文章統計彙總時資料庫操作失敗: %s", e, exc_info=True)
+            return {"success": False, "message": error_msg, "result": None}
+        except Exception as e:
+            error_msg = f"重建文章統計彙總失敗: {e}"
+            logger.error("重建文章統計彙總失敗: %s", e, exc_info=True)
+            return {"success": False, "message": error_msg, "result": None}
+
     def update_article_scrape_status(
         self,
         link: str,
@@ -1277,8 +1457,9 @@ class ArticleService(BaseService[Articles]):
         source: Optional[str] = None,
         is_preview: bool = False,
         preview_fields: Optional[List[str]] = None,
+        column_set: Optional[str] = None,
     ) -> Dict[str, Any]:
-        """獲取未爬取的文章，支援預覽和排序"""
+        """獲取未爬取的文章，支援預覽、具名欄位集合和排序"""
         try:
             with self._transaction() as session:
                 article_repo = cast(
@@ -1297,6 +1478,7 @@ class ArticleService(BaseService[Articles]):
                     order_by_status=True,
                     is_preview=is_preview,
                     preview_fields=preview_fields,
+                    column_set=column_set,
                 )
 
                 if (
@@ -1447,8 +1629,9 @@ class ArticleService(BaseService[Articles]):
         sort_desc: bool = False,
         is_preview: bool = False,
         preview_fields: Optional[List[str]] = None,
+        column_set: Optional[str] = None,
     ) -> Dict[str, Any]:
-        """根據任務ID查詢相關的文章，支援分頁、排序和預覽"""
+        """根據任務ID查詢相關的文章，支援分頁、排序、預覽與具名欄位集合"""
         try:
             with self._transaction() as session:
                 article_repo = cast(
@@ -1467,6 +1650,7 @@ class ArticleService(BaseService[Articles]):
                     sort_desc=sort_desc,
                     is_preview=is_preview,
                     preview_fields=preview_fields,
+                    column_set=column_set,
                 )
 
                 if (
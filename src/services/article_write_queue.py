@@ -0,0 +1,342 @@
+"""提供跨任務共用的文章 write-behind 寫入佇列，將多個任務的文章合併為大批次寫入資料庫。"""
+
+import atexit
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set
+import logging
+
+logger = logging.getLogger(__name__)  # 使用統一的 logger
+
+# 等待寫入確認的預設逾時時間（秒）
+DEFAULT_ACK_TIMEOUT = 300.0
+
+# 寫入模式
+WRITE_MODE_CREATE = "create"
+WRITE_MODE_UPDATE_BY_LINK = "update_by_link"
+
+
+def is_write_behind_enabled() -> bool:
+    """是否啟用共用的文章寫入佇列 (環境變數 ARTICLE_WRITE_BEHIND_ENABLED)"""
+    return os.getenv("ARTICLE_WRITE_BEHIND_ENABLED", "false").lower() in ("true", "1", "yes")
+
+
+class WriteTicket:
+    """單次提交的寫入確認，記錄該任務提交的文章寫入成功與失敗的數量 (成功中內容未變更的數量另計)"""
+
+    def __init__(self, task_id: Optional[int], expected_count: int):
+        self.task_id = task_id
+        self.expected_count = expected_count
+        self.success_count = 0
+        self.unchanged_count = 0
+        self.fail_count = 0
+        self.errors: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        if expected_count == 0:
+            self._done.set()
+
+    def _record(
+        self,
+        success: bool,
+        link: Optional[str] = None,
+        error: Optional[str] = None,
+        unchanged: bool = False,
+    ) -> None:
+        """記錄單篇文章的寫入結果，全部完成時發出確認"""
+        with self._lock:
+            if success:
+                self.success_count += 1
+                if unchanged:
+                    self.unchanged_count += 1
+            else:
+                self.fail_count += 1
+                self.errors.append({"link": link, "error": error})
+            if self.success_count + self.fail_count >= self.expected_count:
+                self._done.set()
+
+    @property
+    def done(self) -> bool:
+        """是否所有文章都已寫入 (或失敗)"""
+        return self._done.is_set()
+
+    def wait(self, timeout: Optional[float] = DEFAULT_ACK_TIMEOUT) -> bool:
+        """等待所有文章寫入完成，返回是否在逾時前完成"""
+        return self._done.wait(timeout)
+
+    def to_result(self) -> Dict[str, Any]:
+        """轉換為與 ArticleService 批量方法相同格式的結果字典"""
+        with self._lock:
+            pending = self.expected_count - self.success_count - self.fail_count
+            success = pending == 0 and self.fail_count == 0
+            message = (
+                f"寫入佇列處理完成：成功 {self.success_count} 筆，失敗 {self.fail_count} 筆"
+                if pending == 0
+                else f"寫入佇列尚未完成：成功 {self.success_count} 筆，失敗 {self.fail_count} 筆，等待中 {pending} 筆"
+            )
+            return {
+                "success": success,
+                "message": message,
+                "resultMsg": {
+                    "success_count": self.success_count,
+                    "unchanged_count": self.unchanged_count,
+                    "fail_count": self.fail_count,
+                    "pending_count": pending,
+                    "failed_details": list(self.errors),
+                },
+            }
+
+
+@dataclass
+class _WriteItem:
+    """佇列中的單篇文章"""
+
+    ticket: WriteTicket
+    mode: str
+    article: Dict[str, Any]
+
+
+_STOP = object()
+
+
+class ArticleWriteQueue:
+    """跨任務共用的 write-behind 文章寫入佇列
+
+    爬蟲執行緒以 submit 提交已轉換好的文章資料，由單一寫入執行緒依數量 (batch_size)
+    或時間窗口 (flush_interval) 合併為大批次，再透過 ArticleService 的批量方法寫入。
+    佇列已滿時 submit 會阻塞 (背壓)，每次提交會取得 WriteTicket，用於等待該任務的寫入確認。
+    """
+
+    def __init__(
+        self,
+        article_service=None,
+        max_queue_size: int = 5000,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+    ):
+        if article_service is None:
+            from src.services.service_container import get_article_service
+
+            article_service = get_article_service()
+        self.article_service = article_service
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._stats = {"batches_written": 0, "rows_written": 0, "rows_failed": 0}
+        self._atexit_registered = False
+
+    def start(self) -> None:
+        """啟動寫入執行緒 (已啟動時不做任何事)"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="ArticleWriteQueue", daemon=True
+            )
+            self._thread.start()
+            if not self._atexit_registered:
+                atexit.register(self.stop)
+                self._atexit_registered = True
+            logger.info(
+                "文章寫入佇列已啟動 (batch_size=%d, flush_interval=%.2fs, max_queue_size=%d)",
+                self.batch_size,
+                self.flush_interval,
+                self._queue.maxsize,
+            )
+
+    def stop(self, timeout: Optional[float] = 30.0) -> None:
+        """寫入佇列中剩餘的文章後停止寫入執行緒"""
+        with self._lock:
+            thread = self._thread
+        if thread is None or not thread.is_alive():
+            return
+        self._queue.put(_STOP)
+        thread.join(timeout)
+        if thread.is_alive():
+            logger.warning("文章寫入佇列未在 %s 秒內停止", timeout)
+        else:
+            logger.info("文章寫入佇列已停止")
+
+    @property
+    def is_running(self) -> bool:
+        """寫入執行緒是否運行中"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def submit(
+        self,
+        task_id: Optional[int],
+        articles: List[Dict[str, Any]],
+        update_by_link: bool = False,
+        timeout: Optional[float] = None,
+    ) -> WriteTicket:
+        """
+        提交文章至寫入佇列
+
+        Args:
+            task_id: 提交的任務 ID，用於記錄
+            articles: 已轉換為可寫入格式的文章資料
+            update_by_link: True 時依連結更新既有文章，否則新增 (已存在則更新)
+            timeout: 佇列已滿時最多等待的秒數，None 表示一直等待
+
+        Returns:
+            WriteTicket: 可用於等待寫入確認的票據；等待逾時未能放入佇列的文章會直接記為失敗
+        """
+        mode = WRITE_MODE_UPDATE_BY_LINK if update_by_link else WRITE_MODE_CREATE
+        ticket = WriteTicket(task_id, len(articles))
+        if not articles:
+            return ticket
+
+        self.start()
+        for index, article in enumerate(articles):
+            try:
+                self._queue.put(_WriteItem(ticket, mode, article), timeout=timeout)
+            except queue.Full:
+                remaining = articles[index:]
+                logger.warning(
+                    "任務 %s 的文章寫入佇列已滿，%d 筆文章未能放入佇列",
+                    task_id,
+                    len(remaining),
+                )
+                for skipped in remaining:
+                    ticket._record(False, skipped.get("link"), "寫入佇列已滿")
+                break
+        return ticket
+
+    def get_stats(self) -> Dict[str, Any]:
+        """取得寫入佇列的統計資料"""
+        with self._lock:
+            stats = dict(self._stats)
+        stats["queued"] = self._queue.qsize()
+        stats["running"] = self.is_running
+        return stats
+
+    def _run(self) -> None:
+        """寫入執行緒主迴圈：依數量或時間窗口合併文章後批次寫入"""
+        while True:
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            if first is _STOP:
+                self._drain_remaining()
+                return
+
+            batch: List[_WriteItem] = [first]
+            stop_requested = False
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop_requested = True
+                    break
+                batch.append(item)
+
+            self._write_batch(batch)
+            if stop_requested:
+                self._drain_remaining()
+                return
+
+    def _drain_remaining(self) -> None:
+        """停止前寫入佇列中剩餘的文章，不再等待時間窗口"""
+        while True:
+            batch: List[_WriteItem] = []
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not _STOP:
+                    batch.append(item)
+            if not batch:
+                return
+            self._write_batch(batch)
+
+    def _write_batch(self, batch: List[_WriteItem]) -> None:
+        """依寫入模式分組後呼叫 ArticleService 的批量方法，並回報每個任務的寫入結果"""
+        for mode in (WRITE_MODE_CREATE, WRITE_MODE_UPDATE_BY_LINK):
+            items = [item for item in batch if item.mode == mode]
+            if not items:
+                continue
+            articles = [item.article for item in items]
+            general_error: Optional[str] = None
+            failed_links: Dict[Optional[str], str] = {}
+            unchanged_links: Set[str] = set()
+            try:
+                if mode == WRITE_MODE_UPDATE_BY_LINK:
+                    result = self.article_service.batch_update_articles_by_link(
+                        article_data=articles
+                    )
+                else:
+                    result = self.article_service.batch_create_articles(
+                        articles_data=articles
+                    )
+                failed_links, general_error = self._extract_failures(mode, result)
+                result_msg = result.get("resultMsg") if result else None
+                if isinstance(result_msg, dict):
+                    unchanged_links = set(result_msg.get("unchanged_links") or [])
+            except Exception as e:
+                logger.error("文章寫入佇列批次寫入失敗: %s", e, exc_info=True)
+                general_error = f"批次寫入失敗: {e}"
+
+            success_rows = 0
+            for item in items:
+                link = item.article.get("link")
+                if general_error is not None:
+                    item.ticket._record(False, link, general_error)
+                elif link in failed_links:
+                    item.ticket._record(False, link, failed_links[link])
+                else:
+                    item.ticket._record(True, unchanged=link in unchanged_links)
+                    success_rows += 1
+
+            with self._lock:
+                self._stats["batches_written"] += 1
+                self._stats["rows_written"] += success_rows
+                self._stats["rows_failed"] += len(items) - success_rows
+            logger.info(
+                "文章寫入佇列完成批次 (%s)：%d 筆，成功 %d 筆",
+                mode,
+                len(items),
+                success_rows,
+            )
+
+    @staticmethod
+    def _extract_failures(mode: str, result: Optional[Dict[str, Any]]):
+        """從批量方法的結果中取出失敗的連結；無法判斷個別結果時返回整體錯誤訊息"""
+        if not result:
+            return {}, "批量寫入未返回結果"
+        result_msg = result.get("resultMsg")
+        if not isinstance(result_msg, dict):
+            if result.get("success", False):
+                return {}, None
+            return {}, result.get("message") or "批量寫入失敗"
+
+        failed_links: Dict[Optional[str], str] = {}
+        if mode == WRITE_MODE_UPDATE_BY_LINK:
+            for link in result_msg.get("missing_links", []) or []:
+                failed_links[link] = "文章連結不存在"
+            for detail in result_msg.get("error_details", []) or []:
+                failed_links[detail.get("link")] = detail.get("error", "")
+        else:
+            for detail in result_msg.get("failed_details", []) or []:
+                data = detail.get("data")
+                if isinstance(data, dict):
+                    failed_links[data.get("link")] = detail.get("error", "")
+                elif data == "General Error":
+                    # 整體交易失敗，批次內的文章都未寫入
+                    return {}, detail.get("error") or result.get("message")
+        if not failed_links and not result.get("success", False):
+            return {}, result.get("message") or "批量寫入失敗"
+        return failed_links, None
+
@@ -164,6 +164,64 @@ class BaseService(Generic[T]):
             logger.error(error_msg, exc_info=True)
             raise ValidationError(error_msg) from e
 
+    def get_data_version(self, *repository_names: str) -> Dict[str, Any]:
+        """
+        取得指定儲存庫資料表的輕量版本，供 API 產生 ETag 並在資料未變更時返回 304。
+
+        Args:
+            repository_names: 儲存庫名稱 (對應 _get_repository_mapping 中的鍵)。
+
+        Returns:
+            包含 version (版本字串) 與 last_modified (所有資料表都能提供時才有值) 的結果字典。
+        """
+        try:
+            with self._transaction() as session:
+                parts = []
+                last_modified_values = []
+                for name in repository_names:
+                    version = self._get_repository(name, session).get_data_version()
+                    max_updated_at = version.get("max_updated_at")
+                    parts.append(
+                        f"{name}:{version.get('count')}:{version.get('max_id')}:"
+                        f"{max_updated_at.isoformat() if max_updated_at else ''}"
+                    )
+                    last_modified_values.append(version.get("last_modified"))
+            has_last_modified = bool(last_modified_values) and all(last_modified_values)
+            return {
+                "success": True,
+                "message": "取得資料版本成功",
+                "version": "|".join(parts),
+                "last_modified": max(last_modified_values) if has_last_modified else None,
+            }
+        except Exception as e:
+            logger.error("取得資料版本失敗: %s", e, exc_info=True)
+            return {
+                "success": False,
+                "message": f"取得資料版本失敗: {e}",
+                "version": None,
+                "last_modified": None,
+            }
+
+    def get_query_cache_version(self, tables: Tuple[str, ...]) -> Optional[str]:
+        """
+        取得查詢快取依賴資料表在資料庫中的版本，讓其他行程的寫入也能使本行程的快取失效。
+
+        Args:
+            tables: 資料表名稱，只計算 _get_repository_mapping 中有對應儲存庫的資料表。
+
+        Returns:
+            版本字串；取得失敗時返回 None。
+        """
+        repository_names = [
+            name
+            for name, (_, model_class) in self._get_repository_mapping().items()
+            if getattr(model_class, "__tablename__", None) in tables
+        ]
+        if not repository_names:
+            return ""
+        result = self.get_data_version(*repository_names)
+        return result["version"] if result["success"] else None
+
     def cleanup(self):
         """清理服務資源"""
         # 實際的清理由 DatabaseManager 處理
@@ -0,0 +1,197 @@
+"""提供持久化待抓取連結 (crawl frontier) 的業務邏輯服務，供爬蟲跨任務加入、依主機分批領取與回報抓取結果。"""
+
+import logging
+import os
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type, cast
+
+from src.database.base_repository import BaseRepository
+from src.database.crawl_frontier_repository import CrawlFrontierRepository
+from src.models.base_model import Base
+from src.models.crawl_frontier_model import CrawlFrontier
+from src.models.crawl_frontier_schema import CrawlFrontierReadSchema
+from src.services.base_service import BaseService
+
+logger = logging.getLogger(__name__)  # 使用統一的 logger
+
+# 預設值 (可由環境變數覆寫)
+DEFAULT_PER_HOST_LIMIT = 10
+DEFAULT_STALE_SEC = 1800.0
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_RETRY_DELAY_SEC = 300.0
+
+
+def is_crawl_frontier_enabled() -> bool:
+    """是否以持久化的待抓取連結表排程內容抓取 (環境變數 CRAWL_FRONTIER_ENABLED)"""
+    return os.getenv("CRAWL_FRONTIER_ENABLED", "false").lower() in ("true", "1", "yes")
+
+
+def _env_number(name: str, default: float) -> float:
+    """讀取正數環境變數，無效時使用預設值"""
+    raw_value = os.getenv(name)
+    if raw_value is None:
+        return default
+    try:
+        value = float(raw_value)
+    except ValueError:
+        logger.warning("環境變數 %s 值 '%s' 無效，使用預設值: %s", name, raw_value, default)
+        return default
+    if value <= 0:
+        logger.warning("環境變數 %s 必須為正數，使用預設值: %s", name, default)
+        return default
+    return value
+
+
+class CrawlFrontierService(BaseService[CrawlFrontier]):
+    """待抓取連結服務
+
+    Attributes:
+        per_host_limit: 不限來源領取時每批次每個主機最多領取的連結數 (CRAWL_FRONTIER_PER_HOST_LIMIT)
+        stale_after_seconds: 領取超過此秒數仍未回報視為 worker 已失聯 (CRAWL_FRONTIER_STALE_SEC)
+        max_attempts: 每個連結最多領取次數 (CRAWL_FRONTIER_MAX_ATTEMPTS)
+        retry_delay_seconds: 抓取失敗後第一次重試的延遲秒數 (CRAWL_FRONTIER_RETRY_DELAY_SEC)
+    """
+
+    def __init__(self, db_manager=None):
+        super().__init__(db_manager)
+        self.per_host_limit = int(_env_number("CRAWL_FRONTIER_PER_HOST_LIMIT", DEFAULT_PER_HOST_LIMIT))
+        self.stale_after_seconds = _env_number("CRAWL_FRONTIER_STALE_SEC", DEFAULT_STALE_SEC)
+        self.max_attempts = int(_env_number("CRAWL_FRONTIER_MAX_ATTEMPTS", DEFAULT_MAX_ATTEMPTS))
+        self.retry_delay_seconds = _env_number("CRAWL_FRONTIER_RETRY_DELAY_SEC", DEFAULT_RETRY_DELAY_SEC)
+
+    def _get_repository_mapping(
+        self,
+    ) -> Dict[str, Tuple[Type[BaseRepository], Type[Base]]]:
+        """提供儲存庫映射"""
+        return {"CrawlFrontier": (CrawlFrontierRepository, CrawlFrontier)}
+
+    def enqueue_links(self, entries: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+        """將發現的連結加入待抓取清單"""
+        try:
+            with self._transaction() as session:
+                frontier_repo = cast(
+                    CrawlFrontierRepository, self._get_repository("CrawlFrontier", session)
+                )
+                counts = frontier_repo.enqueue_links(entries)
+                return {
+                    "success": True,
+                    "message": (
+                        f"待抓取連結新增 {counts['inserted']} 筆，更新 {counts['updated']} 筆，"
+                        f"略過 {counts['skipped']} 筆"
+                    ),
+                    **counts,
+                }
+        except Exception as e:
+            error_msg = f"加入待抓取連結失敗: {e}"
+            logger.error(error_msg, exc_info=True)
+            return {"success": False, "message": error_msg, "inserted": 0, "updated": 0, "skipped": 0}
+
+    def claim_batch(
+        self,
+        worker_id: str,
+        limit: int,
+        per_host_limit: Optional[int] = None,
+        source: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """依優先度與主機分散領取一批待抓取連結，沒有可領取的連結時 entries 為空列表
+
+        指定 source 時只領取該來源的連結；此時連結通常來自同一主機，未指定 per_host_limit
+        時不限制每個主機的數量，避免單一網站的爬蟲每次只能抓取 CRAWL_FRONTIER_PER_HOST_LIMIT 篇。
+        """
+        if per_host_limit is None and source is None:
+            per_host_limit = self.per_host_limit
+        try:
+            dialect_name = self.db_manager.engine.dialect.name
+            with CrawlFrontierRepository.claim_lock(dialect_name), self._transaction() as session:
+                frontier_repo = cast(
+                    CrawlFrontierRepository, self._get_repository("CrawlFrontier", session)
+                )
+                entries = frontier_repo.claim_batch(worker_id, limit, per_host_limit, source)
+                entries_data: List[Dict[str, Any]] = [
+                    CrawlFrontierReadSchema.model_validate(entry).model_dump()
+                    for entry in entries
+                ]
+                return {
+                    "success": True,
+                    "message": f"已領取 {len(entries_data)} 筆待抓取連結",
+                    "entries": entries_data,
+                }
+        except Exception as e:
+            error_msg = f"領取待抓取連結失敗: {e}"
+            logger.error(error_msg, exc_info=True)
+            return {"success": False, "message": error_msg, "entries": []}
+
+    def complete_claims(
+        self,
+        worker_id: str,
+        done_ids: Sequence[int] = (),
+        failed: Optional[Dict[int, Optional[str]]] = None,
+        released_ids: Sequence[int] = (),
+    ) -> Dict[str, Any]:
+        """
+        回報領取連結的抓取結果
+
+        Args:
+            worker_id: 領取者識別碼
+            done_ids: 抓取完成的連結 ID
+            failed: 抓取失敗的 {連結 ID: 錯誤訊息}，未達最大嘗試次數者延後重試
+            released_ids: 領取後未抓取的連結 ID，放回等待中且不計入嘗試次數
+        """
+        try:
+            with self._transaction() as session:
+                frontier_repo = cast(
+                    CrawlFrontierRepository, self._get_repository("CrawlFrontier", session)
+                )
+                done = frontier_repo.mark_done(done_ids, worker_id)
+                failed_counts = frontier_repo.mark_failed(
+                    failed or {}, worker_id, self.retry_delay_seconds, self.max_attempts
+                )
+                released = frontier_repo.release(released_ids, worker_id)
+                return {
+                    "success": True,
+                    "message": (
+                        f"待抓取連結完成 {done} 筆，稍後重試 {failed_counts['retry']} 筆，"
+                        f"失敗 {failed_counts['failed']} 筆，放回 {released} 筆"
+                    ),
+                    "done": done,
+                    "released": released,
+                    **failed_counts,
+                }
+        except Exception as e:
+            error_msg = f"回報待抓取連結結果失敗: {e}"
+            logger.error(error_msg, exc_info=True)
+            return {"success": False, "message": error_msg}
+
+    def requeue_stale_claims(self) -> Dict[str, Any]:
+        """回收領取逾時的連結，讓中斷的任務留下的連結可由其他任務繼續抓取"""
+        try:
+            with self._transaction() as session:
+                frontier_repo = cast(
+                    CrawlFrontierRepository, self._get_repository("CrawlFrontier", session)
+                )
+                counts = frontier_repo.requeue_stale(self.stale_after_seconds, self.max_attempts)
+                return {
+                    "success": True,
+                    "message": f"已重新排入 {counts['requeued']} 筆，標記失敗 {counts['failed']} 筆",
+                    **counts,
+                }
+        except Exception as e:
+            error_msg = f"回收逾時待抓取連結失敗: {e}"
+            logger.error(error_msg, exc_info=True)
+            return {"success": False, "message": error_msg, "requeued": 0, "failed": 0}
+
+    def get_frontier_stats(self) -> Dict[str, Any]:
+        """取得各狀態的待抓取連結數量"""
+        try:
+            with self._transaction() as session:
+                frontier_repo = cast(
+                    CrawlFrontierRepository, self._get_repository("CrawlFrontier", session)
+                )
+                return {
+                    "success": True,
+                    "message": "獲取待抓取連結統計成功",
+                    "stats": frontier_repo.count_by_status(),
+                }
+        except Exception as e:
+            error_msg = f"獲取待抓取連結統計失敗: {e}"
+            logger.error(error_msg, exc_info=True)
+            return {"success": False, "message": error_msg, "stats": {}}
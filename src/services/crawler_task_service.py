@@ -16,6 +16,7 @@ from src.database.base_repository import BaseRepository, SchemaType
 from src.database.crawler_task_history_repository import CrawlerTaskHistoryRepository
 from src.database.crawler_tasks_repository import CrawlerTasksRepository
 from src.database.crawlers_repository import CrawlersRepository
+from src.database.scheduler_task_change_repository import SchedulerTaskChangeRepository
 from src.error.errors import (
     DatabaseOperationError,
     InvalidOperationError,
@@ -31,6 +32,7 @@ from src.models.crawler_tasks_schema import (
     PaginatedCrawlerTaskResponse,
 )  # Keep Create/Update for potential implicit use in validate_data
 from src.models.crawlers_model import Crawlers
+from src.models.scheduler_task_change_model import SchedulerTaskChange
 from src.services.base_service import BaseService
 from src.services.service_container import get_article_service, get_scheduler_service
 from src.utils.enum_utils import ScrapeMode, ScrapePhase, TaskStatus
@@ -62,8 +64,20 @@ class CrawlerTaskService(BaseService[CrawlerTasks]):
             "Crawler": (CrawlersRepository, Crawlers),
             "TaskHistory": (CrawlerTaskHistoryRepository, CrawlerTaskHistory),
             "Articles": (ArticlesRepository, Articles),
+            "SchedulerTaskChange": (
+                SchedulerTaskChangeRepository,
+                SchedulerTaskChange,
+            ),
         }
 
+    def _record_schedule_change(self, session: Session, task_id: int) -> None:
+        """記錄任務的排程相關變更 (與任務變更同一交易)，排程器的領導者行程會據此增量同步"""
+        change_repo = cast(
+            SchedulerTaskChangeRepository,
+            self._get_repository("SchedulerTaskChange", session),
+        )
+        change_repo.record_change(task_id)
+
     def _get_crawler_instance(self, crawler_name: str, task_id: int) -> "BaseCrawler":
         """獲取爬蟲實例"""
         if task_id not in self.running_crawlers:
@@ -168,6 +182,7 @@ class CrawlerTaskService(BaseService[CrawlerTasks]):
                     session.refresh(task)  # Refresh the task object with the generated ID
 
                     task_schema = CrawlerTaskReadSchema.model_validate(task)
+                    self._record_schedule_change(session, task.id)
 
                     if task.is_auto:
                         try:
@@ -339,6 +354,7 @@ class CrawlerTaskService(BaseService[CrawlerTasks]):
                     # 在提交前 flush 和 refresh 以獲取最新狀態
                     session.flush()
                     session.refresh(task)
+                    self._record_schedule_change(session, task_id)
                     updated_task = task  # 將更新後的 task 賦值給 updated_task
                     final_update_result = {"success": True, "message": "任務更新成功"}
                     # 跳出 with 區塊前，記錄 is_auto 狀態
@@ -437,6 +453,8 @@ class CrawlerTaskService(BaseService[CrawlerTasks]):
 
                 success = tasks_repo.delete(task_id)
                 # Delete 不返回對象，無需 flush 或 refresh
+                if success:
+                    self._record_schedule_change(session, task_id)
                 return {
                     "success": success,
                     "message": "任務刪除成功" if success else "任務不存在或刪除失敗",
@@ -736,6 +754,7 @@ class CrawlerTaskService(BaseService[CrawlerTasks]):
                 if updated_task:
                     session.flush()
                     session.refresh(updated_task)
+                    self._record_schedule_change(session, task_id)
                     logger.info("任務 ID %s 自動執行狀態已切換並準備提交。", task_id)
                     task_schema = CrawlerTaskReadSchema.model_validate(updated_task)
                     return {
@@ -770,6 +789,7 @@ class CrawlerTaskService(BaseService[CrawlerTasks]):
                 if updated_task:
                     session.flush()
                     session.refresh(updated_task)
+                    self._record_schedule_change(session, task_id)
                     logger.info("任務 ID %s 啟用狀態已切換並準備提交。", task_id)
                     task_schema = CrawlerTaskReadSchema.model_validate(updated_task)
                     return {
@@ -840,8 +860,13 @@ class CrawlerTaskService(BaseService[CrawlerTasks]):
         sort_desc: bool = False,
         is_preview: bool = False,
         preview_fields: Optional[List[str]] = None,
+        include_latest_run: bool = False,
     ) -> Dict:
-        """獲取所有任務"""
+        """獲取所有任務
+
+        include_latest_run 為 True 時，另以單一查詢取得每個任務最新一次執行的摘要，
+        以 latest_runs ({task_id: 摘要}) 一併返回。
+        """
         try:
             with self._transaction() as session:
                 tasks_repo = cast(
@@ -864,11 +889,28 @@ class CrawlerTaskService(BaseService[CrawlerTasks]):
                 else:
                     tasks_schema = tasks
 
-                return {
+                result = {
                     "success": True,
                     "message": "所有任務獲取成功",
                     "tasks": tasks_schema,
                 }
+                if include_latest_run:
+                    task_ids = [
+                        task_id
+                        for task_id in (
+                            task.get("id") if isinstance(task, dict) else task.id
+                            for task in tasks
+                        )
+                        if task_id is not None
+                    ]
+                    history_repo = cast(
+                        CrawlerTaskHistoryRepository,
+                        self._get_repository("TaskHistory", session),
+                    )
+                    result["latest_runs"] = history_repo.find_latest_run_summaries(
+                        task_ids
+                    )
+                return result
         except (DatabaseOperationError, InvalidOperationError) as e:
             logger.error("獲取所有任務失敗: %s", e)
             return {"success": False, "message": str(e), "tasks": []}
@@ -981,12 +1023,12 @@ class CrawlerTaskService(BaseService[CrawlerTasks]):
 
     def find_due_tasks(
         self,
-        cron_expression: str,
+        cron_expression: Optional[str] = None,
         limit: Optional[int] = None,
         is_preview: bool = False,
         preview_fields: Optional[List[str]] = None,
     ) -> Dict:
-        """查詢需要執行的任務（根據 cron 表達式和上次執行時間）"""
+        """查詢需要執行的任務（依預先計算的下次執行時間，cron_expression 為 None 時查詢所有自動任務）"""
         try:
             with self._transaction() as session:
                 tasks_repo = cast(
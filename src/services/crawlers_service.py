@@ -21,6 +21,7 @@ from src.models.crawlers_schema import (
 from src.database.crawlers_repository import CrawlersRepository
 from src.database.base_repository import BaseRepository, SchemaType
 from src.services.base_service import BaseService
+from src.services.query_cache import QueryCache, cached_query
 from src.error.errors import InvalidOperationError
 
 
@@ -33,6 +34,9 @@ class CrawlersService(BaseService[Crawlers]):
 
     def __init__(self, db_manager=None):
         super().__init__(db_manager)
+        self.query_cache = QueryCache(
+            "CrawlersService", version_loader=self.get_query_cache_version
+        )
 
     def _get_repository_mapping(
         self,
@@ -116,6 +120,7 @@ class CrawlersService(BaseService[Crawlers]):
             logger.error("創建爬蟲設定失敗: %s", str(e))
             raise e
 
+    @cached_query("crawlers")
     def find_all_crawlers(
         self,
         limit: Optional[int] = None,
@@ -276,6 +281,7 @@ class CrawlersService(BaseService[Crawlers]):
             logger.error("刪除爬蟲設定失敗，ID=%s: %s", crawler_id, str(e))
             raise e
 
+    @cached_query("crawlers")
     def find_active_crawlers(
         self,
         limit: Optional[int] = None,
@@ -602,6 +608,7 @@ class CrawlersService(BaseService[Crawlers]):
             )
             raise e
 
+    @cached_query("crawlers")
     def get_crawler_statistics(self) -> Dict[str, Any]:
         """獲取爬蟲統計信息"""
         try:
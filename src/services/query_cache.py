@@ -0,0 +1,271 @@
+"""提供服務層的行程內查詢快取 (LRU + TTL)，以資料表世代計數器與資料庫版本在寫入後失效。
+
+文章與爬蟲資料只在爬取或管理操作寫入時變更，列表、搜尋與統計查詢卻每次請求都存取資料庫。
+讀取方法以 @cached_query 標註依賴的資料表，結果依正規化後的參數快取；
+任何 Session 提交了對這些資料表的寫入 (ORM 物件或 DML 語句) 時，對應的世代計數器遞增，
+舊世代的快取項目即視為失效。計數器只在本行程內有效，因此快取可再提供 version_loader，
+每次查詢時取得資料表在資料庫中的輕量版本 (筆數、最大 id、最近更新時間)，
+讓其他行程 (gunicorn 的其他 worker、worker.py) 的寫入也立即使快取失效。
+"""
+
+import functools
+import inspect
+import logging
+import os
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)  # 使用統一的 logger
+
+DEFAULT_TTL_SEC = 30.0
+DEFAULT_MAX_ENTRIES = 256
+CACHE_BYPASS_HEADER = "X-Cache-Bypass"
+CACHE_STATUS_HEADER = "X-Cache"
+
+# 目前請求是否略過快取，以及最近一次快取查詢的結果 (HIT/MISS/BYPASS)
+cache_bypass_var: ContextVar[bool] = ContextVar("query_cache_bypass", default=False)
+cache_status_var: ContextVar[Optional[str]] = ContextVar(
+    "query_cache_status", default=None
+)
+
+_generations: Dict[str, int] = {}
+_generations_lock = threading.Lock()
+_caches: "weakref.WeakSet[QueryCache]" = weakref.WeakSet()
+
+_PENDING_TABLES_KEY = "query_cache_pending_tables"
+
+
+def get_table_generation(table_name: str) -> int:
+    """取得資料表目前的世代"""
+    return _generations.get(table_name, 0)
+
+
+def bump_table_generation(*table_names: str) -> None:
+    """遞增資料表的世代，使依賴這些資料表的快取失效"""
+    with _generations_lock:
+        for table_name in table_names:
+            _generations[table_name] = _generations.get(table_name, 0) + 1
+
+
+def is_query_cache_enabled() -> bool:
+    """是否啟用查詢快取 (環境變數 QUERY_CACHE_ENABLED，預設啟用)"""
+    return os.getenv("QUERY_CACHE_ENABLED", "true").lower() in ("true", "1", "yes")
+
+
+def _read_float_env(name: str, default: float) -> float:
+    try:
+        value = float(os.getenv(name, str(default)))
+    except ValueError:
+        logger.warning("環境變數 %s 無效，使用預設值: %s", name, default)
+        return default
+    return value if value > 0 else default
+
+
+def _normalize(value: Any) -> Any:
+    """將參數轉為可雜湊且與順序無關的形式"""
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), _normalize(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_normalize(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(_normalize(v) for v in value))
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
+
+
+class QueryCache:
+    """執行緒安全的 LRU + TTL 快取，項目記錄建立時依賴資料表的世代"""
+
+    def __init__(
+        self,
+        name: str,
+        ttl_seconds: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+        version_loader: Optional[Callable[[Tuple[str, ...]], Optional[str]]] = None,
+    ):
+        """
+        Args:
+            version_loader: 依資料表名稱返回資料庫中共用版本的函數 (例如 BaseService.get_query_cache_version)，
+                返回 None 表示無法取得版本，此時略過快取
+        """
+        self.name = name
+        self.ttl_seconds = ttl_seconds or _read_float_env(
+            "QUERY_CACHE_TTL_SEC", DEFAULT_TTL_SEC
+        )
+        self.max_entries = max_entries or int(
+            _read_float_env("QUERY_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)
+        )
+        self._clock = clock
+        self._version_loader = version_loader
+        self._entries: "OrderedDict[Any, Tuple[float, Tuple[Any, ...], Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._metrics = {"hits": 0, "misses": 0, "bypasses": 0, "evictions": 0, "invalidations": 0}
+        _caches.add(self)
+
+    def get_or_load(
+        self, key: Any, tables: Iterable[str], loader: Callable[[], Any]
+    ) -> Any:
+        """讀取快取，未命中時呼叫 loader 並在結果成功時寫入"""
+        tables = tuple(tables)
+        if cache_bypass_var.get() or not is_query_cache_enabled():
+            self._count("bypasses")
+            cache_status_var.set("BYPASS")
+            return loader()
+
+        generations: Tuple[Any, ...] = tuple(get_table_generation(t) for t in tables)
+        if self._version_loader is not None:
+            shared_version = self._version_loader(tables)
+            if shared_version is None:
+                self._count("bypasses")
+                cache_status_var.set("BYPASS")
+                return loader()
+            generations += (shared_version,)
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, entry_generations, value = entry
+                if expires_at > now and entry_generations == generations:
+                    self._entries.move_to_end(key)
+                    self._metrics["hits"] += 1
+                    cache_status_var.set("HIT")
+                    return _copy_result(value)
+                del self._entries[key]
+                self._metrics["invalidations"] += 1
+            self._metrics["misses"] += 1
+        cache_status_var.set("MISS")
+
+        value = loader()
+        if _is_cacheable(value):
+            with self._lock:
+                self._entries[key] = (now + self.ttl_seconds, generations, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self._metrics["evictions"] += 1
+        return value
+
+    def clear(self) -> None:
+        """清除所有項目"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """取得命中率等統計"""
+        with self._lock:
+            metrics = dict(self._metrics)
+            metrics["size"] = len(self._entries)
+        lookups = metrics["hits"] + metrics["misses"]
+        metrics["hit_rate"] = round(metrics["hits"] / lookups, 4) if lookups else 0.0
+        metrics["ttl_seconds"] = self.ttl_seconds
+        metrics["max_entries"] = self.max_entries
+        return metrics
+
+    def _count(self, metric: str) -> None:
+        with self._lock:
+            self._metrics[metric] += 1
+
+
+def _is_cacheable(value: Any) -> bool:
+    """只快取成功的服務結果"""
+    return not (isinstance(value, dict) and value.get("success") is False)
+
+
+def _copy_result(value: Any) -> Any:
+    """返回服務結果字典的淺拷貝，避免呼叫端修改快取內容"""
+    return dict(value) if isinstance(value, dict) else value
+
+
+def get_query_cache_metrics() -> Dict[str, Dict[str, Any]]:
+    """取得本行程所有查詢快取的統計"""
+    return {cache.name: cache.get_metrics() for cache in list(_caches)}
+
+
+def cached_query(*tables: str) -> Callable:
+    """將服務的讀取方法結果快取，依賴的資料表有寫入提交後失效
+
+    快取鍵為方法名稱加上依簽名綁定 (含預設值) 並正規化的參數，
+    相同查詢的不同寫法 (位置/關鍵字參數、字典順序) 共用同一項目。
+    """
+
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            cache = getattr(self, "query_cache", None)
+            if cache is None:
+                return func(self, *args, **kwargs)
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            params = tuple(
+                (name, _normalize(value))
+                for name, value in bound.arguments.items()
+                if name != "self"
+            )
+            return cache.get_or_load(
+                (func.__name__, params),
+                tables,
+                lambda: func(self, *args, **kwargs),
+            )
+
+        return wrapper
+
+    return decorator
+
+
+def _pending_tables(session: Session) -> set:
+    return session.info.setdefault(_PENDING_TABLES_KEY, set())
+
+
+@event.listens_for(Session, "after_flush")
+def _record_flushed_tables(session: Session, flush_context) -> None:
+    """記錄本次交易中以 ORM 物件寫入的資料表"""
+    changed = set()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        table = getattr(obj, "__table__", None)
+        if table is not None:
+            changed.add(table.name)
+    if changed:
+        _pending_tables(session).update(changed)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _record_dml_tables(orm_execute_state) -> None:
+    """記錄以 insert/update/delete 語句寫入的資料表"""
+    if not (
+        orm_execute_state.is_insert
+        or orm_execute_state.is_update
+        or orm_execute_state.is_delete
+    ):
+        return
+    table = getattr(orm_execute_state.statement, "table", None)
+    name = getattr(table, "name", None)
+    if name:
+        _pending_tables(orm_execute_state.session).add(name)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_committed_tables(session: Session) -> None:
+    """交易提交後遞增有寫入的資料表世代"""
+    tables = session.info.pop(_PENDING_TABLES_KEY, None)
+    if tables:
+        bump_table_generation(*tables)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_pending_tables(session: Session, previous_transaction) -> None:
+    """交易回滾時捨棄尚未提交的寫入記錄"""
+    if not session.in_transaction():
+        session.info.pop(_PENDING_TABLES_KEY, None)
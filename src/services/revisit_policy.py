@@ -0,0 +1,219 @@
+"""重訪策略：依各類別觀察到的新連結產出，調整類別列表頁的重訪頻率與抓取頁數。
+
+排程任務依 cron 固定重新抓取每個類別的列表頁，但各類別的更新頻率差異很大，
+很少更新的類別和熱門類別被同樣頻繁地抓取，浪費大量請求。此模組為每個類別維護
+重訪狀態 (存於 crawler_tasks.revisit_state)：
+
+- 頁數：最後一頁仍有新連結時加倍 (不超過任務的 max_pages)；否則縮減為最後一個
+  有新連結的頁數 + 1，沒有新連結時降到 min_pages。
+- 重訪間隔：沒有新連結時加倍 (至少為距上次重訪的時間，不超過最長重訪間隔)；
+  有新連結時減半，最後一頁仍有新連結時歸零 (每次任務觸發都重訪)。
+- 任務觸發時只抓取已到期的類別，因此重訪頻率的上限仍是任務的 cron 排程。
+"""
+
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)  # 使用統一的 logger
+
+DEFAULT_MIN_PAGES = 1
+DEFAULT_MAX_INTERVAL_SEC = 86400
+# 沒有新連結時重訪間隔的增長倍數
+INTERVAL_BACKOFF_FACTOR = 2
+# 重訪間隔減半後低於此秒數時歸零
+MIN_INTERVAL_SEC = 60
+# 任務觸發時間早於下次重訪時間不超過重訪間隔的此比例時仍視為到期，避免排程抖動讓類別多等一個週期
+DUE_TOLERANCE_RATIO = 0.1
+# 平均新連結數的指數移動平均權重
+NEW_LINKS_EMA_ALPHA = 0.3
+
+
+def _read_number_env(name: str, default, cast=int):
+    raw_value = os.getenv(name)
+    if raw_value is None or raw_value == "":
+        return default
+    try:
+        value = cast(raw_value)
+    except ValueError:
+        logger.warning("環境變數 %s 值 '%s' 無效，使用預設值: %s", name, raw_value, default)
+        return default
+    if value <= 0:
+        logger.warning("環境變數 %s 必須為正數，使用預設值: %s", name, default)
+        return default
+    return value
+
+
+def _parse_datetime(value: Any) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def build_category_stats(
+    category_pages: Dict[str, Dict[str, Any]],
+    new_links: Dict[str, List[int]],
+    skipped: Optional[Dict[str, Optional[str]]] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """整理各類別的抓取統計，供任務歷史記錄顯示
+
+    Args:
+        category_pages: 爬蟲回報的 {類別: {requests, planned_pages, page_links}}
+        new_links: {類別: 每頁新連結數}
+        skipped: 未到期而略過的 {類別: 下次重訪時間}
+
+    Returns:
+        {類別: {planned_pages, pages, requests, links, new_links, new_links_per_page, yield_ratio}}，
+        略過的類別為 {skipped: True, requests: 0, next_visit_at}
+    """
+    stats: Dict[str, Dict[str, Any]] = {}
+    for category, observed in category_pages.items():
+        pages = len(observed.get("page_links") or [])
+        requests = observed.get("requests", 0)
+        category_new_links = sum(new_links.get(category, []))
+        stats[category] = {
+            "planned_pages": observed.get("planned_pages"),
+            "pages": pages,
+            "requests": requests,
+            "links": sum(len(links) for links in observed.get("page_links") or []),
+            "new_links": category_new_links,
+            "new_links_per_page": round(category_new_links / pages, 4) if pages else 0.0,
+            "yield_ratio": round(category_new_links / requests, 4) if requests else 0.0,
+        }
+    for category, next_visit_at in (skipped or {}).items():
+        stats[category] = {"skipped": True, "requests": 0, "next_visit_at": next_visit_at}
+    return stats
+
+
+class RevisitPolicy:
+    """依新連結產出調整各類別的重訪間隔與頁數
+
+    Attributes:
+        min_pages: 每個類別最少抓取的頁數 (REVISIT_MIN_PAGES，可由任務參數 min_pages 覆寫)
+        max_interval_sec: 類別最長的重訪間隔秒數 (REVISIT_MAX_INTERVAL_SEC，可由任務參數 revisit_max_interval_sec 覆寫)
+    """
+
+    def __init__(self, min_pages: Optional[int] = None, max_interval_sec: Optional[int] = None):
+        self.min_pages = min_pages or _read_number_env("REVISIT_MIN_PAGES", DEFAULT_MIN_PAGES)
+        self.max_interval_sec = max_interval_sec or _read_number_env(
+            "REVISIT_MAX_INTERVAL_SEC", DEFAULT_MAX_INTERVAL_SEC
+        )
+
+    def _clamp_pages(self, pages: int, max_pages: int) -> int:
+        return max(min(pages, max_pages), min(self.min_pages, max_pages))
+
+    def plan(
+        self,
+        categories: Sequence[str],
+        revisit_state: Optional[Dict[str, Any]],
+        max_pages: int,
+        now: Optional[datetime] = None,
+    ) -> Tuple[Dict[str, int], Dict[str, Optional[str]]]:
+        """決定本次要抓取的類別與頁數
+
+        沒有重訪狀態的類別抓取完整的 max_pages，作為之後調整的依據。
+
+        Returns:
+            ({類別: 頁數}, 未到期而略過的 {類別: 下次重訪時間})
+        """
+        now = now or datetime.now(timezone.utc)
+        revisit_state = revisit_state or {}
+        category_pages: Dict[str, int] = {}
+        skipped: Dict[str, Optional[str]] = {}
+        for category in categories:
+            state = revisit_state.get(category)
+            if not state:
+                category_pages[category] = max_pages
+                continue
+            next_visit_at = _parse_datetime(state.get("next_visit_at"))
+            tolerance = timedelta(seconds=state.get("interval_sec", 0) * DUE_TOLERANCE_RATIO)
+            if next_visit_at is not None and now + tolerance < next_visit_at:
+                skipped[category] = state.get("next_visit_at")
+                continue
+            category_pages[category] = self._clamp_pages(state.get("pages") or max_pages, max_pages)
+        return category_pages, skipped
+
+    def update(
+        self,
+        revisit_state: Optional[Dict[str, Any]],
+        new_links: Dict[str, List[int]],
+        planned_pages: Dict[str, int],
+        max_pages: int,
+        now: Optional[datetime] = None,
+    ) -> Dict[str, Any]:
+        """依本次各類別每頁的新連結數更新重訪狀態
+
+        沒有抓到任何頁面的類別 (例如請求失敗) 不調整，避免把錯誤當成沒有更新。
+
+        Args:
+            revisit_state: 目前的重訪狀態
+            new_links: {類別: 每頁新連結數}
+            planned_pages: {類別: 本次計畫抓取的頁數}
+            max_pages: 任務的最大頁數
+
+        Returns:
+            新的重訪狀態
+        """
+        now = now or datetime.now(timezone.utc)
+        updated = dict(revisit_state or {})
+        for category, page_new_links in new_links.items():
+            if not page_new_links:
+                continue
+            previous = updated.get(category) or {}
+            planned = planned_pages.get(category, max_pages)
+            total_new_links = sum(page_new_links)
+            last_new_page = max(
+                (index + 1 for index, count in enumerate(page_new_links) if count > 0), default=0
+            )
+            # 抓滿計畫頁數且最後一頁仍有新連結，表示可能還有更多新文章
+            saturated = len(page_new_links) >= planned and page_new_links[-1] > 0
+
+            if saturated:
+                pages = self._clamp_pages(planned * 2, max_pages)
+            elif last_new_page:
+                pages = self._clamp_pages(last_new_page + 1, max_pages)
+            else:
+                pages = self._clamp_pages(self.min_pages, max_pages)
+
+            interval = float(previous.get("interval_sec", 0))
+            if total_new_links == 0:
+                last_visit_at = _parse_datetime(previous.get("last_visit_at"))
+                elapsed = (now - last_visit_at).total_seconds() if last_visit_at else 0.0
+                interval = min(max(interval * INTERVAL_BACKOFF_FACTOR, elapsed), self.max_interval_sec)
+            elif saturated:
+                interval = 0.0
+            else:
+                interval = interval / INTERVAL_BACKOFF_FACTOR
+                if interval < MIN_INTERVAL_SEC:
+                    interval = 0.0
+
+            average = previous.get("avg_new_links")
+            updated[category] = {
+                "pages": pages,
+                "interval_sec": round(interval, 1),
+                "last_visit_at": now.isoformat(),
+                "next_visit_at": (now + timedelta(seconds=interval)).isoformat(),
+                "avg_new_links": round(
+                    total_new_links
+                    if average is None
+                    else NEW_LINKS_EMA_ALPHA * total_new_links + (1 - NEW_LINKS_EMA_ALPHA) * average,
+                    4,
+                ),
+                "visits": previous.get("visits", 0) + 1,
+            }
+            if previous.get("pages") != pages or previous.get("interval_sec") != updated[category]["interval_sec"]:
+                logger.info(
+                    "類別 %s 新連結 %d 個，重訪頁數 %s -> %d，重訪間隔 %s -> %.0f 秒",
+                    category,
+                    total_new_links,
+                    previous.get("pages", planned),
+                    pages,
+                    previous.get("interval_sec", 0),
+                    interval,
+                )
+        return updated
@@ -0,0 +1,244 @@
+"""排程策略：避免大量任務在同一時間觸發 (thundering herd)。
+
+使用者常把許多任務設定在 `0 * * * *` 或 `0 9 * * *`，若全部在同一秒觸發，
+會同時佔滿任務執行緒池、資料庫連線，並對同一個網站瞬間送出大量請求。此模組提供：
+
+- 確定性分散：依任務 ID 的雜湊值，在分散窗口內給每個任務固定的偏移秒數，
+  同一分鐘的任務會平均分散開來，且每次觸發 (以及每個行程) 計算結果都相同。
+- 隨機抖動：全域 (SCHEDULER_JITTER_SEC) 或單一任務 (task_args.schedule_jitter_sec) 的抖動窗口。
+- 每個爬蟲的啟動上限：同一爬蟲在啟動窗口內最多啟動的任務數，超過時由排程服務
+  將該次觸發改排到名額釋出的時間 (不在排程器的執行緒中等待)。
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import deque
+from datetime import timedelta
+from typing import Any, Callable, Deque, Dict, Optional
+
+import pytz
+from apscheduler.triggers.cron import CronTrigger
+
+logger = logging.getLogger(__name__)  # 使用統一的 logger
+
+DEFAULT_SPREAD_SEC = 60
+DEFAULT_JITTER_SEC = 0
+DEFAULT_MAX_STARTS_PER_CRAWLER = 2
+DEFAULT_START_WINDOW_SEC = 30.0
+# 計算尖峰啟動數時保留的最近啟動記錄數
+START_HISTORY_SIZE = 1000
+
+
+def _read_number_env(name: str, default, cast=int):
+    raw_value = os.getenv(name)
+    if raw_value is None or raw_value == "":
+        return default
+    try:
+        value = cast(raw_value)
+    except ValueError:
+        logger.warning("環境變數 %s 值 '%s' 無效，使用預設值: %s", name, raw_value, default)
+        return default
+    if value < 0:
+        logger.warning("環境變數 %s 不可為負數，使用預設值: %s", name, default)
+        return default
+    return value
+
+
+def spread_offset_seconds(task_id: int, window_seconds: int) -> int:
+    """依任務 ID 計算分散窗口內的固定偏移秒數
+
+    使用 sha1 而非內建 hash()，因為內建 hash 在不同行程間會隨機化。
+    """
+    if window_seconds <= 0:
+        return 0
+    digest = hashlib.sha1(f"crawler_task:{task_id}".encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % window_seconds
+
+
+class SpreadCronTrigger(CronTrigger):
+    """在 cron 觸發時間加上固定偏移 (與可選隨機抖動) 的觸發器
+
+    偏移以原始 cron 時間為基準計算，因此偏移不會累積；並保留原始 cron 表達式
+    (expression 屬性)，讓排程服務能比較資料庫中的設定是否變更。
+    """
+
+    def __init__(
+        self,
+        expression: str,
+        offset_seconds: int = 0,
+        jitter: Optional[int] = None,
+        timezone=pytz.UTC,
+    ):
+        values = expression.split()
+        if len(values) != 5:
+            raise ValueError(f"cron 表達式必須包含 5 個欄位，收到 {len(values)} 個")
+        super().__init__(
+            minute=values[0],
+            hour=values[1],
+            day=values[2],
+            month=values[3],
+            day_of_week=values[4],
+            jitter=jitter or None,
+            timezone=timezone,
+        )
+        self.expression = expression
+        self.offset_seconds = int(offset_seconds)
+
+    def get_next_fire_time(self, previous_fire_time, now):
+        offset = timedelta(seconds=self.offset_seconds)
+        # 以未偏移的時間軸計算下一次 cron 時間，再加回偏移
+        base_previous = previous_fire_time - offset if previous_fire_time else None
+        next_fire_time = super().get_next_fire_time(base_previous, now - offset)
+        return next_fire_time + offset if next_fire_time else None
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        state["expression"] = self.expression
+        state["offset_seconds"] = self.offset_seconds
+        return state
+
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        self.expression = state.get("expression")
+        self.offset_seconds = state.get("offset_seconds", 0)
+
+    def __str__(self):
+        return f"cron[{self.expression}] +{self.offset_seconds}s"
+
+    def __repr__(self):
+        return (
+            f"<{self.__class__.__name__} (expression='{self.expression}', "
+            f"offset_seconds={self.offset_seconds}, jitter={self.jitter})>"
+        )
+
+
+class CrawlerStartLimiter:
+    """限制同一爬蟲在啟動窗口內的啟動數，並記錄啟動指標
+
+    只檢查並記錄名額，不會等待：超過上限時返回窗口內最早的一次啟動過期前的秒數，
+    由呼叫端決定延後或略過該次啟動。
+    """
+
+    def __init__(
+        self,
+        max_starts: int = DEFAULT_MAX_STARTS_PER_CRAWLER,
+        window_seconds: float = DEFAULT_START_WINDOW_SEC,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_starts = max_starts
+        self.window_seconds = window_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._starts_by_crawler: Dict[Any, Deque[float]] = {}
+        self._start_history: Deque[float] = deque(maxlen=START_HISTORY_SIZE)
+        self._metrics = {"total_starts": 0, "deferred_starts": 0, "total_defer_sec": 0.0}
+
+    def try_acquire(self, crawler_key: Any) -> float:
+        """嘗試取得啟動名額
+
+        Returns:
+            0 表示已取得名額；大於 0 表示已達上限，為名額釋出前的秒數 (未記錄啟動)
+        """
+        with self._lock:
+            now = self._clock()
+            starts = self._starts_by_crawler.setdefault(crawler_key, deque())
+            while starts and now - starts[0] >= self.window_seconds:
+                starts.popleft()
+            if self.max_starts <= 0 or len(starts) < self.max_starts:
+                starts.append(now)
+                self._start_history.append(now)
+                self._metrics["total_starts"] += 1
+                return 0.0
+            retry_after = max(self.window_seconds - (now - starts[0]), 0.01)
+            self._metrics["deferred_starts"] += 1
+            self._metrics["total_defer_sec"] += retry_after
+            return retry_after
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """啟動指標：總啟動數、因達上限而延後的觸發數、平均延後秒數與最近的每秒尖峰啟動數"""
+        with self._lock:
+            per_second: Dict[int, int] = {}
+            for started_at in self._start_history:
+                bucket = int(started_at)
+                per_second[bucket] = per_second.get(bucket, 0) + 1
+            deferred = self._metrics["deferred_starts"]
+            return {
+                "max_starts_per_crawler": self.max_starts,
+                "start_window_sec": self.window_seconds,
+                "total_starts": self._metrics["total_starts"],
+                "deferred_starts": deferred,
+                "avg_defer_sec": (
+                    round(self._metrics["total_defer_sec"] / deferred, 3) if deferred else 0.0
+                ),
+                "peak_starts_per_sec": max(per_second.values(), default=0),
+            }
+
+
+class SchedulePolicy:
+    """排程策略設定，負責建立觸發器與限制啟動"""
+
+    def __init__(
+        self,
+        spread_seconds: Optional[int] = None,
+        jitter_seconds: Optional[int] = None,
+        start_limiter: Optional[CrawlerStartLimiter] = None,
+    ):
+        self.spread_seconds = (
+            spread_seconds
+            if spread_seconds is not None
+            else _read_number_env("SCHEDULER_SPREAD_SEC", DEFAULT_SPREAD_SEC)
+        )
+        self.jitter_seconds = (
+            jitter_seconds
+            if jitter_seconds is not None
+            else _read_number_env("SCHEDULER_JITTER_SEC", DEFAULT_JITTER_SEC)
+        )
+        self.start_limiter = start_limiter or CrawlerStartLimiter(
+            max_starts=_read_number_env(
+                "SCHEDULER_MAX_STARTS_PER_CRAWLER", DEFAULT_MAX_STARTS_PER_CRAWLER
+            ),
+            window_seconds=_read_number_env(
+                "SCHEDULER_START_WINDOW_SEC", DEFAULT_START_WINDOW_SEC, float
+            ),
+        )
+
+    def jitter_for(self, task_args: Optional[Dict[str, Any]]) -> int:
+        """任務的抖動窗口：task_args.schedule_jitter_sec 優先，否則使用全域設定"""
+        if task_args and task_args.get("schedule_jitter_sec") is not None:
+            return max(int(task_args["schedule_jitter_sec"]), 0)
+        return self.jitter_seconds
+
+    def build_trigger(
+        self, task_id: int, cron_expression: str, task_args: Optional[Dict[str, Any]] = None
+    ) -> SpreadCronTrigger:
+        """建立帶有確定性偏移與抖動的 cron 觸發器"""
+        return SpreadCronTrigger(
+            cron_expression,
+            offset_seconds=spread_offset_seconds(task_id, self.spread_seconds),
+            jitter=self.jitter_for(task_args),
+            timezone=pytz.UTC,
+        )
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """排程策略設定與啟動指標"""
+        return {
+            "spread_sec": self.spread_seconds,
+            "jitter_sec": self.jitter_seconds,
+            **self.start_limiter.get_metrics(),
+        }
+
+
+_policy_lock = threading.Lock()
+_policy: Optional[SchedulePolicy] = None
+
+
+def get_schedule_policy() -> SchedulePolicy:
+    """取得行程內共用的排程策略 (觸發回呼為靜態方法，因此以模組層級共用)"""
+    global _policy
+    with _policy_lock:
+        if _policy is None:
+            _policy = SchedulePolicy()
+        return _policy
@@ -0,0 +1,286 @@
+"""提供排程器的領導者選舉，確保多個行程 (例如 gunicorn 的多個 worker) 中只有一個負責觸發排程任務。
+
+PostgreSQL 使用 session 層級的 advisory lock：鎖綁定在專用連線上，行程結束或連線中斷時自動釋放，
+其他行程在下一次檢查時即可接手。SQLite 等其他資料庫改用同一台主機上的檔案鎖。
+"""
+
+import logging
+import os
+import tempfile
+import threading
+from typing import Any, Dict, Optional
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)  # 使用統一的 logger
+
+try:  # pragma: no cover - 依平台載入
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+    import msvcrt
+
+# advisory lock 的鍵值 (所有行程必須一致)
+DEFAULT_ADVISORY_LOCK_KEY = 7_349_201_562
+DEFAULT_LOCK_FILE_NAME = "ainews_scheduler.lock"
+DEFAULT_CHECK_INTERVAL_SEC = 15.0
+
+
+def is_leader_election_enabled() -> bool:
+    """是否啟用排程器領導者選舉 (環境變數 SCHEDULER_LEADER_ELECTION，預設啟用)"""
+    return os.getenv("SCHEDULER_LEADER_ELECTION", "true").lower() in ("true", "1", "yes")
+
+
+def get_scheduler_health(scheduler_running: bool, leader_status: Dict[str, Any]) -> Dict[str, Any]:
+    """判斷排程器是否健康
+
+    未啟用領導者選舉時此行程必須運行排程器；啟用時只有領導者負責運行排程器，
+    非領導者不運行排程器屬於正常狀態，領導者的排程器未運行才視為不健康。
+
+    Args:
+        scheduler_running: 此行程的排程器是否運行中
+        leader_status: SchedulerLeaderElection.get_status() 的結果，未啟用時為 {"enabled": False}
+
+    Returns:
+        {"running", "is_leader", "healthy"}
+    """
+    is_leader = bool(leader_status.get("is_leader")) if leader_status.get("enabled") else True
+    return {
+        "running": scheduler_running,
+        "is_leader": is_leader,
+        "healthy": scheduler_running or not is_leader,
+    }
+
+
+class PostgresAdvisoryLock:
+    """以 pg_try_advisory_lock 實作的領導者鎖，持有期間保留一條專用連線"""
+
+    lock_type = "postgres_advisory_lock"
+
+    def __init__(self, engine, lock_key: int = DEFAULT_ADVISORY_LOCK_KEY):
+        self.engine = engine
+        self.lock_key = lock_key
+        self._connection = None
+
+    def try_acquire(self) -> bool:
+        """嘗試取得鎖，不阻塞"""
+        if self._connection is not None:
+            return self.is_held()
+        connection = self.engine.connect()
+        try:
+            acquired = bool(
+                connection.execute(
+                    text("SELECT pg_try_advisory_lock(:key)"), {"key": self.lock_key}
+                ).scalar()
+            )
+            # advisory lock 屬於 session 層級，提交交易不會釋放鎖，避免連線停留在 idle in transaction
+            connection.commit()
+        except Exception:
+            connection.close()
+            raise
+        if not acquired:
+            connection.close()
+            return False
+        self._connection = connection
+        return True
+
+    def is_held(self) -> bool:
+        """確認持有鎖的連線仍然存活"""
+        if self._connection is None:
+            return False
+        try:
+            self._connection.execute(text("SELECT 1"))
+            self._connection.commit()
+            return True
+        except Exception as e:
+            logger.warning("排程器領導者鎖的連線已中斷: %s", e)
+            self._close()
+            return False
+
+    def release(self) -> None:
+        """釋放鎖並關閉專用連線"""
+        if self._connection is None:
+            return
+        try:
+            self._connection.execute(
+                text("SELECT pg_advisory_unlock(:key)"), {"key": self.lock_key}
+            )
+            self._connection.commit()
+        except Exception as e:
+            logger.warning("釋放排程器領導者鎖時發生錯誤 (連線關閉後將自動釋放): %s", e)
+        finally:
+            self._close()
+
+    def _close(self) -> None:
+        try:
+            if self._connection is not None:
+                self._connection.close()
+        except Exception:
+            pass
+        self._connection = None
+
+
+class FileLeaderLock:
+    """以檔案鎖實作的領導者鎖，適用於 SQLite 等單機部署"""
+
+    lock_type = "file_lock"
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+
+    def try_acquire(self) -> bool:
+        """嘗試取得檔案鎖，不阻塞"""
+        if self._file is not None:
+            return True
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        lock_file = open(self.path, "a+", encoding="utf-8")
+        try:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:  # pragma: no cover - Windows
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            lock_file.close()
+            return False
+        lock_file.seek(0)
+        lock_file.truncate()
+        lock_file.write(str(os.getpid()))
+        lock_file.flush()
+        self._file = lock_file
+        return True
+
+    def is_held(self) -> bool:
+        """檔案鎖在行程存活期間一直有效"""
+        return self._file is not None
+
+    def release(self) -> None:
+        """釋放檔案鎖"""
+        if self._file is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            else:  # pragma: no cover - Windows
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+        except OSError as e:
+            logger.warning("釋放排程器檔案鎖時發生錯誤: %s", e)
+        finally:
+            self._file.close()
+            self._file = None
+
+
+def create_leader_lock(db_manager):
+    """依資料庫類型建立領導者鎖"""
+    engine = db_manager.engine
+    if engine.dialect.name == "postgresql":
+        raw_key = os.getenv("SCHEDULER_LEADER_LOCK_KEY")
+        lock_key = int(raw_key) if raw_key and raw_key.lstrip("-").isdigit() else DEFAULT_ADVISORY_LOCK_KEY
+        return PostgresAdvisoryLock(engine, lock_key)
+    lock_path = os.getenv("SCHEDULER_LOCK_FILE") or os.path.join(
+        tempfile.gettempdir(), DEFAULT_LOCK_FILE_NAME
+    )
+    return FileLeaderLock(lock_path)
+
+
+class SchedulerLeaderElection:
+    """排程器領導者選舉
+
+    每個行程定期嘗試取得領導者鎖：取得鎖的行程啟動排程器並負責觸發任務，
+    其餘行程只處理 Web 請求；領導者失去鎖 (例如資料庫連線中斷) 時暫停排程器，
+    由其他行程在下一次檢查時接手。
+    """
+
+    def __init__(
+        self,
+        scheduler_service=None,
+        lock=None,
+        check_interval: Optional[float] = None,
+    ):
+        if scheduler_service is None:
+            from src.services.service_container import get_scheduler_service
+
+            scheduler_service = get_scheduler_service()
+        self.scheduler_service = scheduler_service
+        self.lock = lock or create_leader_lock(scheduler_service.db_manager)
+        if check_interval is None:
+            try:
+                check_interval = float(
+                    os.getenv("SCHEDULER_LEADER_CHECK_SEC", str(DEFAULT_CHECK_INTERVAL_SEC))
+                )
+            except ValueError:
+                check_interval = DEFAULT_CHECK_INTERVAL_SEC
+        self.check_interval = check_interval if check_interval > 0 else DEFAULT_CHECK_INTERVAL_SEC
+        self._is_leader = False
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def is_leader(self) -> bool:
+        """此行程目前是否為排程器領導者"""
+        return self._is_leader
+
+    def start(self) -> None:
+        """立即進行一次選舉，並啟動背景執行緒定期檢查領導權"""
+        self.check_leadership()
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="SchedulerLeaderElection", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """停止選舉並釋放領導權"""
+        self._stop_event.set()
+        with self._lock:
+            if self._is_leader:
+                self._step_down("行程停止")
+
+    def check_leadership(self) -> bool:
+        """檢查或爭取領導權，返回此行程是否為領導者"""
+        with self._lock:
+            try:
+                if self._is_leader:
+                    if not self.lock.is_held():
+                        self._step_down("領導者鎖已失效")
+                elif self.lock.try_acquire():
+                    result = self.scheduler_service.start_scheduler()
+                    if result.get("success") or self.scheduler_service.is_running():
+                        self._is_leader = True
+                        logger.info("此行程 (PID %s) 已成為排程器領導者", os.getpid())
+                    else:
+                        logger.error("取得領導權但啟動排程器失敗: %s", result.get("message"))
+                        self.lock.release()
+            except Exception as e:
+                logger.error("排程器領導者選舉時發生錯誤: %s", e, exc_info=True)
+            return self._is_leader
+
+    def get_status(self) -> Dict[str, Any]:
+        """取得選舉狀態"""
+        return {
+            "enabled": True,
+            "is_leader": self._is_leader,
+            "lock_type": getattr(self.lock, "lock_type", type(self.lock).__name__),
+            "pid": os.getpid(),
+        }
+
+    def _step_down(self, reason: str) -> None:
+        """暫停排程器並釋放鎖 (呼叫前須持有 self._lock)"""
+        logger.warning("此行程 (PID %s) 卸下排程器領導者: %s", os.getpid(), reason)
+        try:
+            if self.scheduler_service.is_running():
+                self.scheduler_service.stop_scheduler()
+        finally:
+            self._is_leader = False
+            self.lock.release()
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.check_interval):
+            self.check_leadership()
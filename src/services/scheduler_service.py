@@ -1,11 +1,14 @@
 """排程服務模組，負責管理和執行基於 Cron 的爬蟲任務。"""
 
 import logging
+import os
+import threading
+import time
 from typing import Dict, Any, Tuple, Optional, Type, cast, List
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
 from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.triggers.cron import CronTrigger
+from apscheduler.schedulers.base import STATE_PAUSED
 from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
 from apscheduler.executors.pool import ThreadPoolExecutor, ProcessPoolExecutor
 import pytz
@@ -15,14 +18,99 @@ from src.services.base_service import BaseService
 from src.database.base_repository import BaseRepository
 from src.models.crawler_tasks_model import CrawlerTasks
 from src.database.crawler_tasks_repository import CrawlerTasksRepository
+from src.database.scheduler_task_change_repository import SchedulerTaskChangeRepository
+from src.models.scheduler_task_change_model import SchedulerTaskChange
 from src.services.task_executor_service import TaskExecutorService
 from src.error.errors import DatabaseOperationError
-from src.services.service_container import get_task_executor_service
+from src.services.service_container import (
+    get_scheduler_service,
+    get_task_executor_service,
+)
+from src.services.schedule_policy import get_schedule_policy
 from src.config import get_db_manager
 
 
 logger = logging.getLogger(__name__)  # 使用統一的 logger
 
+DEFAULT_SYNC_INTERVAL_SEC = 5
+DEFAULT_RELOAD_INTERVAL_SEC = 1800
+DEFAULT_STATS_REBUILD_INTERVAL_SEC = 21600
+# 排程變更記錄的保留時間，完整重載時清理
+CHANGE_LOG_RETENTION = timedelta(days=1)
+
+
+def _read_interval_env(name: str, default: int) -> int:
+    """讀取秒數設定，無效或非正整數時使用預設值"""
+    raw_value = os.getenv(name, str(default))
+    try:
+        value = int(raw_value)
+    except ValueError:
+        logger.warning("環境變數 %s 值 '%s' 無效，使用預設值: %s 秒", name, raw_value, default)
+        return default
+    if value <= 0:
+        logger.warning("%s 必須為正整數，使用預設值: %s 秒", name, default)
+        return default
+    return value
+
+
+def run_schedule_sync_loop(
+    scheduler_service_getter=None,
+    stop_event: Optional[threading.Event] = None,
+    sync_interval: Optional[float] = None,
+    reload_interval: Optional[float] = None,
+    stats_rebuild_interval: Optional[float] = None,
+    article_service_getter=None,
+) -> None:
+    """長期運行的排程同步迴圈
+
+    每 SCHEDULE_SYNC_INTERVAL_SEC 秒 (預設 5 秒) 套用排程變更記錄中的增量變更，
+    每 SCHEDULE_RELOAD_INTERVAL_SEC 秒 (預設 1800 秒) 執行一次完整重載作為安全網，
+    每 ARTICLE_STATS_REBUILD_SEC 秒 (預設 21600 秒) 重建文章統計彙總以修正誤差。
+    只有運行排程器的行程 (領導者) 會實際同步。
+    """
+    if scheduler_service_getter is None:
+        from src.services.service_container import get_scheduler_service
+
+        scheduler_service_getter = get_scheduler_service
+    if article_service_getter is None:
+        from src.services.service_container import get_article_service
+
+        article_service_getter = get_article_service
+    stop_event = stop_event or threading.Event()
+    sync_interval = sync_interval or _read_interval_env(
+        "SCHEDULE_SYNC_INTERVAL_SEC", DEFAULT_SYNC_INTERVAL_SEC
+    )
+    reload_interval = reload_interval or _read_interval_env(
+        "SCHEDULE_RELOAD_INTERVAL_SEC", DEFAULT_RELOAD_INTERVAL_SEC
+    )
+    stats_rebuild_interval = stats_rebuild_interval or _read_interval_env(
+        "ARTICLE_STATS_REBUILD_SEC", DEFAULT_STATS_REBUILD_INTERVAL_SEC
+    )
+    logger.info(
+        "排程增量同步間隔: %s 秒，完整重載間隔: %s 秒", sync_interval, reload_interval
+    )
+
+    last_reload = time.monotonic()
+    last_stats_rebuild = last_reload
+    while not stop_event.wait(sync_interval):
+        try:
+            scheduler = scheduler_service_getter()
+            if not scheduler.is_running():
+                logger.debug("此行程未運行排程器 (非領導者)，略過同步。")
+                continue
+            if time.monotonic() - last_reload >= reload_interval:
+                logger.info("開始完整重載排程任務...")
+                scheduler.reload_scheduler()
+                last_reload = time.monotonic()
+                logger.info("排程任務完整重載完成。")
+            else:
+                scheduler.sync_task_changes()
+            if time.monotonic() - last_stats_rebuild >= stats_rebuild_interval:
+                last_stats_rebuild = time.monotonic()
+                article_service_getter().rebuild_article_stats()
+        except Exception as e:
+            logger.error("排程同步錯誤: %s", e, exc_info=True)
+
 
 class SchedulerService(BaseService[CrawlerTasks]):
     """排程服務，使用 Cron 表達式調度爬蟲任務執行"""
@@ -73,13 +161,30 @@ class SchedulerService(BaseService[CrawlerTasks]):
             "job_count": 0,
             "last_start_time": None,
             "last_shutdown_time": None,
+            "last_change_id": 0,
+            "last_sync_time": None,
+            "synced_change_count": 0,
         }
 
     def _get_repository_mapping(
         self,
     ) -> Dict[str, Tuple[Type[BaseRepository], Type[CrawlerTasks]]]:
         """提供儲存庫映射"""
-        return {"CrawlerTask": (CrawlerTasksRepository, CrawlerTasks)}
+        return {
+            "CrawlerTask": (CrawlerTasksRepository, CrawlerTasks),
+            "SchedulerTaskChange": (
+                SchedulerTaskChangeRepository,
+                SchedulerTaskChange,
+            ),
+        }
+
+    def _mark_changes_applied_until_now(self, session: Session) -> None:
+        """在完整同步前記下目前最新的變更記錄 id，之後只需套用之後的變更"""
+        change_repo = cast(
+            SchedulerTaskChangeRepository,
+            self._get_repository("SchedulerTaskChange", session),
+        )
+        self.scheduler_status["last_change_id"] = change_repo.get_latest_change_id()
     
 
         
@@ -103,6 +208,7 @@ class SchedulerService(BaseService[CrawlerTasks]):
             removed_count = 0
 
             with self._transaction() as session:
+                self._mark_changes_applied_until_now(session)
                 repo = cast(
                     CrawlerTasksRepository, self._get_repository("CrawlerTask", session)
                 )
@@ -195,7 +301,11 @@ class SchedulerService(BaseService[CrawlerTasks]):
                         except Exception as e:
                             logger.warning("移除持久化任務 %s 失敗: %s", job_id, str(e))
 
-            self.cron_scheduler.start()
+            if self.cron_scheduler.state == STATE_PAUSED:
+                # stop_scheduler 只會暫停，再次啟動 (例如重新取得領導權) 時恢復即可
+                self.cron_scheduler.resume()
+            else:
+                self.cron_scheduler.start()
 
             self.scheduler_status["running"] = True
             self.scheduler_status["job_count"] = len(self.cron_scheduler.get_jobs())
@@ -275,7 +385,10 @@ class SchedulerService(BaseService[CrawlerTasks]):
             return False
 
         try:
-            trigger = CronTrigger.from_crontab(task.cron_expression, timezone=pytz.UTC)
+            # 依任務 ID 分散同一分鐘的任務，並套用抖動窗口，避免同時觸發
+            trigger = get_schedule_policy().build_trigger(
+                task.id, task.cron_expression, task.task_args
+            )
             job_id = f"task_{task.id}"
             self.cron_scheduler.add_job(
                 func=self._trigger_task,
@@ -289,7 +402,12 @@ class SchedulerService(BaseService[CrawlerTasks]):
                 jobstore="default",
             )
 
-            logger.info("已排程任務 %s，cron 表達式: %s", task.id, task.cron_expression)
+            logger.info(
+                "已排程任務 %s，cron 表達式: %s，分散偏移: %s 秒",
+                task.id,
+                task.cron_expression,
+                trigger.offset_seconds,
+            )
             return True
         except Exception as e:
             logger.error("排程任務 %s 失敗: %s", task.id, str(e), exc_info=True)
@@ -323,6 +441,7 @@ class SchedulerService(BaseService[CrawlerTasks]):
 
                 is_auto = task.is_auto
                 task_name = task.task_name
+                crawler_id = task.crawler_id
 
             if not is_auto:
                 logger.warning(
@@ -330,6 +449,12 @@ class SchedulerService(BaseService[CrawlerTasks]):
                 )
                 return
 
+            # 同一爬蟲短時間內啟動過多任務時改排到名額釋出後，不佔用排程器的執行緒等待
+            retry_after = get_schedule_policy().start_limiter.try_acquire(crawler_id)
+            if retry_after > 0:
+                SchedulerService._defer_task_start(task_id, crawler_id, retry_after)
+                return
+
             task_executor_service = get_task_executor_service()
             logger.info(
                 "調度器觸發執行任務 %s (%s), 附加參數: %s",
@@ -349,6 +474,35 @@ class SchedulerService(BaseService[CrawlerTasks]):
             if db_manager:
                 pass
 
+    @staticmethod
+    def _defer_task_start(task_id: int, crawler_id: Any, retry_after: float) -> None:
+        """爬蟲啟動數已達上限時，將任務的下次執行時間提前到名額釋出的時間
+
+        若任務原本的下次執行時間更早 (或任務已不在排程中)，略過本次觸發。
+        """
+        job_id = f"task_{task_id}"
+        retry_at = datetime.now(timezone.utc) + timedelta(seconds=retry_after)
+        try:
+            cron_scheduler = get_scheduler_service().cron_scheduler
+            job = cron_scheduler.get_job(job_id)
+            if job is None or (job.next_run_time and job.next_run_time <= retry_at):
+                logger.info(
+                    "任務 %s 的爬蟲 %s 啟動數已達上限，略過本次觸發 (下次執行時間: %s)",
+                    task_id,
+                    crawler_id,
+                    job.next_run_time if job else None,
+                )
+                return
+            cron_scheduler.modify_job(job_id, next_run_time=retry_at)
+            logger.info(
+                "任務 %s 的爬蟲 %s 啟動數已達上限，延後 %.1f 秒後重新觸發",
+                task_id,
+                crawler_id,
+                retry_after,
+            )
+        except Exception as e:
+            logger.error("延後任務 %s 的觸發失敗，略過本次觸發: %s", task_id, e, exc_info=True)
+
     def add_or_update_task_to_scheduler(
         self, task: CrawlerTasks, session: Session
     ) -> Dict[str, Any]:
@@ -378,6 +532,9 @@ class SchedulerService(BaseService[CrawlerTasks]):
                         job.trigger.expression,
                         task.cron_expression,
                     )
+                elif (job.kwargs or {}).get("task_args") != task.task_args:
+                    needs_update = True
+                    logger.info("任務 %s 的任務參數已變更，標記為需要更新。", task.id)
 
                 if needs_update:
                     self.cron_scheduler.remove_job(job_id)
@@ -506,6 +663,94 @@ class SchedulerService(BaseService[CrawlerTasks]):
                 "message": f"從排程移除任務 {task_id} 失敗: {str(e)}",
             }
 
+    def sync_task_changes(self, limit: int = 500) -> Dict[str, Any]:
+        """套用排程變更記錄中尚未處理的變更，只重新排程有變更的任務
+
+        Args:
+            limit: 單次最多讀取的變更記錄數量
+
+        Returns:
+            Dict[str, Any]: 包含同步結果的字典
+        """
+        if not self.scheduler_status["running"]:
+            return {"success": False, "message": "調度器未運行，無法同步"}
+
+        try:
+            scheduled_count = 0
+            removed_count = 0
+            with self._transaction() as session:
+                change_repo = cast(
+                    SchedulerTaskChangeRepository,
+                    self._get_repository("SchedulerTaskChange", session),
+                )
+                changes = change_repo.find_changes_after(
+                    self.scheduler_status.get("last_change_id", 0), limit
+                )
+                if not changes:
+                    return {
+                        "success": True,
+                        "message": "沒有新的排程變更",
+                        "scheduled_count": 0,
+                        "removed_count": 0,
+                    }
+
+                repo = cast(
+                    CrawlerTasksRepository, self._get_repository("CrawlerTask", session)
+                )
+                # 同一任務的多筆變更只需以目前狀態套用一次
+                changed_task_ids = list(dict.fromkeys(c["task_id"] for c in changes))
+                for task_id in changed_task_ids:
+                    task = repo.get_by_id(task_id)
+                    if (
+                        task
+                        and task.is_auto
+                        and task.is_active
+                        and task.cron_expression
+                    ):
+                        result = self.add_or_update_task_to_scheduler(task, session)
+                        if result["success"]:
+                            scheduled_count += 1
+                        else:
+                            logger.error("同步任務 %s 的排程變更失敗。", task_id)
+                        continue
+
+                    job_id = f"task_{task_id}"
+                    if self.cron_scheduler.get_job(job_id):
+                        self.cron_scheduler.remove_job(job_id)
+                        removed_count += 1
+                        logger.info("同步時移除已刪除/非自動的任務: %s", job_id)
+                    if task and task.is_scheduled:
+                        repo.toggle_scheduled_status(task_id)
+                        session.flush()
+
+            self.scheduler_status["last_change_id"] = changes[-1]["id"]
+            self.scheduler_status["last_sync_time"] = datetime.now(timezone.utc)
+            self.scheduler_status["synced_change_count"] = self.scheduler_status.get(
+                "synced_change_count", 0
+            ) + len(changes)
+            self.scheduler_status["job_count"] = len(self.cron_scheduler.get_jobs())
+            logger.info(
+                "已套用 %s 筆排程變更 (%s 個任務)：排程 %s 個，移除 %s 個",
+                len(changes),
+                len(changed_task_ids),
+                scheduled_count,
+                removed_count,
+            )
+            return {
+                "success": True,
+                "message": f"已套用 {len(changes)} 筆排程變更，排程 {scheduled_count} 個任務，移除 {removed_count} 個任務",
+                "scheduled_count": scheduled_count,
+                "removed_count": removed_count,
+            }
+        except DatabaseOperationError as db_e:
+            error_msg = f"同步排程變更時資料庫操作失敗: {str(db_e)}"
+            logger.error(error_msg, exc_info=True)
+            return {"success": False, "message": error_msg}
+        except Exception as e:
+            error_msg = f"同步排程變更失敗: {str(e)}"
+            logger.error(error_msg, exc_info=True)
+            return {"success": False, "message": error_msg}
+
     def reload_scheduler(self) -> Dict[str, Any]:
         """當任務資料變更時，重新載入或調整調度任務，使用事務管理"""
         if not self.scheduler_status["running"]:
@@ -524,6 +769,16 @@ class SchedulerService(BaseService[CrawlerTasks]):
             added_count = 0
 
             with self._transaction() as session:
+                self._mark_changes_applied_until_now(session)
+                change_repo = cast(
+                    SchedulerTaskChangeRepository,
+                    self._get_repository("SchedulerTaskChange", session),
+                )
+                purged = change_repo.purge_before(
+                    datetime.now(timezone.utc) - CHANGE_LOG_RETENTION
+                )
+                if purged:
+                    logger.info("已清理 %s 筆過期的排程變更記錄", purged)
                 repo = cast(
                     CrawlerTasksRepository, self._get_repository("CrawlerTask", session)
                 )
@@ -585,6 +840,7 @@ class SchedulerService(BaseService[CrawlerTasks]):
         """
         if self.scheduler_status["running"]:
             self.scheduler_status["job_count"] = len(self.cron_scheduler.get_jobs())
+        self.scheduler_status["start_metrics"] = get_schedule_policy().get_metrics()
 
         return {
             "success": True,
@@ -620,6 +876,9 @@ class SchedulerService(BaseService[CrawlerTasks]):
                             if hasattr(job.trigger, "expression")
                             else None
                         ),
+                        "spread_offset_seconds": getattr(
+                            job.trigger, "offset_seconds", 0
+                        ),
                         "misfire_grace_time": job.misfire_grace_time,
                         "active": job.next_run_time is not None,
                     }
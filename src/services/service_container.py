@@ -34,6 +34,30 @@ def get_scheduler_service():
     from src.services.scheduler_service import SchedulerService
     return ServiceContainer.get_instance(SchedulerService, task_executor_service=get_task_executor_service())
 
+# singleton
+def get_scheduler_leader_election():
+    """獲取排程器領導者選舉實例"""
+    from src.services.scheduler_leader import SchedulerLeaderElection
+    return ServiceContainer.get_instance(SchedulerLeaderElection, scheduler_service=get_scheduler_service())
+
+# singleton
+def get_article_write_queue():
+    """獲取跨任務共用的文章寫入佇列實例"""
+    from src.services.article_write_queue import ArticleWriteQueue
+    return ServiceContainer.get_instance(ArticleWriteQueue, article_service=get_article_service())
+
+# singleton
+def get_task_queue_service():
+    """獲取任務佇列服務實例"""
+    from src.services.task_queue_service import TaskQueueService
+    return ServiceContainer.get_instance(TaskQueueService)
+
+# singleton
+def get_crawl_frontier_service():
+    """獲取待抓取連結服務實例"""
+    from src.services.crawl_frontier_service import CrawlFrontierService
+    return ServiceContainer.get_instance(CrawlFrontierService)
+
 def get_article_service():
     """獲取文章服務實例"""
     from src.services.article_service import ArticleService
@@ -23,14 +23,24 @@ from src.database.base_repository import BaseRepository, SchemaType
 from src.database.crawler_task_history_repository import CrawlerTaskHistoryRepository
 from src.database.crawler_tasks_repository import CrawlerTasksRepository
 from src.database.crawlers_repository import CrawlersRepository
+from src.database.task_queue_repository import TaskQueueRepository
 from src.interface.progress_reporter import ProgressListener
 from src.models.base_model import Base  # Base 可能在類型提示中使用，予以保留
 from src.models.crawler_task_history_model import CrawlerTaskHistory
 from src.models.crawler_tasks_model import CrawlerTasks, ScrapePhase
 from src.models.crawler_tasks_schema import CrawlerTaskReadSchema
 from src.models.crawlers_model import Crawlers
+from src.models.task_queue_model import TaskQueue
 from src.services.base_service import BaseService
-from src.services.service_container import get_article_service, get_crawlers_service
+from src.services.service_container import (
+    get_article_service,
+    get_article_write_queue,
+    get_crawl_frontier_service,
+    get_crawlers_service,
+)
+from src.services.article_write_queue import is_write_behind_enabled
+from src.services.crawl_frontier_service import is_crawl_frontier_enabled
+from src.services.task_queue_service import is_task_queue_enabled
 from src.utils.enum_utils import TaskStatus
   # 使用統一的 logger
 from src.web.socket_instance import generate_session_id, socketio
@@ -70,6 +80,7 @@ class TaskExecutorService(BaseService[CrawlerTasks], ProgressListener):
             "CrawlerTask": (CrawlerTasksRepository, CrawlerTasks),
             "Crawler": (CrawlersRepository, Crawlers),
             "TaskHistory": (CrawlerTaskHistoryRepository, CrawlerTaskHistory),
+            "TaskQueue": (TaskQueueRepository, TaskQueue),
         }
 
     def on_progress_update(self, task_id: int, progress_data: Dict[str, Any]) -> None:
@@ -101,6 +112,10 @@ class TaskExecutorService(BaseService[CrawlerTasks], ProgressListener):
                     ),
                 }
             )
+            if progress_data.get("circuit_breaker"):
+                self.task_execution_status[task_id]["circuit_breaker"] = progress_data[
+                    "circuit_breaker"
+                ]
 
         session_id = None
         with self.task_lock:
@@ -120,6 +135,9 @@ class TaskExecutorService(BaseService[CrawlerTasks], ProgressListener):
             "message": progress_data.get("message", "無訊息"),
             "session_id": session_id,
         }
+        # 主機斷路器開啟時任務會暫停請求，一併回報狀態
+        if progress_data.get("circuit_breaker"):
+            socketio_data["circuit_breaker"] = progress_data["circuit_breaker"]
 
         socketio.emit(
             "task_progress", socketio_data, namespace="/tasks", to=base_room_name
@@ -136,6 +154,9 @@ class TaskExecutorService(BaseService[CrawlerTasks], ProgressListener):
     ) -> Dict[str, Any]:
         """執行指定的爬蟲任務
 
+        異步執行且 TASK_EXECUTION_MODE=queue 時，任務會寫入資料庫佇列交由 worker 執行，
+        而非提交到本機執行緒池。
+
         Args:
             task_id: 任務ID
             is_async: 是否異步執行
@@ -216,6 +237,28 @@ class TaskExecutorService(BaseService[CrawlerTasks], ProgressListener):
                 task_orm_for_sync = updated_task
                 session.flush()
 
+                if is_async and is_task_queue_enabled():
+                    queue_repo = cast(
+                        TaskQueueRepository, self._get_repository("TaskQueue", session)
+                    )
+                    if queue_repo.find_active_by_task_id(task_id):
+                        raise ValueError(f"任務 {task_id} 已在佇列中")
+                    entry = queue_repo.enqueue(task_id, history_id, dict(kwargs))
+                    logger.info(
+                        "任務 %s 已加入資料庫佇列 (佇列項目 %s)，等待 worker 領取",
+                        task_id,
+                        entry.id if entry else None,
+                    )
+                    return {
+                        "success": True,
+                        "message": f"任務 {task_id} 已加入佇列",
+                        "task_id": task_id,
+                        "status": "queued",
+                        "queue_id": entry.id if entry else None,
+                        "session_id": session_id,
+                        "room": base_room_name,
+                    }
+
             if is_async:
                 with self.task_lock:
                     future = self.thread_pool.submit(
@@ -264,6 +307,23 @@ class TaskExecutorService(BaseService[CrawlerTasks], ProgressListener):
                     logger.error("清理歷史記錄 %s 失敗: %s", history_id, cleanup_error)
             return {"success": False, "message": error_msg}
 
+    def run_queued_task(
+        self, task_id: int, history_id: Optional[int], **kwargs
+    ) -> Dict[str, Any]:
+        """在目前執行緒同步執行 worker 從任務佇列領取的任務
+
+        任務狀態與歷史記錄已在排入佇列時建立，此處直接執行並寫回結果。
+
+        Args:
+            task_id: 任務ID
+            history_id: 排入佇列時建立的歷史記錄ID
+            **kwargs: 任務參數 (佇列項目的 payload)
+
+        Returns:
+            Dict[str, Any]: 執行結果
+        """
+        return self._execute_task_internal(task_id, history_id, **kwargs)
+
     def _task_completion_callback(self, task_id: int, future: Future):
         """任務完成回調函數，清理執行中的任務記錄
 
@@ -397,11 +457,13 @@ class TaskExecutorService(BaseService[CrawlerTasks], ProgressListener):
                     return {"success": False, "message": f"執行時找不到任務 {task_id}"}
 
                 local_task_args = None
+                local_revisit_state = None
 
                 try:
                     session.refresh(task)
                     logger.debug("成功刷新任務 %s 的狀態", task_id)
                     local_task_args = task.task_args or {}
+                    local_revisit_state = task.revisit_state
                     logger.debug("成功獲取任務 %s 的 task_args (提前獲取)", task_id)
                 except DetachedInstanceError as detached_e:
                     logger.error("在 session.refresh 後立即訪問 task_args 仍發生 DetachedInstanceError: %s", detached_e, exc_info=True)
@@ -460,6 +522,11 @@ class TaskExecutorService(BaseService[CrawlerTasks], ProgressListener):
                 crawler_instance = CrawlerFactory.get_crawler(crawler_name)
 
                 crawler_instance.add_progress_listener(task_id, self)
+                if is_write_behind_enabled():
+                    crawler_instance.article_write_queue = get_article_write_queue()
+                if is_crawl_frontier_enabled():
+                    crawler_instance.crawl_frontier = get_crawl_frontier_service()
+                crawler_instance.revisit_state = local_revisit_state
 
                 with self.task_lock:
                     self.running_crawlers[task_id] = crawler_instance
@@ -493,7 +560,10 @@ class TaskExecutorService(BaseService[CrawlerTasks], ProgressListener):
                         else "任務執行失敗"
                     ),
                 )
-                articles_count = result.get("articles_count", 0)
+                # 有寫入確認時以實際保存的文章數為準
+                articles_count = result.get(
+                    "saved_articles_count", result.get("articles_count", 0)
+                )
 
                 task_data = {
                     "task_status": task_status_enum.value,
@@ -503,6 +573,9 @@ class TaskExecutorService(BaseService[CrawlerTasks], ProgressListener):
                     "last_run_message": message,
                     "task_args": {**task_args, "get_links_by_task_id": result.get("get_links_by_task_id", False)}
                 }
+                # 啟用 adaptive_revisit 的任務保存更新後的各類別重訪狀態
+                if "revisit_state" in result:
+                    task_data["revisit_state"] = result["revisit_state"]
                 validated_task_data = tasks_repo.validate_data(
                     task_data, SchemaType.UPDATE
                 )
@@ -521,6 +594,9 @@ class TaskExecutorService(BaseService[CrawlerTasks], ProgressListener):
                         "articles_count": articles_count,
                         "success": result.get("success", False),
                     }
+                    # 各類別的頁數、請求數與新連結/請求比例
+                    if result.get("category_stats"):
+                        history_data["category_stats"] = result["category_stats"]
                     validated_history_data = history_repo.validate_data(
                         history_data, SchemaType.UPDATE
                     )
@@ -565,6 +641,10 @@ class TaskExecutorService(BaseService[CrawlerTasks], ProgressListener):
                 "articles_count": articles_count,
                 "session_id": session_id,
             }
+            # 保存的文章中內容變更與未變更的數量 (有保存到資料庫時才提供) 與各類別的抓取統計
+            for key in ("changed_articles_count", "unchanged_articles_count", "category_stats"):
+                if key in result:
+                    final_data[key] = result[key]
             socketio.emit(
                 "task_progress", final_data, namespace="/tasks", to=base_room_name
             )
@@ -733,6 +813,15 @@ class TaskExecutorService(BaseService[CrawlerTasks], ProgressListener):
                 if not task:
                     return {"success": False, "message": "任務不存在"}
 
+                queue_cancelled = False
+                if is_task_queue_enabled():
+                    queue_repo = cast(
+                        TaskQueueRepository, self._get_repository("TaskQueue", session)
+                    )
+                    queue_cancelled = queue_repo.cancel_queued(task_id) > 0
+                    if queue_cancelled:
+                        logger.info("已取消任務 %s 尚未被 worker 領取的佇列項目", task_id)
+
                 crawler_cancelled = False
                 if crawler_instance_to_cancel:
                     try:
@@ -773,7 +862,7 @@ class TaskExecutorService(BaseService[CrawlerTasks], ProgressListener):
                         # 即使爬蟲取消失敗，如果執行緒已取消，也可能繼續標記為已取消
 
                 # 如果執行緒已成功取消，即使爬蟲取消失敗，也認為任務已停止
-                cancelled = thread_cancelled or crawler_cancelled
+                cancelled = thread_cancelled or crawler_cancelled or queue_cancelled
 
                 if cancelled:
                     latest_history_orm = cast(
@@ -925,7 +1014,7 @@ class TaskExecutorService(BaseService[CrawlerTasks], ProgressListener):
 
         if is_running_in_memory and has_status_in_memory:
             status_data = self.task_execution_status.get(task_id, {})
-            return {
+            status = {
                 "success": True,
                 "task_status": TaskStatus.RUNNING.value,
                 "scrape_phase": status_data.get(
@@ -935,6 +1024,9 @@ class TaskExecutorService(BaseService[CrawlerTasks], ProgressListener):
                 "message": status_data.get("message", "任務執行中"),
                 "session_id": session_id,
             }
+            if status_data.get("circuit_breaker"):
+                status["circuit_breaker"] = status_data["circuit_breaker"]
+            return status
 
         if is_running_in_memory:
             progress = 50
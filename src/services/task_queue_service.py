@@ -0,0 +1,233 @@
+"""提供資料庫任務佇列的業務邏輯服務，供多節點 worker 領取、回報心跳與寫回爬蟲任務執行結果。"""
+
+import logging
+import os
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple, Type, cast
+
+from src.database.base_repository import BaseRepository, SchemaType
+from src.database.crawler_task_history_repository import CrawlerTaskHistoryRepository
+from src.database.crawler_tasks_repository import CrawlerTasksRepository
+from src.database.task_queue_repository import TaskQueueRepository
+from src.models.base_model import Base
+from src.models.crawler_task_history_model import CrawlerTaskHistory
+from src.models.crawler_tasks_model import CrawlerTasks, ScrapePhase
+from src.models.task_queue_model import TaskQueue
+from src.models.task_queue_schema import TaskQueueReadSchema
+from src.services.base_service import BaseService
+from src.utils.enum_utils import TaskStatus
+
+logger = logging.getLogger(__name__)  # 使用統一的 logger
+
+# 任務執行模式
+EXECUTION_MODE_LOCAL = "local"
+EXECUTION_MODE_QUEUE = "queue"
+
+
+def is_task_queue_enabled() -> bool:
+    """是否將任務交由 worker 執行 (環境變數 TASK_EXECUTION_MODE=queue)"""
+    return (
+        os.getenv("TASK_EXECUTION_MODE", EXECUTION_MODE_LOCAL).strip().lower()
+        == EXECUTION_MODE_QUEUE
+    )
+
+
+class TaskQueueService(BaseService[TaskQueue]):
+    """任務佇列服務"""
+
+    def __init__(self, db_manager=None):
+        super().__init__(db_manager)
+
+    def _get_repository_mapping(
+        self,
+    ) -> Dict[str, Tuple[Type[BaseRepository], Type[Base]]]:
+        """提供儲存庫映射"""
+        return {
+            "TaskQueue": (TaskQueueRepository, TaskQueue),
+            "CrawlerTask": (CrawlerTasksRepository, CrawlerTasks),
+            "TaskHistory": (CrawlerTaskHistoryRepository, CrawlerTaskHistory),
+        }
+
+    def enqueue_task(
+        self,
+        task_id: int,
+        history_id: Optional[int] = None,
+        payload: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """將任務加入佇列"""
+        try:
+            with self._transaction() as session:
+                queue_repo = cast(
+                    TaskQueueRepository, self._get_repository("TaskQueue", session)
+                )
+                entry = queue_repo.enqueue(task_id, history_id, payload)
+                entry_data = TaskQueueReadSchema.model_validate(entry).model_dump()
+                return {
+                    "success": True,
+                    "message": f"任務 {task_id} 已加入佇列",
+                    "entry": entry_data,
+                }
+        except Exception as e:
+            error_msg = f"任務 {task_id} 加入佇列失敗: {e}"
+            logger.error(error_msg, exc_info=True)
+            return {"success": False, "message": error_msg, "entry": None}
+
+    def claim_next_task(self, worker_id: str) -> Dict[str, Any]:
+        """領取下一個等待中的任務，佇列為空時 entry 為 None"""
+        try:
+            dialect_name = self.db_manager.engine.dialect.name
+            with TaskQueueRepository.claim_lock(dialect_name), self._transaction() as session:
+                queue_repo = cast(
+                    TaskQueueRepository, self._get_repository("TaskQueue", session)
+                )
+                entry = queue_repo.claim_next(worker_id)
+                if entry is None:
+                    return {"success": True, "message": "佇列中沒有等待的任務", "entry": None}
+                entry_data = TaskQueueReadSchema.model_validate(entry).model_dump()
+                return {
+                    "success": True,
+                    "message": f"已領取佇列項目 {entry_data['id']} (任務 {entry_data['task_id']})",
+                    "entry": entry_data,
+                }
+        except Exception as e:
+            error_msg = f"領取佇列任務失敗: {e}"
+            logger.error(error_msg, exc_info=True)
+            return {"success": False, "message": error_msg, "entry": None}
+
+    def heartbeat(self, queue_id: int, worker_id: str) -> Dict[str, Any]:
+        """回報心跳，owned 為 False 表示此項目已不屬於該 worker"""
+        try:
+            with self._transaction() as session:
+                queue_repo = cast(
+                    TaskQueueRepository, self._get_repository("TaskQueue", session)
+                )
+                owned = queue_repo.heartbeat(queue_id, worker_id)
+                return {
+                    "success": True,
+                    "message": "心跳已更新" if owned else "佇列項目已不屬於此 worker",
+                    "owned": owned,
+                }
+        except Exception as e:
+            error_msg = f"更新佇列項目 {queue_id} 心跳失敗: {e}"
+            logger.error(error_msg)
+            return {"success": False, "message": error_msg, "owned": True}
+
+    def complete_task(
+        self,
+        queue_id: int,
+        worker_id: str,
+        success: bool,
+        result: Optional[Dict[str, Any]] = None,
+        error_message: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """寫回任務執行結果"""
+        try:
+            with self._transaction() as session:
+                queue_repo = cast(
+                    TaskQueueRepository, self._get_repository("TaskQueue", session)
+                )
+                updated = queue_repo.complete(
+                    queue_id, worker_id, success, result, error_message
+                )
+                if not updated:
+                    return {
+                        "success": False,
+                        "message": f"佇列項目 {queue_id} 已不屬於 worker {worker_id}，結果未寫回",
+                    }
+                return {"success": True, "message": f"佇列項目 {queue_id} 結果已寫回"}
+        except Exception as e:
+            error_msg = f"寫回佇列項目 {queue_id} 結果失敗: {e}"
+            logger.error(error_msg, exc_info=True)
+            return {"success": False, "message": error_msg}
+
+    def requeue_stale_tasks(
+        self, stale_after_seconds: float, max_attempts: int
+    ) -> Dict[str, Any]:
+        """回收心跳逾時的佇列項目
+
+        已達最大嘗試次數而標記失敗的項目，在同一交易中將對應的任務與歷史記錄標記為失敗，
+        避免任務一直停在執行中而無法再次執行。
+        """
+        try:
+            with self._transaction() as session:
+                queue_repo = cast(
+                    TaskQueueRepository, self._get_repository("TaskQueue", session)
+                )
+                tasks_repo = cast(
+                    CrawlerTasksRepository, self._get_repository("CrawlerTask", session)
+                )
+                history_repo = cast(
+                    CrawlerTaskHistoryRepository,
+                    self._get_repository("TaskHistory", session),
+                )
+                counts = queue_repo.requeue_stale(stale_after_seconds, max_attempts)
+                failed_entries = counts.pop("failed_entries", [])
+                for failed_entry in failed_entries:
+                    self._mark_stale_task_failed(
+                        tasks_repo,
+                        history_repo,
+                        failed_entry["task_id"],
+                        failed_entry.get("history_id"),
+                    )
+                return {
+                    "success": True,
+                    "message": f"已重新排入 {counts['requeued']} 筆，標記失敗 {counts['failed']} 筆",
+                    **counts,
+                }
+        except Exception as e:
+            error_msg = f"回收逾時佇列項目失敗: {e}"
+            logger.error(error_msg, exc_info=True)
+            return {"success": False, "message": error_msg, "requeued": 0, "failed": 0}
+
+    def _mark_stale_task_failed(
+        self,
+        tasks_repo: CrawlerTasksRepository,
+        history_repo: CrawlerTaskHistoryRepository,
+        task_id: int,
+        history_id: Optional[int],
+    ) -> None:
+        """將 worker 逾時且不再重試的任務與歷史記錄標記為失敗"""
+        now = datetime.now(timezone.utc)
+        message = "worker 心跳逾時且已達最大嘗試次數，任務執行失敗"
+
+        task = tasks_repo.get_by_id(task_id)
+        if task and task.task_status == TaskStatus.RUNNING:
+            task_data = {
+                "task_status": TaskStatus.FAILED.value,
+                "scrape_phase": ScrapePhase.FAILED.value,
+                "last_run_at": now,
+                "last_run_success": False,
+                "last_run_message": message,
+            }
+            tasks_repo.update(task_id, tasks_repo.validate_data(task_data, SchemaType.UPDATE))
+
+        if history_id:
+            history = history_repo.get_by_id(history_id)
+            if history and history.end_time is None:
+                history_data = {
+                    "end_time": now,
+                    "task_status": TaskStatus.FAILED.value,
+                    "message": message,
+                    "success": False,
+                }
+                history_repo.update(
+                    history_id, history_repo.validate_data(history_data, SchemaType.UPDATE)
+                )
+        logger.warning("任務 %s 的 worker 心跳逾時且已達最大嘗試次數，已標記為失敗", task_id)
+
+    def get_queue_stats(self) -> Dict[str, Any]:
+        """取得各狀態的佇列項目數量"""
+        try:
+            with self._transaction() as session:
+                queue_repo = cast(
+                    TaskQueueRepository, self._get_repository("TaskQueue", session)
+                )
+                return {
+                    "success": True,
+                    "message": "獲取任務佇列統計成功",
+                    "stats": queue_repo.count_by_status(),
+                }
+        except Exception as e:
+            error_msg = f"獲取任務佇列統計失敗: {e}"
+            logger.error(error_msg, exc_info=True)
+            return {"success": False, "message": error_msg, "stats": {}}
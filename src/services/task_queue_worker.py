@@ -0,0 +1,189 @@
+"""提供多節點 worker 模式的任務佇列消費者，從資料庫佇列領取爬蟲任務並在本機執行。"""
+
+import json
+import logging
+import os
+import socket
+import threading
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)  # 使用統一的 logger
+
+
+def _env_float(name: str, default: float) -> float:
+    """讀取正數環境變數，無效時使用預設值"""
+    raw_value = os.getenv(name)
+    if raw_value is None:
+        return default
+    try:
+        value = float(raw_value)
+    except ValueError:
+        logger.warning("環境變數 %s 值 '%s' 無效，使用預設值: %s", name, raw_value, default)
+        return default
+    if value <= 0:
+        logger.warning("環境變數 %s 必須為正數，使用預設值: %s", name, default)
+        return default
+    return value
+
+
+def default_worker_id() -> str:
+    """以主機名稱與行程 ID 組成 worker 識別碼"""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+def _to_json_safe(result: Any) -> Optional[Dict[str, Any]]:
+    """將執行結果轉換為可寫入 JSON 欄位的字典"""
+    if result is None:
+        return None
+    if not isinstance(result, dict):
+        result = {"result": result}
+    return json.loads(json.dumps(result, default=str))
+
+
+class TaskQueueWorker:
+    """資料庫任務佇列的 worker
+
+    以輪詢方式領取佇列項目，透過 TaskExecutorService 在本機執行任務；
+    執行期間由背景執行緒定期回報心跳，結束後將結果寫回佇列。
+    每次輪詢也會回收心跳逾時 (worker 失聯) 的項目，讓其他 worker 重新領取。
+    """
+
+    def __init__(
+        self,
+        queue_service=None,
+        task_executor_service=None,
+        worker_id: Optional[str] = None,
+        poll_interval: Optional[float] = None,
+        heartbeat_interval: Optional[float] = None,
+        stale_after: Optional[float] = None,
+        max_attempts: Optional[int] = None,
+    ):
+        if queue_service is None:
+            from src.services.service_container import get_task_queue_service
+
+            queue_service = get_task_queue_service()
+        if task_executor_service is None:
+            from src.services.service_container import get_task_executor_service
+
+            task_executor_service = get_task_executor_service()
+        self.queue_service = queue_service
+        self.task_executor_service = task_executor_service
+        self.worker_id = worker_id or default_worker_id()
+        self.poll_interval = poll_interval or _env_float(
+            "TASK_QUEUE_POLL_INTERVAL_SEC", 2.0
+        )
+        self.heartbeat_interval = heartbeat_interval or _env_float(
+            "TASK_QUEUE_HEARTBEAT_SEC", 15.0
+        )
+        self.stale_after = stale_after or _env_float("TASK_QUEUE_STALE_SEC", 120.0)
+        self.max_attempts = max_attempts or int(
+            _env_float("TASK_QUEUE_MAX_ATTEMPTS", 3)
+        )
+        self._stop_event = threading.Event()
+
+    def stop(self) -> None:
+        """要求 worker 在目前任務結束後停止"""
+        self._stop_event.set()
+
+    @property
+    def stopped(self) -> bool:
+        """是否已要求停止"""
+        return self._stop_event.is_set()
+
+    def run_forever(self) -> None:
+        """持續領取並執行任務，直到呼叫 stop()"""
+        logger.info(
+            "任務佇列 worker %s 已啟動 (poll=%.1fs, heartbeat=%.1fs, stale=%.1fs)",
+            self.worker_id,
+            self.poll_interval,
+            self.heartbeat_interval,
+            self.stale_after,
+        )
+        while not self._stop_event.is_set():
+            try:
+                processed = self.run_once()
+            except Exception as e:
+                logger.error("worker %s 處理佇列時發生錯誤: %s", self.worker_id, e, exc_info=True)
+                processed = False
+            if not processed:
+                self._stop_event.wait(self.poll_interval)
+        logger.info("任務佇列 worker %s 已停止", self.worker_id)
+
+    def run_once(self) -> bool:
+        """回收逾時項目後領取並執行一個任務，返回是否有處理任務"""
+        self.queue_service.requeue_stale_tasks(self.stale_after, self.max_attempts)
+        claim_result = self.queue_service.claim_next_task(self.worker_id)
+        entry = claim_result.get("entry")
+        if not claim_result.get("success") or entry is None:
+            return False
+        self._process(entry)
+        return True
+
+    def _process(self, entry: Dict[str, Any]) -> None:
+        """執行已領取的佇列項目並寫回結果"""
+        queue_id = entry["id"]
+        task_id = entry["task_id"]
+        payload = entry.get("payload") or {}
+        logger.info(
+            "worker %s 開始執行佇列項目 %s (任務 %s，第 %s 次嘗試)",
+            self.worker_id,
+            queue_id,
+            task_id,
+            entry.get("attempts"),
+        )
+
+        heartbeat_stop = threading.Event()
+        heartbeat_thread = threading.Thread(
+            target=self._heartbeat_loop,
+            args=(queue_id, heartbeat_stop),
+            name=f"TaskQueueHeartbeat-{queue_id}",
+            daemon=True,
+        )
+        heartbeat_thread.start()
+
+        success = False
+        result: Optional[Dict[str, Any]] = None
+        error_message: Optional[str] = None
+        try:
+            result = self.task_executor_service.run_queued_task(
+                task_id, entry.get("history_id"), **payload
+            )
+            success = bool(result and result.get("success"))
+            if not success:
+                error_message = (result or {}).get("message")
+        except Exception as e:
+            logger.error("worker %s 執行任務 %s 失敗: %s", self.worker_id, task_id, e, exc_info=True)
+            error_message = str(e)
+        finally:
+            heartbeat_stop.set()
+            heartbeat_thread.join(self.heartbeat_interval)
+
+        complete_result = self.queue_service.complete_task(
+            queue_id,
+            self.worker_id,
+            success,
+            result=_to_json_safe(result),
+            error_message=error_message,
+        )
+        if not complete_result.get("success"):
+            logger.warning("worker %s: %s", self.worker_id, complete_result.get("message"))
+        else:
+            logger.info(
+                "worker %s 完成佇列項目 %s (任務 %s)，成功: %s",
+                self.worker_id,
+                queue_id,
+                task_id,
+                success,
+            )
+
+    def _heartbeat_loop(self, queue_id: int, stop_event: threading.Event) -> None:
+        """執行期間定期更新心跳"""
+        while not stop_event.wait(self.heartbeat_interval):
+            heartbeat_result = self.queue_service.heartbeat(queue_id, self.worker_id)
+            if not heartbeat_result.get("owned", True):
+                logger.warning(
+                    "worker %s 已失去佇列項目 %s 的所有權 (可能因心跳逾時被回收)",
+                    self.worker_id,
+                    queue_id,
+                )
+                return
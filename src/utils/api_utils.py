@@ -1,8 +1,12 @@
 """提供 API 請求處理相關的工具函數，例如解析通用查詢參數。"""
 
+import functools
+import hashlib
 import logging
-from typing import Dict, Any, Optional, List, Tuple
+from datetime import datetime
+from typing import Dict, Any, Optional, List, Tuple, Callable
 
+from flask import Blueprint, make_response, request
 from werkzeug.datastructures import MultiDict
 
 
@@ -13,7 +17,7 @@ logger = logging.getLogger(__name__)  # 使用統一的 logger
 STANDARD_KEYS = {
     'page', 'per_page', 'limit', 'offset',
     'sort_by', 'sort_desc',
-    'is_preview', 'preview_fields',
+    'is_preview', 'preview_fields', 'column_set',
     'q',  # 通用搜尋關鍵字 'q'
 }
 
@@ -84,6 +88,8 @@ def parse_and_validate_common_query_params(args: MultiDict) -> Tuple[Dict[str, A
     validated_params['is_preview'] = is_preview_str in ['true', '1', 'yes']
     preview_fields_str = args.get('preview_fields')
     validated_params['preview_fields'] = preview_fields_str.split(',') if preview_fields_str else None
+    # 具名欄位集合 (例如 list/status/full)，由 Repository 驗證
+    validated_params['column_set'] = args.get('column_set')
 
     # --- 處理通用搜尋關鍵字 'q' ---
     validated_params['q'] = args.get('q') # 由具體的 API 端點驗證
@@ -95,3 +101,88 @@ def parse_and_validate_common_query_params(args: MultiDict) -> Tuple[Dict[str, A
             filter_criteria[key] = value
 
     return validated_params, filter_criteria
+
+
+def register_query_cache_hooks(blueprint: Blueprint) -> None:
+    """為藍圖註冊查詢快取的請求掛鉤
+
+    請求帶有 X-Cache-Bypass: 1 時略過服務層快取直接查詢資料庫，
+    回應以 X-Cache 標頭標示最近一次快取查詢的結果 (HIT/MISS/BYPASS)，方便除錯。
+    """
+    # 延遲載入，避免 src.utils 與服務層之間的循環匯入
+    from src.services.query_cache import (
+        CACHE_BYPASS_HEADER,
+        CACHE_STATUS_HEADER,
+        cache_bypass_var,
+        cache_status_var,
+    )
+
+    @blueprint.before_request
+    def _reset_query_cache_state():
+        bypass = request.headers.get(CACHE_BYPASS_HEADER, '').lower() in ('1', 'true', 'yes')
+        cache_bypass_var.set(bypass)
+        cache_status_var.set(None)
+
+    @blueprint.after_request
+    def _add_query_cache_header(response):
+        status = cache_status_var.get()
+        if status:
+            response.headers[CACHE_STATUS_HEADER] = status
+        return response
+
+
+def _is_not_modified(etag: str, last_modified: Optional[datetime]) -> bool:
+    """依 If-None-Match (優先) 或 If-Modified-Since 判斷客戶端的副本是否仍然有效"""
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    since = request.if_modified_since
+    if last_modified is not None and since is not None:
+        return last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def conditional_get(version_getter: Callable[[], Dict[str, Any]]) -> Callable:
+    """為 GET 路由加上 ETag / Last-Modified 條件請求處理
+
+    先以 version_getter (服務的 get_data_version) 取得資料表的輕量版本，
+    客戶端的副本仍有效時直接返回 304，不查詢資料列也不序列化回應；
+    否則執行原本的路由並在 200 回應加上 ETag、Last-Modified 與 Cache-Control: no-cache，
+    讓瀏覽器輪詢時自動帶上條件標頭。取得版本失敗時退回一般回應。
+    """
+
+    def decorator(view: Callable) -> Callable:
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            try:
+                version_result = version_getter()
+            except Exception as e:
+                logger.warning("取得資料版本失敗，略過條件請求處理: %s", e)
+                version_result = None
+            version = (
+                version_result.get('version')
+                if isinstance(version_result, dict) and version_result.get('success')
+                else None
+            )
+            if not isinstance(version, str):
+                return view(*args, **kwargs)
+
+            etag = hashlib.sha1(f"{request.full_path}|{version}".encode('utf-8')).hexdigest()
+            last_modified = version_result.get('last_modified')
+            if not isinstance(last_modified, datetime):
+                last_modified = None
+
+            if _is_not_modified(etag, last_modified):
+                response = make_response('', 304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag, weak=True)
+            if last_modified is not None:
+                response.last_modified = last_modified
+            response.headers['Cache-Control'] = 'no-cache'
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,47 @@
+"""提供文章擷取結果的內容雜湊，用於判斷重新抓取的文章是否有變更。
+
+雜湊涵蓋擷取得到的欄位 (標題、摘要、內容、分類、作者、標籤、類型與發布時間)，
+欄位值先去除頭尾空白，以固定順序與分隔字元串接後計算 SHA-256。
+重新抓取的文章雜湊與資料庫中相同時即可跳過寫入，不必載入或更新該筆資料。
+"""
+
+import hashlib
+import logging
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)  # 使用統一的 logger
+
+CONTENT_HASH_LENGTH = 64
+# 參與雜湊的欄位 (順序固定，變更時既有雜湊將全部失效)
+CONTENT_HASH_FIELDS = (
+    "title",
+    "summary",
+    "content",
+    "category",
+    "author",
+    "tags",
+    "article_type",
+    "published_at",
+)
+_FIELD_SEPARATOR = "\x1f"
+
+
+def _normalize_value(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, float) and value != value:  # pandas 的 NaN
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value).strip()
+
+
+def compute_content_hash(article_data: Dict[str, Any]) -> Optional[str]:
+    """計算文章擷取結果的 SHA-256 雜湊 (64 字元十六進位)，沒有內容時返回 None"""
+    if not _normalize_value(article_data.get("content")):
+        return None
+    joined = _FIELD_SEPARATOR.join(
+        _normalize_value(article_data.get(field)) for field in CONTENT_HASH_FIELDS
+    )
+    return hashlib.sha256(joined.encode("utf-8")).hexdigest()
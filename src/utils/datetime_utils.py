@@ -1,7 +1,10 @@
 """提供日期時間處理相關的工具函數，例如時區轉換和格式化。"""
 
 from datetime import datetime, timezone
+from typing import Optional
 import logging
+
+from croniter import croniter
 import pytz
 
 
@@ -110,4 +113,19 @@ def convert_str_to_utc_datetime(value: str, tz: str = 'Asia/Taipei') -> datetime
     return utc_dt
 
 
+def calculate_next_cron_run(cron_expression: str, base_time: Optional[datetime] = None) -> datetime:
+    """計算 cron 表達式在指定時間之後的下一次執行時間 (cron 以 UTC 解讀，與排程器一致)
+
+    Args:
+        cron_expression (str): cron 表達式
+        base_time (datetime, optional): 起算時間，預設為現在
+
+    Returns:
+        datetime: UTC 時區的下一次執行時間
 
+    Raises:
+        ValueError: cron 表達式無效時
+    """
+    base = enforce_utc_datetime_transform(base_time or datetime.now(timezone.utc))
+    next_run = croniter(cron_expression, base).get_next(datetime)
+    return enforce_utc_datetime_transform(next_run)
@@ -49,3 +49,22 @@ class ArticleScrapeStatus(enum.Enum):
     PARTIAL_SAVED = "partial_saved"  # 部分保存
     CONTENT_SCRAPED = "content_scraped"  # 內容已爬取
     FAILED = "failed"  # 爬取失敗
+
+
+class TaskQueueStatus(enum.Enum):
+    """任務佇列項目狀態枚舉"""
+
+    QUEUED = "queued"  # 等待領取
+    CLAIMED = "claimed"  # 已被 worker 領取執行中
+    COMPLETED = "completed"  # 執行完成
+    FAILED = "failed"  # 執行失敗
+    CANCELLED = "cancelled"  # 已取消
+
+
+class CrawlFrontierStatus(enum.Enum):
+    """待抓取連結 (crawl frontier) 狀態枚舉"""
+
+    PENDING = "pending"  # 等待抓取
+    CLAIMED = "claimed"  # 已被 worker 領取抓取中
+    DONE = "done"  # 抓取完成
+    FAILED = "failed"  # 已達最大嘗試次數仍失敗
@@ -0,0 +1,81 @@
+"""提供串流匯出相關的工具函式：將資料列逐批序列化為 NDJSON / CSV，並可選擇以 gzip 串流壓縮。"""
+
+import csv
+import enum
+import io
+import json
+import logging
+import zlib
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, Iterator, List
+
+logger = logging.getLogger(__name__)  # 使用統一的 logger
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+# 累積到此大小才輸出一個區塊，避免每列一個 HTTP chunk
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+def _export_value(value: Any) -> Any:
+    """將 datetime、枚舉等轉為可序列化的值 (也作為 json.dumps 的 default)"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return str(value)
+
+
+def iter_ndjson(
+    rows: Iterable[Dict[str, Any]], chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[str]:
+    """逐列序列化為 NDJSON (每列一個 JSON 物件)"""
+    buffer: List[str] = []
+    size = 0
+    for row in rows:
+        line = json.dumps(row, ensure_ascii=False, default=_export_value)
+        buffer.append(line)
+        buffer.append("\n")
+        size += len(line) + 1
+        if size >= chunk_size:
+            yield "".join(buffer)
+            buffer.clear()
+            size = 0
+    if buffer:
+        yield "".join(buffer)
+
+
+def iter_csv(
+    rows: Iterable[Dict[str, Any]],
+    fields: List[str],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[str]:
+    """逐列序列化為 CSV，第一列為欄位名稱"""
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow(fields)
+    for row in rows:
+        writer.writerow(
+            ["" if row.get(field) is None else _export_value(row.get(field)) for field in fields]
+        )
+        if output.tell() >= chunk_size:
+            yield output.getvalue()
+            output.seek(0)
+            output.truncate()
+    if output.tell():
+        yield output.getvalue()
+
+
+def iter_gzip(chunks: Iterable[str], level: int = 6) -> Iterator[bytes]:
+    """以 gzip 串流壓縮文字區塊"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk.encode("utf-8"))
+        if compressed:
+            yield compressed
+    yield compressor.flush()
@@ -517,9 +517,16 @@ def validate_task_args(field_name: str, required: bool = False):
                 'min_keywords': int,
                 'num_articles': int,
                 'csv_file_prefix': str,
+                'result_format': str,
+                'result_batch_size': int,
                 'max_cancel_wait': int,
                 'cancel_interrupt_interval': int,
-                'cancel_timeout': int
+                'cancel_timeout': int,
+                'schedule_jitter_sec': int,
+                'frontier_per_host_limit': int,
+                'adaptive_revisit': bool,
+                'min_pages': int,
+                'revisit_max_interval_sec': int
             }
 
             validated_args = {}
@@ -557,6 +564,14 @@ def validate_task_args(field_name: str, required: bool = False):
                     logger.error(msg)
                     raise ValidationError(msg)
 
+            if 'result_format' in validated_args:
+                result_format = validated_args['result_format'].lower()
+                if result_format not in ('csv', 'parquet'):
+                    msg = f"{field_name}.result_format: 必須是 csv 或 parquet"
+                    logger.error(msg)
+                    raise ValidationError(msg)
+                validated_args['result_format'] = result_format
+
             cancel_params = ['max_cancel_wait', 'cancel_interrupt_interval', 'cancel_timeout']
             for param in cancel_params:
                 if param in validated_args:
@@ -573,7 +588,12 @@ def validate_task_args(field_name: str, required: bool = False):
                 'num_articles': False,
                 'min_keywords': False,
                 'timeout': False,
-                'max_retries': True
+                'max_retries': True,
+                'result_batch_size': False,
+                'schedule_jitter_sec': True,
+                'frontier_per_host_limit': False,
+                'min_pages': False,
+                'revisit_max_interval_sec': False
             }
             for param, is_zero_allowed in numeric_params.items():
                 if param in validated_args:
@@ -771,3 +791,54 @@ def validate_task_status(field_name: str, required: bool = False):
                 raise ValidationError(msg) from e
     return validator
 
+
+def validate_task_queue_status(field_name: str, required: bool = False):
+    """任務佇列狀態驗證"""
+    from src.utils.enum_utils import TaskQueueStatus
+    def validator(value: Any) -> Optional[TaskQueueStatus]:
+        if value is None:
+            if required:
+                msg = f"{field_name}: 不能為空"
+                logger.error(msg)
+                raise ValidationError(msg)
+            return None
+        if isinstance(value, TaskQueueStatus):
+            return value
+        else:
+            try:
+                 # 嘗試從字串或其他值轉換為枚舉
+                return str_to_enum(value, TaskQueueStatus, field_name)
+            except ValidationError as e:
+                logger.error(str(e))
+                raise e
+            except Exception as e:
+                msg = f"{field_name}: 無法將值 '{value}' (類型 {type(value).__name__}) 轉換為 TaskQueueStatus: {str(e)}"
+                logger.error(msg)
+                raise ValidationError(msg) from e
+    return validator
+
+
+def validate_crawl_frontier_status(field_name: str, required: bool = False):
+    """待抓取連結狀態驗證"""
+    from src.utils.enum_utils import CrawlFrontierStatus
+    def validator(value: Any) -> Optional[CrawlFrontierStatus]:
+        if value is None:
+            if required:
+                msg = f"{field_name}: 不能為空"
+                logger.error(msg)
+                raise ValidationError(msg)
+            return None
+        if isinstance(value, CrawlFrontierStatus):
+            return value
+        else:
+            try:
+                 # 嘗試從字串或其他值轉換為枚舉
+                return str_to_enum(value, CrawlFrontierStatus, field_name)
+            except ValidationError as e:
+                logger.error(str(e))
+                raise e
+            except Exception as e:
+                msg = f"{field_name}: 無法將值 '{value}' (類型 {type(value).__name__}) 轉換為 CrawlFrontierStatus: {str(e)}"
+                logger.error(msg)
+                raise ValidationError(msg) from e
+    return validator
@@ -0,0 +1,118 @@
+"""提供文章內容的 64 位元 SimHash 指紋計算，用於偵測近似重複的文章。
+
+內容經正規化後切成字元 3-gram，以各 3-gram 出現次數為權重計算 SimHash。
+指紋分成 4 段各 16 位元 (band)：漢明距離不超過 3 的兩個指紋至少有一段完全相同 (鴿籠原理)，
+因此只需以索引查詢任一段相同的候選文章，再計算實際漢明距離。
+"""
+
+import hashlib
+import logging
+import os
+import re
+import unicodedata
+from collections import Counter
+from typing import List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)  # 使用統一的 logger
+
+SIMHASH_BITS = 64
+SIMHASH_BANDS = 4
+SIMHASH_BAND_BITS = SIMHASH_BITS // SIMHASH_BANDS
+# 視為近似重複的最大漢明距離 (不可超過 SIMHASH_BANDS - 1，否則分段查詢會漏掉候選)
+DEFAULT_MAX_HAMMING_DISTANCE = 3
+# 正規化後少於此長度的內容不計算指紋 (太短的內容容易誤判)
+MIN_FINGERPRINT_LENGTH = 200
+SHINGLE_SIZE = 3
+
+_NON_WORD_RE = re.compile(r"[\W_]+", re.UNICODE)
+_BIT_SHIFTS = np.arange(SIMHASH_BITS, dtype=np.uint64)
+
+
+def normalize_content(text: Optional[str]) -> str:
+    """正規化內容：全半形統一、轉小寫並移除空白與標點"""
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFKC", text).lower()
+    return _NON_WORD_RE.sub("", text)
+
+
+def compute_simhash(text: Optional[str]) -> Optional[int]:
+    """計算內容的 64 位元 SimHash (無號整數)，內容太短時返回 None"""
+    normalized = normalize_content(text)
+    if len(normalized) < MIN_FINGERPRINT_LENGTH:
+        return None
+    shingles = Counter(
+        normalized[i:i + SHINGLE_SIZE] for i in range(len(normalized) - SHINGLE_SIZE + 1)
+    )
+    hashes = np.fromiter(
+        (
+            int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "big")
+            for s in shingles
+        ),
+        dtype=np.uint64,
+        count=len(shingles),
+    )
+    weights = np.fromiter(shingles.values(), dtype=np.int64, count=len(shingles))
+    bits = ((hashes[:, None] >> _BIT_SHIFTS) & np.uint64(1)).astype(np.int64)
+    # 每個位元依權重投票：設為 1 的加權重，設為 0 的減權重
+    votes = (bits * 2 - 1).T @ weights
+    fingerprint = 0
+    for bit in np.nonzero(votes > 0)[0]:
+        fingerprint |= 1 << int(bit)
+    return fingerprint
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """兩個指紋的漢明距離"""
+    return ((a ^ b) & ((1 << SIMHASH_BITS) - 1)).bit_count()
+
+
+def split_bands(fingerprint: int) -> List[int]:
+    """將指紋分成 SIMHASH_BANDS 段，供索引查詢"""
+    mask = (1 << SIMHASH_BAND_BITS) - 1
+    return [(fingerprint >> (i * SIMHASH_BAND_BITS)) & mask for i in range(SIMHASH_BANDS)]
+
+
+def to_signed64(value: int) -> int:
+    """無號 64 位元指紋轉為有號整數 (資料庫 BIGINT 為有號)"""
+    return value - (1 << SIMHASH_BITS) if value >= (1 << (SIMHASH_BITS - 1)) else value
+
+
+def from_signed64(value: int) -> int:
+    """資料庫中的有號整數轉回無號 64 位元指紋"""
+    return value & ((1 << SIMHASH_BITS) - 1)
+
+
+NEAR_DUPLICATE_POLICY_LINK = "link"
+NEAR_DUPLICATE_POLICY_SKIP = "skip"
+NEAR_DUPLICATE_POLICY_OFF = "off"
+NEAR_DUPLICATE_POLICIES = (
+    NEAR_DUPLICATE_POLICY_LINK,
+    NEAR_DUPLICATE_POLICY_SKIP,
+    NEAR_DUPLICATE_POLICY_OFF,
+)
+
+
+def get_near_duplicate_policy() -> str:
+    """近似重複文章的處理方式 (環境變數 NEAR_DUPLICATE_POLICY)
+
+    - link: 照常保存，並以 duplicate_of_id 指向原始文章 (預設)
+    - skip: 新文章與既有文章近似重複時不保存 (已存在的文章仍以 link 處理)
+    - off: 不偵測
+    """
+    policy = os.getenv("NEAR_DUPLICATE_POLICY", NEAR_DUPLICATE_POLICY_LINK).lower()
+    if policy not in NEAR_DUPLICATE_POLICIES:
+        logger.warning("未知的 NEAR_DUPLICATE_POLICY: %s，使用 %s", policy, NEAR_DUPLICATE_POLICY_LINK)
+        return NEAR_DUPLICATE_POLICY_LINK
+    return policy
+
+
+def get_max_hamming_distance() -> int:
+    """視為近似重複的最大漢明距離 (環境變數 NEAR_DUPLICATE_MAX_DISTANCE，最大 SIMHASH_BANDS - 1)"""
+    try:
+        distance = int(os.getenv("NEAR_DUPLICATE_MAX_DISTANCE", str(DEFAULT_MAX_HAMMING_DISTANCE)))
+    except ValueError:
+        return DEFAULT_MAX_HAMMING_DISTANCE
+    return max(0, min(distance, SIMHASH_BANDS - 1))
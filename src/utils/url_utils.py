@@ -0,0 +1,149 @@
+"""提供文章網址的標準化 (canonicalization)，讓同一篇文章的不同網址形式對應到相同的連結。
+
+標準化規則：
+- 相對路徑依 base_url 轉為絕對網址，協定與主機名稱轉小寫，移除預設埠號與 fragment
+- http 統一為 https (可關閉)，路徑結尾的斜線移除 (根路徑除外)
+- 查詢參數：網站設定了允許清單時只保留清單內的參數，否則移除追蹤參數 (utm_* 等)，其餘依名稱排序
+- 文章頁面的 <link rel="canonical"> 指向同一網站時以其為準
+"""
+
+import fnmatch
+import logging
+from typing import Any, Dict, Iterable, Optional
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+logger = logging.getLogger(__name__)  # 使用統一的 logger
+
+# 未設定允許清單時移除的追蹤參數 (支援 * 萬用字元)
+DEFAULT_TRACKING_PARAMS = (
+    "utm_*",
+    "fbclid",
+    "gclid",
+    "dclid",
+    "msclkid",
+    "mc_cid",
+    "mc_eid",
+    "igshid",
+    "_ga",
+    "ref",
+    "ref_src",
+)
+_DEFAULT_PORTS = {"http": "80", "https": "443"}
+
+
+def _host_key(host: str) -> str:
+    host = host.lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+class UrlCanonicalizer:
+    """依網站設定將網址轉為標準形式
+
+    Args:
+        allowed_params: 各主機允許保留的查詢參數 ({主機: [參數]})，"*" 代表所有未個別設定的主機；
+            未設定的主機只移除追蹤參數
+        tracking_params: 沒有允許清單時移除的參數
+        force_https: 是否將 http 統一為 https
+        strip_trailing_slash: 是否移除路徑結尾的斜線
+    """
+
+    def __init__(
+        self,
+        allowed_params: Optional[Dict[str, Iterable[str]]] = None,
+        tracking_params: Iterable[str] = DEFAULT_TRACKING_PARAMS,
+        force_https: bool = True,
+        strip_trailing_slash: bool = True,
+    ):
+        self.allowed_params = {
+            _host_key(host): frozenset(params)
+            for host, params in (allowed_params or {}).items()
+        }
+        self.tracking_params = tuple(tracking_params)
+        self.force_https = force_https
+        self.strip_trailing_slash = strip_trailing_slash
+
+    @classmethod
+    def from_config(cls, config: Any, base_url: Optional[str] = None) -> "UrlCanonicalizer":
+        """由網站設定的 url_canonicalization 區塊建立
+
+        allowed_query_params 為列表時套用於 base_url 的主機，也可直接提供 {主機: [參數]}。
+        """
+        if not isinstance(config, dict):
+            config = {}
+        allowed = config.get("allowed_query_params")
+        if isinstance(allowed, (list, tuple)):
+            host = urlsplit(base_url).hostname if base_url else None
+            allowed = {host or "*": allowed}
+        return cls(
+            allowed_params=allowed if isinstance(allowed, dict) else None,
+            tracking_params=config.get("tracking_params", DEFAULT_TRACKING_PARAMS),
+            force_https=config.get("force_https", True),
+            strip_trailing_slash=config.get("strip_trailing_slash", True),
+        )
+
+    def _keep_param(self, host: str, name: str) -> bool:
+        allowed = self.allowed_params.get(_host_key(host), self.allowed_params.get("*"))
+        if allowed is not None:
+            return name in allowed
+        lowered = name.lower()
+        return not any(fnmatch.fnmatchcase(lowered, pattern) for pattern in self.tracking_params)
+
+    def canonicalize(self, url: Optional[str], base_url: Optional[str] = None) -> Optional[str]:
+        """返回標準化後的網址；空值返回 None，非 http(s) 網址原樣返回"""
+        if not url or not url.strip():
+            return None
+        url = url.strip()
+        if base_url:
+            url = urljoin(base_url, url)
+        try:
+            parts = urlsplit(url)
+            port = parts.port
+        except ValueError:
+            logger.debug("無法解析網址，不進行標準化: %s", url)
+            return url
+        scheme = parts.scheme.lower()
+        if scheme not in _DEFAULT_PORTS or not parts.hostname:
+            return url
+
+        if self.force_https:
+            scheme = "https"
+        host = parts.hostname.lower()
+        netloc = host
+        if port is not None and str(port) != _DEFAULT_PORTS[scheme]:
+            netloc = f"{host}:{port}"
+
+        path = parts.path or "/"
+        if self.strip_trailing_slash and len(path) > 1:
+            path = path.rstrip("/") or "/"
+
+        params = [
+            (name, value)
+            for name, value in parse_qsl(parts.query, keep_blank_values=True)
+            if self._keep_param(host, name)
+        ]
+        query = urlencode(sorted(params))
+        return urlunsplit((scheme, netloc, path, query, ""))
+
+    def extract_canonical_link(self, soup: Any, page_url: str) -> Optional[str]:
+        """取得頁面 <link rel="canonical"> 的標準化網址，不存在或指向其他網站時返回 None"""
+        if soup is None:
+            return None
+        tag = soup.find("link", rel=lambda rel: rel and "canonical" in rel)
+        href = tag.get("href") if tag else None
+        if not href:
+            return None
+        canonical = self.canonicalize(href, base_url=page_url)
+        page_host = urlsplit(page_url).hostname or ""
+        canonical_host = urlsplit(canonical).hostname or ""
+        if _host_key(canonical_host) != _host_key(page_host):
+            logger.debug("canonical 連結指向其他網站，忽略: %s -> %s", page_url, canonical)
+            return None
+        return canonical
+
+
+_default_canonicalizer = UrlCanonicalizer()
+
+
+def canonicalize_url(url: Optional[str], base_url: Optional[str] = None) -> Optional[str]:
+    """以預設規則 (移除追蹤參數) 標準化網址，供 Repository 比對同一篇文章使用"""
+    return _default_canonicalizer.canonicalize(url, base_url)
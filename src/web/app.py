@@ -12,7 +12,6 @@ eventlet.monkey_patch()
 import os
 import sys
 import threading
-import time
 import logging
 import datetime
 
@@ -27,8 +26,12 @@ from src.config import get_db_manager
 from src.services.service_container import (
     ServiceContainer,
     get_crawlers_service,
+    get_scheduler_leader_election,
     get_scheduler_service,
 )
+from src.services.query_cache import get_query_cache_metrics
+from src.services.scheduler_leader import get_scheduler_health, is_leader_election_enabled
+from src.services.scheduler_service import run_schedule_sync_loop
 from src.web.routes.article_api import article_bp
 from src.web.routes.crawler_api import crawler_bp
 from src.web.routes.tasks_api import tasks_bp
@@ -143,38 +146,8 @@ def initialize_default_crawler():
         logger.error("初始化默認爬蟲時發生錯誤: %s", e, exc_info=True)
 
 def reload_scheduled_tasks():
-    """定期重新載入排程任務的背景執行緒"""
-    try:
-        raw_interval = os.getenv("SCHEDULE_RELOAD_INTERVAL_SEC", "1800")
-        interval_sec = int(raw_interval)
-        if interval_sec <= 0:
-            interval_sec = 1800
-            logger.warning(
-                "SCHEDULE_RELOAD_INTERVAL_SEC 必須為正整數，使用預設值: %s 秒",
-                interval_sec,
-            )
-        logger.info("排程任務重新載入間隔設定為: %s 秒", interval_sec)
-    except ValueError:
-        interval_sec = 1800
-        logger.warning(
-            "環境變數 SCHEDULE_RELOAD_INTERVAL_SEC 值 '%s' 無效，使用預設值: %s 秒",
-            raw_interval,
-            interval_sec,
-        )
-
-    interval_min = interval_sec / 60
-    while True:
-        try:
-            logger.info("開始重新載入排程任務...")
-            get_scheduler_service().reload_scheduler()
-            logger.info("排程任務重新載入完成。")
-            logger.info("下一次重新載入將在 %.1f 分鐘後進行。", interval_min)
-            time.sleep(interval_sec)
-        except Exception as e:
-            logger.error("排程任務重新載入/執行錯誤: %s", e, exc_info=True)
-            # 考慮是否在每次失敗後都停止排程器，目前選擇記錄錯誤並在短暫延遲後重試
-            logger.info("發生錯誤，將在 60 秒後重試...")
-            time.sleep(60)
+    """定期同步排程任務的背景執行緒：增量套用任務的排程變更，並定期完整重載作為安全網"""
+    run_schedule_sync_loop()
 
 
 def init_application():
@@ -189,14 +162,22 @@ def init_application():
         except Exception as e:
             cleanup_logger.error("日誌清理任務失敗: %s", e, exc_info=True)
 
-        # 啟動排程器
+        # 啟動排程器 (gunicorn 多 worker 時僅由取得領導權的行程啟動)
         try:
-            scheduler = get_scheduler_service()
-            scheduler_result = scheduler.start_scheduler()
-            if scheduler_result.get("success"):
-                logger.info("排程器已成功啟動: %s", scheduler_result.get('message'))
+            if is_leader_election_enabled():
+                election = get_scheduler_leader_election()
+                election.start()
+                if election.is_leader:
+                    logger.info("此行程為排程器領導者，排程器已啟動")
+                else:
+                    logger.info("排程器領導權由其他行程持有，此行程僅處理 Web 請求")
             else:
-                logger.error("啟動排程器失敗: %s", scheduler_result.get('message'))
+                scheduler = get_scheduler_service()
+                scheduler_result = scheduler.start_scheduler()
+                if scheduler_result.get("success"):
+                    logger.info("排程器已成功啟動: %s", scheduler_result.get('message'))
+                else:
+                    logger.error("啟動排程器失敗: %s", scheduler_result.get('message'))
         except Exception as e:
             logger.error("啟動排程器時發生未預期錯誤: %s", e, exc_info=True)
 
@@ -228,6 +209,8 @@ def init_application():
 def cleanup_resources():
     """清理應用程式資源"""
     try:
+        if is_leader_election_enabled():
+            get_scheduler_leader_election().stop()
         scheduler = get_scheduler_service()
         scheduler.stop_scheduler()
     except Exception as se:
@@ -298,6 +281,14 @@ def health_check():
     except Exception as e:
         logger.error("數據庫健康檢查失敗: %s", e)
 
+    scheduler_running = bool(scheduler_service.is_running())
+    leader_status = (
+        get_scheduler_leader_election().get_status()
+        if is_leader_election_enabled()
+        else {"enabled": False}
+    )
+    scheduler_health = get_scheduler_health(scheduler_running, leader_status)
+
     status = {
         "status": "healthy",
         "components": {
@@ -306,12 +297,14 @@ def health_check():
                 "connected_clients": len(socketio.server.eio.sockets) if socketio.server else 0 # type: ignore
             },
             "scheduler": {
-                "running": bool(scheduler_service.is_running()),
-                "next_run": scheduler_service.get_next_run_time() if scheduler_service.is_running() else None
+                **scheduler_health,
+                "next_run": scheduler_service.get_next_run_time() if scheduler_running else None,
+                "leader_election": leader_status,
             },
             "database": {
                 "connected": db_healthy
-            }
+            },
+            "query_cache": get_query_cache_metrics()
         },
         "timestamp": datetime.datetime.now().isoformat()
     }
@@ -319,7 +312,7 @@ def health_check():
     # 如果任何關鍵組件不健康，更新整體狀態
     if not all([
         status["components"]["socketio"]["running"],
-        status["components"]["scheduler"]["running"],
+        scheduler_health["healthy"],
         status["components"]["database"]["connected"]
     ]):
         status["status"] = "unhealthy"
@@ -1,17 +1,25 @@
 """定義文章相關的 API 路由。"""
 # 標準函式庫
+from datetime import datetime, timezone
 from typing import Optional, List, Dict, Any, Union, cast
 import logging
 
 # 第三方函式庫
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, jsonify, request, stream_with_context
 
 # 本地應用程式
 from src.error.handle_api_error import handle_api_error
+from src.models.articles_model import ArticleScrapeStatus
 from src.models.articles_schema import ArticleReadSchema, PaginatedArticleResponse
 from src.services.article_service import ArticleService
 from src.services.service_container import get_article_service
-from src.utils.api_utils import parse_and_validate_common_query_params
+from src.utils.api_utils import (
+    conditional_get,
+    parse_and_validate_common_query_params,
+    register_query_cache_hooks,
+)
+from src.utils.export_utils import EXPORT_FORMATS, iter_csv, iter_gzip, iter_ndjson
+from src.utils.transform_utils import str_to_enum
  # 使用統一的 logger
 
 
@@ -19,8 +27,16 @@ logger = logging.getLogger(__name__)  # 使用統一的 logger # 使用統一的
 
 # 創建藍圖
 article_bp = Blueprint('article_api', __name__, url_prefix='/api/articles')
+register_query_cache_hooks(article_bp)
+
+
+def _articles_version():
+    """文章表的資料版本 (條件請求用)"""
+    return get_article_service().get_data_version("Article")
+
 
 @article_bp.route('', methods=['GET'])
+@conditional_get(_articles_version)
 def get_articles():
     """取得文章列表 (支援分頁/篩選/排序)。"""
     try:
@@ -35,7 +51,8 @@ def get_articles():
             sort_by=validated_params['sort_by'],
             sort_desc=validated_params['sort_desc'],
             is_preview=validated_params['is_preview'],
-            preview_fields=validated_params['preview_fields']
+            preview_fields=validated_params['preview_fields'],
+            column_set=validated_params['column_set']
         )
 
         if not result.get('success'):
@@ -63,6 +80,7 @@ def get_articles():
         return handle_api_error(e)
 
 @article_bp.route('/<int:article_id>', methods=['GET'])
+@conditional_get(_articles_version)
 def get_article(article_id):
     """取得單篇文章詳情。"""
     try:
@@ -88,6 +106,7 @@ def get_article(article_id):
         return handle_api_error(e)
 
 @article_bp.route('/search', methods=['GET'])
+@conditional_get(_articles_version)
 def search_articles():
     """專用搜尋端點 (根據關鍵字搜尋標題/內容/摘要)。"""
     try:
@@ -141,3 +160,98 @@ def search_articles():
         return handle_api_error(e)
 
 
+def _parse_bool_arg(value: Optional[str]) -> Optional[bool]:
+    if value is None:
+        return None
+    return value.lower() in ('true', '1', 'yes')
+
+
+def _parse_datetime_arg(name: str, value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError as e:
+        raise ValueError(f"{name} 必須是 ISO 8601 日期時間") from e
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _parse_export_filters(args) -> Dict[str, Any]:
+    """解析匯出的過濾條件 (與 find_articles_advanced 相同)"""
+    date_from = _parse_datetime_arg('date_from', args.get('date_from'))
+    date_to = _parse_datetime_arg('date_to', args.get('date_to'))
+    date_range = None
+    if date_from or date_to:
+        date_range = (
+            date_from or datetime.min.replace(tzinfo=timezone.utc),
+            date_to or datetime.max.replace(tzinfo=timezone.utc),
+        )
+    scrape_status = args.get('scrape_status')
+    tags = args.get('tags')
+    return {
+        'task_id': args.get('task_id'),
+        'keywords': args.get('q'),
+        'category': args.get('category'),
+        'date_range': date_range,
+        'is_ai_related': _parse_bool_arg(args.get('is_ai_related')),
+        'is_scraped': _parse_bool_arg(args.get('is_scraped')),
+        'scrape_status': (
+            str_to_enum(scrape_status, ArticleScrapeStatus, 'scrape_status')
+            if scrape_status else None
+        ),
+        'tags': [t.strip() for t in tags.split(',') if t.strip()] if tags else None,
+        'source': args.get('source'),
+    }
+
+
+@article_bp.route('/export', methods=['GET'])
+def export_articles():
+    """串流匯出文章 (NDJSON 或 CSV)，支援進階搜尋的過濾條件與 gzip 壓縮。
+
+    查詢參數：format (ndjson/csv)、column_set (list/status/full)、q、task_id、category、
+    source、tags、is_ai_related、is_scraped、scrape_status、date_from、date_to、gzip。
+    客戶端接受 gzip 時預設壓縮，gzip=false 可停用。
+    """
+    try:
+        export_format = request.args.get('format', 'ndjson').lower()
+        if export_format not in EXPORT_FORMATS:
+            return jsonify({
+                "success": False,
+                "message": f"不支援的匯出格式: {export_format}，可用: {', '.join(EXPORT_FORMATS)}"
+            }), 400
+        filters = _parse_export_filters(request.args)
+
+        service: ArticleService = get_article_service()
+        result = service.export_articles(
+            column_set=request.args.get('column_set'), **filters
+        )
+        if not result.get('success'):
+            return jsonify({"success": False, "message": result.get('message')}), 400
+
+        rows = result['rows']
+        if export_format == 'csv':
+            chunks = iter_csv(rows, result['fields'])
+        else:
+            chunks = iter_ndjson(rows)
+
+        gzip_arg = _parse_bool_arg(request.args.get('gzip'))
+        use_gzip = gzip_arg if gzip_arg is not None else 'gzip' in request.accept_encodings
+        body = iter_gzip(chunks) if use_gzip else (chunk.encode('utf-8') for chunk in chunks)
+
+        response = Response(
+            stream_with_context(body),
+            mimetype=EXPORT_FORMATS[export_format],
+        )
+        response.headers['Content-Disposition'] = (
+            f'attachment; filename="articles.{export_format}{".gz" if use_gzip and gzip_arg else ""}"'
+        )
+        if use_gzip and gzip_arg is None:
+            response.headers['Content-Encoding'] = 'gzip'
+            response.headers['Vary'] = 'Accept-Encoding'
+        elif use_gzip:
+            response.mimetype = 'application/gzip'
+        return response
+    except ValueError as ve:
+        return jsonify({"success": False, "message": str(ve)}), 400
+    except Exception as e:
+        return handle_api_error(e)
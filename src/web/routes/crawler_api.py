@@ -11,15 +11,23 @@ from src.error.handle_api_error import handle_api_error
 from src.models.crawlers_schema import CrawlerReadSchema, PaginatedCrawlerResponse
 from src.services.crawlers_service import CrawlersService
 from src.services.service_container import get_crawlers_service
+from src.utils.api_utils import conditional_get, register_query_cache_hooks
 
 
 logger = logging.getLogger(__name__)  # 使用統一的 logger
 
 # 創建藍圖
 crawler_bp = Blueprint('crawlerapi', __name__, url_prefix='/api/crawlers')
+register_query_cache_hooks(crawler_bp)
+
+
+def _crawlers_version():
+    """爬蟲表的資料版本 (條件請求用)"""
+    return get_crawlers_service().get_data_version("Crawler")
 
 
 @crawler_bp.route('', methods=['GET'])
+@conditional_get(_crawlers_version)
 def get_crawlers():
     """取得所有爬蟲設定列表"""
     try:
@@ -101,6 +109,7 @@ def create_crawler_with_config_route():
         return handle_api_error(e)
 
 @crawler_bp.route('/<int:crawler_id>', methods=['GET'])
+@conditional_get(_crawlers_version)
 def get_crawler(crawler_id):
     """取得特定爬蟲設定"""
     try:
@@ -223,6 +232,7 @@ def get_available_crawler_types():
         return handle_api_error(e)
 
 @crawler_bp.route('/active', methods=['GET'])
+@conditional_get(_crawlers_version)
 def get_active_crawlers():
     """取得所有活動中的爬蟲設定"""
     try:
@@ -352,6 +362,7 @@ def get_crawlers_by_target(target_pattern):
         return handle_api_error(e)
 
 @crawler_bp.route('/statistics', methods=['GET'])
+@conditional_get(_crawlers_version)
 def get_crawler_statistics():
     """獲取爬蟲統計信息"""
     try:
@@ -15,6 +15,7 @@ from src.services.service_container import (
     get_scheduler_service, get_task_executor_service,
     get_crawler_task_service, get_article_service
 )
+from src.utils.api_utils import conditional_get
   # 使用統一的 logger
 
 # 使用統一的 logger
@@ -23,6 +24,17 @@ logger = logging.getLogger(__name__)  # 使用統一的 logger
 
 tasks_bp = Blueprint('tasks_api', __name__, url_prefix='/api/tasks')
 
+
+def _tasks_version():
+    """任務列表的資料版本 (任務與執行歷史，條件請求用)"""
+    return get_crawler_task_service().get_data_version("CrawlerTask", "TaskHistory")
+
+
+def _task_history_version():
+    """任務執行歷史的資料版本 (條件請求用)"""
+    return get_crawler_task_service().get_data_version("TaskHistory")
+
+
 # 排程任務相關端點
 @tasks_bp.route('/scheduled', methods=['GET'])
 def get_scheduled_tasks():
@@ -528,6 +540,7 @@ def cancel_task(task_id):
         return handle_api_error(e)
 
 @tasks_bp.route('/<int:task_id>/history', methods=['GET'])
+@conditional_get(_task_history_version)
 def get_task_history(task_id):
     try:
         # 從 CrawlerTaskService 獲取歷史記錄
@@ -729,12 +742,13 @@ def update_task(task_id):
         return handle_api_error(e)
 
 @tasks_bp.route('', methods=['GET'])
+@conditional_get(_tasks_version)
 def get_all_tasks():
     """獲取所有任務列表"""
     try:
         service = get_crawler_task_service()
-        # 使用 find_all_tasks
-        result = service.find_all_tasks()
+        # 使用 find_all_tasks，並以單一查詢附上每個任務最新一次執行的摘要
+        result = service.find_all_tasks(include_latest_run=True)
         
         if not result.get('success'):
             return jsonify({"success": False, "message": result.get('message', '獲取任務列表失敗')}), 500
@@ -742,6 +756,9 @@ def get_all_tasks():
         tasks_list = result.get('tasks', [])
         # 使用 _prepare_task_for_response 處理每個任務對象，確保枚舉類型被正確序列化
         tasks_dict_list = [_prepare_task_for_response(task) for task in tasks_list]
+        latest_runs = result.get('latest_runs', {})
+        for task_dict in tasks_dict_list:
+            task_dict['latest_run'] = latest_runs.get(task_dict.get('id'))
         
         logger.info("成功獲取 %s 個任務", len(tasks_dict_list))
         
@@ -20,6 +20,7 @@ def test_parse_default_params():
         'sort_desc': False,
         'is_preview': False,
         'preview_fields': None,
+        'column_set': None,
         'q': None
     }
     assert filter_criteria == {}
@@ -35,6 +36,7 @@ def test_parse_valid_params():
         ('sort_desc', 'true'),
         ('is_preview', '1'),
         ('preview_fields', 'id,name,email'),
+        ('column_set', 'list'),
         ('q', 'search term')
     ])
     validated_params, filter_criteria = parse_and_validate_common_query_params(args)
@@ -47,6 +49,7 @@ def test_parse_valid_params():
         'sort_desc': True,
         'is_preview': True,
         'preview_fields': ['id', 'name', 'email'],
+        'column_set': 'list',
         'q': 'search term'
     }
     assert filter_criteria == {}
@@ -70,6 +73,7 @@ def test_parse_with_filter_criteria():
         'sort_desc': False,
         'is_preview': False,
         'preview_fields': None,
+        'column_set': None,
         'q': None
     }
     # 注意：MultiDict 對於同名鍵的處理，這裡 parse 函數只取第一個值
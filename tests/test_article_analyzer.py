@@ -3,8 +3,13 @@ import logging
 import pandas as pd
 import pytest
 
-from src.crawlers.article_analyzer import ArticleAnalyzer
-from src.crawlers.configs.ai_filter_config import AI_KEYWORDS
+from src.crawlers.article_analyzer import ArticleAnalyzer, IncrementalArticleStatistics
+from src.crawlers.configs.ai_filter_config import (
+    AI_KEYWORDS,
+    FIELD_WEIGHTS,
+    HIGH_PRIORITY_WEIGHT,
+    register_additional_keywords,
+)
   # 使用統一的 logger
 
 # flake8: noqa: F811
@@ -164,3 +169,128 @@ class TestArticleAnalyzer:
             df_no_content, ai_only=True
         )
         assert "ai_keyword_frequency" not in stats_no_content
+
+    def test_is_ai_related_after_register_additional_keywords(self):
+        """測試註冊新關鍵字後，自動機會重建並能比對新關鍵字"""
+        article = {"title": "量子退火演算法新突破"}
+        assert ArticleAnalyzer.is_ai_related(article) is False
+        register_additional_keywords("量子退火")
+        try:
+            assert ArticleAnalyzer.is_ai_related(article) is True
+        finally:
+            AI_KEYWORDS.discard("量子退火")
+        assert ArticleAnalyzer.is_ai_related(article) is False
+
+    def test_is_ai_related_content_counts_distinct_keywords(self):
+        """測試內容關鍵字數量以不重複的關鍵字計算"""
+        article = {"content": "機器學習、機器學習、機器學習"}
+        assert ArticleAnalyzer.is_ai_related(article, min_keywords=2) is False
+        assert ArticleAnalyzer.is_ai_related(article, min_keywords=1) is True
+
+    def test_score_ai_relevance_field_weights(self):
+        """測試各欄位依權重計分"""
+        article = {
+            "title": "深度學習入門",
+            "summary": "介紹機器學習",
+            "content": "深度學習與機器學習，深度學習",
+            "tags": "科技, 自然語言處理",
+        }
+        result = ArticleAnalyzer.score_ai_relevance(article)
+
+        assert result["field_scores"]["title"] == FIELD_WEIGHTS["title"] * 1
+        assert result["field_scores"]["summary"] == FIELD_WEIGHTS["summary"] * 1
+        assert result["field_scores"]["content"] == FIELD_WEIGHTS["content"] * 2
+        assert result["field_scores"]["tags"] == FIELD_WEIGHTS["tags"] * 1
+        assert result["keyword_hits"]["深度學習"] == 3
+        assert result["high_priority_hits"] == []
+        assert result["score"] == sum(result["field_scores"].values())
+
+    def test_score_ai_relevance_high_priority(self):
+        """測試高優先級關鍵字額外加分，且不需在 AI_KEYWORDS 中"""
+        result = ArticleAnalyzer.score_ai_relevance(
+            {"title": "Midjourney 推出新版本"}, field_weights={"title": 1.0}
+        )
+        assert result["high_priority_hits"] == ["midjourney"]
+        assert result["score"] == 1.0 + HIGH_PRIORITY_WEIGHT
+
+    def test_score_ai_relevance_no_hits(self):
+        """測試沒有命中時分數為 0"""
+        result = ArticleAnalyzer.score_ai_relevance({"title": "週末好去處"})
+        assert result["score"] == 0
+        assert result["keyword_hits"] == {}
+
+    def test_count_keyword_documents_counts_each_article_once(self):
+        """測試關鍵字頻率以文章數計算，且不會跨文章誤判"""
+        contents = pd.Series(["機器學習 機器學習", "深度學習", None, "人工智", "慧"])
+        counts = ArticleAnalyzer.count_keyword_documents(contents)
+        assert counts["機器學習"] == 1
+        assert counts["深度學習"] == 1
+        # "人工智" 與 "慧" 分屬不同文章，不應組成 "人工智慧"
+        assert "人工智慧" not in counts
+
+    def test_count_keyword_documents_matches_per_row_loop(self):
+        """測試單次掃描的結果與逐列逐關鍵字比對的結果一致"""
+        contents = pd.Series([
+            "ChatGPT 與 LLM 的發展，生成式AI 帶動 AI 應用",
+            "推薦系統使用機器學習與 embedding",
+            "今天天氣晴朗",
+            "AI倫理與AI監管議題",
+        ])
+        expected = {}
+        for content in contents:
+            for keyword in AI_KEYWORDS:
+                if keyword in content.lower():
+                    expected[keyword] = expected.get(keyword, 0) + 1
+        assert dict(ArticleAnalyzer.count_keyword_documents(contents)) == expected
+
+    def test_analyze_articles_statistics_ai_related_ratio(self):
+        """測試 analyze_articles_statistics 計算AI相關文章比例"""
+        df = pd.DataFrame({"title": ["A", "B", "C", "D"], "is_ai_related": [True, False, True, True]})
+        stats = ArticleAnalyzer.analyze_articles_statistics(df)
+        assert stats["ai_related_ratio"] == 0.75
+
+
+class TestIncrementalArticleStatistics:
+    def test_update_only_processes_new_articles_by_id(self):
+        """測試增量統計只處理 id 大於上次最大 id 的文章"""
+        df = pd.DataFrame({
+            "id": [1, 2],
+            "category": ["AI", "Tech"],
+            "content": ["機器學習", "演算法"],
+            "is_ai_related": [True, False],
+        })
+        tracker = IncrementalArticleStatistics()
+        assert tracker.update(df) == 2
+
+        df_more = pd.concat([df, pd.DataFrame({
+            "id": [3],
+            "category": ["AI"],
+            "content": ["機器學習與深度學習"],
+            "is_ai_related": [True],
+        })], ignore_index=True)
+        assert tracker.update(df_more) == 1
+        assert tracker.update(df_more) == 0
+
+        stats = tracker.to_dict()
+        assert stats == {
+            "total_articles": 3,
+            "category_distribution": {"AI": 2, "Tech": 1},
+            "ai_related_ratio": round(2 / 3, 4),
+            "ai_keyword_frequency": ArticleAnalyzer.analyze_articles_statistics(df_more)["ai_keyword_frequency"],
+        }
+        assert stats["ai_keyword_frequency"]["機器學習"] == 2
+
+    def test_update_uses_link_when_no_id(self):
+        """測試沒有 id 欄位時以 link 判斷是否已統計"""
+        tracker = IncrementalArticleStatistics()
+        df = pd.DataFrame({"link": ["a", "b"], "content_length": [100, 300]})
+        assert tracker.update(df) == 2
+        df_more = pd.DataFrame({"link": ["b", "c"], "content_length": [300, 500]})
+        assert tracker.update(df_more) == 1
+        assert tracker.to_dict()["avg_article_length"] == 300
+
+    def test_update_empty_dataframe(self):
+        """測試空 DataFrame 不影響統計"""
+        tracker = IncrementalArticleStatistics()
+        assert tracker.update(pd.DataFrame()) == 0
+        assert tracker.to_dict() == {"total_articles": 0}
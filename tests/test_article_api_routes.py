@@ -178,7 +178,7 @@ def mock_article_service(monkeypatch, sample_articles_data):
         def __init__(self):
             self.articles = {a['id']: ArticleReadSchemaMock(**a) for a in sample_articles_data}
 
-        def find_articles_paginated(self, page=1, per_page=10, filter_criteria=None, sort_by=None, sort_desc=False, is_preview=False, preview_fields=None):
+        def find_articles_paginated(self, page=1, per_page=10, filter_criteria=None, sort_by=None, sort_desc=False, is_preview=False, preview_fields=None, column_set=None):
             all_articles = list(self.articles.values())
 
             # 模擬過濾
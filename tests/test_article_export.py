@@ -0,0 +1,239 @@
+"""測試文章串流匯出，包括 NDJSON/CSV 格式、過濾條件、gzip 與記憶體用量不隨筆數成長。"""
+
+# flake8: noqa: F811
+# pylint: disable=redefined-outer-name
+
+# Standard library imports
+import csv
+import gc
+import gzip
+import io
+import json
+import logging
+import os
+import tracemalloc
+import zlib
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+# Third party imports
+import pytest
+from flask import Flask
+from sqlalchemy import insert
+
+# Local application imports
+from src.models.articles_model import Articles, ArticleScrapeStatus
+from src.models.base_model import Base
+from src.services.article_service import ArticleService
+from src.utils.export_utils import iter_csv, iter_gzip, iter_ndjson
+from src.web.routes.article_api import article_bp
+
+logger = logging.getLogger(__name__)  # 使用統一的 logger
+
+
+@pytest.fixture(scope="function")
+def initialized_db_manager(db_manager_for_test):
+    """建立資料表後提供資料庫管理器"""
+    db_manager_for_test.create_tables(Base)
+    yield db_manager_for_test
+
+
+@pytest.fixture(scope="function")
+def article_service(initialized_db_manager):
+    return ArticleService(initialized_db_manager)
+
+
+@pytest.fixture(scope="function")
+def client(article_service):
+    """使用真實 ArticleService 的文章 API 測試客戶端"""
+    app = Flask(__name__)
+    app.register_blueprint(article_bp)
+    with patch(
+        "src.web.routes.article_api.get_article_service", return_value=article_service
+    ):
+        yield app.test_client()
+
+
+def _insert_articles(db_manager, count: int, start: int = 0) -> None:
+    """以批次 INSERT 建立測試文章"""
+    now = datetime.now(timezone.utc)
+    rows = [
+        {
+            "title": f"匯出測試文章{i}",
+            "link": f"https://example.com/export/{i}",
+            "summary": "摘要" * 20,
+            "content": "內容" * 200,
+            "source": "來源A" if i % 2 else "來源B",
+            "source_url": f"https://example.com/export/{i}",
+            "category": "AI" if i % 3 == 0 else "財經",
+            "published_at": now,
+            "is_ai_related": i % 3 == 0,
+            "is_scraped": False,
+            "scrape_status": ArticleScrapeStatus.LINK_SAVED,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for i in range(start, start + count)
+    ]
+    with db_manager.session_scope() as session:
+        session.execute(insert(Articles), rows)
+
+
+def _synthetic_rows(count: int):
+    published_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    for i in range(count):
+        yield {
+            "id": i,
+            "title": f"合成文章{i}",
+            "link": f"https://example.com/synthetic/{i}",
+            "published_at": published_at,
+            "scrape_status": ArticleScrapeStatus.LINK_SAVED,
+            "is_ai_related": bool(i % 2),
+        }
+
+
+class TestExportSerialization:
+    """序列化工具測試"""
+
+    def test_ndjson_and_csv(self):
+        """NDJSON 每列一個物件，CSV 第一列為欄位名稱，日期與枚舉轉為字串"""
+        rows = list(_synthetic_rows(3))
+        lines = "".join(iter_ndjson(rows)).splitlines()
+        assert len(lines) == 3
+        first = json.loads(lines[0])
+        assert first["scrape_status"] == "link_saved"
+        assert first["published_at"] == "2024-01-01T00:00:00+00:00"
+
+        fields = ["id", "title", "scrape_status"]
+        parsed = list(csv.reader(io.StringIO("".join(iter_csv(rows, fields)))))
+        assert parsed[0] == fields
+        assert parsed[1] == ["0", "合成文章0", "link_saved"]
+
+    def test_gzip_stream(self):
+        """gzip 串流可完整解壓"""
+        text = "".join(iter_ndjson(_synthetic_rows(1000)))
+        compressed = b"".join(iter_gzip(iter_ndjson(_synthetic_rows(1000))))
+        assert gzip.decompress(compressed).decode("utf-8") == text
+
+    def test_million_rows_under_rss_budget(self):
+        """串流 100 萬筆合成資料時常駐記憶體不隨筆數成長"""
+        statm_path = "/proc/self/statm"
+        if not os.path.exists(statm_path):
+            pytest.skip("需要 /proc 取得目前的 RSS")
+        page_size = os.sysconf("SC_PAGE_SIZE")
+
+        def current_rss() -> int:
+            with open(statm_path, encoding="utf-8") as statm:
+                return int(statm.read().split()[1]) * page_size
+
+        gc.collect()
+        baseline = current_rss()
+        peak = baseline
+        decompressor = zlib.decompressobj(31)
+        total_lines = 0
+        for index, chunk in enumerate(
+            iter_gzip(iter_ndjson(_synthetic_rows(1_000_000)), level=1)
+        ):
+            total_lines += decompressor.decompress(chunk).count(b"\n")
+            if index % 20 == 0:
+                peak = max(peak, current_rss())
+        total_lines += decompressor.flush().count(b"\n")
+
+        assert total_lines == 1_000_000
+        # 完整輸出超過 100MB，串流時的 RSS 增量必須維持在固定預算內
+        assert peak - baseline < 32 * 1024 * 1024
+
+
+class TestArticleExportService:
+    """服務層串流匯出"""
+
+    def test_filters_and_order(self, initialized_db_manager, article_service):
+        """支援進階搜尋的過濾條件並依 id 排序"""
+        _insert_articles(initialized_db_manager, 30)
+        result = article_service.export_articles(
+            column_set="list", is_ai_related=True, source="來源B"
+        )
+        assert result["success"] is True
+        assert "content" not in result["fields"]
+        rows = list(result["rows"])
+        assert rows
+        assert all(r["is_ai_related"] and r["source"] == "來源B" for r in rows)
+        assert [r["id"] for r in rows] == sorted(r["id"] for r in rows)
+
+    def test_unknown_column_set(self, article_service):
+        """未知的欄位集合返回失敗"""
+        result = article_service.export_articles(column_set="unknown")
+        assert result["success"] is False
+
+    def test_memory_flat_regardless_of_row_count(
+        self, initialized_db_manager, article_service
+    ):
+        """匯出的記憶體峰值與筆數無關 (以 yield_per 逐批讀取)"""
+
+        def export_peak() -> int:
+            gc.collect()
+            tracemalloc.start()
+            try:
+                result = article_service.export_articles(batch_size=200)
+                for _ in iter_ndjson(result["rows"]):
+                    pass
+                return tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+        _insert_articles(initialized_db_manager, 1000)
+        small_peak = export_peak()
+        _insert_articles(initialized_db_manager, 9000, start=1000)
+        large_peak = export_peak()
+        # 全部載入時 10000 筆的內容約 15MB，串流的峰值應與 1000 筆時相近
+        assert large_peak < small_peak * 1.5 + 512 * 1024
+
+
+class TestArticleExportRoute:
+    """/api/articles/export 路由測試"""
+
+    def test_ndjson_export(self, client, initialized_db_manager):
+        """預設匯出 NDJSON 並套用過濾條件"""
+        _insert_articles(initialized_db_manager, 12)
+        response = client.get("/api/articles/export?category=AI&column_set=list")
+        assert response.status_code == 200
+        assert response.mimetype == "application/x-ndjson"
+        rows = [json.loads(line) for line in response.data.decode("utf-8").splitlines()]
+        assert len(rows) == 4
+        assert all(row["category"] == "AI" for row in rows)
+
+    def test_csv_export(self, client, initialized_db_manager):
+        """CSV 匯出包含欄位名稱列"""
+        _insert_articles(initialized_db_manager, 5)
+        response = client.get("/api/articles/export?format=csv&column_set=status")
+        assert response.status_code == 200
+        assert response.mimetype == "text/csv"
+        parsed = list(csv.reader(io.StringIO(response.data.decode("utf-8"))))
+        assert parsed[0][0] == "id"
+        assert len(parsed) == 6
+
+    def test_gzip_negotiated(self, client, initialized_db_manager):
+        """客戶端接受 gzip 時以 Content-Encoding 壓縮"""
+        _insert_articles(initialized_db_manager, 5)
+        response = client.get(
+            "/api/articles/export", headers={"Accept-Encoding": "gzip"}
+        )
+        assert response.headers["Content-Encoding"] == "gzip"
+        lines = gzip.decompress(response.data).decode("utf-8").splitlines()
+        assert len(lines) == 5
+
+    def test_gzip_download(self, client, initialized_db_manager):
+        """gzip=true 時下載 .gz 檔案"""
+        _insert_articles(initialized_db_manager, 3)
+        response = client.get("/api/articles/export?gzip=true")
+        assert "Content-Encoding" not in response.headers
+        assert "articles.ndjson.gz" in response.headers["Content-Disposition"]
+        assert len(gzip.decompress(response.data).splitlines()) == 3
+
+    @pytest.mark.parametrize(
+        "query", ["format=xml", "column_set=unknown", "date_from=not-a-date"]
+    )
+    def test_invalid_parameters(self, client, query):
+        """無效的參數返回 400"""
+        response = client.get(f"/api/articles/export?{query}")
+        assert response.status_code == 400
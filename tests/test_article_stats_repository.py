@@ -0,0 +1,185 @@
+"""測試文章統計彙總，包括寫入時的增量維護、重建與統計讀取。"""
+
+# flake8: noqa: F811
+# pylint: disable=redefined-outer-name
+
+# Standard library imports
+import logging
+from datetime import datetime, timezone, timedelta
+
+# Third party imports
+import pytest
+from sqlalchemy import update
+
+# Local application imports
+from src.database.article_stats_repository import ArticleStatsRepository
+from src.database.articles_repository import ArticlesRepository
+from src.error.errors import ValidationError
+from src.models.article_stats_model import ArticleStats, article_stats_key
+from src.models.articles_model import Articles, ArticleScrapeStatus
+from src.models.base_model import Base
+from src.services.article_service import ArticleService
+
+logger = logging.getLogger(__name__)  # 使用統一的 logger
+
+
+@pytest.fixture(scope="function")
+def initialized_db_manager(db_manager_for_test):
+    """建立資料表後提供資料庫管理器"""
+    db_manager_for_test.create_tables(Base)
+    yield db_manager_for_test
+
+
+def _article(index: int, **overrides) -> Articles:
+    data = {
+        "title": f"統計測試文章{index}",
+        "link": f"https://example.com/stats/{index}",
+        "source": "來源A" if index % 2 else "來源B",
+        "source_url": f"https://example.com/stats/{index}",
+        "category": "AI" if index % 3 else None,
+        "published_at": datetime.now(timezone.utc) - timedelta(days=index),
+        "is_ai_related": index % 2 == 0,
+        "is_scraped": False,
+        "scrape_status": ArticleScrapeStatus.LINK_SAVED,
+    }
+    data.update(overrides)
+    return Articles(**data)
+
+
+def _rollup_matches_live(session) -> None:
+    """彙總統計與直接聚合文章表的結果一致"""
+    live = ArticlesRepository(session, Articles)
+    rollup = ArticleStatsRepository(session, ArticleStats)
+    live_stats = live.get_statistics()
+    rollup_stats = rollup.get_statistics()
+    for key in (
+        "total_count",
+        "ai_related_count",
+        "category_distribution",
+        "source_distribution",
+        "scrape_status_distribution",
+    ):
+        assert rollup_stats[key] == live_stats[key], key
+    assert rollup.get_source_statistics() == live.get_source_statistics()
+
+
+@pytest.fixture(scope="function")
+def seeded_articles(initialized_db_manager):
+    """建立 12 篇測試文章，返回文章 ID 列表"""
+    with initialized_db_manager.session_scope() as session:
+        articles = [_article(i) for i in range(12)]
+        session.add_all(articles)
+        session.flush()
+        return [article.id for article in articles]
+
+
+class TestArticleStatsMaintenance:
+    """寫入文章時增量維護彙總"""
+
+    def test_insert_updates_rollup(self, initialized_db_manager, seeded_articles):
+        """新增文章後彙總與文章表一致"""
+        with initialized_db_manager.session_scope() as session:
+            assert session.query(ArticleStats).count() > 0
+            _rollup_matches_live(session)
+
+    def test_status_change_moves_count(self, initialized_db_manager, seeded_articles):
+        """更新爬取狀態時計數從舊鍵移到新鍵"""
+        with initialized_db_manager.session_scope() as session:
+            repo = ArticlesRepository(session, Articles)
+            repo.update(
+                seeded_articles[0],
+                {
+                    "is_scraped": True,
+                    "scrape_status": ArticleScrapeStatus.CONTENT_SCRAPED,
+                },
+            )
+        with initialized_db_manager.session_scope() as session:
+            _rollup_matches_live(session)
+            distribution = ArticleStatsRepository(
+                session, ArticleStats
+            ).get_scrape_status_distribution()
+            assert distribution == {"link_saved": 11, "content_scraped": 1}
+
+    def test_update_of_expired_article(self, initialized_db_manager, seeded_articles):
+        """欄位已過期時直接覆寫，仍能由資料庫讀取舊值計算增減"""
+        with initialized_db_manager.session_scope() as session:
+            article = session.get(Articles, seeded_articles[1])
+            session.expire(article)
+            article.source = "來源C"
+        with initialized_db_manager.session_scope() as session:
+            _rollup_matches_live(session)
+
+    def test_delete_decrements_rollup(self, initialized_db_manager, seeded_articles):
+        """刪除文章後計數減少，歸零的鍵不出現在分布中"""
+        with initialized_db_manager.session_scope() as session:
+            repo = ArticlesRepository(session, Articles)
+            for article_id in seeded_articles:
+                if article_id % 2:
+                    repo.delete(article_id)
+        with initialized_db_manager.session_scope() as session:
+            _rollup_matches_live(session)
+
+    def test_key_uses_utc_day_and_defaults(self):
+        """彙總鍵使用 UTC 日期，未設定的欄位以空字串表示"""
+        taipei = timezone(timedelta(hours=8))
+        key = article_stats_key(
+            {"published_at": datetime(2024, 1, 2, 3, 0, tzinfo=taipei), "source": None}
+        )
+        assert key == ("", "", "2024-01-01", False, False, "pending")
+
+
+class TestArticleStatsRepository:
+    """彙總讀取與重建"""
+
+    def test_direct_writes_rejected(self, initialized_db_manager):
+        """彙總由系統維護，不允許直接創建或更新"""
+        with initialized_db_manager.session_scope() as session:
+            repo = ArticleStatsRepository(session, ArticleStats)
+            with pytest.raises(ValidationError):
+                repo.create({"article_count": 1})
+            with pytest.raises(ValidationError):
+                repo.update(1, {"article_count": 1})
+
+    def test_rebuild_fixes_drift(self, initialized_db_manager, seeded_articles):
+        """繞過 ORM 的批次更新造成誤差，重建後恢復一致"""
+        with initialized_db_manager.session_scope() as session:
+            session.execute(
+                update(Articles)
+                .where(Articles.id.in_(seeded_articles[:4]))
+                .values(source="批次來源")
+            )
+        with initialized_db_manager.session_scope() as session:
+            rollup = ArticleStatsRepository(session, ArticleStats)
+            assert "批次來源" not in rollup.get_source_distribution()
+            result = rollup.rebuild(batch_size=5)
+            assert result["article_count"] == 12
+            assert result["corrected_rows"] > 0
+        with initialized_db_manager.session_scope() as session:
+            _rollup_matches_live(session)
+            assert ArticleStatsRepository(session, ArticleStats).rebuild()[
+                "corrected_rows"
+            ] == 0
+
+    def test_recent_count_by_day(self, initialized_db_manager, seeded_articles):
+        """近期文章數以發布日期計算"""
+        with initialized_db_manager.session_scope() as session:
+            stats = ArticleStatsRepository(session, ArticleStats).get_statistics(
+                recent_days=3
+            )
+            assert stats["total_count"] == 12
+            assert stats["recent_count"] == 4
+
+    def test_service_reads_rollup(self, initialized_db_manager, seeded_articles):
+        """服務的統計讀取彙總表，重建後反映繞過 ORM 的刪除"""
+        service = ArticleService(initialized_db_manager)
+        with initialized_db_manager.session_scope() as session:
+            session.query(Articles).filter(Articles.id == seeded_articles[0]).delete(
+                synchronize_session=False
+            )
+        stale = service.get_articles_statistics()
+        assert stale["success"] is True
+        assert stale["statistics"]["total_count"] == 12
+
+        rebuild = service.rebuild_article_stats()
+        assert rebuild["success"] is True
+        assert service.get_articles_statistics()["statistics"]["total_count"] == 11
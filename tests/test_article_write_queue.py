@@ -0,0 +1,183 @@
+"""測試 ArticleWriteQueue (跨任務共用的文章 write-behind 寫入佇列) 的功能。"""
+import logging
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.services.article_write_queue import ArticleWriteQueue, is_write_behind_enabled
+
+logger = logging.getLogger(__name__)  # 使用統一的 logger
+
+# flake8: noqa: F811
+# pylint: disable=redefined-outer-name
+
+
+def _create_result(articles_data):
+    """模擬 batch_create_articles 全部成功的結果"""
+    return {
+        "success": True,
+        "message": "ok",
+        "resultMsg": {
+            "success_count": len(articles_data),
+            "update_count": 0,
+            "fail_count": 0,
+            "failed_details": [],
+        },
+    }
+
+
+@pytest.fixture
+def article_service():
+    service = MagicMock()
+    service.batch_create_articles.side_effect = lambda articles_data: _create_result(articles_data)
+    return service
+
+
+@pytest.fixture
+def write_queue(article_service):
+    write_queue = ArticleWriteQueue(article_service, max_queue_size=100, batch_size=50, flush_interval=0.2)
+    yield write_queue
+    write_queue.stop(timeout=5)
+
+
+class TestArticleWriteQueue:
+    def test_coalesces_submissions_from_multiple_tasks(self, write_queue, article_service):
+        """測試時間窗口內多個任務的文章會合併為同一批次寫入，且各任務分別取得寫入確認"""
+        ticket_a = write_queue.submit(1, [{"link": f"https://example.com/a{i}"} for i in range(3)])
+        ticket_b = write_queue.submit(2, [{"link": f"https://example.com/b{i}"} for i in range(2)])
+
+        assert ticket_a.wait(5)
+        assert ticket_b.wait(5)
+        assert ticket_a.to_result()["resultMsg"]["success_count"] == 3
+        assert ticket_b.to_result()["resultMsg"]["success_count"] == 2
+        article_service.batch_create_articles.assert_called_once()
+        assert len(article_service.batch_create_articles.call_args[1]["articles_data"]) == 5
+
+    def test_splits_batches_by_size(self, article_service):
+        """測試超過 batch_size 時拆成多個批次"""
+        write_queue = ArticleWriteQueue(article_service, batch_size=2, flush_interval=0.2)
+        try:
+            ticket = write_queue.submit(1, [{"link": f"https://example.com/{i}"} for i in range(5)])
+            assert ticket.wait(5)
+        finally:
+            write_queue.stop(timeout=5)
+        assert ticket.success_count == 5
+        assert article_service.batch_create_articles.call_count == 3
+        assert write_queue.get_stats()["batches_written"] == 3
+
+    def test_per_task_failures_are_attributed_by_link(self, write_queue, article_service):
+        """測試批次中個別失敗的文章只會計入提交該文章的任務"""
+        article_service.batch_create_articles.side_effect = lambda articles_data: {
+            "success": False,
+            "message": "部分失敗",
+            "resultMsg": {
+                "success_count": len(articles_data) - 1,
+                "update_count": 0,
+                "fail_count": 1,
+                "failed_details": [{"data": {"link": "https://example.com/bad"}, "error": "驗證失敗"}],
+            },
+        }
+        ticket = write_queue.submit(1, [{"link": "https://example.com/ok"}, {"link": "https://example.com/bad"}])
+
+        assert ticket.wait(5)
+        result = ticket.to_result()
+        assert result["success"] is False
+        assert result["resultMsg"]["success_count"] == 1
+        assert result["resultMsg"]["fail_count"] == 1
+        assert result["resultMsg"]["failed_details"][0]["link"] == "https://example.com/bad"
+
+    def test_update_by_link_mode(self, write_queue, article_service):
+        """測試依連結更新模式使用 batch_update_articles_by_link，並處理不存在的連結"""
+        article_service.batch_update_articles_by_link.return_value = {
+            "success": True,
+            "message": "ok",
+            "resultMsg": {"success_count": 1, "fail_count": 1, "missing_links": ["https://example.com/missing"], "error_details": []},
+        }
+        ticket = write_queue.submit(
+            1, [{"link": "https://example.com/1"}, {"link": "https://example.com/missing"}], update_by_link=True
+        )
+
+        assert ticket.wait(5)
+        assert ticket.success_count == 1
+        assert ticket.fail_count == 1
+        article_service.batch_create_articles.assert_not_called()
+
+    def test_reports_unchanged_articles(self, write_queue, article_service):
+        """測試內容未變更的文章計入成功數，並另外回報未變更數量"""
+        article_service.batch_update_articles_by_link.return_value = {
+            "success": True,
+            "message": "ok",
+            "resultMsg": {
+                "success_count": 2,
+                "fail_count": 0,
+                "missing_links": [],
+                "error_details": [],
+                "unchanged_count": 1,
+                "unchanged_links": ["https://example.com/same"],
+            },
+        }
+        ticket = write_queue.submit(
+            1, [{"link": "https://example.com/same"}, {"link": "https://example.com/new"}], update_by_link=True
+        )
+
+        assert ticket.wait(5)
+        result = ticket.to_result()
+        assert result["resultMsg"]["success_count"] == 2
+        assert result["resultMsg"]["unchanged_count"] == 1
+
+    def test_service_exception_fails_whole_batch(self, write_queue, article_service):
+        """測試批量寫入拋出例外時，批次內的文章都記為失敗"""
+        article_service.batch_create_articles.side_effect = RuntimeError("db down")
+        ticket = write_queue.submit(1, [{"link": "https://example.com/1"}, {"link": "https://example.com/2"}])
+
+        assert ticket.wait(5)
+        assert ticket.fail_count == 2
+        assert write_queue.get_stats()["rows_failed"] == 2
+
+    def test_backpressure_when_queue_full(self, article_service):
+        """測試佇列已滿且等待逾時時，未能放入的文章記為失敗"""
+        gate = threading.Event()
+        article_service.batch_create_articles.side_effect = lambda articles_data: (gate.wait(5), _create_result(articles_data))[1]
+        write_queue = ArticleWriteQueue(article_service, max_queue_size=2, batch_size=1, flush_interval=0.05)
+        try:
+            first = write_queue.submit(1, [{"link": "https://example.com/0"}])
+            # 等待寫入執行緒取走第一筆並阻塞在寫入中
+            for _ in range(100):
+                if write_queue.get_stats()["queued"] == 0:
+                    break
+                threading.Event().wait(0.01)
+            ticket = write_queue.submit(2, [{"link": f"https://example.com/{i}"} for i in range(1, 5)], timeout=0.1)
+            assert ticket.fail_count == 2
+            gate.set()
+            assert first.wait(5)
+            assert ticket.wait(5)
+            assert ticket.success_count == 2
+        finally:
+            gate.set()
+            write_queue.stop(timeout=5)
+
+    def test_stop_flushes_pending_articles(self, article_service):
+        """測試停止時會寫入佇列中剩餘的文章"""
+        write_queue = ArticleWriteQueue(article_service, batch_size=100, flush_interval=10)
+        ticket = write_queue.submit(1, [{"link": "https://example.com/1"}])
+        write_queue.stop(timeout=5)
+
+        assert ticket.done
+        assert ticket.success_count == 1
+        assert write_queue.is_running is False
+
+    def test_empty_submission_is_acknowledged_immediately(self, write_queue):
+        """測試提交空列表時立即完成"""
+        ticket = write_queue.submit(1, [])
+        assert ticket.done
+        assert ticket.to_result()["success"] is True
+
+    @pytest.mark.parametrize("value, expected", [("true", True), ("1", True), ("false", False), (None, False)])
+    def test_is_write_behind_enabled(self, monkeypatch, value, expected):
+        """測試以環境變數啟用寫入佇列"""
+        if value is None:
+            monkeypatch.delenv("ARTICLE_WRITE_BEHIND_ENABLED", raising=False)
+        else:
+            monkeypatch.setenv("ARTICLE_WRITE_BEHIND_ENABLED", value)
+        assert is_write_behind_enabled() is expected
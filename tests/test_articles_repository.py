@@ -19,6 +19,7 @@ import logging
 
 # Third party imports
 import pytest
+from sqlalchemy import event, inspect
 
 # Local application imports
 from src.database.articles_repository import ArticlesRepository
@@ -26,7 +27,11 @@ from src.models.articles_model import Articles, ArticleScrapeStatus
 from src.models.base_model import Base
 from src.database.base_repository import SchemaType
 from src.models.articles_schema import ArticleCreateSchema, ArticleUpdateSchema
-from src.error.errors import ValidationError, DatabaseOperationError
+from src.error.errors import (
+    ValidationError,
+    DatabaseOperationError,
+    InvalidOperationError,
+)
 
 
 logger = logging.getLogger(__name__)  # 使用統一的 logger
@@ -773,6 +778,27 @@ class TestArticleRepository:
             article_repo.delete_by_link(link_to_delete)
         assert f"連結 '{link_to_delete}' 不存在，無法刪除" in str(exc_info.value)
 
+    def test_find_existing_links(self, article_repo, sample_article_data, clean_db):
+        """測試找出已存在的文章連結，同時比對 link 與 canonical_link"""
+        article = article_repo.get_by_id(sample_article_data[1]["id"])
+        article.canonical_link = "https://example.com/article2-canonical"
+        article_repo.session.commit()
+
+        existing = article_repo.find_existing_links(
+            [
+                "https://example.com/article1",
+                "https://example.com/article2-canonical",
+                "https://example.com/new",
+                "https://example.com/article1",
+                "",
+            ]
+        )
+        assert existing == {
+            "https://example.com/article1",
+            "https://example.com/article2-canonical",
+        }
+        assert article_repo.find_existing_links([]) == set()
+
     def test_count_unscraped_links(self, article_repo, sample_article_data, clean_db):
         """測試計算未爬取連結的數量"""
         assert article_repo.count_unscraped_links() == 1
@@ -923,3 +949,65 @@ class TestArticleRepository:
         assert (
             article_repo.count_articles_by_task_id(task_id=11, is_scraped=False) == 2
         )  # ai2, finance are unscraped
+
+
+class TestArticleColumnSets:
+    """具名欄位集合與延遲載入欄位測試"""
+
+    def test_list_and_status_sets_exclude_body(self, article_repo, sample_article_data):
+        """list/status 欄位集合返回字典且不含內文與摘要"""
+        list_rows = article_repo.find_by_filter({}, column_set="list")
+        assert len(list_rows) == 3
+        assert set(list_rows[0].keys()) == set(ArticlesRepository.column_sets["list"])
+        assert "content" not in list_rows[0] and "summary" not in list_rows[0]
+
+        total, status_rows = article_repo.find_paginated(
+            page=1, per_page=2, column_set="status"
+        )
+        assert total == 3
+        assert set(status_rows[0].keys()) == set(ArticlesRepository.column_sets["status"])
+
+    def test_column_set_overrides_preview(self, article_repo, sample_article_data):
+        """column_set 優先於 is_preview/preview_fields"""
+        rows = article_repo.find_unscraped_links(
+            is_preview=True, preview_fields=["title"], column_set="status"
+        )
+        assert len(rows) == 1
+        assert rows[0]["link"] == "https://example.com/article3"
+        assert "scrape_error" in rows[0]
+
+        rows = article_repo.find_articles_by_task_id(task_id=1, column_set="list")
+        assert {row["task_id"] for row in rows} == {1}
+
+    def test_full_set_loads_body_in_single_query(
+        self, initialized_db_manager, sample_article_data
+    ):
+        """完整物件列表會一併載入延遲欄位，存取內文不再逐筆查詢"""
+        with initialized_db_manager.session_scope() as session:
+            repo = ArticlesRepository(session, Articles)
+            statements = []
+
+            def count_statement(conn, cursor, statement, *args):
+                statements.append(statement)
+
+            event.listen(initialized_db_manager.engine, "before_cursor_execute", count_statement)
+            try:
+                articles = repo.find_by_filter({}, column_set="full")
+                contents = [article.content for article in articles]
+            finally:
+                event.remove(
+                    initialized_db_manager.engine, "before_cursor_execute", count_statement
+                )
+            assert len(statements) == 1
+            assert all(contents)
+
+            # 未經列表查詢載入的物件預設延遲內文
+            session.expire_all()
+            article = session.get(Articles, sample_article_data[0]["id"])
+            assert "content" in inspect(article).unloaded
+
+    def test_unknown_column_set(self, article_repo, sample_article_data):
+        """未知的欄位集合名稱拋出 InvalidOperationError"""
+        with pytest.raises(InvalidOperationError) as exc_info:
+            article_repo.find_by_filter({}, column_set="unknown")
+        assert "unknown" in str(exc_info.value)
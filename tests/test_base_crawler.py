@@ -3,7 +3,7 @@
 # pylint: disable=redefined-outer-name
 
 # 標準函式庫
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 import json
 import logging # 保留 logging 以便 MockCrawlerForTest 中的 logger 屬性
 from typing import Dict, List, Any, Optional
@@ -25,6 +25,8 @@ from src.models.articles_model import Articles
 from src.models.articles_schema import ArticleReadSchema, PaginatedArticleResponse
 from src.models.crawler_tasks_model import TASK_ARGS_DEFAULT, CrawlerTasks
 from src.services.article_service import ArticleService
+from src.services.article_write_queue import ArticleWriteQueue
+from src.services.crawl_frontier_service import CrawlFrontierService
 from src.utils.enum_utils import ScrapeMode, ArticleScrapeStatus, ScrapePhase
   # 使用統一的 logger
 
@@ -453,6 +455,53 @@ class TestBaseCrawler:
             
             # 驗證 to_csv 沒有被調用
             mock_to_csv.assert_not_called()
+
+    def test_save_results_to_parquet_and_replay(self, mock_config_file, article_service, tmp_path, monkeypatch):
+        """result_format=parquet 時依任務與日期分區保存，並可讀回重新保存到資料庫"""
+        monkeypatch.setattr("src.crawlers.base_crawler.DEFAULT_RESULT_DIR", str(tmp_path))
+        crawler = MockCrawlerForTest(mock_config_file, article_service)
+        task_id = 7
+        crawler.scrape_phase[task_id] = {'progress': 0, 'scrape_phase': ScrapePhase.INIT, 'message': ''}
+        crawler.articles_df = pd.DataFrame({
+            "title": ["Parquet 1", "Parquet 2"],
+            "link": ["https://example.com/p1", "https://example.com/p2"],
+            "source": ["Test Source", "Test Source"],
+            "source_url": ["https://example.com", "https://example.com"],
+            "category": ["AI", None],
+            "published_at": [datetime.now(timezone.utc)] * 2,
+            "is_ai_related": [True, False],
+            "is_scraped": [False, False],
+            "scrape_status": [ArticleScrapeStatus.LINK_SAVED, ArticleScrapeStatus.LINK_SAVED.value],
+        })
+        crawler._save_to_csv = MagicMock()
+        crawler.global_params = {'save_to_csv': True, 'save_to_database': False,
+                                 'result_format': 'parquet', 'csv_file_prefix': 'articles'}
+
+        crawler._save_results(task_id)
+
+        crawler._save_to_csv.assert_not_called()
+        files = list(tmp_path.glob(f"task={task_id}/date=*/articles_*.parquet"))
+        assert len(files) == 1
+        assert article_service.find_all_articles()["articles"] == []
+
+        crawler.global_params = {'task_id': task_id}
+        assert crawler.replay_saved_results(str(tmp_path), task_id=task_id) == 2
+        articles = article_service.find_all_articles()["articles"]
+        assert sorted(a.title for a in articles) == ["Parquet 1", "Parquet 2"]
+        assert {a.category for a in articles} == {"AI", None}
+
+    def test_save_results_defaults_to_csv(self, mock_config_file, article_service):
+        """未設定 result_format 的既有任務仍保存為 CSV"""
+        crawler = MockCrawlerForTest(mock_config_file, article_service)
+        crawler._save_to_csv = MagicMock()
+        data = pd.DataFrame({"title": ["Test Title"]})
+        crawler.global_params = {'csv_file_prefix': 'legacy'}
+
+        path = crawler._save_to_result_file(3, data, 'legacy')
+
+        crawler._save_to_csv.assert_called_once()
+        assert crawler._save_to_csv.call_args[0][1] == path
+        assert os.path.basename(path).startswith('legacy_3_') and path.endswith('.csv')
     
     def test_save_to_database(self, mock_config_file, article_service, initialized_db_manager):
         """測試保存數據到資料庫 (使用 initialized_db_manager)"""
@@ -574,6 +623,32 @@ class TestBaseCrawler:
         assert article_data[0]['link'] == "https://example.com/1"
         assert article_data[1]['link'] == "https://example.com/2"
     
+    def test_save_to_database_through_write_queue(self, mock_config_file, article_service):
+        """測試設定寫入佇列時，文章透過佇列寫入並記錄實際保存的文章數"""
+        crawler = MockCrawlerForTest(mock_config_file, article_service)
+        crawler.global_params = {'task_id': 7}
+        crawler.articles_df = pd.DataFrame({
+            "title": ["Test Title 1", "Test Title 2"],
+            "link": ["https://example.com/1", "https://example.com/2"],
+            "source": ["Test Source 1", "Test Source 2"],
+            "source_url": ["https://example.com/1", "https://example.com/2"],
+            "is_ai_related": [False, False],
+            "is_scraped": [False, False],
+            "scrape_status": [ArticleScrapeStatus.LINK_SAVED.value, ArticleScrapeStatus.LINK_SAVED.value],
+        })
+        write_queue = ArticleWriteQueue(article_service, batch_size=10, flush_interval=0.1)
+        crawler.article_write_queue = write_queue
+        try:
+            crawler._save_to_database()
+        finally:
+            write_queue.stop(timeout=5)
+
+        assert crawler.saved_articles_count == 2
+        assert crawler.global_params['get_links_by_task_id'] is True
+        result = article_service.find_all_articles()
+        assert len(result["articles"]) == 2
+        assert all(article.task_id == 7 for article in result["articles"])
+    
     def test_get_scrape_phase(self, mock_config_file, article_service):
         """測試獲取任務狀態"""
         crawler = MockCrawlerForTest(mock_config_file, article_service)
@@ -635,6 +710,39 @@ class TestBaseCrawler:
         # 操作應該沒有被調用，因為任務已取消
         operation_with_task_id.assert_not_called()
 
+    def test_retry_operation_backoff(self, mock_config_file, article_service):
+        """測試重試等待時間以指數增加並加入隨機抖動"""
+        crawler = MockCrawlerForTest(mock_config_file, article_service)
+        always_fail = MagicMock(side_effect=Exception("Always fail"))
+        with patch("src.crawlers.base_crawler.time.sleep") as mock_sleep:
+            with pytest.raises(Exception, match="Always fail"):
+                crawler.retry_operation(always_fail, max_retries=4, retry_delay=1.0)
+        delays = [c.args[0] for c in mock_sleep.call_args_list]
+        assert len(delays) == 3
+        for delay, base in zip(delays, [1.0, 2.0, 4.0]):
+            assert base <= delay <= base * 1.5
+
+    def test_circuit_state_in_progress(self, mock_config_file, article_service):
+        """測試主機斷路器狀態加入任務進度並通知監聽者"""
+        crawler = MockCrawlerForTest(mock_config_file, article_service)
+        task_id = 7
+        crawler.scrape_phase[task_id] = {
+            'scrape_phase': ScrapePhase.CONTENT_SCRAPING.value,
+            'progress': 40,
+            'message': '抓取內容',
+        }
+        listener = MagicMock()
+        crawler.add_progress_listener(task_id, listener)
+
+        state = {"host": "www.bnext.com.tw", "state": "open", "consecutive_failures": 5, "trips": 1, "retry_in": 30.0}
+        crawler._report_circuit_state(task_id, state)
+
+        progress = crawler.get_scrape_phase(task_id)
+        assert progress['circuit_breaker'] == state
+        assert progress['progress'] == 40
+        assert "www.bnext.com.tw" in progress['message']
+        listener.on_progress_update.assert_called_once()
+
     def test_update_scrape_phase(self, mock_config_file, article_service):
         """測試更新任務狀態功能"""
         crawler = MockCrawlerForTest(mock_config_file, article_service)
@@ -1287,6 +1395,30 @@ class TestBaseCrawler:
         assert result_df.loc[2, 'is_scraped'] == False
         assert result_df.loc[2, 'scrape_status'] == 'link_saved'
 
+    def test_update_articles_with_content_missing_hash_is_none(self, mock_config_file, article_service):
+        """原資料沒有的欄位 (content_hash)，未抓取到內容的列為 None 而非 NaN，保存時不會寫入 'nan'"""
+        crawler = MockCrawlerForTest(mock_config_file, article_service)
+        df = pd.DataFrame({
+            'title': ['Test Article 1', 'Test Article 2'],
+            'link': ['https://example.com/1', 'https://example.com/2'],
+            'is_scraped': [False, False],
+            'scrape_status': ['link_saved', 'link_saved'],
+        })
+        articles_content = [{
+            'title': 'Test Article 1',
+            'link': 'https://example.com/1',
+            'content': 'content 1',
+            'content_hash': 'a' * 64,
+            'is_scraped': True,
+            'scrape_status': 'content_scraped',
+        }]
+
+        result_df = crawler._update_articles_with_content(df, articles_content)
+
+        assert result_df.loc[0, 'content_hash'] == 'a' * 64
+        assert result_df.loc[1, 'content_hash'] is None
+        assert result_df.to_dict('records')[1]['content_hash'] is None
+
     def test_save_to_database_with_new_fields(self, mock_config_file, article_service, initialized_db_manager):
         """測試保存到數據庫包含新欄位 (使用 initialized_db_manager)"""
         crawler = MockCrawlerForTest(mock_config_file, article_service)
@@ -1544,6 +1676,136 @@ class TestBaseCrawler:
         assert crawler.scrape_phase[task_id]['scrape_phase'] == ScrapePhase.COMPLETED.value
         assert crawler.scrape_phase[task_id]['progress'] == 100
     
+    def test_execute_full_scrape_task_with_crawl_frontier(self, mock_config_file, article_service, initialized_db_manager):
+        """測試啟用待抓取連結表時，依優先度領取本來源的連結 (含先前任務遺留的連結) 並回報抓取結果"""
+        crawler = MockCrawlerForTest(mock_config_file, article_service)
+        source = crawler.site_config.name
+        frontier = CrawlFrontierService(initialized_db_manager)
+        frontier.enqueue_links([
+            {
+                'url': 'https://example.com/old',
+                'source': source,
+                'priority': 100.0,
+                'payload': {'title': 'Old Article', 'link': 'https://example.com/old'},
+            },
+            # 其他來源的連結不會被本爬蟲領取
+            {
+                'url': 'https://other.example.com/1',
+                'source': 'other',
+                'priority': 200.0,
+                'payload': {'title': 'Other Article', 'link': 'https://other.example.com/1'},
+            },
+        ])
+
+        crawler.crawl_frontier = frontier
+        task_id = 1
+        crawler.global_params = {'scrape_mode': ScrapeMode.FULL_SCRAPE}
+        crawler.scrape_phase[task_id] = {
+            'scrape_phase': ScrapePhase.LINK_COLLECTION.value,
+            'progress': 0,
+            'message': '開始執行任務',
+            'start_time': datetime.now(timezone.utc)
+        }
+        crawler.retry_operation = MagicMock(side_effect=lambda func, max_retries=None, retry_delay=None, task_id=None: func())
+        crawler._fetch_article_list = MagicMock(return_value=pd.DataFrame({
+            'title': ['Article 1', 'Article 2'],
+            'link': ['https://example.com/1', 'https://example.com/2'],
+            'source': [source, source],
+            'is_scraped': [False, False]
+        }))
+        claimed_links = []
+
+        def fetch_articles(task_id):
+            claimed_links.extend(crawler.articles_df['link'])
+            return [
+                {'link': 'https://example.com/old', 'content': 'Content', 'is_scraped': True,
+                 'scrape_status': 'content_scraped'},
+                {'link': 'https://example.com/2', 'is_scraped': False, 'scrape_status': 'failed',
+                 'scrape_error': 'HTTP 500'},
+            ]
+
+        crawler._fetch_articles = MagicMock(side_effect=fetch_articles)
+        crawler._update_articles_with_content = MagicMock(side_effect=lambda df, content: df)
+        crawler._save_results = MagicMock()
+
+        result = crawler._execute_full_scrape_task(task_id, 3, 0.1)
+
+        assert result['success'] is True
+        assert claimed_links == ['https://example.com/old', 'https://example.com/2']
+        assert crawler.articles_df['task_id'].tolist() == [task_id, task_id]
+        assert crawler.frontier_claims == {}
+        stats = frontier.get_frontier_stats()['stats']
+        assert stats == {'pending': 3, 'claimed': 0, 'done': 1, 'failed': 0}
+
+    def test_adaptive_revisit_records_category_yield(self, mock_config_file, article_service, initialized_db_manager):
+        """測試啟用 adaptive_revisit 時略過未到期的類別，並依新連結數記錄統計與更新重訪狀態"""
+        with initialized_db_manager.session_scope() as session:
+            session.add(Articles(
+                title="既有文章", link="https://example.com/old", source="test_source",
+                source_url="https://example.com", is_ai_related=False, is_scraped=True,
+            ))
+
+        crawler = MockCrawlerForTest(mock_config_file, article_service)
+        crawler.global_params = {'adaptive_revisit': True}
+        now = datetime.now(timezone.utc)
+        quiet_state = {
+            'pages': 1,
+            'interval_sec': 7200.0,
+            'last_visit_at': now.isoformat(),
+            'next_visit_at': (now + timedelta(hours=2)).isoformat(),
+        }
+        crawler.revisit_state = {'quiet': quiet_state}
+
+        assert crawler._plan_category_revisits(['ai', 'quiet'], 3) == {'ai': 3}
+        crawler._record_category_yield({
+            'ai': {
+                'requests': 3,
+                'planned_pages': 3,
+                'page_links': [
+                    ['https://example.com/new', 'https://example.com/old'],
+                    ['https://example.com/new', 'https://example.com/old'],
+                    [],
+                ],
+            },
+        }, 3)
+
+        assert crawler.category_stats['ai']['new_links'] == 1
+        assert crawler.category_stats['ai']['yield_ratio'] == round(1 / 3, 4)
+        assert crawler.category_stats['quiet'] == {
+            'skipped': True, 'requests': 0, 'next_visit_at': quiet_state['next_visit_at'],
+        }
+        assert crawler.updated_revisit_state['ai']['pages'] == 2
+        assert crawler.updated_revisit_state['quiet'] == quiet_state
+        # 任務開始時的重訪狀態不變，重試時以相同基準重新計算
+        assert crawler.revisit_state == {'quiet': quiet_state}
+
+    def test_execute_full_scrape_task_no_category_due(self, mock_config_file, article_service):
+        """測試所有類別都尚未到期重訪時任務成功結束且不抓取內容"""
+        crawler = MockCrawlerForTest(mock_config_file, article_service)
+        task_id = 1
+        crawler.global_params = {'scrape_mode': ScrapeMode.FULL_SCRAPE, 'adaptive_revisit': True}
+        crawler.scrape_phase[task_id] = {
+            'scrape_phase': ScrapePhase.LINK_COLLECTION.value,
+            'progress': 0,
+            'message': '開始執行任務',
+            'start_time': datetime.now(timezone.utc)
+        }
+        next_visit_at = (datetime.now(timezone.utc) + timedelta(hours=1)).isoformat()
+        crawler.revisit_state = {'ai': {'pages': 1, 'interval_sec': 3600.0, 'next_visit_at': next_visit_at}}
+
+        def fetch_article_list(task_id, max_retries, retry_delay):
+            assert crawler._plan_category_revisits(['ai'], 3) == {}
+            return None
+
+        crawler._fetch_article_list = MagicMock(side_effect=fetch_article_list)
+        crawler._fetch_articles = MagicMock()
+
+        result = crawler._execute_full_scrape_task(task_id, 3, 0.1)
+
+        assert result['success'] is True
+        assert result['message'] == '沒有到期需要重訪的類別'
+        crawler._fetch_articles.assert_not_called()
+
     def test_execute_content_only_task_with_article_ids(self, mock_config_file, article_service):
         """測試使用文章ID列表的內容抓取模式"""
         crawler = MockCrawlerForTest(mock_config_file, article_service)
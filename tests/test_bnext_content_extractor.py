@@ -10,6 +10,7 @@ from bs4 import BeautifulSoup
 
 from src.crawlers.bnext_content_extractor import BnextContentExtractor
 from src.crawlers.configs.site_config import SiteConfig
+from src.crawlers.html_archive import HtmlArchive
   # 使用統一的 logger
 
 logger = logging.getLogger(__name__)  # 使用統一的 logger  # 使用統一的 logger
@@ -210,6 +211,26 @@ def test_get_article_content_success(mock_is_ai_related, mock_get_article_column
     assert result['scrape_error'] is None
     assert result['last_scrape_attempt'] is not None
 
+@patch('requests.get')
+@patch('src.crawlers.bnext_utils.BnextUtils.sleep_random_time')
+def test_get_article_content_archives_raw_html(mock_sleep, mock_get, mock_config, example_html, tmp_path):
+    """設定原始 HTML 封存時，抓取成功的原始回應會寫入封存"""
+    archive = HtmlArchive(str(tmp_path / "archive"))
+    extractor = BnextContentExtractor(config=mock_config, html_archive=archive)
+    mock_response = Mock()
+    mock_response.status_code = 200
+    mock_response.text = example_html
+    mock_response.content = example_html.encode('utf-8')
+    mock_response.encoding = 'utf-8'
+    mock_get.return_value = mock_response
+    url = 'https://www.bnext.com.tw/article/82812/deepl-ai100'
+
+    extractor._get_article_content(url, ai_only=False)
+
+    archived = archive.get_latest(url)
+    assert archived['content'] == example_html.encode('utf-8')
+    assert archived['encoding'] == 'utf-8'
+
 @patch('requests.get')
 def test_get_article_content_request_failed(mock_get, extractor):
     """測試獲取文章內容請求失敗"""
@@ -272,7 +272,7 @@ class TestBnextCrawler:
         mock_extractor.batch_get_articles_content.return_value = [
             {
                 'title': '測試文章1',
-                'link': 'https://example.com/1',
+                'link': 'https://www.bnext.com.tw/article/1',
                 'is_scraped': True,
                 'scrape_status': 'content_scraped',
                 'scrape_error': None,
@@ -282,7 +282,7 @@ class TestBnextCrawler:
             },
             {
                 'title': '測試文章2',
-                'link': 'https://example.com/2',
+                'link': 'https://www.bnext.com.tw/article/2',
                 'is_scraped': True,
                 'scrape_status': 'content_scraped',
                 'scrape_error': None,
@@ -321,6 +321,47 @@ class TestBnextCrawler:
         assert crawler.articles_df.loc[1, 'scrape_status'] == "content_scraped"
         assert crawler.articles_df.loc[1, 'is_scraped'] == True
 
+    def test_fetch_articles_merges_by_link(self, mock_config_file, mock_article_service, mock_scraper, mock_extractor):
+        """測試抓取結果依 link 合併回 DataFrame，而非依列表順序"""
+        crawler = BnextCrawler(
+            config_file_name=mock_config_file,
+            article_service=mock_article_service,
+            scraper=mock_scraper,
+            extractor=mock_extractor
+        )
+        current_time = datetime.now(timezone.utc)
+        # 回傳順序與 DataFrame 相反，且包含一筆不在列表中的連結
+        mock_extractor.batch_get_articles_content.return_value = [
+            {
+                'link': 'https://www.bnext.com.tw/article/2',
+                'is_scraped': False,
+                'scrape_error': '請求失敗',
+                'last_scrape_attempt': current_time,
+            },
+            {
+                'link': 'https://www.bnext.com.tw/article/unknown',
+                'is_scraped': True,
+                'scrape_error': None,
+                'last_scrape_attempt': current_time,
+            },
+        ]
+        crawler.articles_df = mock_scraper.scrape_article_list()
+
+        crawler._fetch_articles(task_id=456)
+
+        df = crawler.articles_df
+        assert len(df) == 2
+        # 第一篇沒有抓取結果，維持原狀
+        assert df.loc[0, 'scrape_status'] == "link_saved"
+        assert df.loc[0, 'is_scraped'] == False
+        assert pd.isna(df.loc[0, 'task_id'])
+        # 第二篇依 link 更新
+        assert df.loc[1, 'scrape_status'] == "failed"
+        assert df.loc[1, 'is_scraped'] == False
+        assert df.loc[1, 'scrape_error'] == '請求失敗'
+        assert df.loc[1, 'task_id'] == 456
+        assert df['is_scraped'].dtype == bool
+
     def test_fetch_article_links_by_filter(self, mock_config_file, mock_article_service, mock_scraper, mock_extractor):
         """測試根據過濾條件從資料庫獲取文章連結"""
         crawler = BnextCrawler(
@@ -388,7 +429,8 @@ class TestBnextCrawler:
             is_scraped=False,
             task_id=456,
             page=1,
-            per_page=10
+            per_page=10,
+            column_set='status'
         )
 
     def test_fetch_article_links_by_filter_with_links(self, mock_config_file, mock_article_service, mock_scraper, mock_extractor):
@@ -3,10 +3,11 @@ import logging
 from datetime import datetime, timezone
 from unittest.mock import patch
 
+import pandas as pd
 import pytest
 from bs4 import BeautifulSoup
 
-from src.crawlers.bnext_utils import BnextUtils
+from src.crawlers.bnext_utils import ARTICLE_COLUMN_DEFAULTS, BnextUtils
 
 
 logger = logging.getLogger(__name__)  # 使用統一的 logger
@@ -203,4 +204,92 @@ class TestBnextUtils:
         assert 'task_id' in df.columns
         assert df.iloc[0]['scrape_status'] == 'content_scraped'
         assert df.iloc[1]['scrape_error'] == '連接錯誤'
-        assert df.iloc[0]['task_id'] == 789
\ No newline at end of file
+        assert df.iloc[0]['task_id'] == 789
+
+    def test_process_articles_to_dataframe_fills_defaults_and_dedups(self):
+        """測試缺少欄位會補上預設值，且重複連結只保留第一筆"""
+        articles = [
+            {'title': '文章1', 'link': 'https://example.com/a', 'extra': 'ignored'},
+            {'title': '文章1-重複', 'link': 'https://example.com/a'},
+            {'title': '文章2', 'link': 'https://example.com/b'},
+        ]
+
+        df = BnextUtils.process_articles_to_dataframe(articles)
+
+        assert list(df.columns) == list(ARTICLE_COLUMN_DEFAULTS)
+        assert len(df) == 2
+        assert list(df.index) == [0, 1]
+        assert df.loc[0, 'title'] == '文章1'
+        assert df.loc[0, 'scrape_status'] == 'pending'
+        assert df.loc[0, 'is_ai_related'] == False
+        assert 'extra' not in df.columns
+
+    def test_process_articles_to_dataframe_empty(self):
+        """測試空列表返回空 DataFrame"""
+        assert BnextUtils.process_articles_to_dataframe([]).empty
+
+    def test_merge_scrape_results_by_link(self):
+        """測試抓取結果依 link 合併，未對應的列維持不變"""
+        now = datetime.now(timezone.utc)
+        df = BnextUtils.process_articles_to_dataframe([
+            {'title': 'A', 'link': 'https://example.com/a', 'scrape_status': 'link_saved'},
+            {'title': 'B', 'link': 'https://example.com/b', 'scrape_status': 'link_saved'},
+            {'title': 'C', 'link': 'https://example.com/c', 'scrape_status': 'link_saved'},
+        ])
+        results = [
+            {'link': 'https://example.com/c', 'is_scraped': True, 'last_scrape_attempt': now},
+            {'link': 'https://example.com/a', 'is_scraped': False, 'scrape_error': '逾時'},
+        ]
+
+        merged = BnextUtils.merge_scrape_results_by_link(df, results, task_id=7)
+
+        assert merged.loc[0, 'scrape_status'] == 'failed'
+        assert merged.loc[0, 'scrape_error'] == '逾時'
+        assert merged.loc[0, 'task_id'] == 7
+        assert merged.loc[1, 'scrape_status'] == 'link_saved'
+        assert merged.loc[1, 'task_id'] is None
+        assert merged.loc[2, 'scrape_status'] == 'content_scraped'
+        assert merged.loc[2, 'is_scraped'] == True
+        assert merged.loc[2, 'last_scrape_attempt'] == now
+        assert merged['is_scraped'].dtype == bool
+
+    def test_merge_scrape_results_by_link_no_results(self):
+        """測試沒有抓取結果時不修改 DataFrame"""
+        df = BnextUtils.process_articles_to_dataframe([{'link': 'https://example.com/a'}])
+        merged = BnextUtils.merge_scrape_results_by_link(df, [], task_id=1)
+        assert merged.loc[0, 'scrape_status'] == 'pending'
+
+    def test_merge_scrape_results_by_link_ignores_missing_links(self):
+        """測試缺少 link 的抓取結果不會更新 link 為空值的文章列"""
+        df = BnextUtils.process_articles_to_dataframe([
+            {'title': 'A', 'link': 'https://example.com/a', 'scrape_status': 'link_saved'},
+            {'title': 'B', 'link': None, 'scrape_status': 'link_saved'},
+        ])
+        results = [{'link': None, 'is_scraped': True, 'scrape_error': None}]
+
+        merged = BnextUtils.merge_scrape_results_by_link(df, results, task_id=3)
+
+        assert list(merged['scrape_status']) == ['link_saved', 'link_saved']
+        assert merged['task_id'].isna().all()
+        assert not merged['is_scraped'].any()
+
+    def test_process_and_merge_10k_articles(self):
+        """測試 10k 篇文章的建表與依 link 合併結果正確 (效能量測見 debug/benchmark_bnext_records.py)"""
+        num_articles = 10_000
+        now = datetime.now(timezone.utc)
+        articles = [
+            {'title': f'文章{i}', 'link': f'https://example.com/{i}', 'category': 'AI'}
+            for i in range(num_articles)
+        ]
+        results = [
+            {'link': f'https://example.com/{i}', 'is_scraped': i % 2 == 0,
+             'scrape_error': None, 'last_scrape_attempt': now}
+            for i in reversed(range(num_articles))
+        ]
+
+        df = BnextUtils.process_articles_to_dataframe(articles)
+        df = BnextUtils.merge_scrape_results_by_link(df, results, task_id=1)
+
+        assert len(df) == num_articles
+        assert int(df['is_scraped'].sum()) == num_articles // 2
+        assert (df['task_id'] == 1).all()
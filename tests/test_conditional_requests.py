@@ -0,0 +1,139 @@
+"""測試 API 的 HTTP 條件請求 (ETag / Last-Modified / 304) 與資料版本查詢。"""
+
+# flake8: noqa: F811
+# pylint: disable=redefined-outer-name
+
+# Standard library imports
+import logging
+from unittest.mock import patch
+
+# Third party imports
+import pytest
+from flask import Flask
+
+# Local application imports
+from src.models.articles_model import ArticleScrapeStatus
+from src.models.base_model import Base
+from src.services.article_service import ArticleService
+from src.web.routes.article_api import article_bp
+
+logger = logging.getLogger(__name__)  # 使用統一的 logger
+
+
+@pytest.fixture(scope="function")
+def initialized_db_manager(db_manager_for_test):
+    """建立資料表後提供資料庫管理器"""
+    db_manager_for_test.create_tables(Base)
+    yield db_manager_for_test
+
+
+@pytest.fixture(scope="function")
+def article_service(initialized_db_manager):
+    return ArticleService(initialized_db_manager)
+
+
+@pytest.fixture(scope="function")
+def client(article_service):
+    """使用真實 ArticleService 的文章 API 測試客戶端"""
+    app = Flask(__name__)
+    app.register_blueprint(article_bp)
+    with patch(
+        "src.web.routes.article_api.get_article_service", return_value=article_service
+    ):
+        yield app.test_client()
+
+
+def _create_article(service: ArticleService, index: int):
+    result = service.create_article(
+        {
+            "title": f"條件請求測試文章{index}",
+            "link": f"https://example.com/etag/{index}",
+            "source": "測試來源",
+            "source_url": f"https://example.com/etag/{index}",
+            "is_ai_related": False,
+            "is_scraped": False,
+            "scrape_status": ArticleScrapeStatus.LINK_SAVED,
+        }
+    )
+    assert result["success"] is True
+    return result["article"].id
+
+
+class TestDataVersion:
+    """服務的資料版本"""
+
+    def test_version_changes_on_write(self, article_service):
+        """新增、更新與刪除都會改變版本"""
+        versions = [article_service.get_data_version("Article")["version"]]
+        article_id = _create_article(article_service, 1)
+        versions.append(article_service.get_data_version("Article")["version"])
+        article_service.update_article(article_id, {"title": "已修改的標題"})
+        versions.append(article_service.get_data_version("Article")["version"])
+        _create_article(article_service, 2)
+        article_service.delete_article(article_id)
+        versions.append(article_service.get_data_version("Article")["version"])
+        assert len(set(versions)) == len(versions)
+
+    def test_last_modified_only_when_reliable(self, article_service):
+        """文章表提供 Last-Modified，一般資料表不提供"""
+        _create_article(article_service, 3)
+        assert article_service.get_data_version("Article")["last_modified"] is not None
+        result = article_service.get_data_version("Article", "ArticleStats")
+        assert result["success"] is True
+        assert result["last_modified"] is None
+
+
+class TestConditionalResponses:
+    """條件請求與 304 回應"""
+
+    def test_if_none_match_returns_304_without_query(self, client, article_service):
+        """ETag 相符時返回 304 且不查詢文章列表"""
+        _create_article(article_service, 4)
+        first = client.get("/api/articles?page=1&per_page=10")
+        assert first.status_code == 200
+        etag = first.headers["ETag"]
+        assert first.headers["Cache-Control"] == "no-cache"
+        assert "Last-Modified" in first.headers
+
+        with patch.object(
+            article_service,
+            "find_articles_paginated",
+            wraps=article_service.find_articles_paginated,
+        ) as spy:
+            second = client.get(
+                "/api/articles?page=1&per_page=10", headers={"If-None-Match": etag}
+            )
+            assert second.status_code == 304
+            assert second.data == b""
+            assert second.headers["ETag"] == etag
+            spy.assert_not_called()
+
+    def test_write_changes_etag(self, client, article_service):
+        """資料變更後舊的 ETag 不再相符"""
+        etag = client.get("/api/articles").headers["ETag"]
+        _create_article(article_service, 5)
+        response = client.get("/api/articles", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+        assert response.get_json()["data"]["total"] == 1
+
+    def test_etag_depends_on_query(self, client):
+        """不同查詢參數的回應有不同的 ETag"""
+        first = client.get("/api/articles?page=1").headers["ETag"]
+        second = client.get("/api/articles?page=2").headers["ETag"]
+        assert first != second
+
+    def test_if_modified_since(self, client, article_service):
+        """沒有 If-None-Match 時依 If-Modified-Since 判斷"""
+        article_id = _create_article(article_service, 6)
+        last_modified = client.get(f"/api/articles/{article_id}").headers["Last-Modified"]
+        response = client.get(
+            f"/api/articles/{article_id}", headers={"If-Modified-Since": last_modified}
+        )
+        assert response.status_code == 304
+
+    def test_error_responses_not_tagged(self, client):
+        """非 200 回應不加上 ETag"""
+        response = client.get("/api/articles/999999")
+        assert response.status_code == 404
+        assert "ETag" not in response.headers
@@ -0,0 +1,154 @@
+"""測試文章內容雜湊的計算，以及重新抓取時跳過內容未變更文章的寫入。"""
+
+# Standard library imports
+import logging
+from datetime import datetime, timezone
+
+# Third party imports
+import pytest
+
+# Local application imports
+from src.models.base_model import Base
+from src.services.article_service import ArticleService
+from src.utils.content_hash_utils import CONTENT_HASH_LENGTH, compute_content_hash
+from src.utils.enum_utils import ArticleScrapeStatus
+
+# flake8: noqa: F811
+# pylint: disable=redefined-outer-name
+
+logger = logging.getLogger(__name__)  # 使用統一的 logger
+
+
+def _extracted(link, content, **kwargs):
+    data = {
+        "title": "測試文章",
+        "link": link,
+        "content": content,
+        "summary": "摘要",
+        "category": "AI",
+        "source": "測試來源",
+        "source_url": "https://example.com",
+        "is_ai_related": True,
+        "is_scraped": True,
+        "scrape_status": ArticleScrapeStatus.CONTENT_SCRAPED.value,
+    }
+    data.update(kwargs)
+    data["content_hash"] = compute_content_hash(data)
+    return data
+
+
+@pytest.fixture
+def article_service(db_manager_for_test):
+    db_manager_for_test.create_tables(Base)
+    return ArticleService(db_manager_for_test)
+
+
+class TestComputeContentHash:
+    """內容雜湊計算測試"""
+
+    def test_same_extraction_same_hash(self):
+        """相同擷取結果 (僅頭尾空白不同) 的雜湊相同，且為 64 字元"""
+        first = compute_content_hash({"title": "標題", "content": "內容"})
+        second = compute_content_hash({"title": " 標題 ", "content": "內容\n"})
+        assert first == second
+        assert len(first) == CONTENT_HASH_LENGTH
+
+    def test_any_extracted_field_changes_hash(self):
+        """內容以外的擷取欄位變更時雜湊也不同"""
+        base = {"title": "標題", "content": "內容", "tags": "AI"}
+        assert compute_content_hash(base) != compute_content_hash({**base, "tags": "AI,ML"})
+        assert compute_content_hash(base) != compute_content_hash({**base, "content": "新內容"})
+
+    def test_empty_content_has_no_hash(self):
+        """沒有內容時不計算雜湊"""
+        assert compute_content_hash({"title": "標題", "content": ""}) is None
+        assert compute_content_hash({"title": "標題", "content": float("nan")}) is None
+
+
+class TestUnchangedArticles:
+    """重新抓取內容未變更的文章測試"""
+
+    def test_update_by_link_skips_unchanged(self, article_service):
+        """依連結更新時，雜湊相同的文章不寫入，updated_at 不變"""
+        article_service.batch_create_articles(
+            [_extracted("https://example.com/1", "內容一"), _extracted("https://example.com/2", "內容二")]
+        )
+        before = article_service.get_article_by_link("https://example.com/1")["article"]
+
+        result = article_service.batch_update_articles_by_link(
+            [_extracted("https://example.com/1", "內容一"), _extracted("https://example.com/2", "內容二（更新）")]
+        )
+
+        assert result["success"] is True
+        assert result["resultMsg"]["success_count"] == 2
+        assert result["resultMsg"]["unchanged_count"] == 1
+        assert result["resultMsg"]["unchanged_links"] == ["https://example.com/1"]
+        after = article_service.get_article_by_link("https://example.com/1")["article"]
+        assert after.updated_at == before.updated_at
+        changed = article_service.get_article_by_link("https://example.com/2")["article"]
+        assert changed.content == "內容二（更新）"
+        assert changed.content_hash == compute_content_hash(_extracted("https://example.com/2", "內容二（更新）"))
+
+    def test_batch_create_counts_unchanged_updates(self, article_service):
+        """既有文章重新保存時，內容未變更的文章計入 update_count 與 unchanged_count"""
+        article_service.batch_create_articles([_extracted("https://example.com/a", "內容")])
+        result = article_service.batch_create_articles(
+            [_extracted("https://example.com/a", "內容"), _extracted("https://example.com/b", "另一篇")]
+        )
+        assert result["success"] is True
+        assert result["resultMsg"]["success_count"] == 1
+        assert result["resultMsg"]["update_count"] == 1
+        assert result["resultMsg"]["unchanged_count"] == 1
+        assert "內容未變更 1 筆" in result["message"]
+
+    def test_unchanged_articles_update_scrape_metadata(self, article_service):
+        """內容未變更時不寫入內容，但仍更新 task_id 與 last_scrape_attempt"""
+        first_attempt = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        second_attempt = datetime(2026, 1, 2, tzinfo=timezone.utc)
+        article_service.batch_create_articles(
+            [
+                _extracted("https://example.com/m1", "內容", task_id=1, last_scrape_attempt=first_attempt),
+                _extracted("https://example.com/m2", "內容二", task_id=1, last_scrape_attempt=first_attempt),
+            ]
+        )
+
+        result = article_service.batch_update_articles_by_link(
+            [_extracted("https://example.com/m1", "內容", task_id=2, last_scrape_attempt=second_attempt)]
+        )
+        assert result["resultMsg"]["unchanged_count"] == 1
+        article = article_service.get_article_by_link("https://example.com/m1")["article"]
+        assert article.task_id == 2
+        assert article.last_scrape_attempt == second_attempt
+
+        # 未提供 (NaN) 的欄位保留原值
+        result = article_service.batch_create_articles(
+            [_extracted("https://example.com/m2", "內容二", task_id=3, last_scrape_attempt=float("nan"))]
+        )
+        assert result["resultMsg"]["unchanged_count"] == 1
+        article = article_service.get_article_by_link("https://example.com/m2")["article"]
+        assert article.task_id == 3
+        assert article.last_scrape_attempt == first_attempt
+
+    def test_content_write_without_hash_clears_stale_hash(self, article_service):
+        """未提供雜湊的內容更新 (例如手動編輯) 會清除舊雜湊，下次抓取必定寫入"""
+        article_service.batch_create_articles([_extracted("https://example.com/x", "原始內容")])
+        article_service.batch_update_articles_by_link(
+            [{"link": "https://example.com/x", "content": "手動修改的內容"}]
+        )
+        article = article_service.get_article_by_link("https://example.com/x")["article"]
+        assert article.content_hash is None
+
+        result = article_service.batch_update_articles_by_link([_extracted("https://example.com/x", "原始內容")])
+        assert result["resultMsg"]["unchanged_count"] == 0
+        article = article_service.get_article_by_link("https://example.com/x")["article"]
+        assert article.content == "原始內容"
+
+    def test_status_update_keeps_hash(self, article_service):
+        """不含內容的更新不會清除既有雜湊"""
+        data = _extracted("https://example.com/y", "內容")
+        article_service.batch_create_articles([data])
+        article_service.batch_update_articles_by_link(
+            [{"link": "https://example.com/y", "is_ai_related": False, "content_hash": None}]
+        )
+        article = article_service.get_article_by_link("https://example.com/y")["article"]
+        assert article.content_hash == data["content_hash"]
@@ -0,0 +1,213 @@
+"""測試 CrawlFrontierRepository 與 CrawlFrontierService 的功能。
+
+此模組包含待抓取連結的測試案例，包括：
+- 加入連結 (標準化、去除重複、提高優先度)
+- 依優先度與主機分散領取 (含多執行緒同時領取不重複)
+- 完成、失敗重試與放回
+- 逾時領取回收
+"""
+
+# Standard library imports
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+
+# Third party imports
+import pytest
+
+# Local application imports
+from src.models.base_model import Base
+from src.models.crawl_frontier_model import CrawlFrontier
+from src.database.crawl_frontier_repository import CrawlFrontierRepository
+from src.services.crawl_frontier_service import CrawlFrontierService
+from src.utils.enum_utils import CrawlFrontierStatus
+
+# flake8: noqa: F811
+# pylint: disable=redefined-outer-name
+
+logger = logging.getLogger(__name__)  # 使用統一的 logger
+
+
+@pytest.fixture(scope="function")
+def initialized_db_manager(db_manager_for_test):
+    """建立資料表後提供資料庫管理器"""
+    db_manager_for_test.create_tables(Base)
+    yield db_manager_for_test
+
+
+@pytest.fixture(scope="function")
+def frontier_service(initialized_db_manager, monkeypatch):
+    """提供待抓取連結服務 (失敗後立即可重試)"""
+    monkeypatch.setenv("CRAWL_FRONTIER_RETRY_DELAY_SEC", "0.001")
+    monkeypatch.setenv("CRAWL_FRONTIER_MAX_ATTEMPTS", "2")
+    return CrawlFrontierService(initialized_db_manager)
+
+
+def _link(url, priority=0.0, **kwargs):
+    return {"url": url, "priority": priority, "payload": {"link": url}, **kwargs}
+
+
+class TestCrawlFrontierRepository:
+    """CrawlFrontierRepository 測試"""
+
+    def test_enqueue_canonicalizes_and_dedupes(self, initialized_db_manager):
+        """url 標準化後去除重複，保留較高優先度並記錄主機"""
+        with initialized_db_manager.session_scope() as session:
+            repo = CrawlFrontierRepository(session, CrawlFrontier)
+            counts = repo.enqueue_links(
+                [
+                    _link("http://Example.com/a/?utm_source=rss", priority=1.0),
+                    _link("https://example.com/a", priority=3.0),
+                    _link("not a url"),
+                ]
+            )
+            assert counts == {"inserted": 1, "updated": 0, "skipped": 2}
+            entry = repo.find_by_urls(["https://example.com/a"])["https://example.com/a"]
+            assert entry.host == "example.com"
+            assert entry.priority == 3.0
+            assert entry.status == CrawlFrontierStatus.PENDING
+            assert entry.attempts == 0
+
+    def test_rediscovery_raises_pending_priority_only(self, initialized_db_manager):
+        """重複發現時提高等待中連結的優先度，已完成的連結不變更"""
+        with initialized_db_manager.session_scope() as session:
+            repo = CrawlFrontierRepository(session, CrawlFrontier)
+            repo.enqueue_links([_link("https://example.com/1", 1.0), _link("https://example.com/2", 1.0)])
+            done = repo.claim_batch("worker", limit=1)
+            repo.mark_done([done[0].id], "worker")
+
+        with initialized_db_manager.session_scope() as session:
+            repo = CrawlFrontierRepository(session, CrawlFrontier)
+            counts = repo.enqueue_links(
+                [_link("https://example.com/1", 5.0), _link("https://example.com/2", 5.0)]
+            )
+            assert counts == {"inserted": 0, "updated": 1, "skipped": 1}
+            assert repo.count_by_status()["done"] == 1
+
+    def test_claim_orders_by_priority_then_freshness(self, initialized_db_manager):
+        """優先度高者先領取，相同優先度時較新加入者優先"""
+        with initialized_db_manager.session_scope() as session:
+            repo = CrawlFrontierRepository(session, CrawlFrontier)
+            repo.enqueue_links([_link("https://a.com/old", 1.0)])
+            repo.enqueue_links([_link("https://a.com/new", 1.0), _link("https://a.com/top", 9.0)])
+            claimed = repo.claim_batch("worker", limit=3)
+            assert [entry.url for entry in claimed] == [
+                "https://a.com/top",
+                "https://a.com/new",
+                "https://a.com/old",
+            ]
+            assert all(entry.status == CrawlFrontierStatus.CLAIMED for entry in claimed)
+            assert all(entry.attempts == 1 for entry in claimed)
+
+    def test_claim_spreads_hosts(self, initialized_db_manager):
+        """每個主機的領取數量受限，並輪流排列不同主機"""
+        links = [_link(f"https://busy.com/{i}", 10.0 - i) for i in range(5)]
+        links += [_link("https://quiet.com/1", 0.5), _link("https://other.com/1", 0.1)]
+        with initialized_db_manager.session_scope() as session:
+            repo = CrawlFrontierRepository(session, CrawlFrontier)
+            repo.enqueue_links(links)
+            claimed = repo.claim_batch("worker", limit=5, per_host_limit=2)
+            assert [entry.host for entry in claimed] == [
+                "busy.com",
+                "quiet.com",
+                "other.com",
+                "busy.com",
+            ]
+            assert repo.count_by_status()["pending"] == 3
+
+    def test_select_host_batch(self):
+        """候選依主機輪流挑選並在達到數量時停止"""
+        candidates = [(1, "a"), (2, "a"), (3, "b"), (4, "a"), (5, "c")]
+        assert CrawlFrontierRepository.select_host_batch(candidates, 10) == [1, 3, 5, 2, 4]
+        assert CrawlFrontierRepository.select_host_batch(candidates, 10, per_host_limit=1) == [1, 3, 5]
+        assert CrawlFrontierRepository.select_host_batch(candidates, 2) == [1, 3]
+
+    def test_requeue_stale(self, initialized_db_manager):
+        """領取逾時的連結重新放回等待中，已達最大嘗試次數者標記失敗"""
+        with initialized_db_manager.session_scope() as session:
+            repo = CrawlFrontierRepository(session, CrawlFrontier)
+            repo.enqueue_links([_link("https://example.com/x"), _link("https://example.com/y")])
+            claimed = repo.claim_batch("dead-worker", limit=2)
+            claimed[1].attempts = 3
+            past = datetime.now(timezone.utc) - timedelta(hours=1)
+            for entry in claimed:
+                entry.claimed_at = past
+            requeued_url = claimed[0].url
+
+        with initialized_db_manager.session_scope() as session:
+            repo = CrawlFrontierRepository(session, CrawlFrontier)
+            assert repo.requeue_stale(stale_after_seconds=60, max_attempts=3) == {
+                "requeued": 1,
+                "failed": 1,
+            }
+            resumed = repo.claim_batch("new-worker", limit=5)
+            assert [entry.url for entry in resumed] == [requeued_url]
+
+
+class TestCrawlFrontierService:
+    """CrawlFrontierService 測試"""
+
+    def test_complete_claims(self, frontier_service):
+        """完成、失敗重試與放回：放回不計入嘗試次數，達最大嘗試次數後標記失敗"""
+        frontier_service.enqueue_links(
+            [_link("https://example.com/done"), _link("https://example.com/fail"), _link("https://example.com/back")]
+        )
+        entries = frontier_service.claim_batch("w", limit=3)["entries"]
+        ids = {entry["url"].rsplit("/", 1)[-1]: entry["id"] for entry in entries}
+
+        result = frontier_service.complete_claims(
+            "w",
+            done_ids=[ids["done"]],
+            failed={ids["fail"]: "HTTP 500"},
+            released_ids=[ids["back"]],
+        )
+        assert result["success"] is True
+        assert (result["done"], result["retry"], result["failed"], result["released"]) == (1, 1, 0, 1)
+
+        retried = frontier_service.claim_batch("w", limit=3)["entries"]
+        attempts = {entry["url"].rsplit("/", 1)[-1]: entry["attempts"] for entry in retried}
+        assert attempts == {"fail": 2, "back": 1}
+
+        frontier_service.complete_claims("w", failed={ids["fail"]: "HTTP 500"}, released_ids=[ids["back"]])
+        stats = frontier_service.get_frontier_stats()["stats"]
+        assert stats == {"pending": 1, "claimed": 0, "done": 1, "failed": 1}
+
+    def test_claim_by_source(self, frontier_service):
+        """指定來源時只領取該來源的連結，且未指定 per_host_limit 時不限制每個主機的數量"""
+        frontier_service.enqueue_links(
+            [_link(f"https://site.com/{i}", float(i), source="site") for i in range(12)]
+            + [_link(f"https://other.com/{i}", 100.0, source="other") for i in range(3)]
+        )
+        entries = frontier_service.claim_batch("w", limit=20, source="site")["entries"]
+        assert len(entries) == 12
+        assert {entry["source"] for entry in entries} == {"site"}
+
+        # 不限來源時套用預設的每個主機上限
+        frontier_service.per_host_limit = 2
+        entries = frontier_service.claim_batch("w", limit=20)["entries"]
+        assert [entry["source"] for entry in entries] == ["other", "other"]
+
+    def test_concurrent_claims_are_unique(self, frontier_service):
+        """多個執行緒同時領取時，每個連結只會被領取一次"""
+        frontier_service.enqueue_links(
+            [_link(f"https://host{i % 3}.com/{i}", float(i)) for i in range(30)]
+        )
+        claimed = []
+        lock = threading.Lock()
+
+        def worker(name):
+            while True:
+                entries = frontier_service.claim_batch(name, limit=4, per_host_limit=2)["entries"]
+                if not entries:
+                    return
+                with lock:
+                    claimed.extend(entry["id"] for entry in entries)
+
+        threads = [threading.Thread(target=worker, args=(f"w{i}",)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(claimed) == 30
+        assert len(set(claimed)) == 30
@@ -118,6 +118,7 @@ class TestCrawlerTaskHistoryModel:
             "success",
             "message",
             "articles_count",
+            "category_stats",
             "duration",
             "task_status",
         }
@@ -10,6 +10,7 @@
 """
 
 # Standard library imports
+import json
 import logging
 from datetime import datetime, timezone, timedelta
 from typing import Dict, Any, List
@@ -18,6 +19,7 @@ from unittest.mock import call
 # Third party imports
 import pytest
 from croniter import croniter
+from sqlalchemy import event
 
 
 # Local application imports
@@ -1059,3 +1061,83 @@ class TestCrawlerTaskService:
         data_no_match = result_no_match["data"]
         assert data_no_match["total"] == 0
         assert len(data_no_match["items"]) == 0
+
+
+class TestTaskListLatestRun:
+    """任務列表的最新執行摘要測試"""
+
+    @staticmethod
+    def _add_histories(db_manager, task_id: int, count: int, start_index: int = 0):
+        base_time = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        with db_manager.session_scope() as session:
+            for index in range(start_index, start_index + count):
+                session.add(
+                    CrawlerTaskHistory(
+                        task_id=task_id,
+                        start_time=base_time + timedelta(hours=index),
+                        end_time=base_time + timedelta(hours=index, minutes=5),
+                        success=index % 2 == 0,
+                        articles_count=index,
+                        message=f"執行 {index:04d}",
+                        task_status=TaskStatus.COMPLETED,
+                        created_at=base_time + timedelta(hours=index),
+                    )
+                )
+
+    @staticmethod
+    def _list_with_query_count(db_manager, service):
+        statements = []
+
+        def count_statement(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("SELECT"):
+                statements.append(statement)
+
+        event.listen(db_manager.engine, "before_cursor_execute", count_statement)
+        try:
+            result = service.find_all_tasks(include_latest_run=True)
+        finally:
+            event.remove(db_manager.engine, "before_cursor_execute", count_statement)
+        return result, len(statements)
+
+    def test_latest_run_summary(
+        self, crawler_task_service, sample_tasks, initialized_db_manager
+    ):
+        """每個任務只返回最新一次執行的摘要與執行次數"""
+        task_id = sample_tasks[0]["id"]
+        self._add_histories(initialized_db_manager, task_id, 3)
+
+        result = crawler_task_service.find_all_tasks(include_latest_run=True)
+        assert result["success"] is True
+        latest = result["latest_runs"][task_id]
+        assert latest["message"] == "執行 0002"
+        assert latest["articles_count"] == 2
+        assert latest["run_count"] == 3
+        assert latest["duration"] == 300
+        assert latest["task_status"] == TaskStatus.COMPLETED.value
+        # 沒有執行記錄的任務不會出現在摘要中
+        assert sample_tasks[1]["id"] not in result["latest_runs"]
+
+    def test_query_count_and_payload_constant_as_history_grows(
+        self, crawler_task_service, sample_tasks, initialized_db_manager
+    ):
+        """歷史記錄增加時，任務列表的查詢次數與返回資料量保持不變"""
+        task_id = sample_tasks[0]["id"]
+        self._add_histories(initialized_db_manager, task_id, 2)
+        small_result, small_queries = self._list_with_query_count(
+            initialized_db_manager, crawler_task_service
+        )
+
+        self._add_histories(initialized_db_manager, task_id, 200, start_index=1000)
+        large_result, large_queries = self._list_with_query_count(
+            initialized_db_manager, crawler_task_service
+        )
+
+        assert large_queries == small_queries
+
+        def payload_size(result):
+            tasks = [task.model_dump(mode="json") for task in result["tasks"]]
+            return len(json.dumps({"tasks": tasks, "latest_runs": result["latest_runs"]}))
+
+        # 只有 run_count 的位數與最新一筆的內容不同，資料量不隨歷史數量線性增長
+        assert abs(payload_size(large_result) - payload_size(small_result)) < 50
+        assert large_result["latest_runs"][task_id]["run_count"] == 202
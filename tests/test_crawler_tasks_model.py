@@ -170,6 +170,8 @@ class TestCrawlerTasksModel:
             "last_run_success",
             "last_run_message",
             "cron_expression",
+            "next_run_at",
+            "revisit_state",
             "scrape_phase",
             "task_status",
             "retry_count",
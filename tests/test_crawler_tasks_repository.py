@@ -24,6 +24,7 @@ from src.models.crawler_tasks_model import (
     ScrapePhase,
     TaskStatus,
 )
+from src.models.crawler_task_history_model import CrawlerTaskHistory
 from src.models.crawlers_model import Crawlers
   # 使用統一的 logger
 from src.utils.transform_utils import convert_to_dict
@@ -1823,6 +1824,167 @@ class TestSpecialCases:
             assert len(due_tasks) == 0
 
 
+class TestNextRunAt:
+    """測試預先計算的 next_run_at 與以其為基礎的待執行任務查詢"""
+
+    def test_next_run_at_computed_on_create(
+        self,
+        crawler_tasks_repo: CrawlerTasksRepository,
+        sample_crawler_data: Dict[str, Any],
+    ):
+        """新增任務時計算 next_run_at：從未執行的任務立即到期，無 cron 則為 None"""
+        crawler_id = sample_crawler_data["id"]
+        last_run = datetime(2026, 1, 1, 10, 30, tzinfo=timezone.utc)
+        never_run = crawler_tasks_repo.create(
+            {
+                "task_name": "從未執行",
+                "crawler_id": crawler_id,
+                "is_auto": True,
+                "cron_expression": "0 * * * *",
+                "task_args": TASK_ARGS_DEFAULT,
+                "scrape_phase": ScrapePhase.INIT,
+            }
+        )
+        has_run = crawler_tasks_repo.create(
+            {
+                "task_name": "已執行",
+                "crawler_id": crawler_id,
+                "is_auto": True,
+                "cron_expression": "0 * * * *",
+                "last_run_at": last_run,
+                "task_args": TASK_ARGS_DEFAULT,
+                "scrape_phase": ScrapePhase.INIT,
+            }
+        )
+        manual = crawler_tasks_repo.create(
+            {
+                "task_name": "手動",
+                "crawler_id": crawler_id,
+                "is_auto": False,
+                "task_args": TASK_ARGS_DEFAULT,
+                "scrape_phase": ScrapePhase.INIT,
+            }
+        )
+        crawler_tasks_repo.session.flush()
+
+        assert never_run.next_run_at <= datetime.now(timezone.utc)
+        assert has_run.next_run_at == datetime(2026, 1, 1, 11, 0, tzinfo=timezone.utc)
+        assert manual.next_run_at is None
+
+    def test_next_run_at_recomputed_on_changes(
+        self,
+        crawler_tasks_repo: CrawlerTasksRepository,
+        sample_crawler_data: Dict[str, Any],
+    ):
+        """變更 cron 表達式與每次執行後重新計算 next_run_at"""
+        task = crawler_tasks_repo.create(
+            {
+                "task_name": "重新計算",
+                "crawler_id": sample_crawler_data["id"],
+                "is_auto": True,
+                "cron_expression": "0 * * * *",
+                "last_run_at": datetime(2026, 1, 1, 10, 30, tzinfo=timezone.utc),
+                "task_args": TASK_ARGS_DEFAULT,
+                "scrape_phase": ScrapePhase.INIT,
+            }
+        )
+        crawler_tasks_repo.session.flush()
+
+        crawler_tasks_repo.update(task.id, {"cron_expression": "0 0 * * *"})
+        crawler_tasks_repo.session.flush()
+        assert task.next_run_at == datetime(2026, 1, 2, 0, 0, tzinfo=timezone.utc)
+
+        crawler_tasks_repo.update_last_run(task.id, True)
+        crawler_tasks_repo.session.flush()
+        assert task.next_run_at > datetime.now(timezone.utc)
+        assert task.next_run_at.hour == 0 and task.next_run_at.minute == 0
+
+    def test_find_due_tasks_uses_next_run_at(
+        self,
+        crawler_tasks_repo: CrawlerTasksRepository,
+        sample_crawler_data: Dict[str, Any],
+    ):
+        """不指定 cron 表達式時查詢所有到期的自動任務，依 next_run_at 排序"""
+        crawler_id = sample_crawler_data["id"]
+        base = datetime(2026, 1, 1, 10, 30, tzinfo=timezone.utc)
+        specs = [
+            ("每小時", "0 * * * *", True, True),
+            ("每日", "0 0 * * *", True, True),
+            ("停用", "0 * * * *", True, False),
+            ("手動", "0 * * * *", False, True),
+        ]
+        ids = {}
+        for name, cron, is_auto, is_active in specs:
+            task = crawler_tasks_repo.create(
+                {
+                    "task_name": name,
+                    "crawler_id": crawler_id,
+                    "is_auto": is_auto,
+                    "is_active": is_active,
+                    "cron_expression": cron,
+                    "last_run_at": base,
+                    "task_args": TASK_ARGS_DEFAULT,
+                    "scrape_phase": ScrapePhase.INIT,
+                "scrape_phase": ScrapePhase.INIT,
+                }
+            )
+            crawler_tasks_repo.session.flush()
+            ids[name] = task.id
+
+        # 11:00 後只有每小時任務到期
+        due = crawler_tasks_repo.find_due_tasks(
+            now=datetime(2026, 1, 1, 11, 5, tzinfo=timezone.utc)
+        )
+        assert [t.id for t in due] == [ids["每小時"]]
+
+        # 隔日 00:00 後兩個啟用的自動任務都到期，較早到期者在前
+        due = crawler_tasks_repo.find_due_tasks(
+            now=datetime(2026, 1, 2, 0, 5, tzinfo=timezone.utc)
+        )
+        assert [t.id for t in due] == [ids["每小時"], ids["每日"]]
+
+        due = crawler_tasks_repo.find_due_tasks(
+            "0 0 * * *",
+            now=datetime(2026, 1, 2, 0, 5, tzinfo=timezone.utc),
+            is_preview=True,
+            preview_fields=["id", "task_name"],
+        )
+        assert due == [{"id": ids["每日"], "task_name": "每日"}]
+
+
+class TestTaskHistoryLoading:
+    """任務執行歷史的載入策略測試"""
+
+    def test_history_not_loaded_by_default(
+        self, initialized_db_manager, sample_crawler_data: Dict[str, Any]
+    ):
+        """一般任務查詢不載入歷史，需要時以 get_task_with_history 明確載入"""
+        with initialized_db_manager.session_scope() as session:
+            task = CrawlerTasks(
+                task_name="歷史載入任務",
+                module_name="test_module",
+                crawler_id=sample_crawler_data["id"],
+                scrape_phase=ScrapePhase.INIT,
+            )
+            session.add(task)
+            session.flush()
+            for index in range(3):
+                session.add(
+                    CrawlerTaskHistory(task_id=task.id, message=f"執行 {index}")
+                )
+            task_id = task.id
+
+        with initialized_db_manager.session_scope() as session:
+            repo = CrawlerTasksRepository(session, CrawlerTasks)
+            task = repo.get_by_id(task_id)
+            assert task.history == []
+
+        with initialized_db_manager.session_scope() as session:
+            repo = CrawlerTasksRepository(session, CrawlerTasks)
+            task = repo.get_task_with_history(task_id)
+            assert len(task.history) == 3
+
+
 class TestCrawlerTasksRepositoryValidation:
     """CrawlerTasksRepository 驗證相關的測試類"""
 
@@ -0,0 +1,265 @@
+"""測試抓取網頁的重試策略 (指數退避、Retry-After) 與主機斷路器。"""
+
+# Standard library imports
+import logging
+import random
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Third party imports
+import pytest
+import requests
+
+# Local application imports
+from src.crawlers.fetch_policy import (
+    CIRCUIT_CLOSED,
+    CIRCUIT_HALF_OPEN,
+    CIRCUIT_OPEN,
+    CircuitBreaker,
+    CircuitBreakerRegistry,
+    CircuitOpenError,
+    RetryPolicy,
+    compute_backoff_delay,
+    parse_retry_after,
+)
+from src.crawlers.http_cache import CachingHttpClient
+
+# flake8: noqa: F811
+# pylint: disable=redefined-outer-name
+
+logger = logging.getLogger(__name__)  # 使用統一的 logger
+
+
+class FakeClock:
+    """以 sleep 推進時間的假時鐘"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class SequenceHandler(BaseHTTPRequestHandler):
+    """依序返回預先設定的狀態碼，用完後返回 200"""
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        server = self.server
+        server.request_count += 1
+        status, headers = server.responses.pop(0) if server.responses else (200, {})
+        body = b"ok" if status == 200 else b"error"
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    """在本機隨機埠啟動 stub 伺服器"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SequenceHandler)
+    server.responses = []
+    server.request_count = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.url = f"http://127.0.0.1:{server.server_address[1]}/page"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def _client(clock, max_retries=2, failure_threshold=3, **kwargs):
+    return CachingHttpClient(
+        retry_policy=RetryPolicy(max_retries=max_retries, base_delay=1.0, rng=random.Random(0)),
+        breakers=CircuitBreakerRegistry(failure_threshold=failure_threshold, recovery_timeout=30.0, clock=clock),
+        sleep=clock.sleep,
+        **kwargs,
+    )
+
+
+def _closed_port_url():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}/page"
+
+
+class TestRetryPolicy:
+    """退避時間與 Retry-After 解析測試"""
+
+    def test_backoff_grows_exponentially_with_jitter(self):
+        """每次重試的等待時間加倍，並在基本值到 1.5 倍之間隨機"""
+        rng = random.Random(1)
+        for attempt, base in [(1, 2.0), (2, 4.0), (3, 8.0)]:
+            delay = compute_backoff_delay(attempt, 2.0, rng=rng)
+            assert base <= delay <= base * 1.5
+        assert compute_backoff_delay(10, 2.0, max_delay=30.0, rng=rng) <= 45.0
+
+    def test_retry_after_sets_minimum_delay(self):
+        """Retry-After 大於退避時間時以 Retry-After 為準，但不超過上限"""
+        policy = RetryPolicy(base_delay=1.0, max_retry_after=60.0)
+        assert policy.get_delay(1, retry_after=20.0) == 20.0
+        assert policy.get_delay(1, retry_after=600.0) == 60.0
+
+    @pytest.mark.parametrize(
+        "value, expected",
+        [
+            ("120", 120.0),
+            ("Sat, 17 Oct 2026 08:01:00 GMT", 60.0),
+            ("soon", None),
+            (None, None),
+        ],
+    )
+    def test_parse_retry_after(self, value, expected):
+        """支援秒數與 HTTP 日期"""
+        now = 1792224000.0  # 2026-10-17 08:00:00 UTC
+        assert parse_retry_after(value, now=now) == expected
+
+
+class TestCircuitBreaker:
+    """斷路器狀態轉換測試"""
+
+    def test_opens_after_threshold_and_probes(self, clock):
+        """連續失敗達門檻後開啟，恢復時間到後只放行一個探測請求"""
+        breaker = CircuitBreaker("example.com", failure_threshold=3, recovery_timeout=30.0, clock=clock)
+        for _ in range(3):
+            assert breaker.acquire() == 0.0
+            breaker.record_failure()
+        assert breaker.state == CIRCUIT_OPEN
+        assert breaker.acquire() == pytest.approx(30.0)
+
+        clock.now += 30
+        assert breaker.acquire() == 0.0
+        assert breaker.state == CIRCUIT_HALF_OPEN
+        # 探測進行中時其他請求等待
+        assert breaker.acquire() > 0
+
+        breaker.record_success()
+        assert breaker.state == CIRCUIT_CLOSED
+        assert breaker.acquire() == 0.0
+        assert breaker.snapshot()["trips"] == 1
+
+    def test_failed_probe_doubles_pause(self, clock):
+        """探測失敗時加倍暫停時間"""
+        breaker = CircuitBreaker("example.com", failure_threshold=1, recovery_timeout=10.0, clock=clock)
+        breaker.record_failure()
+        clock.now += 10
+        assert breaker.acquire() == 0.0
+        breaker.record_failure()
+        assert breaker.state == CIRCUIT_OPEN
+        assert breaker.snapshot()["retry_in"] == 20.0
+
+    def test_retry_after_opens_immediately(self, clock):
+        """伺服器以 Retry-After 要求暫停時直接開啟斷路器"""
+        breaker = CircuitBreaker("example.com", failure_threshold=5, clock=clock)
+        breaker.record_failure(retry_after=45.0)
+        assert breaker.state == CIRCUIT_OPEN
+        assert breaker.snapshot()["retry_in"] == 45.0
+
+    def test_registry_shares_breaker_per_host(self, clock):
+        """同一主機共用斷路器"""
+        registry = CircuitBreakerRegistry(clock=clock)
+        assert registry.get("a.com") is registry.get("a.com")
+        assert registry.get("a.com") is not registry.get("b.com")
+        assert set(registry.snapshot()) == {"a.com", "b.com"}
+
+
+class TestResilientFetch:
+    """HTTP 用戶端的重試與斷路器整合測試"""
+
+    def test_retries_5xx_with_backoff(self, stub_server, clock):
+        """5xx 回應以遞增的等待時間重試，成功後返回"""
+        stub_server.responses = [(502, {}), (500, {})]
+        client = _client(clock)
+        response = client.get(stub_server.url)
+        assert response.status_code == 200
+        assert stub_server.request_count == 3
+        assert len(clock.sleeps) == 2
+        assert 1.0 <= clock.sleeps[0] <= 1.5
+        assert 2.0 <= clock.sleeps[1] <= 3.0
+        assert client.get_stats()["retries"] == 2
+
+    def test_honours_retry_after(self, stub_server, clock):
+        """429 帶 Retry-After 時等待伺服器要求的時間"""
+        stub_server.responses = [(429, {"Retry-After": "12"})]
+        client = _client(clock, failure_threshold=10)
+        response = client.get(stub_server.url)
+        assert response.status_code == 200
+        assert sum(clock.sleeps) >= 12.0
+
+    def test_returns_last_response_when_retries_exhausted(self, stub_server, clock):
+        """重試用盡時返回最後的錯誤回應，由呼叫端處理"""
+        stub_server.responses = [(503, {})] * 3
+        client = _client(clock, failure_threshold=10)
+        response = client.get(stub_server.url)
+        assert response.status_code == 503
+        assert stub_server.request_count == 3
+
+    def test_non_retryable_status_not_retried(self, stub_server, clock):
+        """404 不重試"""
+        stub_server.responses = [(404, {})]
+        client = _client(clock)
+        assert client.get(stub_server.url).status_code == 404
+        assert stub_server.request_count == 1
+
+    def test_connection_errors_open_circuit_for_all_clients(self, clock):
+        """連線失敗達門檻後開啟斷路器，共用斷路器的其他用戶端也暫停請求"""
+        url = _closed_port_url()
+        registry = CircuitBreakerRegistry(failure_threshold=3, recovery_timeout=30.0, clock=clock)
+        states = []
+        first = CachingHttpClient(retry_policy=RetryPolicy(max_retries=2, base_delay=1.0),
+                                  breakers=registry, sleep=clock.sleep)
+        first.on_circuit_change = states.append
+        with pytest.raises(requests.exceptions.ConnectionError):
+            first.get(url, timeout=1)
+        assert registry.get("127.0.0.1").state == CIRCUIT_OPEN
+        assert states[-1]["state"] == CIRCUIT_OPEN
+
+        other = CachingHttpClient(retry_policy=RetryPolicy(max_retries=0), breakers=registry,
+                                  sleep=clock.sleep, max_circuit_wait=10.0)
+        with pytest.raises(CircuitOpenError):
+            other.get(url, timeout=1)
+        assert other.get_stats()["network_requests"] == 0
+        assert other.get_stats()["circuit_waits"] == 1
+
+    def test_paused_request_resumes_after_recovery(self, stub_server, clock):
+        """斷路器開啟時暫停，恢復時間到後探測成功即繼續並關閉斷路器"""
+        registry = CircuitBreakerRegistry(failure_threshold=1, recovery_timeout=30.0, clock=clock)
+        registry.get("127.0.0.1").record_failure()
+        states = []
+        client = CachingHttpClient(retry_policy=RetryPolicy(max_retries=0), breakers=registry, sleep=clock.sleep)
+        client.on_circuit_change = states.append
+
+        response = client.get(stub_server.url)
+
+        assert response.status_code == 200
+        assert sum(clock.sleeps) == pytest.approx(30.0)
+        assert [s["state"] for s in states] == [CIRCUIT_OPEN, CIRCUIT_HALF_OPEN, CIRCUIT_CLOSED]
+        assert registry.get("127.0.0.1").state == CIRCUIT_CLOSED
+
+    def test_cancelled_task_stops_waiting(self, stub_server, clock):
+        """任務取消時不再等待斷路器"""
+        registry = CircuitBreakerRegistry(failure_threshold=1, recovery_timeout=300.0, clock=clock)
+        registry.get("127.0.0.1").record_failure()
+        client = CachingHttpClient(breakers=registry, sleep=clock.sleep)
+        client.should_abort = lambda: True
+        with pytest.raises(CircuitOpenError):
+            client.get(stub_server.url)
+        assert stub_server.request_count == 0
+        assert clock.sleeps == []
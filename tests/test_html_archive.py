@@ -0,0 +1,183 @@
+"""測試原始 HTML 封存，包括內容定址去重、URL 索引、保留政策與統計。"""
+
+# Standard library imports
+import logging
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+
+# Third party imports
+import pytest
+
+# Local application imports
+from src.crawlers.html_archive import (
+    HtmlArchive,
+    get_html_archive,
+    reset_html_archive,
+)
+
+# flake8: noqa: F811
+# pylint: disable=redefined-outer-name
+
+logger = logging.getLogger(__name__)  # 使用統一的 logger
+
+PAGE_A = ("<html><body>" + "<p>人工智慧新聞段落</p>" * 200 + "</body></html>").encode("utf-8")
+PAGE_B = ("<html><body>" + "<p>改版後的段落</p>" * 200 + "</body></html>").encode("utf-8")
+
+
+@pytest.fixture
+def archive(tmp_path):
+    """使用暫存目錄的封存，關閉自動保留政策"""
+    return HtmlArchive(
+        str(tmp_path / "archive"),
+        retention_days=None,
+        max_versions=None,
+        retention_check_interval=3600,
+    )
+
+
+def _blob_files(archive):
+    objects_dir = os.path.join(archive.root_dir, "objects")
+    return [
+        os.path.join(root, name)
+        for root, _, names in os.walk(objects_dir)
+        for name in names
+    ]
+
+
+class TestHtmlArchive:
+    """封存讀寫測試"""
+
+    def test_store_and_get_latest(self, archive):
+        """寫入後可取回最近一次的原始內容與索引資訊"""
+        entry = archive.store("https://example.com/a", PAGE_A, encoding="utf-8")
+        latest = archive.get_latest("https://example.com/a")
+        assert latest["content"] == PAGE_A
+        assert latest["content_hash"] == entry["content_hash"]
+        assert latest["encoding"] == "utf-8"
+        assert latest["status_code"] == 200
+        assert archive.get_latest("https://example.com/missing") is None
+
+    def test_identical_content_stored_once(self, archive):
+        """相同內容 (不同 URL 或重複抓取) 只保存一個壓縮檔"""
+        archive.store("https://example.com/a", PAGE_A)
+        archive.store("https://example.com/a", PAGE_A)
+        archive.store("https://example.com/b", PAGE_A)
+        assert len(_blob_files(archive)) == 1
+
+        stats = archive.get_stats()
+        assert stats["entry_count"] == 3
+        assert stats["url_count"] == 2
+        assert stats["blob_count"] == 1
+        assert stats["raw_bytes"] == len(PAGE_A)
+        assert stats["stored_bytes"] < len(PAGE_A) / 5
+        assert stats["writes"] == 3
+        assert stats["avg_write_ms"] is not None
+
+    def test_latest_version_by_fetch_time(self, archive):
+        """以抓取時間決定最新版本，歷史由新到舊"""
+        now = datetime.now(timezone.utc)
+        archive.store("https://example.com/a", PAGE_B, fetched_at=now)
+        archive.store("https://example.com/a", PAGE_A, fetched_at=now - timedelta(days=1))
+        assert archive.get_latest("https://example.com/a")["content"] == PAGE_B
+        history = archive.get_history("https://example.com/a")
+        assert [archive.load(h["content_hash"]) for h in history] == [PAGE_B, PAGE_A]
+
+    def test_find_latest_entries(self, archive):
+        """可一次查詢多個 URL 的最新索引"""
+        archive.store("https://example.com/a", PAGE_A)
+        archive.store("https://example.com/b", PAGE_B)
+        archive.store("https://example.com/b", PAGE_A)
+        entries = archive.find_latest_entries(["https://example.com/b", "https://example.com/x"])
+        assert len(entries) == 1
+        assert archive.load(entries[0]["content_hash"]) == PAGE_A
+        assert [e["url"] for e in archive.find_latest_entries()] == [
+            "https://example.com/a",
+            "https://example.com/b",
+        ]
+
+    def test_concurrent_writes(self, archive):
+        """多個執行緒同時寫入時索引完整"""
+        def worker(index):
+            for i in range(10):
+                archive.store(f"https://example.com/{index}/{i}", PAGE_A + str(i).encode())
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        stats = archive.get_stats()
+        assert stats["entry_count"] == 40
+        assert stats["blob_count"] == 10
+
+
+class TestRetention:
+    """保留政策測試"""
+
+    def test_retention_days_removes_old_entries_and_blobs(self, tmp_path):
+        """超過保留天數的索引刪除，未被引用的內容檔案一併清除"""
+        archive = HtmlArchive(str(tmp_path / "archive"), retention_days=7, max_versions=None)
+        now = datetime.now(timezone.utc)
+        archive.store("https://example.com/old", PAGE_A, fetched_at=now - timedelta(days=10))
+        archive.store("https://example.com/new", PAGE_B, fetched_at=now)
+
+        result = archive.apply_retention(now)
+
+        assert result["removed_entries"] == 1
+        assert result["removed_blobs"] == 1
+        assert result["freed_bytes"] > 0
+        assert archive.get_latest("https://example.com/old") is None
+        assert archive.get_latest("https://example.com/new")["content"] == PAGE_B
+        assert len(_blob_files(archive)) == 1
+
+    def test_max_versions_keeps_newest(self, tmp_path):
+        """每個 URL 只保留最新的 N 個版本，仍被其他 URL 引用的內容保留"""
+        archive = HtmlArchive(str(tmp_path / "archive"), retention_days=None, max_versions=1)
+        now = datetime.now(timezone.utc)
+        archive.store("https://example.com/a", PAGE_A, fetched_at=now - timedelta(hours=2))
+        archive.store("https://example.com/a", PAGE_B, fetched_at=now)
+        archive.store("https://example.com/b", PAGE_A, fetched_at=now)
+
+        result = archive.apply_retention(now)
+
+        assert result["removed_entries"] == 1
+        assert result["removed_blobs"] == 0
+        assert len(archive.get_history("https://example.com/a")) == 1
+        assert archive.get_latest("https://example.com/b")["content"] == PAGE_A
+
+    def test_retention_runs_periodically_on_store(self, tmp_path):
+        """寫入時依檢查間隔自動執行保留政策"""
+        archive = HtmlArchive(
+            str(tmp_path / "archive"), retention_days=None, max_versions=1, retention_check_interval=0
+        )
+        archive.store("https://example.com/a", PAGE_A)
+        archive.store("https://example.com/a", PAGE_B)
+        assert len(archive.get_history("https://example.com/a")) == 1
+        assert len(_blob_files(archive)) == 1
+
+
+class TestHtmlArchiveFactory:
+    """環境變數設定測試"""
+
+    def test_disabled_by_default(self, monkeypatch):
+        """預設不啟用封存"""
+        monkeypatch.delenv("HTML_ARCHIVE_ENABLED", raising=False)
+        reset_html_archive()
+        assert get_html_archive() is None
+
+    def test_enabled_from_env(self, monkeypatch, tmp_path):
+        """啟用後使用環境變數指定的目錄與保留政策，並共用同一個實例"""
+        monkeypatch.setenv("HTML_ARCHIVE_ENABLED", "true")
+        monkeypatch.setenv("HTML_ARCHIVE_DIR", str(tmp_path / "env_archive"))
+        monkeypatch.setenv("HTML_ARCHIVE_RETENTION_DAYS", "14")
+        monkeypatch.setenv("HTML_ARCHIVE_MAX_VERSIONS", "invalid")
+        reset_html_archive()
+        try:
+            archive = get_html_archive()
+            assert archive is get_html_archive()
+            assert archive.root_dir == str(tmp_path / "env_archive")
+            assert archive.retention_days == 14
+            assert archive.max_versions == 3
+        finally:
+            reset_html_archive()
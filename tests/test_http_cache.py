@@ -0,0 +1,247 @@
+"""測試本機 HTTP 回應快取，以本機的 stub 伺服器驗證 ETag / Last-Modified 條件式重新驗證與 Cache-Control。"""
+
+# Standard library imports
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+# Third party imports
+import pytest
+
+# Local application imports
+from src.crawlers.bnext_content_extractor import BnextContentExtractor
+from src.crawlers.configs.site_config import SiteConfig
+from src.crawlers.http_cache import (
+    CACHE_STATUS_HEADER,
+    CachingHttpClient,
+    HttpResponseCache,
+    compute_freshness_lifetime,
+    get_http_cache,
+    reset_http_cache,
+)
+
+# flake8: noqa: F811
+# pylint: disable=redefined-outer-name
+
+logger = logging.getLogger(__name__)  # 使用統一的 logger
+
+LAST_MODIFIED = "Sat, 17 Oct 2026 08:00:00 GMT"
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """依路徑返回不同快取標頭的 stub 伺服器，記錄收到的條件式標頭"""
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        server = self.server
+        server.requests.append(
+            {
+                "path": self.path,
+                "if_none_match": self.headers.get("If-None-Match"),
+                "if_modified_since": self.headers.get("If-Modified-Since"),
+            }
+        )
+        page = server.pages[self.path]
+        etag = page.get("etag")
+        if etag and self.headers.get("If-None-Match") == etag:
+            self._send(304, b"", page)
+            return
+        if (
+            not etag
+            and page.get("last_modified")
+            and self.headers.get("If-Modified-Since") == page["last_modified"]
+        ):
+            self._send(304, b"", page)
+            return
+        self._send(200, page["body"], page)
+
+    def _send(self, status, body, page):
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        if page.get("etag"):
+            self.send_header("ETag", page["etag"])
+        if page.get("last_modified"):
+            self.send_header("Last-Modified", page["last_modified"])
+        if page.get("cache_control"):
+            self.send_header("Cache-Control", page["cache_control"])
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    """在本機隨機埠啟動 stub 伺服器"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.requests = []
+    server.pages = {
+        "/etag": {"body": "<p>文章內容</p>".encode("utf-8") * 100, "etag": '"v1"', "cache_control": "no-cache"},
+        "/modified": {"body": b"<p>list</p>" * 50, "last_modified": LAST_MODIFIED},
+        "/fresh": {"body": b"<p>fresh</p>" * 20, "etag": '"f1"', "cache_control": "max-age=300"},
+        "/no-store": {"body": b"<p>secret</p>", "etag": '"s1"', "cache_control": "no-store"},
+    }
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client(tmp_path):
+    """使用暫存目錄快取的用戶端"""
+    return CachingHttpClient(HttpResponseCache(str(tmp_path / "http_cache")))
+
+
+class TestCachingHttpClient:
+    """快取與條件式重新驗證測試"""
+
+    def test_etag_revalidation_serves_local_copy(self, stub_server, client):
+        """第二次請求帶 If-None-Match，伺服器回 304 時返回本機副本並計入節省量"""
+        url = f"{stub_server.base_url}/etag"
+        body = stub_server.pages["/etag"]["body"]
+
+        first = client.get(url)
+        second = client.get(url)
+
+        assert first.status_code == 200
+        assert second.status_code == 200
+        assert second.content == body
+        assert second.text == body.decode("utf-8")
+        assert second.headers[CACHE_STATUS_HEADER] == "REVALIDATED"
+        assert stub_server.requests[0]["if_none_match"] is None
+        assert stub_server.requests[1]["if_none_match"] == '"v1"'
+        stats = client.get_stats()
+        assert stats["requests"] == 2
+        assert stats["network_requests"] == 2
+        assert stats["revalidated"] == 1
+        assert stats["bytes_downloaded"] == len(body)
+        assert stats["bytes_saved"] == len(body)
+
+    def test_last_modified_revalidation(self, stub_server, client):
+        """只有 Last-Modified 時以 If-Modified-Since 重新驗證"""
+        url = f"{stub_server.base_url}/modified"
+        client.get(url)
+        response = client.get(url)
+        assert stub_server.requests[1]["if_modified_since"] == LAST_MODIFIED
+        assert response.headers[CACHE_STATUS_HEADER] == "REVALIDATED"
+
+    def test_fresh_response_served_without_request(self, stub_server, client):
+        """max-age 內直接使用本機副本，不連線"""
+        url = f"{stub_server.base_url}/fresh"
+        client.get(url)
+        response = client.get(url)
+        assert len(stub_server.requests) == 1
+        assert response.headers[CACHE_STATUS_HEADER] == "HIT"
+        assert client.get_stats()["fresh_hits"] == 1
+
+    def test_fresh_response_expires(self, stub_server, tmp_path):
+        """超過 max-age 後重新驗證"""
+        now = [1000.0]
+        client = CachingHttpClient(HttpResponseCache(str(tmp_path / "c")), clock=lambda: now[0])
+        url = f"{stub_server.base_url}/fresh"
+        client.get(url)
+        now[0] += 301
+        client.get(url)
+        assert len(stub_server.requests) == 2
+        assert stub_server.requests[1]["if_none_match"] == '"f1"'
+
+    def test_no_store_not_cached(self, stub_server, client):
+        """no-store 的回應不保存，也不送出條件式標頭"""
+        url = f"{stub_server.base_url}/no-store"
+        client.get(url)
+        client.get(url)
+        assert stub_server.requests[1]["if_none_match"] is None
+        assert client.get_stats()["bytes_saved"] == 0
+
+    def test_changed_content_replaces_cache(self, stub_server, client):
+        """內容變更 (ETag 不同) 時下載新內容並更新快取"""
+        url = f"{stub_server.base_url}/etag"
+        client.get(url)
+        stub_server.pages["/etag"] = {"body": b"<p>v2</p>", "etag": '"v2"', "cache_control": "no-cache"}
+        changed = client.get(url)
+        again = client.get(url)
+        assert changed.content == b"<p>v2</p>"
+        assert CACHE_STATUS_HEADER not in changed.headers
+        assert again.content == b"<p>v2</p>"
+        assert stub_server.requests[2]["if_none_match"] == '"v2"'
+
+    def test_reset_stats(self, stub_server, client):
+        """任務開始時重設統計"""
+        client.get(f"{stub_server.base_url}/etag")
+        client.reset_stats()
+        assert client.get_stats()["requests"] == 0
+
+    def test_without_cache_passes_through(self, stub_server):
+        """未設定快取時直接發送請求"""
+        client = CachingHttpClient()
+        url = f"{stub_server.base_url}/etag"
+        client.get(url)
+        client.get(url)
+        assert stub_server.requests[1]["if_none_match"] is None
+        assert client.get_stats()["bytes_saved"] == 0
+
+
+class TestFreshnessLifetime:
+    """Cache-Control / Expires 解析測試"""
+
+    @pytest.mark.parametrize(
+        "headers, expected",
+        [
+            ({"Cache-Control": "public, max-age=60"}, 60.0),
+            ({"Cache-Control": "max-age=60, no-cache"}, None),
+            ({"Expires": "Sat, 17 Oct 2026 08:10:00 GMT", "Date": LAST_MODIFIED}, 600.0),
+            ({}, None),
+        ],
+    )
+    def test_compute_freshness_lifetime(self, headers, expected):
+        """max-age 優先，no-cache 必須重新驗證，其次使用 Expires"""
+        assert compute_freshness_lifetime(headers) == expected
+
+
+class TestExtractorWithCache:
+    """內容擷取器使用快取的整合測試"""
+
+    def test_extractor_revalidates_article(self, stub_server, client):
+        """擷取器重複抓取同一篇文章時以 304 使用本機副本"""
+        config = SiteConfig(
+            name="stub",
+            base_url=stub_server.base_url,
+            list_url_template="{base_url}/{category}",
+            categories=["ai"],
+            full_categories=["ai"],
+            selectors={"get_article_contents": {"content_container": "p", "content": "p"}},
+        )
+        extractor = BnextContentExtractor(config=config, http_client=client)
+        url = f"{stub_server.base_url}/etag"
+        with patch("src.crawlers.bnext_utils.BnextUtils.sleep_random_time"):
+            first = extractor._get_article_content(url, ai_only=False)
+            second = extractor._get_article_content(url, ai_only=False)
+        assert first["content"] == second["content"]
+        assert client.get_stats()["revalidated"] == 1
+
+
+class TestHttpCacheFactory:
+    """環境變數設定測試"""
+
+    def test_disabled_by_default(self, monkeypatch):
+        """預設不啟用快取"""
+        monkeypatch.delenv("HTTP_CACHE_ENABLED", raising=False)
+        reset_http_cache()
+        assert get_http_cache() is None
+
+    def test_enabled_from_env(self, monkeypatch, tmp_path):
+        """啟用後使用環境變數指定的目錄"""
+        monkeypatch.setenv("HTTP_CACHE_ENABLED", "true")
+        monkeypatch.setenv("HTTP_CACHE_DIR", str(tmp_path / "env_cache"))
+        reset_http_cache()
+        try:
+            cache = get_http_cache()
+            assert cache is get_http_cache()
+            assert cache.root_dir == str(tmp_path / "env_cache")
+        finally:
+            reset_http_cache()
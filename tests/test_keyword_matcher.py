@@ -0,0 +1,60 @@
+"""測試 KeywordMatcher (Aho-Corasick 多關鍵字比對器) 的功能。"""
+import logging
+
+import pytest
+
+from src.crawlers.keyword_matcher import KeywordMatcher
+
+logger = logging.getLogger(__name__)  # 使用統一的 logger
+
+
+class TestKeywordMatcher:
+    def test_find_keywords_chinese_and_english(self):
+        """測試同時比對中英文關鍵字"""
+        matcher = KeywordMatcher({"ai", "人工智慧", "機器學習"})
+        text = "人工智慧與機器學習的結合，讓 ai 應用更普及"
+        assert matcher.find_keywords(text) == {"ai", "人工智慧", "機器學習"}
+
+    def test_overlapping_keywords(self):
+        """測試重疊與互為子字串的關鍵字都能被找到"""
+        matcher = KeywordMatcher({"ai", "ai倫理", "人工智慧", "人工智慧倫理", "倫理"})
+        text = "討論人工智慧倫理與ai倫理"
+        assert matcher.count_occurrences(text) == {
+            "人工智慧": 1,
+            "人工智慧倫理": 1,
+            "倫理": 2,
+            "ai": 1,
+            "ai倫理": 1,
+        }
+
+    def test_match_positions(self):
+        """測試命中位置為關鍵字的起始位置"""
+        matcher = KeywordMatcher({"llm", "gpt"})
+        text = "gpt 與 llm"
+        for position, keyword in matcher.iter_matches(text):
+            assert text[position:position + len(keyword)] == keyword
+
+    def test_count_occurrences_repeated(self):
+        """測試重複出現的關鍵字會累計次數"""
+        matcher = KeywordMatcher({"深度學習"})
+        assert matcher.count_occurrences("深度學習、深度學習、深度學習") == {"深度學習": 3}
+
+    @pytest.mark.parametrize("text", ["", "今天天氣晴朗，適合出遊。"])
+    def test_no_match(self, text):
+        """測試沒有命中時返回空結果"""
+        matcher = KeywordMatcher({"ai", "人工智慧"})
+        assert matcher.find_keywords(text) == set()
+        assert matcher.contains_any(text) is False
+
+    def test_empty_keywords(self):
+        """測試沒有關鍵字時不會命中任何文字"""
+        matcher = KeywordMatcher([])
+        assert len(matcher) == 0
+        assert matcher.find_keywords("ai 人工智慧") == set()
+
+    def test_matches_substring_semantics(self):
+        """測試結果與逐一使用 in 判斷的結果一致"""
+        keywords = {"ai", "ml", "nlp", "ai助理", "語音助手", "大模型", "模型"}
+        matcher = KeywordMatcher(keywords)
+        text = "這款ai助理內建大模型，支援nlp 與 html 解析，並提供語音助手功能"
+        assert matcher.find_keywords(text) == {k for k in keywords if k in text}
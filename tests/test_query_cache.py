@@ -0,0 +1,254 @@
+"""測試服務層查詢快取，包括 LRU/TTL、世代失效、寫入提交後的失效與略過快取的標頭。"""
+
+# flake8: noqa: F811
+# pylint: disable=redefined-outer-name
+
+# Standard library imports
+import logging
+from unittest.mock import MagicMock
+
+# Third party imports
+import pytest
+from flask import Blueprint, Flask, jsonify
+from sqlalchemy import insert
+
+# Local application imports
+from src.models.articles_model import Articles, ArticleScrapeStatus
+from src.models.base_model import Base
+from src.services.article_service import ArticleService
+from src.services.query_cache import (
+    QueryCache,
+    bump_table_generation,
+    cache_bypass_var,
+    cached_query,
+    get_table_generation,
+)
+from src.utils.api_utils import register_query_cache_hooks
+
+logger = logging.getLogger(__name__)  # 使用統一的 logger
+
+
+class FakeClock:
+    """可手動推進的時鐘"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(clock):
+    return QueryCache("test", ttl_seconds=10, max_entries=2, clock=clock)
+
+
+@pytest.fixture(scope="function")
+def initialized_db_manager(db_manager_for_test):
+    """建立資料表後提供資料庫管理器"""
+    db_manager_for_test.create_tables(Base)
+    yield db_manager_for_test
+
+
+def _article_data(index: int):
+    return {
+        "title": f"快取測試文章{index}",
+        "link": f"https://example.com/cache/{index}",
+        "source": "快取來源",
+        "source_url": f"https://example.com/cache/{index}",
+        "category": "AI",
+        "is_ai_related": True,
+        "is_scraped": False,
+        "scrape_status": ArticleScrapeStatus.LINK_SAVED,
+    }
+
+
+class TestQueryCache:
+    """QueryCache 行為測試"""
+
+    def test_hit_after_miss(self, cache):
+        """第二次相同查詢命中快取"""
+        loader = MagicMock(return_value={"success": True, "value": 1})
+        assert cache.get_or_load("k", ["t_hit"], loader)["value"] == 1
+        assert cache.get_or_load("k", ["t_hit"], loader)["value"] == 1
+        loader.assert_called_once()
+        metrics = cache.get_metrics()
+        assert metrics["hits"] == 1
+        assert metrics["misses"] == 1
+        assert metrics["hit_rate"] == 0.5
+
+    def test_ttl_expiry(self, cache, clock):
+        """超過 TTL 後重新載入"""
+        loader = MagicMock(return_value={"success": True})
+        cache.get_or_load("k", ["t_ttl"], loader)
+        clock.now = 11
+        cache.get_or_load("k", ["t_ttl"], loader)
+        assert loader.call_count == 2
+
+    def test_lru_eviction(self, cache):
+        """超過容量時淘汰最久未使用的項目"""
+        loader = MagicMock(side_effect=lambda: {"success": True})
+        cache.get_or_load("a", ["t_lru"], loader)
+        cache.get_or_load("b", ["t_lru"], loader)
+        cache.get_or_load("a", ["t_lru"], loader)
+        cache.get_or_load("c", ["t_lru"], loader)
+        assert cache.get_metrics()["evictions"] == 1
+        cache.get_or_load("a", ["t_lru"], loader)
+        cache.get_or_load("b", ["t_lru"], loader)
+        assert loader.call_count == 4
+
+    def test_generation_bump_invalidates(self, cache):
+        """依賴資料表的世代遞增後項目失效"""
+        loader = MagicMock(return_value={"success": True})
+        cache.get_or_load("k", ["t_gen"], loader)
+        bump_table_generation("t_other")
+        cache.get_or_load("k", ["t_gen"], loader)
+        assert loader.call_count == 1
+        bump_table_generation("t_gen")
+        cache.get_or_load("k", ["t_gen"], loader)
+        assert loader.call_count == 2
+        assert cache.get_metrics()["invalidations"] == 1
+
+    def test_shared_version_invalidates(self, clock):
+        """資料庫版本 (其他行程的寫入) 變更時快取失效，無法取得版本時略過快取"""
+        versions = {"value": "v1"}
+        cache = QueryCache(
+            "shared", ttl_seconds=10, clock=clock, version_loader=lambda tables: versions["value"]
+        )
+        loader = MagicMock(return_value={"success": True})
+        cache.get_or_load("k", ["t_shared"], loader)
+        cache.get_or_load("k", ["t_shared"], loader)
+        assert loader.call_count == 1
+
+        versions["value"] = "v2"
+        cache.get_or_load("k", ["t_shared"], loader)
+        assert loader.call_count == 2
+
+        versions["value"] = None
+        cache.get_or_load("k", ["t_shared"], loader)
+        assert loader.call_count == 3
+        assert cache.get_metrics()["bypasses"] == 1
+
+    def test_failures_not_cached(self, cache):
+        """失敗的服務結果不寫入快取"""
+        loader = MagicMock(return_value={"success": False, "message": "錯誤"})
+        cache.get_or_load("k", ["t_fail"], loader)
+        cache.get_or_load("k", ["t_fail"], loader)
+        assert loader.call_count == 2
+
+    def test_bypass(self, cache):
+        """略過快取時每次都載入"""
+        loader = MagicMock(return_value={"success": True})
+        token = cache_bypass_var.set(True)
+        try:
+            cache.get_or_load("k", ["t_bypass"], loader)
+            cache.get_or_load("k", ["t_bypass"], loader)
+        finally:
+            cache_bypass_var.reset(token)
+        assert loader.call_count == 2
+        assert cache.get_metrics()["bypasses"] == 2
+
+    def test_cached_query_normalizes_arguments(self):
+        """位置/關鍵字參數與字典順序不同的相同查詢共用快取項目"""
+
+        class Service:
+            def __init__(self):
+                self.query_cache = QueryCache("normalize", ttl_seconds=10)
+                self.calls = 0
+
+            @cached_query("t_normalize")
+            def find(self, page, filters=None, sort_desc=False):
+                self.calls += 1
+                return {"success": True, "page": page}
+
+        service = Service()
+        service.find(1, {"a": 1, "b": [1, 2]})
+        service.find(page=1, filters={"b": [1, 2], "a": 1}, sort_desc=False)
+        assert service.calls == 1
+        service.find(2)
+        assert service.calls == 2
+
+
+class TestQueryCacheInvalidation:
+    """寫入提交後使服務快取失效"""
+
+    def test_commit_bumps_generation_rollback_does_not(self, initialized_db_manager):
+        """提交寫入遞增世代，回滾不遞增"""
+        before = get_table_generation("articles")
+        with initialized_db_manager.session_scope() as session:
+            session.add(Articles(**_article_data(1)))
+        assert get_table_generation("articles") == before + 1
+
+        with pytest.raises(RuntimeError):
+            with initialized_db_manager.session_scope() as session:
+                session.add(Articles(**_article_data(2)))
+                session.flush()
+                raise RuntimeError("回滾")
+        assert get_table_generation("articles") == before + 1
+
+    def test_service_write_invalidates_list(self, initialized_db_manager):
+        """透過服務新增文章後列表查詢不返回過期結果"""
+        service = ArticleService(initialized_db_manager)
+        first = service.find_articles_paginated(page=1, per_page=10)
+        assert first["resultMsg"].total == 0
+        assert service.find_articles_paginated(page=1, per_page=10)["resultMsg"].total == 0
+        assert service.query_cache.get_metrics()["hits"] == 1
+
+        assert service.create_article(_article_data(3))["success"] is True
+        assert service.find_articles_paginated(page=1, per_page=10)["resultMsg"].total == 1
+        stats = service.get_articles_statistics()
+        assert stats["statistics"]["total_count"] == 1
+
+    def test_bulk_statement_invalidates(self, initialized_db_manager):
+        """以 DML 語句寫入 (不經過 ORM 物件) 也會使快取失效"""
+        service = ArticleService(initialized_db_manager)
+        service.create_article(_article_data(4))
+        assert service.find_articles_paginated(page=1, per_page=10)["resultMsg"].total == 1
+        with initialized_db_manager.session_scope() as session:
+            session.query(Articles).delete(synchronize_session=False)
+        assert service.find_articles_paginated(page=1, per_page=10)["resultMsg"].total == 0
+
+
+    def test_write_from_other_process_invalidates(self, initialized_db_manager):
+        """不經過本行程 Session 的寫入 (模擬其他 worker) 也會使快取失效"""
+        service = ArticleService(initialized_db_manager)
+        service.create_article(_article_data(5))
+        assert service.find_articles_paginated(page=1, per_page=10)["resultMsg"].total == 1
+        generation = get_table_generation("articles")
+
+        with initialized_db_manager.engine.begin() as connection:
+            connection.execute(insert(Articles).values(**_article_data(6)))
+        assert get_table_generation("articles") == generation
+        assert service.find_articles_paginated(page=1, per_page=10)["resultMsg"].total == 2
+
+
+class TestQueryCacheHeaders:
+    """請求掛鉤測試"""
+
+    @pytest.fixture
+    def client(self):
+        blueprint = Blueprint("cache_test", __name__)
+        register_query_cache_hooks(blueprint)
+        cache = QueryCache("headers", ttl_seconds=10)
+
+        @blueprint.route("/cached")
+        def cached():
+            value = cache.get_or_load("k", ["t_headers"], lambda: {"success": True})
+            return jsonify(value)
+
+        app = Flask(__name__)
+        app.register_blueprint(blueprint)
+        return app.test_client()
+
+    def test_status_and_bypass_headers(self, client):
+        """回應標示 MISS/HIT，帶 X-Cache-Bypass 時略過快取"""
+        assert client.get("/cached").headers["X-Cache"] == "MISS"
+        assert client.get("/cached").headers["X-Cache"] == "HIT"
+        response = client.get("/cached", headers={"X-Cache-Bypass": "1"})
+        assert response.headers["X-Cache"] == "BYPASS"
+        assert client.get("/cached").headers["X-Cache"] == "HIT"
@@ -0,0 +1,155 @@
+"""測試以封存的原始 HTML 離線重新解析文章，包括多行程解析、依連結更新與處理速度報告。"""
+
+# Standard library imports
+import logging
+
+# Third party imports
+import pytest
+
+# Local application imports
+from src.crawlers.bnext_content_extractor import BnextContentExtractor
+from src.crawlers.configs.site_config import SiteConfig
+from src.crawlers.html_archive import HtmlArchive
+from src.crawlers.reextraction import ArticleReextractionJob
+from src.models.articles_model import Articles
+from src.models.base_model import Base
+from src.services.article_service import ArticleService
+from src.utils.enum_utils import ArticleScrapeStatus
+
+# flake8: noqa: F811
+# pylint: disable=redefined-outer-name
+
+logger = logging.getLogger(__name__)  # 使用統一的 logger
+
+BASE_URL = "https://news.example.com"
+
+
+def _page(index):
+    return f"""
+    <html><body>
+      <div class="article">
+        <h1 class="title">文章 {index}</h1>
+        <a class="category">AI 新分類</a>
+        <span class="author">作者{index}</span>
+        <div class="tags"><a>標籤A</a><a>標籤B</a></div>
+      </div>
+      <div class="body"><p>改版後的內文 {index}</p></div>
+    </body></html>
+    """.encode("utf-8")
+
+
+@pytest.fixture
+def site_config():
+    """使用簡化選擇器的網站配置"""
+    return SiteConfig(
+        name="example",
+        base_url=BASE_URL,
+        list_url_template="{base_url}/{category}",
+        categories=["ai"],
+        full_categories=["ai"],
+        selectors={
+            "get_article_contents": {
+                "content_container": "div.article",
+                "title": "h1.title",
+                "category": "a.category",
+                "author": "span.author",
+                "tags": {"container": "div.tags", "tag": "a"},
+                "content": "div.body",
+            }
+        },
+    )
+
+
+@pytest.fixture
+def archive(tmp_path):
+    """使用暫存目錄的封存"""
+    return HtmlArchive(str(tmp_path / "archive"), retention_days=None, max_versions=None)
+
+
+@pytest.fixture
+def article_service(db_manager_for_test):
+    """建立資料表並寫入內容過時的文章"""
+    db_manager_for_test.create_tables(Base)
+    with db_manager_for_test.session_scope() as session:
+        session.add_all(
+            Articles(
+                title=f"文章 {i}",
+                link=f"{BASE_URL}/article/{i}",
+                content="舊的內文",
+                category="舊分類",
+                author=None,
+                source="example",
+                source_url=BASE_URL,
+                is_ai_related=True,
+                is_scraped=True,
+                scrape_status=ArticleScrapeStatus.CONTENT_SCRAPED,
+            )
+            for i in range(6)
+        )
+    return ArticleService(db_manager_for_test)
+
+
+class TestArticleReextractionJob:
+    """離線重新解析測試"""
+
+    def test_reextracts_archived_pages_in_worker_processes(self, site_config, archive, article_service):
+        """以多個子行程解析封存頁面並依連結更新文章"""
+        for i in range(6):
+            archive.store(f"{BASE_URL}/article/{i}", _page(i), encoding="utf-8")
+        # 其他網站的封存頁面不處理
+        archive.store("https://other.example.com/article/1", _page(99))
+
+        job = ArticleReextractionJob(
+            BnextContentExtractor, site_config, archive, article_service, max_workers=2, batch_size=2
+        )
+        result = job.run()
+
+        assert result["success"] is True
+        report = result["result"]
+        assert report["processed"] == 6
+        assert report["updated"] == 6
+        assert report["failed"] == 0
+        assert sum(w["pages"] for w in report["workers"]) == 6
+        assert all(w["pages_per_minute"] > 0 for w in report["workers"])
+        assert report["pages_per_minute"] > 0
+
+        article = article_service.get_article_by_link(f"{BASE_URL}/article/3")["article"]
+        assert article.content == "改版後的內文 3"
+        assert article.category == "AI 新分類"
+        assert article.author == "作者3"
+        assert article.tags == "標籤A,標籤B"
+        # 未列入更新欄位的標題維持原值
+        assert article.title == "文章 3"
+        # 內容雜湊與重新解析的結果一致，之後重新抓取時可判斷內容未變更
+        expected = BnextContentExtractor(config=site_config).parse_article_html(
+            _page(3).decode("utf-8"), f"{BASE_URL}/article/3"
+        )
+        assert expected["content_hash"]
+        assert article.content_hash == expected["content_hash"]
+
+    def test_selected_links_and_failures(self, site_config, archive, article_service):
+        """指定連結時只處理這些連結，未封存與無法解析的頁面分別計入"""
+        archive.store(f"{BASE_URL}/article/0", _page(0))
+        archive.store(f"{BASE_URL}/article/1", b"<html><body><p>no container</p></body></html>")
+        archive.store(f"{BASE_URL}/article/2", _page(2))
+
+        job = ArticleReextractionJob(
+            BnextContentExtractor, site_config, archive, article_service, max_workers=1
+        )
+        result = job.run([f"{BASE_URL}/article/0", f"{BASE_URL}/article/1", f"{BASE_URL}/article/5"])
+
+        report = result["result"]
+        assert report["processed"] == 2
+        assert report["updated"] == 1
+        assert report["failed"] == 1
+        assert report["failures"][0]["link"] == f"{BASE_URL}/article/1"
+        assert report["missing"] == 1
+        untouched = article_service.get_article_by_link(f"{BASE_URL}/article/2")["article"]
+        assert untouched.content == "舊的內文"
+
+    def test_no_archived_pages(self, site_config, archive, article_service):
+        """沒有封存頁面時直接返回"""
+        job = ArticleReextractionJob(BnextContentExtractor, site_config, archive, article_service)
+        result = job.run()
+        assert result["success"] is True
+        assert result["result"]["processed"] == 0
@@ -0,0 +1,148 @@
+"""測試爬蟲結果輸出 (CSV / Parquet)，包括分區路徑、分批寫入、欄位結構對齊與讀回。"""
+
+# Standard library imports
+import logging
+import os
+from datetime import datetime, timezone
+
+# Third party imports
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+# Local application imports
+from src.crawlers.result_sink import (
+    CsvResultSink,
+    ParquetResultSink,
+    ResultSink,
+    create_result_sink,
+    find_result_files,
+    load_results,
+    resolve_result_format,
+)
+from src.utils.enum_utils import ArticleScrapeStatus
+
+# flake8: noqa: F811
+# pylint: disable=redefined-outer-name
+
+logger = logging.getLogger(__name__)  # 使用統一的 logger
+
+
+def _articles(start, count, **extra):
+    data = {
+        "title": [f"文章 {i}" for i in range(start, start + count)],
+        "link": [f"https://example.com/{i}" for i in range(start, start + count)],
+        "is_scraped": [i % 2 == 0 for i in range(start, start + count)],
+    }
+    data.update(extra)
+    return pd.DataFrame(data)
+
+
+class TestResultFormat:
+    """輸出格式解析測試"""
+
+    @pytest.mark.parametrize(
+        "value, expected",
+        [(None, "csv"), ("csv", "csv"), ("PARQUET", "parquet"), ("xlsx", "csv")],
+    )
+    def test_resolve_result_format(self, value, expected):
+        """未指定或無效時使用 CSV"""
+        assert resolve_result_format(value) == expected
+
+    def test_parquet_falls_back_without_pyarrow(self, monkeypatch):
+        """未安裝 pyarrow 時退回 CSV"""
+        monkeypatch.setattr("src.crawlers.result_sink.pa", None)
+        assert resolve_result_format("parquet") == "csv"
+
+
+class TestParquetResultSink:
+    """Parquet 輸出測試"""
+
+    def test_partitioned_path(self, tmp_path):
+        """依任務與日期分區"""
+        sink = create_result_sink("parquet", str(tmp_path), 12, "articles", "20260101000000")
+        today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        assert isinstance(sink, ParquetResultSink)
+        assert sink.path == os.path.join(
+            str(tmp_path), "task=12", f"date={today}", "articles_20260101000000.parquet"
+        )
+
+    def test_each_batch_is_a_row_group(self, tmp_path):
+        """每批寫入一個 row group，壓縮格式為 zstd"""
+        path = str(tmp_path / "out.parquet")
+        with ParquetResultSink(path) as sink:
+            sink.write_dataframe(_articles(0, 25), batch_size=10)
+        metadata = pq.ParquetFile(path).metadata
+        assert sink.rows_written == 25
+        assert metadata.num_rows == 25
+        assert metadata.num_row_groups == 3
+        assert metadata.row_group(0).column(0).compression == "ZSTD"
+
+    def test_later_batches_align_to_first_schema(self, tmp_path):
+        """後續批次缺少的欄位補空值、多出的欄位忽略，空值欄位之後可寫入字串"""
+        path = str(tmp_path / "out.parquet")
+        with ParquetResultSink(path) as sink:
+            sink.write_batch(_articles(0, 2, category=[None, None]))
+            sink.write_batch(_articles(2, 2, category=["AI", "科技"], extra=[1, 2]))
+            sink.write_batch(_articles(4, 1).drop(columns=["is_scraped"]))
+        data = load_results(path)
+        assert list(data.columns) == ["title", "link", "is_scraped", "category"]
+        assert data["category"].tolist() == [None, None, "AI", "科技", None]
+        assert data["is_scraped"].tolist() == [True, False, True, False, None]
+
+    def test_mixed_type_columns_saved_as_text(self, tmp_path):
+        """枚舉與字串混合的欄位以字串值保存"""
+        path = str(tmp_path / "out.parquet")
+        statuses = [ArticleScrapeStatus.LINK_SAVED, ArticleScrapeStatus.CONTENT_SCRAPED.value]
+        with ParquetResultSink(path) as sink:
+            sink.write_batch(_articles(0, 2, scrape_status=statuses))
+        data = load_results(path)
+        assert data["scrape_status"].tolist() == [
+            ArticleScrapeStatus.LINK_SAVED.value,
+            ArticleScrapeStatus.CONTENT_SCRAPED.value,
+        ]
+
+    def test_write_after_close_raises(self, tmp_path):
+        """關閉後不能再寫入"""
+        sink = ParquetResultSink(str(tmp_path / "out.parquet"))
+        sink.close()
+        with pytest.raises(RuntimeError):
+            sink.write_batch(_articles(0, 1))
+
+
+class TestCsvResultSink:
+    """CSV 輸出測試"""
+
+    def test_base_sink_is_abstract(self, tmp_path):
+        """基底類別未實作 _write，不能直接建立"""
+        with pytest.raises(TypeError):
+            ResultSink(str(tmp_path / "out"))  # type: ignore[abstract]
+
+    def test_batches_appended(self, tmp_path):
+        """只有第一批寫入標題列，讀回時缺值為 None"""
+        sink = create_result_sink("csv", str(tmp_path), 5, "articles", "20260101000000")
+        assert isinstance(sink, CsvResultSink)
+        assert os.path.basename(sink.path) == "articles_5_20260101000000.csv"
+        with sink:
+            sink.write_batch(_articles(0, 2, category=["AI", "科技"]))
+            sink.write_batch(_articles(2, 1))
+        data = load_results(sink.path)
+        assert len(data) == 3
+        assert data["category"].tolist() == ["AI", "科技", None]
+
+
+class TestLoadResults:
+    """讀回分區結果測試"""
+
+    def test_filter_by_task_and_date(self, tmp_path):
+        """可依任務與日期分區篩選"""
+        for task_id in (1, 2):
+            with create_result_sink("parquet", str(tmp_path), task_id, "articles") as sink:
+                sink.write_batch(_articles(task_id * 10, 3))
+        today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+        assert len(find_result_files(str(tmp_path))) == 2
+        assert len(load_results(str(tmp_path))) == 6
+        task_rows = load_results(str(tmp_path), task_id=2, date=today)
+        assert task_rows["title"].tolist() == ["文章 20", "文章 21", "文章 22"]
+        assert load_results(str(tmp_path), task_id=3).empty
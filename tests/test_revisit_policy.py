@@ -0,0 +1,171 @@
+"""測試重訪策略，包括到期類別與頁數的決定、依新連結產出調整頁數與重訪間隔，以及各類別抓取統計。"""
+
+# Standard library imports
+import logging
+from datetime import datetime, timedelta, timezone
+
+# Third party imports
+import pytest
+
+# Local application imports
+from src.services.revisit_policy import (
+    RevisitPolicy,
+    build_category_stats,
+)
+from src.utils.model_utils import validate_task_args
+
+# flake8: noqa: F811
+# pylint: disable=redefined-outer-name
+
+logger = logging.getLogger(__name__)  # 使用統一的 logger
+
+NOW = datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def policy():
+    return RevisitPolicy(min_pages=1, max_interval_sec=86400)
+
+
+def _state(pages=2, interval_sec=0.0, last_visit_at=None, next_visit_at=None, **kwargs):
+    last_visit_at = last_visit_at or NOW - timedelta(hours=1)
+    next_visit_at = next_visit_at or last_visit_at + timedelta(seconds=interval_sec)
+    return {
+        "pages": pages,
+        "interval_sec": interval_sec,
+        "last_visit_at": last_visit_at.isoformat(),
+        "next_visit_at": next_visit_at.isoformat(),
+        "avg_new_links": 1.0,
+        "visits": 1,
+        **kwargs,
+    }
+
+
+class TestRevisitPolicyPlan:
+    """RevisitPolicy.plan 測試"""
+
+    def test_unknown_categories_use_max_pages(self, policy):
+        """沒有重訪狀態的類別抓取完整的 max_pages"""
+        category_pages, skipped = policy.plan(["ai", "tech"], None, max_pages=5, now=NOW)
+        assert category_pages == {"ai": 5, "tech": 5}
+        assert skipped == {}
+
+    def test_skips_categories_not_due(self, policy):
+        """未到期的類別略過，到期的類別使用記錄的頁數 (不超過 max_pages)"""
+        state = {
+            "quiet": _state(pages=1, interval_sec=7200, next_visit_at=NOW + timedelta(hours=1)),
+            "busy": _state(pages=8, interval_sec=0),
+        }
+        category_pages, skipped = policy.plan(["quiet", "busy", "new"], state, max_pages=5, now=NOW)
+        assert category_pages == {"busy": 5, "new": 5}
+        assert skipped == {"quiet": state["quiet"]["next_visit_at"]}
+
+    def test_due_within_tolerance(self, policy):
+        """觸發時間略早於下次重訪時間 (排程抖動) 時仍視為到期"""
+        state = {"ai": _state(pages=2, interval_sec=3600, next_visit_at=NOW + timedelta(seconds=60))}
+        category_pages, skipped = policy.plan(["ai"], state, max_pages=5, now=NOW)
+        assert category_pages == {"ai": 2}
+        assert skipped == {}
+
+
+class TestRevisitPolicyUpdate:
+    """RevisitPolicy.update 測試"""
+
+    def test_saturated_category_grows_depth(self, policy):
+        """最後一頁仍有新連結時頁數加倍、重訪間隔歸零"""
+        state = {"ai": _state(pages=2, interval_sec=3600)}
+        updated = policy.update(state, {"ai": [5, 3]}, {"ai": 2}, max_pages=3, now=NOW)
+        assert updated["ai"]["pages"] == 3
+        assert updated["ai"]["interval_sec"] == 0.0
+        assert updated["ai"]["next_visit_at"] == NOW.isoformat()
+        assert updated["ai"]["visits"] == 2
+
+    def test_depth_shrinks_to_last_page_with_new_links(self, policy):
+        """新連結只出現在前面的頁面時，頁數縮減為最後一個有新連結的頁數 + 1，重訪間隔減半"""
+        state = {"ai": _state(pages=5, interval_sec=7200)}
+        updated = policy.update(state, {"ai": [4, 0, 0, 0, 0]}, {"ai": 5}, max_pages=5, now=NOW)
+        assert updated["ai"]["pages"] == 2
+        assert updated["ai"]["interval_sec"] == 3600.0
+        assert updated["ai"]["avg_new_links"] == pytest.approx(0.3 * 4 + 0.7 * 1.0)
+
+    def test_quiet_category_backs_off(self, policy):
+        """沒有新連結時頁數降到 min_pages，重訪間隔至少為距上次重訪的時間並加倍到上限"""
+        state = {"ai": _state(pages=3, interval_sec=0, last_visit_at=NOW - timedelta(hours=1))}
+        updated = policy.update(state, {"ai": [0, 0, 0]}, {"ai": 3}, max_pages=5, now=NOW)
+        assert updated["ai"]["pages"] == 1
+        assert updated["ai"]["interval_sec"] == 3600.0
+
+        later = NOW + timedelta(hours=1)
+        updated = policy.update(updated, {"ai": [0]}, {"ai": 1}, max_pages=5, now=later)
+        assert updated["ai"]["interval_sec"] == 7200.0
+        assert updated["ai"]["next_visit_at"] == (later + timedelta(hours=2)).isoformat()
+
+        capped = policy.update({"ai": _state(interval_sec=80000)}, {"ai": [0]}, {"ai": 1}, max_pages=5, now=NOW)
+        assert capped["ai"]["interval_sec"] == 86400.0
+
+    def test_site_with_fewer_pages_is_not_saturated(self, policy):
+        """網站頁數少於計畫頁數時不視為還有更多新文章"""
+        updated = policy.update(None, {"ai": [3]}, {"ai": 4}, max_pages=4, now=NOW)
+        assert updated["ai"]["pages"] == 2
+        assert updated["ai"]["interval_sec"] == 0.0
+
+    def test_categories_without_pages_keep_state(self, policy):
+        """沒有抓到任何頁面 (請求失敗) 或略過的類別保留原本的狀態"""
+        state = {"failed": _state(pages=4, interval_sec=600), "skipped": _state(pages=2)}
+        updated = policy.update(state, {"failed": []}, {"failed": 4}, max_pages=5, now=NOW)
+        assert updated == state
+        assert updated is not state
+
+    def test_min_pages_bounds(self):
+        """min_pages 為頁數下限，但不超過任務的 max_pages"""
+        policy = RevisitPolicy(min_pages=2, max_interval_sec=3600)
+        updated = policy.update(None, {"ai": [0, 0, 0]}, {"ai": 3}, max_pages=3, now=NOW)
+        assert updated["ai"]["pages"] == 2
+        updated = policy.update(None, {"ai": [0]}, {"ai": 1}, max_pages=1, now=NOW)
+        assert updated["ai"]["pages"] == 1
+
+    def test_env_defaults(self, monkeypatch):
+        """未指定時使用環境變數，無效值使用預設值"""
+        monkeypatch.setenv("REVISIT_MIN_PAGES", "2")
+        monkeypatch.setenv("REVISIT_MAX_INTERVAL_SEC", "abc")
+        policy = RevisitPolicy()
+        assert policy.min_pages == 2
+        assert policy.max_interval_sec == 86400
+        assert RevisitPolicy(min_pages=3).min_pages == 3
+
+
+class TestCategoryStats:
+    """build_category_stats 與任務參數測試"""
+
+    def test_build_category_stats(self):
+        """統計頁數、請求數、新連結數與新連結/請求比例，並列出略過的類別"""
+        category_pages = {
+            "ai": {"requests": 3, "planned_pages": 2, "page_links": [["a", "b"], ["c"]]},
+            "empty": {"requests": 1, "planned_pages": 1, "page_links": []},
+        }
+        stats = build_category_stats(
+            category_pages, {"ai": [2, 1], "empty": []}, {"quiet": "2026-01-01T13:00:00+00:00"}
+        )
+        assert stats["ai"] == {
+            "planned_pages": 2,
+            "pages": 2,
+            "requests": 3,
+            "links": 3,
+            "new_links": 3,
+            "new_links_per_page": 1.5,
+            "yield_ratio": 1.0,
+        }
+        assert stats["empty"]["yield_ratio"] == 0.0
+        assert stats["quiet"] == {
+            "skipped": True,
+            "requests": 0,
+            "next_visit_at": "2026-01-01T13:00:00+00:00",
+        }
+
+    def test_task_args(self):
+        """adaptive_revisit 相關任務參數通過驗證"""
+        validated = validate_task_args("task_args")(
+            {"adaptive_revisit": True, "min_pages": 2, "revisit_max_interval_sec": 3600},
+            is_update=True,
+        )
+        assert validated == {"adaptive_revisit": True, "min_pages": 2, "revisit_max_interval_sec": 3600}
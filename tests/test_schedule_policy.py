@@ -0,0 +1,173 @@
+"""測試排程策略，包括確定性分散偏移、抖動窗口、觸發器序列化與每個爬蟲的啟動上限。"""
+
+# Standard library imports
+import logging
+import pickle
+from datetime import datetime, timezone
+
+# Third party imports
+import pytest
+
+# Local application imports
+from src.services.schedule_policy import (
+    CrawlerStartLimiter,
+    SchedulePolicy,
+    SpreadCronTrigger,
+    spread_offset_seconds,
+)
+from src.utils.model_utils import validate_task_args
+
+# flake8: noqa: F811
+# pylint: disable=redefined-outer-name
+
+logger = logging.getLogger(__name__)  # 使用統一的 logger
+
+
+class FakeClock:
+    """可手動推進的時鐘"""
+
+    def __init__(self, start: float = 1000.0):
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _limiter(clock, max_starts=2, window_seconds=10.0):
+    return CrawlerStartLimiter(
+        max_starts=max_starts,
+        window_seconds=window_seconds,
+        clock=clock,
+    )
+
+
+class TestSpreadOffset:
+    """確定性分散偏移測試"""
+
+    def test_offset_is_stable_and_within_window(self):
+        """相同任務 ID 的偏移固定，且落在窗口內"""
+        offsets = [spread_offset_seconds(task_id, 60) for task_id in range(1, 201)]
+        assert offsets == [spread_offset_seconds(task_id, 60) for task_id in range(1, 201)]
+        assert all(0 <= offset < 60 for offset in offsets)
+        # 200 個任務應分散到大部分秒數上
+        assert len(set(offsets)) > 40
+
+    def test_zero_window_disables_spread(self):
+        """窗口為 0 時不偏移"""
+        assert spread_offset_seconds(123, 0) == 0
+
+
+class TestSpreadCronTrigger:
+    """帶偏移的 cron 觸發器測試"""
+
+    def test_fires_at_offset(self):
+        """觸發時間為 cron 時間加上偏移，且偏移不會累積"""
+        trigger = SpreadCronTrigger("0 9 * * *", offset_seconds=125)
+        now = datetime(2026, 1, 1, 8, 0, tzinfo=timezone.utc)
+        first = trigger.get_next_fire_time(None, now)
+        assert first == datetime(2026, 1, 1, 9, 2, 5, tzinfo=timezone.utc)
+        second = trigger.get_next_fire_time(first, first)
+        assert second == datetime(2026, 1, 2, 9, 2, 5, tzinfo=timezone.utc)
+
+    def test_inside_offset_window_still_fires_today(self):
+        """cron 時間已過但偏移後時間未到時，本次仍會觸發"""
+        trigger = SpreadCronTrigger("0 9 * * *", offset_seconds=125)
+        now = datetime(2026, 1, 1, 9, 1, tzinfo=timezone.utc)
+        assert trigger.get_next_fire_time(None, now) == datetime(
+            2026, 1, 1, 9, 2, 5, tzinfo=timezone.utc
+        )
+
+    def test_pickle_round_trip(self):
+        """持久化到 job store 後仍保留 cron 表達式與偏移"""
+        trigger = SpreadCronTrigger("*/30 * * * *", offset_seconds=17, jitter=5)
+        restored = pickle.loads(pickle.dumps(trigger))
+        assert restored.expression == "*/30 * * * *"
+        assert restored.offset_seconds == 17
+        assert restored.jitter == 5
+
+    def test_invalid_expression(self):
+        """欄位數錯誤的 cron 表達式拋出 ValueError"""
+        with pytest.raises(ValueError):
+            SpreadCronTrigger("0 9 * *")
+
+
+class TestSchedulePolicy:
+    """排程策略測試"""
+
+    def test_task_jitter_overrides_global(self):
+        """task_args.schedule_jitter_sec 優先於全域抖動"""
+        policy = SchedulePolicy(spread_seconds=60, jitter_seconds=30)
+        assert policy.build_trigger(1, "0 * * * *").jitter == 30
+        assert policy.build_trigger(1, "0 * * * *", {"schedule_jitter_sec": 5}).jitter == 5
+        assert policy.build_trigger(1, "0 * * * *", {"schedule_jitter_sec": 0}).jitter is None
+
+    def test_schedule_jitter_sec_kept_by_task_args_validation(self):
+        """schedule_jitter_sec 為可選的任務參數，不可為負數"""
+        validator = validate_task_args("task_args", required=False)
+        validated = validator({"schedule_jitter_sec": 15}, is_update=True)
+        assert validated["schedule_jitter_sec"] == 15
+        with pytest.raises(Exception):
+            validator({"schedule_jitter_sec": -1}, is_update=True)
+
+    def test_env_configuration(self, monkeypatch):
+        """由環境變數設定分散窗口與啟動上限，無效值使用預設值"""
+        monkeypatch.setenv("SCHEDULER_SPREAD_SEC", "120")
+        monkeypatch.setenv("SCHEDULER_JITTER_SEC", "abc")
+        monkeypatch.setenv("SCHEDULER_MAX_STARTS_PER_CRAWLER", "3")
+        policy = SchedulePolicy()
+        assert policy.spread_seconds == 120
+        assert policy.jitter_seconds == 0
+        assert policy.start_limiter.max_starts == 3
+
+
+class TestCrawlerStartLimiter:
+    """每個爬蟲的啟動上限測試"""
+
+    def test_defers_starts_over_limit(self):
+        """超過上限時不等待，返回窗口內最早的啟動過期前的秒數，名額釋出後可再取得"""
+        clock = FakeClock()
+        limiter = _limiter(clock)
+        assert limiter.try_acquire(1) == 0
+        clock.now += 4
+        assert limiter.try_acquire(1) == 0
+        assert limiter.try_acquire(1) == pytest.approx(6.0)
+        # 其他爬蟲不受影響
+        assert limiter.try_acquire(2) == 0
+
+        clock.now += 6
+        assert limiter.try_acquire(1) == 0
+
+        metrics = limiter.get_metrics()
+        assert metrics["total_starts"] == 4
+        assert metrics["deferred_starts"] == 1
+        assert metrics["avg_defer_sec"] == pytest.approx(6.0)
+
+    def test_unlimited_when_zero(self):
+        """上限為 0 時不限制"""
+        clock = FakeClock()
+        limiter = _limiter(clock, max_starts=0)
+        assert all(limiter.try_acquire(1) == 0 for _ in range(10))
+
+    def test_peak_starts_reduced_by_spread(self):
+        """同一分鐘的任務經過分散後，指標中的每秒尖峰啟動數下降"""
+        task_ids = range(1, 101)
+        base = datetime(2026, 1, 1, 8, 0, tzinfo=timezone.utc)
+
+        def peak_for(spread_seconds):
+            clock = FakeClock(0)
+            limiter = _limiter(clock, max_starts=0)
+            policy = SchedulePolicy(spread_seconds=spread_seconds, jitter_seconds=0, start_limiter=limiter)
+            fire_times = sorted(
+                (
+                    policy.build_trigger(task_id, "0 9 * * *").get_next_fire_time(None, base),
+                    task_id,
+                )
+                for task_id in task_ids
+            )
+            for fire_time, task_id in fire_times:
+                clock.now = fire_time.timestamp()
+                limiter.try_acquire(task_id)
+            return policy.get_metrics()["peak_starts_per_sec"]
+
+        assert peak_for(0) == 100
+        assert peak_for(60) <= 10
@@ -0,0 +1,229 @@
+"""測試排程器領導者選舉，包括檔案鎖、PostgreSQL advisory lock 與領導權的取得、交接與卸任。"""
+
+# Standard library imports
+import logging
+from unittest.mock import MagicMock
+
+# Third party imports
+import pytest
+
+# Local application imports
+from src.services.scheduler_leader import (
+    FileLeaderLock,
+    PostgresAdvisoryLock,
+    SchedulerLeaderElection,
+    create_leader_lock,
+    get_scheduler_health,
+    is_leader_election_enabled,
+)
+
+# flake8: noqa: F811
+# pylint: disable=redefined-outer-name
+
+logger = logging.getLogger(__name__)  # 使用統一的 logger
+
+
+@pytest.fixture
+def lock_path(tmp_path):
+    """測試用的鎖檔案路徑"""
+    return str(tmp_path / "scheduler.lock")
+
+
+def _mock_scheduler_service(start_success=True):
+    """模擬排程服務，記錄啟動/停止狀態"""
+    service = MagicMock()
+    state = {"running": False}
+
+    def start_scheduler():
+        state["running"] = start_success
+        return {"success": start_success, "message": "ok" if start_success else "失敗"}
+
+    def stop_scheduler():
+        state["running"] = False
+        return {"success": True, "message": "已暫停"}
+
+    service.start_scheduler.side_effect = start_scheduler
+    service.stop_scheduler.side_effect = stop_scheduler
+    service.is_running.side_effect = lambda: state["running"]
+    return service
+
+
+class TestFileLeaderLock:
+    """檔案鎖測試"""
+
+    def test_only_one_holder(self, lock_path):
+        """同一個鎖檔案同時只能有一個持有者"""
+        first = FileLeaderLock(lock_path)
+        second = FileLeaderLock(lock_path)
+        assert first.try_acquire() is True
+        assert second.try_acquire() is False
+        assert first.is_held() is True
+        assert second.is_held() is False
+
+        first.release()
+        assert first.is_held() is False
+        assert second.try_acquire() is True
+        second.release()
+
+    def test_acquire_is_idempotent(self, lock_path):
+        """已持有時再次取得仍返回 True"""
+        lock = FileLeaderLock(lock_path)
+        assert lock.try_acquire() is True
+        assert lock.try_acquire() is True
+        lock.release()
+
+
+class TestPostgresAdvisoryLock:
+    """PostgreSQL advisory lock 測試 (以模擬的 engine 驗證連線處理)"""
+
+    def test_acquire_keeps_connection(self):
+        """取得鎖後保留專用連線，釋放時解鎖並關閉"""
+        engine = MagicMock()
+        connection = engine.connect.return_value
+        connection.execute.return_value.scalar.return_value = True
+
+        lock = PostgresAdvisoryLock(engine, lock_key=42)
+        assert lock.try_acquire() is True
+        connection.close.assert_not_called()
+        assert lock.is_held() is True
+
+        lock.release()
+        connection.close.assert_called_once()
+        assert lock.is_held() is False
+
+    def test_acquire_fails_closes_connection(self):
+        """未取得鎖時關閉連線"""
+        engine = MagicMock()
+        connection = engine.connect.return_value
+        connection.execute.return_value.scalar.return_value = False
+
+        lock = PostgresAdvisoryLock(engine, lock_key=42)
+        assert lock.try_acquire() is False
+        connection.close.assert_called_once()
+
+    def test_lost_connection_releases_leadership(self):
+        """連線中斷時視為失去鎖"""
+        engine = MagicMock()
+        connection = engine.connect.return_value
+        connection.execute.return_value.scalar.return_value = True
+
+        lock = PostgresAdvisoryLock(engine, lock_key=42)
+        assert lock.try_acquire() is True
+        connection.execute.side_effect = Exception("server closed the connection")
+        assert lock.is_held() is False
+
+
+class TestSchedulerLeaderElection:
+    """領導者選舉測試"""
+
+    def test_only_one_process_starts_scheduler(self, lock_path):
+        """兩個行程競爭時只有一個啟動排程器，領導者停止後由另一個接手"""
+        service_a = _mock_scheduler_service()
+        service_b = _mock_scheduler_service()
+        election_a = SchedulerLeaderElection(service_a, FileLeaderLock(lock_path), 60)
+        election_b = SchedulerLeaderElection(service_b, FileLeaderLock(lock_path), 60)
+
+        assert election_a.check_leadership() is True
+        assert election_b.check_leadership() is False
+        service_a.start_scheduler.assert_called_once()
+        service_b.start_scheduler.assert_not_called()
+
+        election_a.stop()
+        service_a.stop_scheduler.assert_called_once()
+        assert election_a.is_leader is False
+
+        assert election_b.check_leadership() is True
+        service_b.start_scheduler.assert_called_once()
+        election_b.stop()
+
+    def test_steps_down_when_lock_lost(self):
+        """領導者鎖失效時暫停排程器"""
+        service = _mock_scheduler_service()
+        lock = MagicMock()
+        lock.try_acquire.return_value = True
+        election = SchedulerLeaderElection(service, lock, 60)
+        assert election.check_leadership() is True
+
+        lock.is_held.return_value = False
+        assert election.check_leadership() is False
+        service.stop_scheduler.assert_called_once()
+        lock.release.assert_called_once()
+
+    def test_start_failure_releases_lock(self, lock_path):
+        """取得鎖但排程器啟動失敗時釋放鎖，讓其他行程接手"""
+        failing = SchedulerLeaderElection(
+            _mock_scheduler_service(start_success=False), FileLeaderLock(lock_path), 60
+        )
+        assert failing.check_leadership() is False
+
+        other = SchedulerLeaderElection(
+            _mock_scheduler_service(), FileLeaderLock(lock_path), 60
+        )
+        assert other.check_leadership() is True
+        other.stop()
+
+    def test_get_status(self, lock_path):
+        """狀態包含領導權與鎖類型"""
+        election = SchedulerLeaderElection(
+            _mock_scheduler_service(), FileLeaderLock(lock_path), 60
+        )
+        election.check_leadership()
+        status = election.get_status()
+        assert status["enabled"] is True
+        assert status["is_leader"] is True
+        assert status["lock_type"] == "file_lock"
+        election.stop()
+
+    @pytest.mark.parametrize(
+        "running, leader_status, expected_leader, expected_healthy",
+        [
+            (True, {"enabled": False}, True, True),
+            (False, {"enabled": False}, True, False),
+            (True, {"enabled": True, "is_leader": True}, True, True),
+            (False, {"enabled": True, "is_leader": True}, True, False),
+            (False, {"enabled": True, "is_leader": False}, False, True),
+        ],
+    )
+    def test_get_scheduler_health(
+        self, running, leader_status, expected_leader, expected_healthy
+    ):
+        """只有應運行排程器的行程 (領導者或未啟用選舉) 排程器未運行時才不健康"""
+        health = get_scheduler_health(running, leader_status)
+        assert health == {
+            "running": running,
+            "is_leader": expected_leader,
+            "healthy": expected_healthy,
+        }
+
+
+class TestLeaderLockFactory:
+    """鎖類型選擇與設定測試"""
+
+    def test_sqlite_uses_file_lock(self, monkeypatch, lock_path):
+        """SQLite 使用檔案鎖，路徑可由環境變數設定"""
+        monkeypatch.setenv("SCHEDULER_LOCK_FILE", lock_path)
+        db_manager = MagicMock()
+        db_manager.engine.dialect.name = "sqlite"
+        lock = create_leader_lock(db_manager)
+        assert isinstance(lock, FileLeaderLock)
+        assert lock.path == lock_path
+
+    def test_postgres_uses_advisory_lock(self, monkeypatch):
+        """PostgreSQL 使用 advisory lock"""
+        monkeypatch.setenv("SCHEDULER_LEADER_LOCK_KEY", "123")
+        db_manager = MagicMock()
+        db_manager.engine.dialect.name = "postgresql"
+        lock = create_leader_lock(db_manager)
+        assert isinstance(lock, PostgresAdvisoryLock)
+        assert lock.lock_key == 123
+
+    @pytest.mark.parametrize(
+        "value, expected", [(None, True), ("false", False), ("true", True)]
+    )
+    def test_is_leader_election_enabled(self, monkeypatch, value, expected):
+        """環境變數控制是否啟用領導者選舉"""
+        if value is None:
+            monkeypatch.delenv("SCHEDULER_LEADER_ELECTION", raising=False)
+        else:
+            monkeypatch.setenv("SCHEDULER_LEADER_ELECTION", value)
+        assert is_leader_election_enabled() is expected
@@ -2,6 +2,7 @@
 
 # 標準函式庫
 import logging
+import threading
 from datetime import datetime, timedelta, timezone
 from unittest.mock import ANY, MagicMock, patch
 
@@ -9,17 +10,21 @@ from unittest.mock import ANY, MagicMock, patch
 import pytest
 import pytz
 from apscheduler.schedulers import SchedulerNotRunningError
+from apscheduler.schedulers.base import STATE_PAUSED
 from sqlalchemy import text
 from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import Session
 
 # 本地應用程式 imports
 from src.database.crawler_tasks_repository import CrawlerTasksRepository
+from src.database.scheduler_task_change_repository import SchedulerTaskChangeRepository
 from src.database.database_manager import DatabaseManager
 from src.models.base_model import Base
 from src.models.crawler_tasks_model import CrawlerTasks, ScrapeMode, ScrapePhase
 from src.models.crawlers_model import Crawlers
-from src.services.scheduler_service import SchedulerService
+from src.models.scheduler_task_change_model import SchedulerTaskChange
+from src.services.crawler_task_service import CrawlerTaskService
+from src.services.scheduler_service import SchedulerService, run_schedule_sync_loop
 from src.services.task_executor_service import TaskExecutorService
 from src.utils.enum_utils import TaskStatus
 
@@ -289,6 +294,30 @@ class TestSchedulerService:
         )
         assert mock_schedule.call_count == expected_auto_tasks_count
 
+    def test_start_scheduler_resumes_paused(
+        self, scheduler_service_with_mocks, sample_tasks_data: dict
+    ):
+        """測試暫停後再次啟動 (例如重新取得領導權) 時恢復排程器而非重新啟動"""
+        scheduler_service, _ = scheduler_service_with_mocks
+        scheduler_service.cron_scheduler.state = STATE_PAUSED
+
+        with patch.object(
+            scheduler_service, "_schedule_task", return_value=True
+        ), patch.object(
+            scheduler_service.cron_scheduler, "start"
+        ) as mock_start, patch.object(
+            scheduler_service.cron_scheduler, "get_jobs", return_value=[]
+        ), patch.object(
+            scheduler_service.cron_scheduler, "get_job", return_value=None
+        ), patch.object(
+            scheduler_service.cron_scheduler, "resume"
+        ) as mock_resume:
+            result = scheduler_service.start_scheduler()
+
+        assert result["success"] is True
+        mock_resume.assert_called_once()
+        mock_start.assert_not_called()
+
     def test_stop_scheduler(self, scheduler_service_with_mocks):
         """測試停止排程器"""
         scheduler_service, _ = scheduler_service_with_mocks
@@ -396,6 +425,44 @@ class TestSchedulerService:
         mock_get_executor.assert_not_called()
         mock_executor_instance.execute_task.assert_not_called()
 
+    @patch("src.services.scheduler_service.get_schedule_policy")
+    @patch("src.services.scheduler_service.get_scheduler_service")
+    @patch("src.database.crawler_tasks_repository.CrawlerTasksRepository.get_by_id")
+    @patch("src.services.scheduler_service.get_task_executor_service")
+    def test_trigger_task_over_start_limit(
+        self,
+        mock_get_executor,
+        mock_get_by_id,
+        mock_get_scheduler_service,
+        mock_get_policy,
+        sample_tasks_data: dict,
+    ):
+        """爬蟲啟動數達上限時不等待也不執行，改排下次執行時間；原本的下次執行時間較早時略過"""
+        task_data = sample_tasks_data["Auto Task"]
+        mock_get_by_id.return_value = MagicMock(spec=CrawlerTasks, **task_data)
+        mock_get_policy.return_value.start_limiter.try_acquire.return_value = 20.0
+        cron_scheduler = mock_get_scheduler_service.return_value.cron_scheduler
+        cron_scheduler.get_job.return_value = MagicMock(
+            next_run_time=datetime.now(timezone.utc) + timedelta(hours=1)
+        )
+
+        before = datetime.now(timezone.utc)
+        SchedulerService._trigger_task(task_data["id"], task_data["task_args"])
+        mock_get_executor.assert_not_called()
+        cron_scheduler.modify_job.assert_called_once()
+        job_id = cron_scheduler.modify_job.call_args.args[0]
+        next_run_time = cron_scheduler.modify_job.call_args.kwargs["next_run_time"]
+        assert job_id == f"task_{task_data['id']}"
+        assert before + timedelta(seconds=19) <= next_run_time <= before + timedelta(seconds=25)
+
+        cron_scheduler.reset_mock()
+        cron_scheduler.get_job.return_value = MagicMock(
+            next_run_time=datetime.now(timezone.utc) + timedelta(seconds=5)
+        )
+        SchedulerService._trigger_task(task_data["id"], task_data["task_args"])
+        mock_get_executor.assert_not_called()
+        cron_scheduler.modify_job.assert_not_called()
+
     def test_add_or_update_task_to_scheduler(
         self,
         scheduler_service_with_mocks,
@@ -734,3 +801,150 @@ class TestSchedulerService:
         assert "cron_expression_in_db" not in job_info_stale
 
         mock_get_jobs.assert_called_once()
+
+
+class TestSchedulerTaskSync:
+    """測試以排程變更記錄進行的增量同步"""
+
+    @staticmethod
+    def _record_changes(db_manager, *task_ids):
+        with db_manager.session_scope() as session:
+            repo = SchedulerTaskChangeRepository(session, SchedulerTaskChange)
+            for task_id in task_ids:
+                repo.record_change(task_id)
+
+    def test_sync_applies_only_changed_tasks(
+        self,
+        scheduler_service_with_mocks,
+        sample_tasks_data: dict,
+        initialized_db_manager: DatabaseManager,
+    ):
+        """只處理有變更記錄的任務：自動任務重新排程，已刪除的任務移除作業，重複變更只套用一次"""
+        scheduler_service, _ = scheduler_service_with_mocks
+        scheduler_service.scheduler_status["running"] = True
+        auto_task_id = sample_tasks_data["Auto Task"]["id"]
+        self._record_changes(initialized_db_manager, auto_task_id, 999, auto_task_id)
+
+        recorded_task_ids = []
+
+        def add_update_side_effect(task_obj, session_arg):
+            recorded_task_ids.append(task_obj.id)
+            return {"success": True, "added_count": 0, "updated_count": 1}
+
+        with patch.object(
+            scheduler_service,
+            "add_or_update_task_to_scheduler",
+            side_effect=add_update_side_effect,
+        ), patch.object(
+            scheduler_service.cron_scheduler, "get_job", return_value=MagicMock()
+        ), patch.object(
+            scheduler_service.cron_scheduler, "remove_job"
+        ) as mock_remove_job, patch.object(
+            scheduler_service.cron_scheduler, "get_jobs", return_value=[]
+        ):
+            result = scheduler_service.sync_task_changes()
+            assert result["success"] is True
+            assert result["scheduled_count"] == 1
+            assert result["removed_count"] == 1
+            assert recorded_task_ids == [auto_task_id]
+            mock_remove_job.assert_called_once_with("task_999")
+
+            # 已套用的變更不會重複處理
+            second = scheduler_service.sync_task_changes()
+            assert second["success"] is True
+            assert second["scheduled_count"] == 0
+            assert recorded_task_ids == [auto_task_id]
+
+        assert scheduler_service.scheduler_status["synced_change_count"] == 3
+        scheduler_service.scheduler_status["running"] = False
+
+    def test_task_service_changes_reach_scheduler(
+        self,
+        scheduler_service_with_mocks,
+        sample_tasks_data: dict,
+        initialized_db_manager: DatabaseManager,
+    ):
+        """CrawlerTaskService 停用任務後，下一次同步即移除作業並標記為未排程"""
+        scheduler_service, _ = scheduler_service_with_mocks
+        scheduler_service.scheduler_status["running"] = True
+        scheduled_task_id = sample_tasks_data["Scheduled Task"]["id"]
+
+        task_service = CrawlerTaskService(initialized_db_manager)
+        assert task_service.toggle_active_status(scheduled_task_id)["success"] is True
+
+        with patch.object(
+            scheduler_service.cron_scheduler, "get_job", return_value=MagicMock()
+        ), patch.object(
+            scheduler_service.cron_scheduler, "remove_job"
+        ) as mock_remove_job, patch.object(
+            scheduler_service.cron_scheduler, "get_jobs", return_value=[]
+        ):
+            result = scheduler_service.sync_task_changes()
+
+        assert result["removed_count"] == 1
+        mock_remove_job.assert_called_once_with(f"task_{scheduled_task_id}")
+        with initialized_db_manager.session_scope() as session:
+            assert session.get(CrawlerTasks, scheduled_task_id).is_scheduled is False
+        scheduler_service.scheduler_status["running"] = False
+
+    def test_full_reload_skips_already_covered_changes(
+        self,
+        scheduler_service_with_mocks,
+        sample_tasks_data: dict,
+        initialized_db_manager: DatabaseManager,
+    ):
+        """完整重載後，重載前的變更記錄不需要再套用"""
+        scheduler_service, _ = scheduler_service_with_mocks
+        scheduler_service.scheduler_status["running"] = True
+        self._record_changes(
+            initialized_db_manager, sample_tasks_data["Auto Task"]["id"]
+        )
+
+        with patch.object(
+            scheduler_service,
+            "add_or_update_task_to_scheduler",
+            return_value={"success": True, "added_count": 0, "updated_count": 0},
+        ) as mock_add_update, patch.object(
+            scheduler_service.cron_scheduler, "get_jobs", return_value=[]
+        ):
+            assert scheduler_service.reload_scheduler()["success"] is True
+            mock_add_update.reset_mock()
+            result = scheduler_service.sync_task_changes()
+
+        assert result["message"] == "沒有新的排程變更"
+        mock_add_update.assert_not_called()
+        scheduler_service.scheduler_status["running"] = False
+
+    def test_sync_requires_running_scheduler(self, scheduler_service_with_mocks):
+        """排程器未運行 (非領導者) 時不同步"""
+        scheduler_service, _ = scheduler_service_with_mocks
+        result = scheduler_service.sync_task_changes()
+        assert result["success"] is False
+        assert "調度器未運行" in result["message"]
+
+    def test_sync_loop_runs_incremental_and_periodic_reload(self):
+        """同步迴圈每次套用增量變更，達到重載間隔時改為完整重載"""
+        scheduler = MagicMock()
+        scheduler.is_running.return_value = True
+        stop_event = threading.Event()
+
+        def stop_after_reload():
+            stop_event.set()
+            return {"success": True}
+
+        scheduler.reload_scheduler.side_effect = stop_after_reload
+        thread = threading.Thread(
+            target=run_schedule_sync_loop,
+            kwargs={
+                "scheduler_service_getter": lambda: scheduler,
+                "stop_event": stop_event,
+                "sync_interval": 0.01,
+                "reload_interval": 0.2,
+            },
+        )
+        thread.start()
+        thread.join(5)
+
+        assert not thread.is_alive()
+        assert scheduler.sync_task_changes.call_count >= 1
+        scheduler.reload_scheduler.assert_called_once()
@@ -0,0 +1,70 @@
+"""測試 SchedulerTaskChangeRepository 的功能，包括變更記錄的寫入、增量讀取與清理。"""
+
+# Standard library imports
+import logging
+from datetime import datetime, timedelta, timezone
+
+# Third party imports
+import pytest
+
+# Local application imports
+from src.models.base_model import Base
+from src.models.scheduler_task_change_model import SchedulerTaskChange
+from src.database.scheduler_task_change_repository import SchedulerTaskChangeRepository
+from src.error.errors import ValidationError
+
+# flake8: noqa: F811
+# pylint: disable=redefined-outer-name
+
+logger = logging.getLogger(__name__)  # 使用統一的 logger
+
+
+@pytest.fixture(scope="function")
+def initialized_db_manager(db_manager_for_test):
+    """建立資料表後提供資料庫管理器"""
+    db_manager_for_test.create_tables(Base)
+    yield db_manager_for_test
+
+
+class TestSchedulerTaskChangeRepository:
+    """SchedulerTaskChangeRepository 測試"""
+
+    def test_record_and_find_changes_after(self, initialized_db_manager):
+        """依 id 遞增讀取指定游標之後的變更"""
+        with initialized_db_manager.session_scope() as session:
+            repo = SchedulerTaskChangeRepository(session, SchedulerTaskChange)
+            assert repo.get_latest_change_id() == 0
+            first = repo.record_change(1)
+            repo.record_change(2)
+            repo.record_change(1)
+
+            changes = repo.find_changes_after(0)
+            assert [c["task_id"] for c in changes] == [1, 2, 1]
+            assert repo.get_latest_change_id() == changes[-1]["id"]
+
+            after_first = repo.find_changes_after(first.id)
+            assert [c["task_id"] for c in after_first] == [2, 1]
+            assert repo.find_changes_after(first.id, limit=1) == after_first[:1]
+
+    def test_record_change_requires_task_id(self, initialized_db_manager):
+        """task_id 必須為正整數，且記錄不可修改"""
+        with initialized_db_manager.session_scope() as session:
+            repo = SchedulerTaskChangeRepository(session, SchedulerTaskChange)
+            with pytest.raises(ValidationError):
+                repo.record_change(0)
+            change = repo.record_change(3)
+            with pytest.raises(ValidationError):
+                repo.update(change.id, {"task_id": 4})
+
+    def test_purge_before(self, initialized_db_manager):
+        """清理指定時間之前的記錄"""
+        now = datetime.now(timezone.utc)
+        with initialized_db_manager.session_scope() as session:
+            repo = SchedulerTaskChangeRepository(session, SchedulerTaskChange)
+            old_change = repo.record_change(1)
+            old_change.created_at = now - timedelta(days=2)
+            repo.record_change(2)
+            session.flush()
+
+            assert repo.purge_before(now - timedelta(days=1)) == 1
+            assert [c["task_id"] for c in repo.find_changes_after(0)] == [2]
@@ -0,0 +1,182 @@
+"""測試 SimHash 指紋計算與文章近似重複偵測 (分段索引查詢、連結原始文章與跳過重複文章)。"""
+
+# Standard library imports
+import logging
+import random
+
+# Third party imports
+import pytest
+
+# Local application imports
+from src.database.articles_repository import ArticlesRepository
+from src.models.articles_model import Articles
+from src.models.base_model import Base
+from src.services.article_service import ArticleService
+from src.utils.enum_utils import ArticleScrapeStatus
+from src.utils.simhash_utils import (
+    SIMHASH_BANDS,
+    compute_simhash,
+    from_signed64,
+    get_max_hamming_distance,
+    hamming_distance,
+    split_bands,
+    to_signed64,
+)
+
+# flake8: noqa: F811
+# pylint: disable=redefined-outer-name
+
+logger = logging.getLogger(__name__)  # 使用統一的 logger
+
+_VOCABULARY = [chr(0x4E00 + i) for i in range(3000)]
+
+
+def _story(seed, length=2000):
+    rng = random.Random(seed)
+    return "".join(rng.choices(_VOCABULARY, k=length))
+
+
+def _article(link, content, **kwargs):
+    data = {
+        "title": "測試文章",
+        "link": link,
+        "content": content,
+        "source": "測試來源",
+        "source_url": "https://example.com",
+        "is_ai_related": True,
+        "is_scraped": True,
+        "scrape_status": ArticleScrapeStatus.CONTENT_SCRAPED,
+    }
+    data.update(kwargs)
+    return data
+
+
+@pytest.fixture
+def article_service(db_manager_for_test):
+    db_manager_for_test.create_tables(Base)
+    return ArticleService(db_manager_for_test)
+
+
+class TestSimhash:
+    """指紋計算測試"""
+
+    def test_same_story_with_whitespace_and_punctuation_changes(self):
+        """只有空白、標點與全半形不同的內容指紋相同"""
+        story = _story(1)
+        variant = "  " + story[:500] + "，\n" + story[500:] + "。"
+        assert compute_simhash(story) == compute_simhash(variant)
+
+    def test_near_and_unrelated_distances(self):
+        """小幅修改的內容距離很近，不相關內容距離很遠"""
+        story = _story(2)
+        edited = story[:1000] + "（本文轉載自合作媒體）" + story[1000:]
+        assert hamming_distance(compute_simhash(story), compute_simhash(edited)) <= 3
+        assert hamming_distance(compute_simhash(story), compute_simhash(_story(3))) > 10
+
+    def test_short_content_has_no_fingerprint(self):
+        """內容太短時不計算指紋"""
+        assert compute_simhash("短內容") is None
+        assert compute_simhash(None) is None
+
+    def test_bands_and_signed_round_trip(self):
+        """分段可以組回原指紋，有號轉換可還原"""
+        fingerprint = compute_simhash(_story(4))
+        bands = split_bands(fingerprint)
+        assert len(bands) == SIMHASH_BANDS
+        assert sum(band << (16 * i) for i, band in enumerate(bands)) == fingerprint
+        assert from_signed64(to_signed64(fingerprint)) == fingerprint
+        assert -(1 << 63) <= to_signed64(fingerprint) < (1 << 63)
+
+    def test_max_distance_is_capped_by_bands(self, monkeypatch):
+        """最大距離不可超過分段數 - 1"""
+        monkeypatch.setenv("NEAR_DUPLICATE_MAX_DISTANCE", "10")
+        assert get_max_hamming_distance() == SIMHASH_BANDS - 1
+
+
+class TestNearDuplicateDetection:
+    """文章近似重複偵測測試"""
+
+    def test_links_duplicate_to_canonical(self, article_service, monkeypatch):
+        """不同網址的同一篇文章連結到最早保存的原始文章"""
+        monkeypatch.delenv("NEAR_DUPLICATE_POLICY", raising=False)
+        story = _story(5)
+        result = article_service.batch_create_articles(
+            [
+                _article("https://example.com/news/1", story),
+                _article("https://example.com/ai/news/1?utm_source=feed", story + "。"),
+                _article("https://partner.example.org/1", story[:1800] + "合作媒體" + story[1800:]),
+                _article("https://example.com/news/2", _story(6)),
+            ]
+        )
+        assert result["success"] is True
+        assert result["resultMsg"]["linked_duplicate_count"] == 2
+
+        by_link = {a.link: a for a in result["resultMsg"]["inserted_articles"]}
+        canonical = by_link["https://example.com/news/1"]
+        assert canonical.duplicate_of_id is None
+        assert by_link["https://example.com/ai/news/1?utm_source=feed"].duplicate_of_id == canonical.id
+        assert by_link["https://partner.example.org/1"].duplicate_of_id == canonical.id
+        assert by_link["https://example.com/news/2"].duplicate_of_id is None
+
+    def test_content_update_links_existing_article(self, article_service):
+        """先保存連結、之後才寫入內容的文章，在更新內容時連結原始文章"""
+        story = _story(7)
+        article_service.batch_create_articles(
+            [
+                _article("https://example.com/a", story),
+                _article("https://example.com/b", None, is_scraped=False,
+                         scrape_status=ArticleScrapeStatus.LINK_SAVED),
+            ]
+        )
+        result = article_service.batch_update_articles_by_link(
+            [{"link": "https://example.com/b", "content": story}]
+        )
+        assert result["success"] is True
+        original = article_service.get_article_by_link("https://example.com/a")["article"]
+        updated = article_service.get_article_by_link("https://example.com/b")["article"]
+        assert updated.duplicate_of_id == original.id
+
+    def test_skip_policy_does_not_store_duplicates(self, article_service, monkeypatch):
+        """skip 模式下近似重複的新文章不保存，並回報跳過的連結"""
+        monkeypatch.setenv("NEAR_DUPLICATE_POLICY", "skip")
+        story = _story(8)
+        article_service.batch_create_articles([_article("https://example.com/x", story)])
+        result = article_service.batch_create_articles(
+            [
+                _article("https://example.com/x-copy", story),
+                _article("https://example.com/y", _story(9)),
+            ]
+        )
+        assert result["success"] is True
+        assert result["resultMsg"]["success_count"] == 1
+        skipped = result["resultMsg"]["skipped_duplicates"]
+        assert [s["link"] for s in skipped] == ["https://example.com/x-copy"]
+        assert article_service.get_article_by_link("https://example.com/x-copy")["article"] is None
+
+    def test_off_policy_only_stores_fingerprint(self, article_service, monkeypatch):
+        """off 模式下不連結，但仍保存指紋"""
+        monkeypatch.setenv("NEAR_DUPLICATE_POLICY", "off")
+        story = _story(10)
+        result = article_service.batch_create_articles(
+            [_article("https://example.com/p", story), _article("https://example.com/q", story)]
+        )
+        assert all(a.duplicate_of_id is None for a in result["resultMsg"]["inserted_articles"])
+
+    def test_banded_lookup(self, db_manager_for_test):
+        """任一段指紋相同的文章才列為候選，並依漢明距離過濾"""
+        db_manager_for_test.create_tables(Base)
+        fingerprint = compute_simhash(_story(11))
+        near = fingerprint ^ 0b111  # 只改變第一段的 3 個位元
+        far = fingerprint ^ ((1 << 16) | (1 << 32) | (1 << 48) | 1)  # 每段各改變 1 個位元
+        with db_manager_for_test.session_scope() as session:
+            for link, value in [("https://e.com/near", near), ("https://e.com/far", far)]:
+                article = Articles(**_article(link, None))
+                article.simhash = to_signed64(value)
+                for index, band in enumerate(split_bands(value)):
+                    setattr(article, f"simhash_band_{index}", band)
+                session.add(article)
+            session.flush()
+            repo = ArticlesRepository(session, Articles)
+            matches = repo.find_near_duplicates(fingerprint)
+            # 4 個位元的差異分散在每一段時不會成為候選 (超過保證範圍)
+            assert [m["distance"] for m in matches] == [3]
@@ -31,7 +31,8 @@ from src.models.crawlers_model import Crawlers
 from src.models.crawler_task_history_model import CrawlerTaskHistory
 from src.services.task_executor_service import TaskExecutorService
 from src.models.crawler_tasks_schema import TASK_ARGS_DEFAULT
-from src.utils.enum_utils import TaskStatus
+from src.models.task_queue_model import TaskQueue
+from src.utils.enum_utils import TaskQueueStatus, TaskStatus
   # 使用統一的 logger
 
 # flake8: noqa: F811
@@ -265,6 +266,55 @@ class TestTaskExecutorService:
         # 驗證 WebSocket 事件
         assert mock_emit.call_count >= 3  # 開始、進度、結束
 
+    @patch("src.crawlers.crawler_factory.CrawlerFactory.get_crawler")
+    def test_execute_task_queue_mode_enqueues(
+        self,
+        mock_get_crawler,
+        monkeypatch,
+        task_executor_service: TaskExecutorService,
+        sample_task_data: Dict[str, Any],
+        initialized_db_manager,
+    ):
+        """測試 worker 模式下異步執行只會寫入任務佇列，不在本機執行"""
+        monkeypatch.setenv("TASK_EXECUTION_MODE", "queue")
+        task_id = sample_task_data["id"]
+
+        result = task_executor_service.collect_links_only(task_id, is_async=True)
+
+        assert result["success"] is True
+        assert result["status"] == "queued"
+        assert result["queue_id"] is not None
+        assert task_id not in task_executor_service.running_tasks
+        mock_get_crawler.assert_not_called()
+
+        with initialized_db_manager.session_scope() as session:
+            entry = session.get(TaskQueue, result["queue_id"])
+            assert entry.status == TaskQueueStatus.QUEUED
+            assert entry.payload["scrape_mode"] == "links_only"
+            history = session.get(CrawlerTaskHistory, entry.history_id)
+            assert history.task_status == TaskStatus.RUNNING
+            assert session.get(CrawlerTasks, task_id).task_status == TaskStatus.RUNNING
+
+    def test_cancel_task_queue_mode(
+        self,
+        monkeypatch,
+        task_executor_service: TaskExecutorService,
+        sample_task_data: Dict[str, Any],
+        initialized_db_manager,
+    ):
+        """測試取消尚未被 worker 領取的佇列任務"""
+        monkeypatch.setenv("TASK_EXECUTION_MODE", "queue")
+        task_id = sample_task_data["id"]
+        queue_id = task_executor_service.execute_task(task_id, is_async=True)["queue_id"]
+
+        with patch("src.web.socket_instance.socketio.emit"):
+            result = task_executor_service.cancel_task(task_id)
+
+        assert result["success"] is True
+        with initialized_db_manager.session_scope() as session:
+            assert session.get(TaskQueue, queue_id).status == TaskQueueStatus.CANCELLED
+            assert session.get(CrawlerTasks, task_id).task_status == TaskStatus.CANCELLED
+
     @patch("src.crawlers.crawler_factory.CrawlerFactory.get_crawler")
     @patch("src.web.socket_instance.socketio.emit")
     def test_execute_task_async_failure(
@@ -391,6 +441,52 @@ class TestTaskExecutorService:
         # 驗證 WebSocket 事件
         assert mock_emit.call_count >= 3  # 開始、進度、結束
 
+    @patch("src.crawlers.crawler_factory.CrawlerFactory.get_crawler")
+    @patch("src.web.socket_instance.socketio.emit")
+    def test_execute_task_saves_revisit_state_and_category_stats(
+        self,
+        mock_emit,
+        mock_get_crawler,
+        task_executor_service: TaskExecutorService,
+        sample_task_data: Dict[str, Any],
+        initialized_db_manager,
+    ):
+        """測試任務結果中的重訪狀態保存到任務，各類別的抓取統計保存到歷史記錄"""
+        mock_crawler_instance = MockCrawler(success=True, message="同步成功", articles_count=2)
+        revisit_state = {
+            "ai": {"pages": 2, "interval_sec": 0.0, "next_visit_at": "2026-01-01T00:00:00+00:00"}
+        }
+        category_stats = {"ai": {"pages": 3, "requests": 4, "new_links": 2, "yield_ratio": 0.5}}
+        original_execute_task = mock_crawler_instance.execute_task
+
+        def execute_task(task_id, task_args):
+            return {
+                **original_execute_task(task_id, task_args),
+                "revisit_state": revisit_state,
+                "category_stats": category_stats,
+            }
+
+        mock_crawler_instance.execute_task = execute_task
+        mock_get_crawler.return_value = mock_crawler_instance
+        task_id = sample_task_data["id"]
+
+        result = task_executor_service.execute_task(task_id, is_async=False)
+
+        assert result["success"] is True
+        # 執行前將任務目前的重訪狀態交給爬蟲
+        assert mock_crawler_instance.revisit_state is None
+        with initialized_db_manager.session_scope() as session:
+            db_task = session.get(CrawlerTasks, task_id)
+            assert db_task.revisit_state == revisit_state
+            history = (
+                session.query(CrawlerTaskHistory)
+                .filter_by(task_id=task_id)
+                .order_by(CrawlerTaskHistory.id.desc())
+                .first()
+            )
+            assert history.category_stats == category_stats
+            assert history.to_dict()["category_stats"] == category_stats
+
     def test_execute_task_already_running(
         self,
         task_executor_service: TaskExecutorService,
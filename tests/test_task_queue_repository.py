@@ -0,0 +1,279 @@
+"""測試 TaskQueueRepository 的功能。
+
+此模組包含對 TaskQueueRepository 類的測試案例，包括：
+- 加入佇列與驗證
+- 領取 (含多執行緒透過服務同時領取不重複)
+- 心跳與結果寫回
+- 逾時項目回收與取消
+"""
+
+# Standard library imports
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict
+
+# Third party imports
+import pytest
+
+# Local application imports
+from src.models.base_model import Base
+from src.models.crawler_task_history_model import CrawlerTaskHistory
+from src.models.crawler_tasks_model import CrawlerTasks, ScrapePhase
+from src.models.crawlers_model import Crawlers
+from src.models.task_queue_model import TaskQueue
+from src.database.task_queue_repository import TaskQueueRepository
+from src.services.task_queue_service import TaskQueueService
+from src.error.errors import ValidationError
+from src.utils.enum_utils import TaskQueueStatus, TaskStatus
+
+# flake8: noqa: F811
+# pylint: disable=redefined-outer-name
+
+logger = logging.getLogger(__name__)  # 使用統一的 logger
+
+
+@pytest.fixture(scope="function")
+def initialized_db_manager(db_manager_for_test):
+    """建立資料表後提供資料庫管理器"""
+    db_manager_for_test.create_tables(Base)
+    yield db_manager_for_test
+
+
+@pytest.fixture(scope="function")
+def sample_task_id(initialized_db_manager) -> int:
+    """創建測試用的爬蟲與任務，返回任務 ID"""
+    with initialized_db_manager.session_scope() as session:
+        crawler = Crawlers(
+            crawler_name="佇列測試爬蟲",
+            module_name="test_module",
+            base_url="https://example.com",
+            is_active=True,
+            crawler_type="web",
+            config_file_name="test_config.json",
+        )
+        session.add(crawler)
+        session.flush()
+        task = CrawlerTasks(
+            task_name="佇列測試任務",
+            module_name="test_module",
+            crawler_id=crawler.id,
+            is_auto=False,
+        )
+        session.add(task)
+        session.flush()
+        task_id = task.id
+    return task_id
+
+
+def _enqueue(db_manager, task_id: int, count: int = 1, payload: Dict[str, Any] = None):
+    """加入指定數量的佇列項目並返回 ID 列表"""
+    ids = []
+    with db_manager.session_scope() as session:
+        repo = TaskQueueRepository(session, TaskQueue)
+        for _ in range(count):
+            ids.append(repo.enqueue(task_id, payload=payload).id)
+    return ids
+
+
+class TestTaskQueueRepository:
+    """TaskQueueRepository 測試"""
+
+    def test_enqueue_defaults(self, initialized_db_manager, sample_task_id):
+        """加入佇列的項目預設為 queued 且嘗試次數為 0"""
+        with initialized_db_manager.session_scope() as session:
+            repo = TaskQueueRepository(session, TaskQueue)
+            entry = repo.enqueue(sample_task_id, payload={"scrape_mode": "links_only"})
+            assert entry.id is not None
+            assert entry.status == TaskQueueStatus.QUEUED
+            assert entry.attempts == 0
+            assert entry.payload == {"scrape_mode": "links_only"}
+
+    def test_enqueue_requires_task_id(self, initialized_db_manager):
+        """缺少 task_id 時驗證失敗"""
+        with initialized_db_manager.session_scope() as session:
+            repo = TaskQueueRepository(session, TaskQueue)
+            with pytest.raises(ValidationError):
+                repo.create({"payload": {}})
+
+    def test_claim_next_in_order(self, initialized_db_manager, sample_task_id):
+        """依加入順序領取，領取後標記為 claimed 並記錄 worker"""
+        first_id, second_id = _enqueue(initialized_db_manager, sample_task_id, count=2)
+        with initialized_db_manager.session_scope() as session:
+            repo = TaskQueueRepository(session, TaskQueue)
+            entry = repo.claim_next("worker-a")
+            assert entry.id == first_id
+            assert entry.status == TaskQueueStatus.CLAIMED
+            assert entry.worker_id == "worker-a"
+            assert entry.attempts == 1
+            assert entry.claimed_at is not None
+            assert entry.heartbeat_at is not None
+
+        with initialized_db_manager.session_scope() as session:
+            repo = TaskQueueRepository(session, TaskQueue)
+            assert repo.claim_next("worker-b").id == second_id
+            assert repo.claim_next("worker-b") is None
+
+    def test_concurrent_claims_are_unique(self, initialized_db_manager, sample_task_id):
+        """多個執行緒同時透過服務領取時，每個項目只會被領取一次"""
+        queue_ids = _enqueue(initialized_db_manager, sample_task_id, count=6)
+        service = TaskQueueService(initialized_db_manager)
+        claimed = []
+        errors = []
+        claimed_lock = threading.Lock()
+
+        def claim_all(worker_id):
+            while True:
+                result = service.claim_next_task(worker_id)
+                if not result["success"]:
+                    errors.append(result["message"])
+                    return
+                if result["entry"] is None:
+                    return
+                with claimed_lock:
+                    claimed.append(result["entry"]["id"])
+
+        threads = [
+            threading.Thread(target=claim_all, args=(f"worker-{i}",)) for i in range(3)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(30)
+
+        assert errors == []
+        assert sorted(claimed) == sorted(queue_ids)
+
+    def test_heartbeat_and_complete(self, initialized_db_manager, sample_task_id):
+        """只有持有項目的 worker 可以回報心跳與寫回結果"""
+        (queue_id,) = _enqueue(initialized_db_manager, sample_task_id)
+        with initialized_db_manager.session_scope() as session:
+            TaskQueueRepository(session, TaskQueue).claim_next("worker-a")
+
+        with initialized_db_manager.session_scope() as session:
+            repo = TaskQueueRepository(session, TaskQueue)
+            assert repo.heartbeat(queue_id, "worker-a") is True
+            assert repo.heartbeat(queue_id, "worker-b") is False
+            assert repo.complete(queue_id, "worker-b", True) is False
+            assert repo.complete(
+                queue_id, "worker-a", True, result={"success": True, "articles_count": 3}
+            )
+
+        with initialized_db_manager.session_scope() as session:
+            entry = session.get(TaskQueue, queue_id)
+            assert entry.status == TaskQueueStatus.COMPLETED
+            assert entry.result == {"success": True, "articles_count": 3}
+            assert entry.finished_at is not None
+            # 已結束的項目不再接受心跳
+            assert TaskQueueRepository(session, TaskQueue).heartbeat(queue_id, "worker-a") is False
+
+    def test_complete_failure(self, initialized_db_manager, sample_task_id):
+        """執行失敗時寫回 failed 與錯誤訊息"""
+        (queue_id,) = _enqueue(initialized_db_manager, sample_task_id)
+        with initialized_db_manager.session_scope() as session:
+            repo = TaskQueueRepository(session, TaskQueue)
+            repo.claim_next("worker-a")
+            assert repo.complete(queue_id, "worker-a", False, error_message="爬取失敗")
+
+        with initialized_db_manager.session_scope() as session:
+            entry = session.get(TaskQueue, queue_id)
+            assert entry.status == TaskQueueStatus.FAILED
+            assert entry.error_message == "爬取失敗"
+
+    def test_requeue_stale(self, initialized_db_manager, sample_task_id):
+        """心跳逾時的項目重新排入佇列，達最大嘗試次數者標記失敗"""
+        retry_id, exhausted_id, alive_id = _enqueue(
+            initialized_db_manager, sample_task_id, count=3
+        )
+        old_time = datetime.now(timezone.utc) - timedelta(minutes=10)
+        with initialized_db_manager.session_scope() as session:
+            repo = TaskQueueRepository(session, TaskQueue)
+            for _ in range(3):
+                repo.claim_next("worker-dead")
+            session.flush()
+            session.get(TaskQueue, retry_id).heartbeat_at = old_time
+            exhausted = session.get(TaskQueue, exhausted_id)
+            exhausted.heartbeat_at = old_time
+            exhausted.attempts = 3
+
+        with initialized_db_manager.session_scope() as session:
+            repo = TaskQueueRepository(session, TaskQueue)
+            counts = repo.requeue_stale(stale_after_seconds=60, max_attempts=3)
+            assert counts == {
+                "requeued": 1,
+                "failed": 1,
+                "failed_entries": [{"task_id": sample_task_id, "history_id": None}],
+            }
+
+        with initialized_db_manager.session_scope() as session:
+            retry = session.get(TaskQueue, retry_id)
+            assert retry.status == TaskQueueStatus.QUEUED
+            assert retry.worker_id is None
+            assert session.get(TaskQueue, exhausted_id).status == TaskQueueStatus.FAILED
+            assert session.get(TaskQueue, alive_id).status == TaskQueueStatus.CLAIMED
+
+    def test_requeue_stale_exhausted_fails_task_and_history(
+        self, initialized_db_manager, sample_task_id
+    ):
+        """已達最大嘗試次數的逾時項目，透過服務回收時將任務與歷史記錄一併標記為失敗"""
+        with initialized_db_manager.session_scope() as session:
+            history = CrawlerTaskHistory(
+                task_id=sample_task_id,
+                start_time=datetime.now(timezone.utc),
+                task_status=TaskStatus.RUNNING,
+            )
+            session.add(history)
+            session.flush()
+            history_id = history.id
+            task = session.get(CrawlerTasks, sample_task_id)
+            task.task_status = TaskStatus.RUNNING
+            task.scrape_phase = ScrapePhase.LINK_COLLECTION
+
+            repo = TaskQueueRepository(session, TaskQueue)
+            entry_id = repo.enqueue(sample_task_id, history_id).id
+            repo.claim_next("worker-dead")
+            session.flush()
+            entry = session.get(TaskQueue, entry_id)
+            entry.heartbeat_at = datetime.now(timezone.utc) - timedelta(minutes=10)
+            entry.attempts = 3
+
+        result = TaskQueueService(initialized_db_manager).requeue_stale_tasks(
+            stale_after_seconds=60, max_attempts=3
+        )
+        assert result["success"] is True
+        assert result["requeued"] == 0
+        assert result["failed"] == 1
+        assert "failed_entries" not in result
+
+        with initialized_db_manager.session_scope() as session:
+            assert session.get(TaskQueue, entry_id).status == TaskQueueStatus.FAILED
+            task = session.get(CrawlerTasks, sample_task_id)
+            assert task.task_status == TaskStatus.FAILED
+            assert task.scrape_phase == ScrapePhase.FAILED
+            assert task.last_run_success is False
+            history = session.get(CrawlerTaskHistory, history_id)
+            assert history.task_status == TaskStatus.FAILED
+            assert history.success is False
+            assert history.end_time is not None
+
+    def test_cancel_queued_and_find_active(self, initialized_db_manager, sample_task_id):
+        """取消只影響尚未領取的項目"""
+        claimed_id, queued_id = _enqueue(initialized_db_manager, sample_task_id, count=2)
+        with initialized_db_manager.session_scope() as session:
+            TaskQueueRepository(session, TaskQueue).claim_next("worker-a")
+
+        with initialized_db_manager.session_scope() as session:
+            repo = TaskQueueRepository(session, TaskQueue)
+            assert [e.id for e in repo.find_active_by_task_id(sample_task_id)] == [
+                claimed_id,
+                queued_id,
+            ]
+            assert repo.cancel_queued(sample_task_id) == 1
+
+        with initialized_db_manager.session_scope() as session:
+            repo = TaskQueueRepository(session, TaskQueue)
+            assert session.get(TaskQueue, queued_id).status == TaskQueueStatus.CANCELLED
+            counts = repo.count_by_status()
+            assert counts["claimed"] == 1
+            assert counts["cancelled"] == 1
+            assert counts["queued"] == 0
@@ -0,0 +1,162 @@
+"""測試 TaskQueueWorker 的功能，包括領取執行、結果寫回、例外處理與心跳。"""
+
+# Standard library imports
+import logging
+import threading
+from unittest.mock import MagicMock
+
+# Third party imports
+import pytest
+
+# Local application imports
+from src.models.base_model import Base
+from src.models.crawler_tasks_model import CrawlerTasks
+from src.models.crawlers_model import Crawlers
+from src.models.task_queue_model import TaskQueue
+from src.services.task_queue_service import TaskQueueService
+from src.services.task_queue_worker import TaskQueueWorker
+from src.utils.enum_utils import TaskQueueStatus
+
+# flake8: noqa: F811
+# pylint: disable=redefined-outer-name
+
+logger = logging.getLogger(__name__)  # 使用統一的 logger
+
+
+@pytest.fixture(scope="function")
+def initialized_db_manager(db_manager_for_test):
+    """建立資料表後提供資料庫管理器"""
+    db_manager_for_test.create_tables(Base)
+    yield db_manager_for_test
+
+
+@pytest.fixture(scope="function")
+def queue_service(initialized_db_manager):
+    """使用測試資料庫的任務佇列服務"""
+    return TaskQueueService(initialized_db_manager)
+
+
+@pytest.fixture(scope="function")
+def sample_task_id(initialized_db_manager) -> int:
+    """創建測試用的爬蟲與任務，返回任務 ID"""
+    with initialized_db_manager.session_scope() as session:
+        crawler = Crawlers(
+            crawler_name="worker測試爬蟲",
+            module_name="test_module",
+            base_url="https://example.com",
+            is_active=True,
+            crawler_type="web",
+            config_file_name="test_config.json",
+        )
+        session.add(crawler)
+        session.flush()
+        task = CrawlerTasks(
+            task_name="worker測試任務",
+            module_name="test_module",
+            crawler_id=crawler.id,
+            is_auto=False,
+        )
+        session.add(task)
+        session.flush()
+        task_id = task.id
+    return task_id
+
+
+def _make_worker(queue_service, executor, **kwargs):
+    return TaskQueueWorker(
+        queue_service=queue_service,
+        task_executor_service=executor,
+        worker_id="worker-test",
+        poll_interval=0.01,
+        heartbeat_interval=kwargs.pop("heartbeat_interval", 5.0),
+        stale_after=60.0,
+        max_attempts=3,
+    )
+
+
+class TestTaskQueueWorker:
+    """TaskQueueWorker 測試"""
+
+    def test_run_once_empty_queue(self, queue_service):
+        """佇列為空時不執行任何任務"""
+        executor = MagicMock()
+        worker = _make_worker(queue_service, executor)
+        assert worker.run_once() is False
+        executor.run_queued_task.assert_not_called()
+
+    def test_run_once_executes_and_writes_result(
+        self, initialized_db_manager, queue_service, sample_task_id
+    ):
+        """領取後以 payload 執行任務並寫回結果"""
+        enqueue_result = queue_service.enqueue_task(
+            sample_task_id, payload={"scrape_mode": "links_only"}
+        )
+        queue_id = enqueue_result["entry"]["id"]
+        executor = MagicMock()
+        executor.run_queued_task.return_value = {
+            "success": True,
+            "message": "任務執行完成",
+            "articles_count": 5,
+        }
+
+        worker = _make_worker(queue_service, executor)
+        assert worker.run_once() is True
+
+        executor.run_queued_task.assert_called_once_with(
+            sample_task_id, None, scrape_mode="links_only"
+        )
+        with initialized_db_manager.session_scope() as session:
+            entry = session.get(TaskQueue, queue_id)
+            assert entry.status == TaskQueueStatus.COMPLETED
+            assert entry.worker_id == "worker-test"
+            assert entry.result["articles_count"] == 5
+
+    def test_run_once_records_exception(
+        self, initialized_db_manager, queue_service, sample_task_id
+    ):
+        """執行時拋出例外會寫回失敗與錯誤訊息"""
+        queue_id = queue_service.enqueue_task(sample_task_id)["entry"]["id"]
+        executor = MagicMock()
+        executor.run_queued_task.side_effect = RuntimeError("爬蟲崩潰")
+
+        worker = _make_worker(queue_service, executor)
+        assert worker.run_once() is True
+
+        with initialized_db_manager.session_scope() as session:
+            entry = session.get(TaskQueue, queue_id)
+            assert entry.status == TaskQueueStatus.FAILED
+            assert entry.error_message == "爬蟲崩潰"
+
+    def test_heartbeat_sent_during_execution(self, queue_service, sample_task_id):
+        """執行期間會定期回報心跳"""
+        queue_service.enqueue_task(sample_task_id)
+        heartbeat_seen = threading.Event()
+        original_heartbeat = queue_service.heartbeat
+
+        def tracking_heartbeat(queue_id, worker_id):
+            result = original_heartbeat(queue_id, worker_id)
+            heartbeat_seen.set()
+            return result
+
+        queue_service.heartbeat = tracking_heartbeat
+        executor = MagicMock()
+
+        def slow_execute(task_id, history_id, **kwargs):
+            heartbeat_seen.wait(5)
+            return {"success": True, "message": "完成"}
+
+        executor.run_queued_task.side_effect = slow_execute
+
+        worker = _make_worker(queue_service, executor, heartbeat_interval=0.05)
+        assert worker.run_once() is True
+        assert heartbeat_seen.is_set()
+
+    def test_run_forever_stops(self, queue_service):
+        """呼叫 stop() 後 run_forever 結束"""
+        worker = _make_worker(queue_service, MagicMock())
+        thread = threading.Thread(target=worker.run_forever)
+        thread.start()
+        worker.stop()
+        thread.join(5)
+        assert not thread.is_alive()
+        assert worker.stopped
@@ -0,0 +1,132 @@
+"""測試文章網址標準化 (追蹤參數、允許清單、canonical 連結) 與以標準連結比對既有文章。"""
+
+# Standard library imports
+import logging
+
+# Third party imports
+import pytest
+from bs4 import BeautifulSoup
+
+# Local application imports
+from src.models.base_model import Base
+from src.services.article_service import ArticleService
+from src.utils.enum_utils import ArticleScrapeStatus
+from src.utils.url_utils import UrlCanonicalizer, canonicalize_url
+
+# flake8: noqa: F811
+# pylint: disable=redefined-outer-name
+
+logger = logging.getLogger(__name__)  # 使用統一的 logger
+
+
+def _article(link, **kwargs):
+    data = {
+        "title": "測試文章",
+        "link": link,
+        "source": "測試來源",
+        "source_url": "https://example.com",
+        "is_ai_related": True,
+        "is_scraped": False,
+        "scrape_status": ArticleScrapeStatus.LINK_SAVED,
+    }
+    data.update(kwargs)
+    return data
+
+
+@pytest.fixture
+def article_service(db_manager_for_test):
+    db_manager_for_test.create_tables(Base)
+    return ArticleService(db_manager_for_test)
+
+
+class TestUrlCanonicalizer:
+    """網址標準化規則測試"""
+
+    @pytest.mark.parametrize(
+        "url",
+        [
+            "https://www.bnext.com.tw/article/1/ai-news",
+            "http://www.bnext.com.tw/article/1/ai-news",
+            "https://WWW.Bnext.com.tw:443/article/1/ai-news/",
+            "https://www.bnext.com.tw/article/1/ai-news?utm_source=fb&utm_medium=social",
+            "https://www.bnext.com.tw/article/1/ai-news#comments",
+            "https://www.bnext.com.tw/article/1/ai-news?fbclid=abc",
+        ],
+    )
+    def test_variants_share_canonical_form(self, url):
+        """協定、主機大小寫、預設埠號、結尾斜線、fragment 與追蹤參數不影響標準連結"""
+        assert canonicalize_url(url) == "https://www.bnext.com.tw/article/1/ai-news"
+
+    def test_keeps_and_sorts_other_params(self):
+        """未設定允許清單時保留非追蹤參數並依名稱排序"""
+        assert (
+            canonicalize_url("https://example.com/a?b=2&utm_campaign=x&a=1")
+            == "https://example.com/a?a=1&b=2"
+        )
+
+    def test_relative_and_invalid_urls(self):
+        """相對路徑依 base_url 轉為絕對網址，空值返回 None，非 http 網址原樣返回"""
+        assert canonicalize_url("/article/2/", "https://example.com") == "https://example.com/article/2"
+        assert canonicalize_url("") is None
+        assert canonicalize_url("mailto:a@example.com") == "mailto:a@example.com"
+
+    def test_site_allowlist(self):
+        """網站設定允許清單時只保留清單內的參數，其他主機不受影響"""
+        canonicalizer = UrlCanonicalizer.from_config(
+            {"allowed_query_params": ["id"]}, base_url="https://news.example.com"
+        )
+        assert (
+            canonicalizer.canonicalize("https://news.example.com/read?id=5&from=rss&page=2")
+            == "https://news.example.com/read?id=5"
+        )
+        assert (
+            canonicalizer.canonicalize("https://other.example.com/read?id=5&from=rss")
+            == "https://other.example.com/read?from=rss&id=5"
+        )
+
+    def test_force_https_can_be_disabled(self):
+        """關閉 force_https 時保留原協定"""
+        canonicalizer = UrlCanonicalizer.from_config({"force_https": False})
+        assert canonicalizer.canonicalize("http://example.com/a") == "http://example.com/a"
+
+    def test_extract_canonical_link(self):
+        """頁面宣告同一網站的 canonical 連結時採用，指向其他網站時忽略"""
+        canonicalizer = UrlCanonicalizer()
+        same_site = BeautifulSoup(
+            '<head><link rel="canonical" href="/article/3/story/"></head>', "html.parser"
+        )
+        other_site = BeautifulSoup(
+            '<head><link rel="canonical" href="https://mirror.example.org/3"></head>', "html.parser"
+        )
+        page_url = "https://www.example.com/amp/article/3?utm_source=x"
+        assert canonicalizer.extract_canonical_link(same_site, page_url) == "https://www.example.com/article/3/story"
+        assert canonicalizer.extract_canonical_link(other_site, page_url) is None
+        assert canonicalizer.extract_canonical_link(BeautifulSoup("", "html.parser"), page_url) is None
+
+
+class TestCanonicalLinkLookup:
+    """以標準連結比對既有文章測試"""
+
+    def test_variant_link_updates_existing_article(self, article_service):
+        """網址形式不同的同一篇文章更新既有文章，不新增重複資料"""
+        article_service.batch_create_articles([_article("https://example.com/news/1")])
+        result = article_service.batch_create_articles(
+            [_article("http://Example.com/news/1/?utm_source=rss", title="新標題")]
+        )
+
+        assert result["success"] is True
+        assert result["resultMsg"]["success_count"] == 0
+        assert result["resultMsg"]["update_count"] == 1
+        article = article_service.get_article_by_link("https://example.com/news/1?utm_medium=email")["article"]
+        assert article.link == "https://example.com/news/1"
+        assert article.title == "新標題"
+        assert article.canonical_link == "https://example.com/news/1"
+
+    def test_declared_canonical_link_matches_other_url(self, article_service):
+        """以頁面宣告的 canonical 連結建立的文章，可用 canonical 網址查到"""
+        article_service.batch_create_articles(
+            [_article("https://example.com/amp/7", canonical_link="https://example.com/news/7/")]
+        )
+        article = article_service.get_article_by_link("https://example.com/news/7")["article"]
+        assert article is not None
+        assert article.link == "https://example.com/amp/7"
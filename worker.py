@@ -0,0 +1,63 @@
+"""任務佇列 worker 執行腳本 (多節點 worker 模式)。
+
+Web/排程節點在 TASK_EXECUTION_MODE=queue 時只會把任務寫入資料庫的 task_queue 表，
+由此腳本啟動的 worker 領取並執行；可在多台主機或多個容器上同時啟動多個 worker。
+"""
+# 標準函式庫
+import signal
+import sys
+import logging
+# 第三方函式庫
+from dotenv import load_dotenv
+
+# 本地應用程式 imports
+from src.config import get_db_manager
+from src.services.service_container import ServiceContainer
+from src.services.task_queue_worker import TaskQueueWorker
+
+
+logger = logging.getLogger(__name__)  # 使用統一的 logger
+
+load_dotenv()
+
+
+def main():
+    """啟動 worker 並持續處理佇列，收到 SIGINT/SIGTERM 時在目前任務完成後結束"""
+    worker = TaskQueueWorker()
+
+    def handle_signal(signum, _frame):
+        logger.info("收到信號 %s，worker 將在目前任務完成後停止", signum)
+        worker.stop()
+
+    signal.signal(signal.SIGINT, handle_signal)
+    signal.signal(signal.SIGTERM, handle_signal)
+
+    worker.run_forever()
+
+
+def cleanup():
+    """清理服務實例與資料庫連線"""
+    try:
+        ServiceContainer.clear_instances()
+    except Exception as ce:
+        logger.error("清理服務實例時發生錯誤: %s", ce, exc_info=True)
+    db_manager = get_db_manager()
+    if db_manager:
+        try:
+            db_manager.cleanup()
+            logger.info("資料庫管理器資源已清理")
+        except Exception as dbe:
+            logger.error("清理資料庫管理器時發生錯誤: %s", dbe, exc_info=True)
+
+
+if __name__ == "__main__":
+    logger.info("開始執行任務佇列 worker (worker.py)...")
+    exit_code = 0
+    try:
+        main()
+    except Exception as e:
+        logger.critical("worker 因未處理的異常而終止: %s", e, exc_info=True)
+        exit_code = 1
+    finally:
+        cleanup()
+    sys.exit(exit_code)